@@ -29,6 +29,7 @@ class Config:
 
     # Performance Configuration
     TOKEN_CACHE_TTL: int = int(os.getenv("TOKEN_CACHE_TTL", "900"))
+    TOKEN_REFRESH_MARGIN: int = int(os.getenv("TOKEN_REFRESH_MARGIN", "120"))
     REQUEST_TIMEOUT: int = int(os.getenv("REQUEST_TIMEOUT", "30"))
     MAX_RETRIES: int = int(os.getenv("MAX_RETRIES", "3"))
     RETRY_BACKOFF: int = int(os.getenv("RETRY_BACKOFF", "2"))
@@ -42,6 +43,35 @@ class Config:
     # Features
     ENABLE_CACHING: bool = os.getenv("ENABLE_CACHING", "true").lower() == "true"
     CACHE_TTL: int = int(os.getenv("CACHE_TTL", "300"))
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+    CACHE_MAX_BYTES: int = int(os.getenv("CACHE_MAX_BYTES", str(128 * 1024 * 1024)))
+    CACHE_CODEC: str = os.getenv("CACHE_CODEC", "")
+    # Seconds past CACHE_TTL that entries may be served stale (opt-in)
+    CACHE_STALE_TTL: int = int(os.getenv("CACHE_STALE_TTL", "0"))
+    CACHE_XFETCH_BETA: float = float(os.getenv("CACHE_XFETCH_BETA", "1.0"))
+    CACHE_NEGATIVE_TTL: int = int(os.getenv("CACHE_NEGATIVE_TTL", "30"))
+    CACHE_SWEEP_INTERVAL: float = float(os.getenv("CACHE_SWEEP_INTERVAL", "1.0"))
+    CACHE_SWEEP_BATCH_SIZE: int = int(os.getenv("CACHE_SWEEP_BATCH_SIZE", "500"))
+    CACHE_HOT_KEYS: int = int(os.getenv("CACHE_HOT_KEYS", "256"))
+    CACHE_HOT_KEY_HALF_LIFE: float = float(os.getenv("CACHE_HOT_KEY_HALF_LIFE", "600"))
+    CACHE_INVALIDATION_SECRET: str = os.getenv("CACHE_INVALIDATION_SECRET", "")
+    CACHE_INVALIDATION_PATH: str = os.getenv("CACHE_INVALIDATION_PATH", "/hooks/payload-changes")
+    CACHE_INVALIDATION_MAX_SKEW: int = int(os.getenv("CACHE_INVALIDATION_MAX_SKEW", "300"))
+    CACHE_SNAPSHOT_PATH: str = os.getenv("CACHE_SNAPSHOT_PATH", "")
+    CACHE_SNAPSHOT_INTERVAL: int = int(os.getenv("CACHE_SNAPSHOT_INTERVAL", "300"))
+    CACHE_L2_PATH: str = os.getenv("CACHE_L2_PATH", "")
+    CACHE_L2_MAX_BYTES: int = int(os.getenv("CACHE_L2_MAX_BYTES", str(1024 * 1024 * 1024)))
+    CACHE_SHARED_URL: str = os.getenv("CACHE_SHARED_URL", "")
+    CACHE_SHARED_MAX_BYTES: int = int(os.getenv("CACHE_SHARED_MAX_BYTES", str(256 * 1024 * 1024)))
+    CACHE_SHARED_POLL_TIMEOUT: float = float(os.getenv("CACHE_SHARED_POLL_TIMEOUT", "1.0"))
+    CACHE_WRITE_THROUGH: bool = os.getenv("CACHE_WRITE_THROUGH", "true").lower() == "true"
+    DOCUMENT_BATCH_WINDOW: float = float(os.getenv("DOCUMENT_BATCH_WINDOW", "0.002"))
+    DOCUMENT_BATCH_MAX_SIZE: int = int(os.getenv("DOCUMENT_BATCH_MAX_SIZE", "50"))
+    BATCH_CONCURRENCY: int = int(os.getenv("BATCH_CONCURRENCY", "8"))
+    BATCH_MAX_CONCURRENCY: int = int(os.getenv("BATCH_MAX_CONCURRENCY", "32"))
+    BATCH_LATENCY_TARGET: float = float(os.getenv("BATCH_LATENCY_TARGET", "2.0"))
+    BATCH_CHUNK_SIZE: int = int(os.getenv("BATCH_CHUNK_SIZE", "100"))
+    BATCH_CHUNKS_IN_FLIGHT: int = int(os.getenv("BATCH_CHUNKS_IN_FLIGHT", "2"))
     ENABLE_AUDIT_LOG: bool = os.getenv("ENABLE_AUDIT_LOG", "true").lower() == "true"
     ENABLE_DRAFT_MODE: bool = os.getenv("ENABLE_DRAFT_MODE", "true").lower() == "true"
 
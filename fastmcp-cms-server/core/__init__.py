@@ -3,6 +3,8 @@
 from .circuit_breaker import CircuitBreaker, CircuitState
 from .retry import RetryConfig, execute_with_retry
 from .deduplication import RequestDeduplicator
+from .batch_loader import BatchLoader
+from .batch_executor import BatchExecutor, ItemResult
 from .middleware import (
     Middleware,
     LoggingMiddleware,
@@ -13,6 +15,12 @@ from .middleware import (
 )
 from .registry import OperationRegistry, OperationMetadata
 from .smart_cache import SmartCache
+from .cache_keys import QueryKey
+from .cache_policy import WTinyLFUPolicy
+from .disk_cache import DiskCache
+from .heavy_hitters import SpaceSaving
+from .encoded_json import EncodedJSON, RawJSON
+from .shared_cache import SharedCacheBackend, SQLiteSharedCache, RedisSharedCache
 from .connection_pool import ConnectionPool
 
 __all__ = [
@@ -21,6 +29,9 @@ __all__ = [
     "RetryConfig",
     "execute_with_retry",
     "RequestDeduplicator",
+    "BatchLoader",
+    "BatchExecutor",
+    "ItemResult",
     "Middleware",
     "LoggingMiddleware",
     "RateLimitMiddleware",
@@ -30,5 +41,14 @@ __all__ = [
     "OperationRegistry",
     "OperationMetadata",
     "SmartCache",
+    "QueryKey",
+    "WTinyLFUPolicy",
+    "DiskCache",
+    "SpaceSaving",
+    "EncodedJSON",
+    "RawJSON",
+    "SharedCacheBackend",
+    "SQLiteSharedCache",
+    "RedisSharedCache",
     "ConnectionPool",
 ]
@@ -0,0 +1,436 @@
+"""Bounded, adaptively parallel execution of batch items."""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional
+from config import Config
+from core.circuit_breaker import CircuitBreakerError
+from core.retry import RetryConfig, is_retryable
+from utils.errors import CMSConnectionError, CMSTimeoutError
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Errors that mean the CMS is struggling, rather than that an item is bad
+# (a CMSConnectionError only without a 4xx; see is_overload)
+OVERLOAD_ERRORS: tuple[type[Exception], ...] = (
+    CMSTimeoutError,
+    CMSConnectionError,
+    CircuitBreakerError,
+    asyncio.TimeoutError,
+)
+
+
+def is_overload(error: Optional[BaseException]) -> bool:
+    """
+    Whether an item's error means the CMS is struggling.
+
+    Timeouts, transport errors, 5xx answers and an open circuit breaker
+    do; a 4xx only says the item itself was refused.
+    """
+    if isinstance(error, CMSConnectionError) and error.is_client_error:
+        return False
+    return isinstance(error, OVERLOAD_ERRORS)
+
+
+@dataclass
+class ItemResult:
+    """Outcome of one batch item."""
+    index: int
+    item: Any
+    value: Any = None
+    error: Optional[Exception] = None
+    duration: float = 0.0
+    attempts: int = 0
+
+    @property
+    def ok(self) -> bool:
+        """Whether the item succeeded."""
+        return self.error is None
+
+
+class BatchExecutor:
+    """
+    Run batch items with a concurrency limit that adapts to the CMS.
+
+    The limit follows AIMD, as in TCP congestion control: every item
+    that completes within ``latency_target`` without an overload error
+    (see is_overload) raises it by ``1 / limit``, so by about one per
+    round of items; a slow or overloaded item cuts it by
+    ``decrease_factor``. Only items started after the last cut can cut
+    it again, so one burst of failures halves it once rather than
+    collapsing it to the minimum.
+
+    Results are yielded in input order. Items are started lazily, so
+    at most a few rounds of items (and their results) are held at once
+    however long the input is.
+
+    With a RetryConfig, a failed item is retried on its own (after a
+    backoff, without holding a slot) while the rest of the batch
+    carries on; items that succeeded are never run again. A
+    ``committed`` check can recognize an item whose failed attempt
+    took effect anyway (e.g. a create that timed out after the CMS
+    stored it), so it isn't sent twice.
+
+    With a ``deadline``, items still running or not yet started when
+    it passes are stopped and reported as timed out, so the results of
+    the items that finished are returned rather than lost.
+
+    Example:
+        executor = BatchExecutor(initial_concurrency=4)
+        async for result in executor.map(create_one, items):
+            print(result.index, result.ok, result.duration)
+    """
+
+    def __init__(
+        self,
+        initial_concurrency: int = 8,
+        min_concurrency: int = 1,
+        max_concurrency: int = 32,
+        latency_target: float = 2.0,
+        decrease_factor: float = 0.5,
+        backoff_unit: float = 1.0,
+    ):
+        """
+        Initialize batch executor.
+
+        Args:
+            initial_concurrency: Items run at once to begin with
+            min_concurrency: Lower bound of the limit
+            max_concurrency: Upper bound of the limit
+            latency_target: Seconds above which an item counts as slow
+            decrease_factor: Multiplier applied to the limit on overload
+            backoff_unit: Seconds of the first retry backoff (later ones
+                          grow by the RetryConfig's backoff_factor)
+        """
+        if not 1 <= min_concurrency <= max_concurrency:
+            raise ValueError("Need 1 <= min_concurrency <= max_concurrency")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+        self.backoff_unit = backoff_unit
+
+        self._limit = float(min(max(initial_concurrency, min_concurrency), max_concurrency))
+        self._in_flight = 0
+        self._slots = asyncio.Condition()
+        self._last_decrease = float("-inf")
+        self._stats = self._empty_stats()
+
+    @staticmethod
+    def _empty_stats() -> dict:
+        """Fresh statistics counters."""
+        return {
+            "items": 0,
+            "errors": 0,
+            "overloads": 0,
+            "decreases": 0,
+            "total_item_time": 0.0,
+            "peak_in_flight": 0,
+            "retries": 0,
+            "recovered_by_retry": 0,
+            "found_committed": 0,
+            "deadline_expired": 0,
+        }
+
+    @property
+    def concurrency(self) -> int:
+        """Current concurrency limit."""
+        return int(self._limit)
+
+    async def map(
+        self,
+        fn: Callable[[Any], Awaitable[Any]],
+        items: Iterable[Any],
+        retry: Optional[RetryConfig] = None,
+        committed: Optional[Callable[[Any], Awaitable[Any]]] = None,
+        deadline: Optional[float] = None,
+    ) -> AsyncIterator[ItemResult]:
+        """
+        Run ``fn`` on every item and yield the results in input order.
+
+        Errors raised by ``fn`` are captured in the ItemResult rather
+        than raised.
+
+        Args:
+            fn: Coroutine function run once per item
+            items: Items (any iterable; consumed lazily)
+            retry: Retry and per-attempt timeout policy (None = one attempt)
+            committed: Coroutine function called before a retry; a
+                       result other than None is taken as the item's
+                       value instead of retrying, and an error keeps
+                       the item failed without retrying
+            deadline: Seconds after which unfinished items are stopped
+                      and yielded as timed out (None = no limit)
+
+        Yields:
+            ItemResult for each item, in input order
+        """
+        # Items started ahead of the one being waited for
+        window = self.max_concurrency * 2
+        iterator = iter(items)
+        queue: deque[tuple[ItemResult, asyncio.Task]] = deque()
+        exhausted = False
+        index = 0
+        loop = asyncio.get_running_loop()
+        stop_at = None if deadline is None else loop.time() + deadline
+
+        try:
+            while True:
+                while not exhausted and len(queue) < window:
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    result = ItemResult(index=index, item=item)
+                    queue.append((result, asyncio.create_task(
+                        self._run_item(fn, result, retry, committed)
+                    )))
+                    index += 1
+
+                if not queue:
+                    return
+                result, task = queue[0]
+                if stop_at is not None:
+                    await asyncio.wait([task], timeout=max(0.0, stop_at - loop.time()))
+                    if not task.done():
+                        break
+                queue.popleft()
+                yield await task
+
+            # Deadline passed: report what finished, stop the rest
+            for result, task in queue:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*(task for _, task in queue), return_exceptions=True)
+            for result, task in queue:
+                if task.cancelled():
+                    self._give_up(result, f"Batch deadline of {deadline}s passed while the "
+                                          "item was running; it may have been applied")
+                yield result
+            queue.clear()
+            for item in iterator:
+                result = ItemResult(index=index, item=item)
+                self._give_up(result, f"Batch deadline of {deadline}s passed before the "
+                                      "item was started")
+                index += 1
+                yield result
+        finally:
+            # Consumer stopped early or was cancelled
+            for _, task in queue:
+                task.cancel()
+            await asyncio.gather(*(task for _, task in queue), return_exceptions=True)
+
+    async def run(
+        self,
+        fn: Callable[[Any], Awaitable[Any]],
+        items: Iterable[Any],
+        retry: Optional[RetryConfig] = None,
+        committed: Optional[Callable[[Any], Awaitable[Any]]] = None,
+        deadline: Optional[float] = None,
+    ) -> list[ItemResult]:
+        """
+        Run ``fn`` on every item and collect the results.
+
+        Args:
+            fn: Coroutine function run once per item
+            items: Items
+            retry: Retry and per-attempt timeout policy (see ``map``)
+            committed: Check for items that took effect (see ``map``)
+            deadline: Seconds before unfinished items time out (see ``map``)
+
+        Returns:
+            ItemResult for each item, in input order
+        """
+        return [
+            result async for result in self.map(fn, items, retry, committed, deadline)
+        ]
+
+    def _give_up(self, result: ItemResult, reason: str):
+        """Record an item stopped by the batch deadline."""
+        result.error = CMSTimeoutError(reason)
+        self._stats["items"] += 1
+        self._stats["errors"] += 1
+        self._stats["deadline_expired"] += 1
+
+    async def _run_item(
+        self,
+        fn: Callable[[Any], Awaitable[Any]],
+        result: ItemResult,
+        retry: Optional[RetryConfig],
+        committed: Optional[Callable[[Any], Awaitable[Any]]],
+    ) -> ItemResult:
+        """Run one item, retrying it on its own if it fails."""
+        item = result.item
+        max_attempts = retry.max_retries + 1 if retry else 1
+
+        while True:
+            result.attempts += 1
+            if result.attempts > 1 and committed is not None:
+                # The failed attempt may have gone through anyway
+                failure = result.error
+                found = await self._attempt(committed, item, retry, result)
+                if result.error is not None:
+                    # Can't tell, so don't risk sending it twice
+                    result.error = failure
+                    break
+                if found is not None:
+                    result.value = found
+                    self._stats["found_committed"] += 1
+                    break
+
+            result.value = await self._attempt(fn, item, retry, result)
+            if result.error is None:
+                if result.attempts > 1:
+                    self._stats["recovered_by_retry"] += 1
+                break
+            if (
+                result.attempts >= max_attempts
+                or not is_retryable(result.error, retry)
+            ):
+                break
+
+            self._stats["retries"] += 1
+            await asyncio.sleep(self.backoff_unit * retry.backoff_factor ** (result.attempts - 1))
+
+        self._stats["items"] += 1
+        if result.error is not None:
+            self._stats["errors"] += 1
+        return result
+
+    async def _attempt(
+        self,
+        fn: Callable[[Any], Awaitable[Any]],
+        item: Any,
+        retry: Optional[RetryConfig],
+        result: ItemResult,
+    ) -> Any:
+        """Run one attempt in a concurrency slot, recording its outcome on result."""
+        async with self._slots:
+            await self._slots.wait_for(lambda: self._in_flight < int(self._limit))
+            self._in_flight += 1
+            self._stats["peak_in_flight"] = max(self._stats["peak_in_flight"], self._in_flight)
+
+        started = time.monotonic()
+        value = None
+        cancelled = False
+        result.error = None
+        try:
+            if retry is not None:
+                value = await asyncio.wait_for(fn(item), timeout=retry.timeout)
+            else:
+                value = await fn(item)
+        except asyncio.CancelledError:
+            # Stopped from outside, which says nothing about the CMS
+            cancelled = True
+            raise
+        except asyncio.TimeoutError:
+            result.error = CMSTimeoutError(f"Item timed out after {retry.timeout}s")
+        except Exception as e:
+            result.error = e
+        finally:
+            duration = time.monotonic() - started
+            result.duration += duration
+            async with self._slots:
+                self._in_flight -= 1
+                if not cancelled:
+                    self._observe(result.error, duration, started)
+                self._slots.notify_all()
+
+        return value
+
+    def _observe(self, error: Optional[Exception], duration: float, started: float):
+        """Adjust the concurrency limit after an attempt completed."""
+        self._stats["total_item_time"] += duration
+
+        overloaded = (
+            is_overload(error)
+            or duration > self.latency_target
+        )
+        if not overloaded:
+            self._limit = min(self.max_concurrency, self._limit + 1 / self._limit)
+            return
+
+        self._stats["overloads"] += 1
+        if started < self._last_decrease:
+            # Already in flight when the limit was last cut
+            return
+        previous = self.concurrency
+        self._limit = max(self.min_concurrency, self._limit * self.decrease_factor)
+        self._last_decrease = time.monotonic()
+        self._stats["decreases"] += 1
+        logger.warning(
+            "Batch concurrency reduced",
+            previous=previous,
+            concurrency=self.concurrency,
+            error=str(error) if error else None,
+            duration=round(duration, 3),
+        )
+
+    def get_stats(self) -> dict:
+        """
+        Get executor statistics.
+
+        Returns:
+            Statistics dictionary with:
+            - concurrency: Current concurrency limit
+            - in_flight: Items running now
+            - peak_in_flight: Most items run at once
+            - items: Items completed
+            - errors: Items that raised
+            - overloads: Items that were slow or hit an overload error
+            - decreases: Times the limit was cut
+            - retries: Item attempts retried
+            - recovered_by_retry: Items that succeeded on a retry
+            - found_committed: Failed items found to have taken effect
+            - deadline_expired: Items stopped by a batch deadline
+            - avg_item_ms: Mean item duration (all attempts)
+        """
+        items = self._stats["items"]
+        return {
+            "concurrency": self.concurrency,
+            "in_flight": self._in_flight,
+            "peak_in_flight": self._stats["peak_in_flight"],
+            "items": items,
+            "errors": self._stats["errors"],
+            "overloads": self._stats["overloads"],
+            "decreases": self._stats["decreases"],
+            "retries": self._stats["retries"],
+            "recovered_by_retry": self._stats["recovered_by_retry"],
+            "found_committed": self._stats["found_committed"],
+            "deadline_expired": self._stats["deadline_expired"],
+            "avg_item_ms": (
+                round(self._stats["total_item_time"] / items * 1000, 2) if items else 0
+            ),
+        }
+
+    def reset_stats(self):
+        """Reset statistics counters."""
+        self._stats = self._empty_stats()
+
+
+# Process-wide executor, so concurrent batches share one limit
+_batch_executor: Optional[BatchExecutor] = None
+
+
+def get_batch_executor() -> BatchExecutor:
+    """
+    Get the process-wide batch executor.
+
+    Returns:
+        BatchExecutor configured from Config
+    """
+    global _batch_executor
+    if _batch_executor is None:
+        _batch_executor = BatchExecutor(
+            initial_concurrency=Config.BATCH_CONCURRENCY,
+            max_concurrency=Config.BATCH_MAX_CONCURRENCY,
+            latency_target=Config.BATCH_LATENCY_TARGET,
+        )
+    return _batch_executor
@@ -0,0 +1,191 @@
+"""Micro-batching of concurrent single-key loads (the DataLoader pattern)."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable, Optional, Sequence
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Loads a batch of keys; returns one value (or Exception) per key, in order
+BatchFunction = Callable[[list[Hashable]], Awaitable[Sequence[Any]]]
+
+
+class BatchLoader:
+    """
+    Collect loads that arrive close together and run them as one batch.
+
+    The first ``load()`` opens a window of ``window`` seconds; every key
+    requested before it closes (or until ``max_batch`` distinct keys are
+    waiting) goes to a single call of ``load_batch``. Each caller gets
+    the value for its own key, or the exception ``load_batch`` returned
+    in its place. If ``load_batch`` itself raises, every caller in the
+    batch gets that error.
+
+    Example:
+        async def load_projects(ids):
+            docs = await fetch_where_id_in(ids)
+            return [docs.get(i) or ResourceNotFoundError(i) for i in ids]
+
+        loader = BatchLoader(load_projects, window=0.002)
+        first, second = await asyncio.gather(loader.load("a"), loader.load("b"))
+        # One request for both documents
+    """
+
+    def __init__(
+        self,
+        load_batch: BatchFunction,
+        window: float = 0.002,
+        max_batch: int = 50,
+    ):
+        """
+        Initialize batch loader.
+
+        Args:
+            load_batch: Coroutine function loading a list of distinct keys
+            window: Seconds to wait for more keys after the first one
+            max_batch: Maximum distinct keys per batch (a full batch is
+                       sent immediately)
+        """
+        self.load_batch = load_batch
+        self.window = window
+        self.max_batch = max(1, max_batch)
+
+        self._pending: dict[Hashable, list[asyncio.Future]] = {}
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task] = set()
+        self._stats = self._empty_stats()
+
+    @staticmethod
+    def _empty_stats() -> dict:
+        """Fresh statistics counters."""
+        return {
+            "loads": 0,
+            "batches": 0,
+            "keys": 0,
+            "full_batches": 0,
+            "max_batch_size": 0,
+            "failed_batches": 0,
+        }
+
+    async def load(self, key: Hashable) -> Any:
+        """
+        Load one key as part of the next batch.
+
+        Args:
+            key: Key to load
+
+        Returns:
+            The key's value
+
+        Raises:
+            Exception: The error returned for the key, or raised by the batch
+        """
+        self._stats["loads"] += 1
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        waiters = self._pending.get(key)
+        if waiters is None:
+            self._pending[key] = [future]
+        else:
+            # Same key twice in a window is loaded once
+            waiters.append(future)
+
+        if len(self._pending) >= self.max_batch:
+            self._stats["full_batches"] += 1
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._dispatch)
+
+        return await future
+
+    def _dispatch(self):
+        """Send the waiting keys as one batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: dict[Hashable, list[asyncio.Future]]):
+        """Load a batch and resolve its waiters."""
+        keys = list(batch)
+        self._stats["batches"] += 1
+        self._stats["keys"] += len(keys)
+        self._stats["max_batch_size"] = max(self._stats["max_batch_size"], len(keys))
+
+        try:
+            values = await self.load_batch(keys)
+            if len(values) != len(keys):
+                raise ValueError(
+                    f"Batch function returned {len(values)} values for {len(keys)} keys"
+                )
+        except asyncio.CancelledError:
+            for waiters in batch.values():
+                for future in waiters:
+                    future.cancel()
+            raise
+        except Exception as e:
+            self._stats["failed_batches"] += 1
+            logger.warning("Batch load failed", keys=len(keys), error=str(e))
+            for waiters in batch.values():
+                for future in waiters:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for key, value in zip(keys, values):
+            for future in batch[key]:
+                # Skip callers that were cancelled while waiting
+                if future.done():
+                    continue
+                if isinstance(value, Exception):
+                    future.set_exception(value)
+                else:
+                    future.set_result(value)
+
+    def get_stats(self) -> dict:
+        """
+        Get batching statistics.
+
+        Returns:
+            Statistics dictionary with:
+            - loads: Calls to load()
+            - batches: Batches sent
+            - keys: Distinct keys loaded across all batches
+            - avg_batch_size: Distinct keys per batch
+            - max_batch_size: Largest batch sent
+            - full_batches: Batches sent early because max_batch was reached
+            - failed_batches: Batches whose load function raised
+            - pending: Keys waiting for the current window
+        """
+        batches = self._stats["batches"]
+        return {
+            **self._stats,
+            "avg_batch_size": round(self._stats["keys"] / batches, 2) if batches else 0,
+            "pending": len(self._pending),
+        }
+
+    def reset_stats(self):
+        """Reset statistics counters."""
+        self._stats = self._empty_stats()
+
+    async def close(self):
+        """Cancel waiting loads and batches in flight."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for waiters in self._pending.values():
+            for future in waiters:
+                future.cancel()
+        self._pending = {}
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
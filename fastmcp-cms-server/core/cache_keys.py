@@ -0,0 +1,246 @@
+"""Canonical, reversible keys for cached CMS queries."""
+
+from dataclasses import dataclass
+from typing import Any, Literal, Optional
+from urllib.parse import parse_qsl, urlencode
+
+
+QueryKind = Literal["collection", "doc", "global"]
+
+
+def _param_str(value: Any) -> str:
+    """Render a scalar the way it appears in a query string."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if value is None:
+        return ""
+    return str(value)
+
+
+def _flatten(prefix: str, value: Any, out: list[tuple[str, str]]):
+    """
+    Flatten a query param into bracket-notation pairs.
+
+    Nested dicts become ``key[sub]`` (the qs convention Payload parses)
+    and lists become repeated keys.
+    """
+    if isinstance(value, dict):
+        for sub_key, sub_value in value.items():
+            _flatten(f"{prefix}[{sub_key}]", sub_value, out)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _flatten(prefix, item, out)
+    else:
+        out.append((prefix, _param_str(value)))
+
+
+def canonicalize_params(params: Optional[dict]) -> tuple[tuple[str, str], ...]:
+    """
+    Convert query params into a canonical tuple of string pairs.
+
+    Keys are sorted so insertion order never matters, while repeated keys
+    keep their value order (the sort is stable).
+
+    Args:
+        params: Query parameters (may contain nested dicts and lists)
+
+    Returns:
+        Sorted tuple of (key, value) string pairs
+    """
+    pairs: list[tuple[str, str]] = []
+    for key, value in (params or {}).items():
+        _flatten(str(key), value, pairs)
+    return tuple(sorted(pairs, key=lambda pair: pair[0]))
+
+
+def key_prefix_tags(key: str) -> tuple[str, ...]:
+    """
+    Get the prefix tags a cache key is indexed under.
+
+    Every ``:``-delimited prefix of the key's kind and name is a tag, so
+    ``collection:projects:limit=10`` is tagged ``collection`` and
+    ``collection:projects``. Invalidating ``collection:projects:*`` then
+    only touches keys under that tag instead of scanning the whole cache.
+    Params are URL-encoded, so a ``:`` never appears inside them.
+
+    Args:
+        key: Cache key string
+
+    Returns:
+        Tags from shortest to longest (empty for keys without a ``:``)
+    """
+    parts = key.split(":", 2)
+    return tuple(":".join(parts[:i]) for i in range(1, len(parts)))
+
+
+def document_tag(collection: str, doc_id: Any) -> str:
+    """Tag for list pages that contain a document."""
+    return f"contains:{collection}:{doc_id}"
+
+
+def field_tag(collection: str, field: str) -> str:
+    """Tag for list pages whose filter or sort reads a field."""
+    return f"filter:{collection}:{field}"
+
+
+def opaque_tag(collection: str) -> str:
+    """Tag for list pages whose contents could not be indexed."""
+    return f"opaque:{collection}"
+
+
+def list_page_tags(query: "QueryKey", response: Any) -> tuple[str, ...]:
+    """
+    Get the tags a cached list response is indexed under.
+
+    A page is tagged with every document id it contains and every field
+    its query filters or sorts on, so an update only needs to drop pages
+    that show the document or that it could move into or out of.
+
+    Args:
+        query: Collection query that produced the response
+        response: Payload list response (``{"docs": [...], ...}``)
+
+    Returns:
+        Tags for the page
+    """
+    collection = query.name
+    tags = [field_tag(collection, field) for field in sorted(query.filter_fields())]
+
+    docs = response.get("docs") if isinstance(response, dict) else None
+    if not isinstance(docs, list):
+        return (*tags, opaque_tag(collection))
+
+    for doc in docs:
+        if not isinstance(doc, dict) or doc.get("id") is None:
+            return (*tags, opaque_tag(collection))
+        tags.append(document_tag(collection, doc["id"]))
+
+    return tuple(tags)
+
+
+@dataclass(frozen=True)
+class QueryKey:
+    """
+    Structured identity of a cacheable CMS read.
+
+    The same query always produces the same key regardless of parameter
+    order, and the string form can be parsed back into the exact request
+    that produced it. The string form is what SmartCache stores entries
+    under; the object itself is hashable and used for deduplication.
+
+    Key formats:
+    - ``collection:{collection}:{urlencoded sorted params}``
+    - ``doc:{collection}:{doc_id}``
+    - ``global:{slug}``
+
+    Example:
+        key = QueryKey.for_collection("projects", {"page": 1, "limit": 10})
+        str(key)  # "collection:projects:limit=10&page=1"
+        QueryKey.parse(str(key)) == key  # True
+    """
+
+    kind: QueryKind
+    name: str
+    doc_id: Optional[str] = None
+    params: tuple[tuple[str, str], ...] = ()
+
+    @classmethod
+    def for_collection(cls, collection: str, params: Optional[dict] = None) -> "QueryKey":
+        """Key for a collection list query."""
+        return cls("collection", collection, params=canonicalize_params(params))
+
+    @classmethod
+    def for_document(cls, collection: str, doc_id: str) -> "QueryKey":
+        """Key for a single document lookup."""
+        return cls("doc", collection, doc_id=str(doc_id))
+
+    @classmethod
+    def for_global(cls, global_slug: str) -> "QueryKey":
+        """Key for a global singleton."""
+        return cls("global", global_slug)
+
+    @classmethod
+    def parse(cls, key: str) -> "QueryKey":
+        """
+        Parse a key string produced by ``str(QueryKey)``.
+
+        Args:
+            key: Cache key string
+
+        Returns:
+            Equivalent QueryKey
+
+        Raises:
+            ValueError: If the key is not in a recognised format
+        """
+        kind, _, rest = key.partition(":")
+
+        if kind == "collection":
+            collection, _, query = rest.partition(":")
+            if not collection:
+                raise ValueError(f"Invalid collection key: {key}")
+            pairs = parse_qsl(query, keep_blank_values=True)
+            return cls("collection", collection, params=tuple(pairs))
+
+        if kind == "doc":
+            collection, sep, doc_id = rest.partition(":")
+            if not collection or not sep:
+                raise ValueError(f"Invalid document key: {key}")
+            return cls("doc", collection, doc_id=doc_id)
+
+        if kind == "global" and rest:
+            return cls("global", rest)
+
+        raise ValueError(f"Unrecognised cache key: {key}")
+
+    def filter_fields(self) -> set[str]:
+        """
+        Get the top-level fields this query filters or sorts on.
+
+        ``where[or][0][meta.title][like]`` reads ``meta`` and
+        ``sort=-updatedAt`` reads ``updatedAt``.
+
+        Returns:
+            Field names (empty for non-collection keys)
+        """
+        fields: set[str] = set()
+        for key, value in self.params:
+            if key.startswith("where[") and key.endswith("]"):
+                segments = [
+                    segment for segment in key[len("where["):-1].split("][")
+                    if segment not in ("and", "or") and not segment.isdigit()
+                ]
+                if segments:
+                    fields.add(segments[0].split(".")[0])
+            elif key == "sort":
+                for part in value.split(","):
+                    if part.strip():
+                        fields.add(part.strip().lstrip("-").split(".")[0])
+        return fields
+
+    def to_params(self) -> dict[str, str | list[str]]:
+        """
+        Rebuild the request query params for this key.
+
+        Returns:
+            Params dict (repeated keys map to lists)
+        """
+        params: dict[str, str | list[str]] = {}
+        for key, value in self.params:
+            if key in params:
+                existing = params[key]
+                if isinstance(existing, list):
+                    existing.append(value)
+                else:
+                    params[key] = [existing, value]
+            else:
+                params[key] = value
+        return params
+
+    def __str__(self) -> str:
+        """Canonical cache key string."""
+        if self.kind == "collection":
+            return f"collection:{self.name}:{urlencode(self.params)}"
+        if self.kind == "doc":
+            return f"doc:{self.name}:{self.doc_id}"
+        return f"global:{self.name}"
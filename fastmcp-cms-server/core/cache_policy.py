@@ -0,0 +1,277 @@
+"""W-TinyLFU admission and eviction policy for SmartCache."""
+
+import sys
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+# Halves every 4-bit counter in one C-level pass (see FrequencySketch.age)
+_HALVE = bytes(i >> 1 for i in range(256))
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimate the resident size of a cached value in bytes.
+
+    Walks dicts, lists, tuples and sets and sums ``sys.getsizeof`` of
+    every object. Shared objects are counted once per reference, so the
+    result errs on the high side.
+
+    Args:
+        value: Cached value (typically parsed JSON)
+
+    Returns:
+        Approximate size in bytes
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += estimate_size(k) + estimate_size(v)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += estimate_size(item)
+    return size
+
+
+class FrequencySketch:
+    """
+    Count-Min sketch of recent access frequency.
+
+    Counters saturate at 15 and are halved once the number of recorded
+    accesses reaches ten times the table width, so old popularity decays
+    and memory stays fixed regardless of how many distinct keys are seen.
+    """
+
+    DEPTH = 4
+    MAX_COUNT = 15
+    _SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93)
+
+    def __init__(self, capacity: int):
+        """
+        Initialize frequency sketch.
+
+        Args:
+            capacity: Expected number of resident keys
+        """
+        width = 16
+        while width < capacity:
+            width <<= 1
+
+        self.width = width
+        self._mask = width - 1
+        self._table = bytearray(width * self.DEPTH)
+        self._sample_size = width * 10
+        self._additions = 0
+
+    def _indexes(self, key: Hashable) -> list[int]:
+        """Get one counter index per row for a key."""
+        h = hash(key)
+        return [
+            row * self.width + (((h ^ seed) * 0x9E3779B1) >> 16 & self._mask)
+            for row, seed in enumerate(self._SEEDS)
+        ]
+
+    def increment(self, key: Hashable):
+        """Record one access to a key."""
+        table = self._table
+        for index in self._indexes(key):
+            if table[index] < self.MAX_COUNT:
+                table[index] += 1
+
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self.age()
+
+    def frequency(self, key: Hashable) -> int:
+        """Estimate how often a key was accessed recently."""
+        table = self._table
+        return min(table[index] for index in self._indexes(key))
+
+    def age(self):
+        """Halve all counters so stale popularity fades."""
+        self._table = bytearray(self._table.translate(_HALVE))
+        self._additions //= 2
+
+    def clear(self):
+        """Reset all counters."""
+        self._table = bytearray(len(self._table))
+        self._additions = 0
+
+
+class WTinyLFUPolicy:
+    """
+    Window TinyLFU eviction policy with entry and byte budgets.
+
+    New keys enter a small LRU window. Keys pushed out of the window are
+    admission candidates for the main segmented LRU (probation and
+    protected) and are only admitted if the frequency sketch says they are
+    used more often than the main segment's eviction victim. This keeps
+    one-off list queries from flushing frequently read entries.
+
+    The policy only tracks keys and weights; the caller owns the values
+    and removes whatever ``add`` reports as evicted.
+
+    Example:
+        policy = WTinyLFUPolicy(max_entries=1000, max_bytes=10_000_000)
+        for evicted_key in policy.add("key", weight=512):
+            drop_value(evicted_key)
+        policy.on_hit("key")
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int,
+        window_ratio: float = 0.01,
+        protected_ratio: float = 0.8,
+    ):
+        """
+        Initialize W-TinyLFU policy.
+
+        Args:
+            max_entries: Maximum number of resident keys
+            max_bytes: Maximum total weight of resident keys
+            window_ratio: Share of entries reserved for the admission window
+            protected_ratio: Share of the main segment reserved for keys
+                             accessed more than once
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sketch = FrequencySketch(max_entries)
+
+        self._window_max = max(1, int(max_entries * window_ratio))
+        self._protected_max = max(1, int((max_entries - self._window_max) * protected_ratio))
+
+        self._window: OrderedDict[str, int] = OrderedDict()
+        self._probation: OrderedDict[str, int] = OrderedDict()
+        self._protected: OrderedDict[str, int] = OrderedDict()
+        self.total_weight = 0
+
+        self.evictions = 0
+        self.admission_rejections = 0
+
+    def __len__(self) -> int:
+        """Number of resident keys."""
+        return len(self._window) + len(self._probation) + len(self._protected)
+
+    def __contains__(self, key: str) -> bool:
+        """Check if a key is resident."""
+        return key in self._window or key in self._probation or key in self._protected
+
+    def _segment_of(self, key: str) -> OrderedDict | None:
+        """Find the segment holding a key."""
+        for segment in (self._window, self._probation, self._protected):
+            if key in segment:
+                return segment
+        return None
+
+    def record(self, key: str):
+        """Record an access that missed the cache."""
+        self.sketch.increment(key)
+
+    def on_hit(self, key: str):
+        """Record a cache hit and update recency."""
+        self.sketch.increment(key)
+
+        if key in self._window:
+            self._window.move_to_end(key)
+        elif key in self._protected:
+            self._protected.move_to_end(key)
+        elif key in self._probation:
+            # Second access promotes from probation to protected
+            self._protected[key] = self._probation.pop(key)
+            while len(self._protected) > self._protected_max:
+                demoted, weight = self._protected.popitem(last=False)
+                self._probation[demoted] = weight
+
+    def add(self, key: str, weight: int) -> list[str]:
+        """
+        Insert or resize a key.
+
+        Args:
+            key: Cache key
+            weight: Size of the value in bytes
+
+        Returns:
+            Keys evicted to stay within budget (may include ``key`` itself
+            if it lost the admission contest)
+        """
+        segment = self._segment_of(key)
+        if segment is not None:
+            self.total_weight += weight - segment[key]
+            segment[key] = weight
+            self.on_hit(key)
+        else:
+            self.sketch.increment(key)
+            self._window[key] = weight
+            self.total_weight += weight
+
+        return self._evict()
+
+    def remove(self, key: str) -> bool:
+        """
+        Stop tracking a key.
+
+        Returns:
+            True if the key was resident
+        """
+        segment = self._segment_of(key)
+        if segment is None:
+            return False
+        self.total_weight -= segment.pop(key)
+        return True
+
+    def _over_budget(self) -> bool:
+        """Check if resident keys exceed either budget."""
+        return len(self) > self.max_entries or self.total_weight > self.max_bytes
+
+    def _drop(self, segment: OrderedDict, key: str, evicted: list[str]):
+        """Evict a key from a segment."""
+        self.total_weight -= segment.pop(key)
+        self.evictions += 1
+        evicted.append(key)
+
+    def _evict(self) -> list[str]:
+        """Move window overflow into main and evict until within budget."""
+        evicted: list[str] = []
+
+        # Keys leaving the window become candidates at the probation MRU end
+        candidates: list[str] = []
+        while len(self._window) > self._window_max:
+            key, weight = self._window.popitem(last=False)
+            self._probation[key] = weight
+            candidates.append(key)
+
+        while self._over_budget():
+            while candidates and candidates[-1] not in self._probation:
+                candidates.pop()
+
+            if self._probation:
+                victim = next(iter(self._probation))
+
+                if candidates and candidates[-1] != victim:
+                    # Admit the candidate only if it's used more than the victim
+                    candidate = candidates[-1]
+                    if self.sketch.frequency(candidate) > self.sketch.frequency(victim):
+                        self._drop(self._probation, victim, evicted)
+                    else:
+                        self.admission_rejections += 1
+                        self._drop(self._probation, candidate, evicted)
+                else:
+                    self._drop(self._probation, victim, evicted)
+
+            elif self._protected:
+                self._drop(self._protected, next(iter(self._protected)), evicted)
+
+            else:
+                self._drop(self._window, next(iter(self._window)), evicted)
+
+        return evicted
+
+    def clear(self):
+        """Forget all keys and frequencies."""
+        self._window.clear()
+        self._probation.clear()
+        self._protected.clear()
+        self.sketch.clear()
+        self.total_weight = 0
@@ -0,0 +1,312 @@
+"""Warm-start snapshots of SmartCache contents."""
+
+import asyncio
+import json
+import os
+import struct
+import time
+import zlib
+from typing import Any, BinaryIO, Optional
+from core.encoded_json import EncodedJSON, get_codec
+from core.smart_cache import SmartCache
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+SNAPSHOT_MAGIC = b"SMCS"
+SNAPSHOT_VERSION = 2
+
+# magic, schema version, written at (Unix time)
+_HEADER = struct.Struct("<4sHd")
+
+# key length, value length, expires at, stale until (Unix time, 0 = none),
+# access count, recompute seconds, value codec (index into _CODECS)
+_RECORD = struct.Struct("<IIddIfB")
+
+# Codecs values are stored with; None = plain JSON text
+_CODECS = (None, "zlib", "zstd", "lz4")
+
+_CHUNK_SIZE = 64 * 1024
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is unreadable or from another schema."""
+    pass
+
+
+def _timestamp(value: Optional[float]) -> float:
+    """Encode an optional expiry (0 = no expiry)."""
+    return value if value is not None else 0.0
+
+
+def _from_timestamp(value: float) -> Optional[float]:
+    """Decode an expiry (0 = no expiry)."""
+    return value or None
+
+
+def _encode_value(value: Any) -> tuple[bytes, int]:
+    """
+    Get the bytes to store for a cached value.
+
+    Encoded values are written as they are held, without decoding.
+
+    Returns:
+        (value bytes, index of their codec in _CODECS)
+    """
+    if isinstance(value, EncodedJSON):
+        codec = None if value.codec == "none" else value.codec
+        return value.data, _CODECS.index(codec)
+    return json.dumps(value, separators=(",", ":")).encode(), 0
+
+
+def _write_snapshot(path: str, records: list[tuple]) -> int:
+    """
+    Encode records and atomically replace the snapshot file.
+
+    Runs in a worker thread.
+
+    Returns:
+        Number of records written
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    written = 0
+
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, time.time()))
+        compressor = zlib.compressobj(level=6)
+
+        for key, value, expires_at, stale_until, access_count, recompute_time in records:
+            try:
+                value_bytes, codec = _encode_value(value)
+            except (TypeError, ValueError, RuntimeError):
+                # Only JSON responses are persisted (RuntimeError: the
+                # value was changed while being serialized)
+                continue
+
+            key_bytes = key.encode()
+            f.write(compressor.compress(_RECORD.pack(
+                len(key_bytes),
+                len(value_bytes),
+                _timestamp(expires_at),
+                _timestamp(stale_until),
+                min(access_count, 0xFFFFFFFF),
+                recompute_time or 0.0,
+                codec,
+            )))
+            f.write(compressor.compress(key_bytes))
+            f.write(compressor.compress(value_bytes))
+            written += 1
+
+        f.write(compressor.flush())
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp_path, path)
+    return written
+
+
+class SnapshotReader:
+    """
+    Incremental reader for a snapshot file.
+
+    Decompresses the file a chunk at a time so a large snapshot is never
+    held in memory at once.
+    """
+
+    def __init__(self, f: BinaryIO, codec: Optional[str] = None):
+        """
+        Open a snapshot and validate its header.
+
+        Args:
+            f: Snapshot file opened in binary mode
+            codec: Codec of the cache being filled; values stored with
+                   it are also returned encoded, ready to keep as is
+
+        Raises:
+            SnapshotError: If the file isn't a snapshot of this schema version
+        """
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise SnapshotError("Snapshot header truncated")
+
+        magic, version, written_at = _HEADER.unpack(header)
+        if magic != SNAPSHOT_MAGIC:
+            raise SnapshotError("Not a cache snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise SnapshotError(
+                f"Snapshot schema version {version} != {SNAPSHOT_VERSION}"
+            )
+
+        self.written_at = written_at
+        self.codec = codec
+        self._file = f
+        self._decompressor = zlib.decompressobj()
+        self._buffer = bytearray()
+        self._eof = False
+
+    def _fill(self, size: int) -> bool:
+        """Decompress until at least ``size`` bytes are buffered."""
+        while len(self._buffer) < size and not self._eof:
+            chunk = self._file.read(_CHUNK_SIZE)
+            if chunk:
+                self._buffer += self._decompressor.decompress(chunk)
+            else:
+                self._buffer += self._decompressor.flush()
+                self._eof = True
+        return len(self._buffer) >= size
+
+    def _take(self, size: int) -> bytes:
+        """Remove ``size`` bytes from the buffer."""
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def read_batch(self, size: int) -> list[tuple]:
+        """
+        Read up to ``size`` records.
+
+        A truncated trailing record ends the stream instead of raising.
+
+        Returns:
+            Records as (key, value, expires_at, stale_until, access_count,
+            recompute_time, encoded), where encoded is the value as
+            EncodedJSON in the reader's codec, if stored that way (else
+            None); empty at end of stream
+        """
+        records = []
+        try:
+            while len(records) < size and self._fill(_RECORD.size):
+                (
+                    key_len, value_len, expires_at, stale_until,
+                    access_count, recompute_time, codec_index,
+                ) = _RECORD.unpack(self._take(_RECORD.size))
+                if not self._fill(key_len + value_len):
+                    break
+                key = self._take(key_len).decode()
+                data = self._take(value_len)
+
+                codec = _CODECS[codec_index]
+                body = get_codec(codec)[1](data) if codec is not None else data
+                encoded = None
+                if self.codec is not None and (codec or "none") == self.codec:
+                    encoded = EncodedJSON(data, self.codec, len(body))
+                records.append((
+                    key,
+                    json.loads(body),
+                    _from_timestamp(expires_at),
+                    _from_timestamp(stale_until),
+                    access_count,
+                    recompute_time or None,
+                    encoded,
+                ))
+        except (zlib.error, UnicodeDecodeError, ValueError, IndexError, ImportError) as e:
+            logger.warning("Cache snapshot corrupt, stopping load", error=str(e))
+            self._eof = True
+            self._buffer.clear()
+        return records
+
+
+async def save_snapshot(cache: SmartCache, path: str) -> int:
+    """
+    Write the cache's entries, TTLs and access statistics to disk.
+
+    Only references to the entries are collected on the event loop;
+    they are serialized and written in a worker thread. Encoded entries
+    (see SmartCache's codec) are written as held, not decoded. The file
+    is replaced atomically, so a crash mid-write leaves the previous
+    snapshot intact.
+
+    Args:
+        cache: Cache to snapshot
+        path: Snapshot file path
+
+    Returns:
+        Number of entries written
+    """
+    records = list(cache.export_entries())
+    written = await asyncio.to_thread(_write_snapshot, path, records)
+    logger.info("Cache snapshot saved", path=path, entries=written)
+    return written
+
+
+async def load_snapshot(cache: SmartCache, path: str, batch_size: int = 500) -> int:
+    """
+    Stream a snapshot back into the cache.
+
+    Records are decoded in a worker thread a batch at a time and inserted
+    between batches, so the server keeps serving while a large snapshot
+    loads. Entries past their hard TTL are discarded, and so are keys
+    cached, written or invalidated since the load began: the snapshot
+    copy is older than those. Hot keys were written first, so they are
+    available soonest.
+
+    Args:
+        cache: Cache to fill
+        path: Snapshot file path
+        batch_size: Records decoded per batch
+
+    Returns:
+        Number of entries restored
+    """
+    if not os.path.exists(path):
+        return 0
+
+    restored = 0
+    discarded = 0
+
+    # Writes and invalidations from now on win over the snapshot
+    cache.begin_restore()
+    try:
+        with open(path, "rb") as f:
+            try:
+                reader = await asyncio.to_thread(SnapshotReader, f, cache.codec)
+            except SnapshotError as e:
+                logger.warning("Ignoring cache snapshot", path=path, error=str(e))
+                return 0
+
+            while True:
+                records = await asyncio.to_thread(reader.read_batch, batch_size)
+                if not records:
+                    break
+                for record in records:
+                    if cache.restore_entry(*record):
+                        restored += 1
+                    else:
+                        discarded += 1
+    finally:
+        cache.end_restore()
+
+    logger.info(
+        "Cache snapshot loaded",
+        path=path,
+        restored=restored,
+        discarded=discarded,
+        age=round(time.time() - reader.written_at),
+    )
+    return restored
+
+
+async def cache_snapshot_task(cache: SmartCache, path: str, interval: int = 300):
+    """
+    Background task to periodically snapshot the cache.
+
+    Args:
+        cache: SmartCache instance
+        path: Snapshot file path
+        interval: Seconds between snapshots
+    """
+    logger.info(f"Starting cache snapshot task (interval: {interval}s)")
+
+    while True:
+        try:
+            await asyncio.sleep(interval)
+            await save_snapshot(cache, path)
+
+        except asyncio.CancelledError:
+            logger.info("Cache snapshot task cancelled")
+            break
+
+        except Exception as e:
+            logger.error("Error in cache snapshot task", error=str(e))
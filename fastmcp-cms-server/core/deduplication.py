@@ -1,9 +1,8 @@
 """Request deduplication for concurrent identical requests."""
 
-import hashlib
-import json
 import asyncio
-from typing import Callable, Any, TypeVar, Coroutine, cast
+from collections import defaultdict
+from typing import Callable, Any, Hashable, TypeVar, Coroutine, cast
 from utils.logging import get_logger
 
 
@@ -12,6 +11,37 @@ logger = get_logger(__name__)
 T = TypeVar('T')
 
 
+def freeze_params(value: Any) -> Hashable:
+    """
+    Convert request parameters into a hashable, order-independent form.
+
+    Dicts become sorted tuples of pairs (tagged so they can't collide with
+    lists), lists become tuples and sets become frozensets, recursively.
+    Unhashable leaf values fall back to their repr.
+
+    Args:
+        value: Parameter value (typically a dict of query params)
+
+    Returns:
+        Hashable canonical representation
+    """
+    if isinstance(value, dict):
+        return (dict, tuple(sorted(
+            ((str(k), freeze_params(v)) for k, v in value.items()),
+            key=lambda item: item[0],
+        )))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_params(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze_params(v) for v in value)
+
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
 class RequestDeduplicator:
     """
     Deduplicate concurrent requests for the same resource.
@@ -42,10 +72,14 @@ class RequestDeduplicator:
             "total_requests": 0,
             "deduplicated": 0,
         }
+        self._saved_by_operation: dict[str, int] = defaultdict(int)
 
-    def _make_key(self, operation: str, **params) -> str:
+    def _make_key(self, operation: str, **params) -> Hashable:
         """
-        Generate cache key from operation and parameters.
+        Generate in-flight key from operation and parameters.
+
+        The key is a plain tuple, so lookups only cost a tuple hash
+        rather than serialising and digesting the parameters.
 
         Args:
             operation: Operation name
@@ -54,10 +88,7 @@ class RequestDeduplicator:
         Returns:
             Unique key for this operation+params combination
         """
-        # Sort params to ensure consistent key generation
-        param_str = json.dumps(params, sort_keys=True, default=str)
-        param_hash = hashlib.md5(param_str.encode()).hexdigest()
-        return f"{operation}:{param_hash}"
+        return (operation, freeze_params(params))
 
     async def execute(
         self,
@@ -89,10 +120,10 @@ class RequestDeduplicator:
             if existing_task is not None:
                 task = existing_task
                 self._stats["deduplicated"] += 1
+                self._saved_by_operation[operation] += 1
                 logger.debug(
                     "Deduplicating request",
                     operation=operation,
-                    key_hash=key[:16],
                 )
             else:
                 task = asyncio.create_task(handler(**params))
@@ -117,6 +148,7 @@ class RequestDeduplicator:
             - deduplicated: Number of deduplicated requests
             - deduplication_rate: Percentage of deduplicated requests
             - in_flight: Current number of in-flight requests
+            - saved_by_operation: Upstream requests saved per operation
         """
         total = self._stats["total_requests"]
         deduped = self._stats["deduplicated"]
@@ -127,6 +159,7 @@ class RequestDeduplicator:
             "deduplicated": deduped,
             "deduplication_rate": round(rate, 2),
             "in_flight": len(self._in_flight),
+            "saved_by_operation": dict(self._saved_by_operation),
         }
 
     def reset_stats(self):
@@ -135,6 +168,7 @@ class RequestDeduplicator:
             "total_requests": 0,
             "deduplicated": 0,
         }
+        self._saved_by_operation.clear()
         logger.debug("Request deduplication stats reset")
 
     async def clear(self):
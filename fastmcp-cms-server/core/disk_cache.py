@@ -0,0 +1,280 @@
+"""SQLite-backed second cache tier for SmartCache."""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Iterable, Optional
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL,
+    stale_until REAL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_by_access ON entries (accessed_at);
+CREATE TABLE IF NOT EXISTS tags (
+    tag TEXT NOT NULL,
+    key TEXT NOT NULL,
+    PRIMARY KEY (tag, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tags_by_key ON tags (key);
+"""
+
+
+class DiskCache:
+    """
+    Size-bounded on-disk cache tier.
+
+    Holds entries SmartCache evicts from memory (or that are too large
+    for it) in a SQLite database in WAL mode. Expiry is stored as Unix
+    time, so an entry expires at the same moment in either tier and
+    survives restarts. Tags are stored alongside entries so tag
+    invalidation reaches entries that only live on disk.
+
+    All methods are blocking and thread-safe; SmartCache calls them from
+    a single writer thread, so its writes and reads apply in order.
+
+    Example:
+        disk = DiskCache("/var/cache/cms/l2.sqlite", max_bytes=1024**3)
+        disk.put("collection:projects:limit=100", response, expires_at=time.time() + 300)
+        value, expires_at, stale_until, tags = disk.pop("collection:projects:limit=100")
+    """
+
+    def __init__(self, path: str, max_bytes: int = 1024 * 1024 * 1024):
+        """
+        Open (or create) the disk tier.
+
+        Args:
+            path: SQLite database file
+            max_bytes: Maximum total size of stored values
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        # Keys are kept in memory so SmartCache can skip disk lookups for
+        # keys that were never demoted
+        self._keys: set[str] = {
+            row[0] for row in self._conn.execute("SELECT key FROM entries")
+        }
+        self.total_bytes: int = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+
+        # Statistics
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0,
+            "invalidations": 0,
+        }
+
+    def __contains__(self, key: str) -> bool:
+        """Check if a key may be on disk."""
+        return key in self._keys
+
+    def put(
+        self,
+        key: str,
+        value: Any,
+        expires_at: Optional[float] = None,
+        stale_until: Optional[float] = None,
+        tags: Iterable[str] = (),
+    ) -> bool:
+        """
+        Store an entry, evicting least recently used entries to fit.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+            expires_at: Soft expiry as Unix time (None = never)
+            stale_until: Hard expiry as Unix time (None = same as soft)
+            tags: Tags the key is indexed under
+
+        Returns:
+            True if stored
+        """
+        try:
+            blob = json.dumps(value, separators=(",", ":")).encode()
+        except (TypeError, ValueError):
+            return False
+        if len(blob) > self.max_bytes:
+            return False
+
+        with self._lock:
+            self._delete(key)
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute(
+                    "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, blob, len(blob), expires_at, stale_until, time.time()),
+                )
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO tags VALUES (?, ?)",
+                    [(tag, key) for tag in tags],
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._keys.add(key)
+            self.total_bytes += len(blob)
+            self._stats["writes"] += 1
+            self._evict()
+        return True
+
+    def pop(self, key: str) -> Optional[tuple[Any, Optional[float], Optional[float], list[str]]]:
+        """
+        Remove and return an entry that is still within its hard TTL.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            (value, expires_at, stale_until, tags), or None if missing or
+            expired
+        """
+        if key not in self._keys:
+            self._stats["misses"] += 1
+            return None
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at, stale_until FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+            tags = [
+                tag for (tag,) in
+                self._conn.execute("SELECT tag FROM tags WHERE key = ?", (key,))
+            ]
+            self._delete(key)
+
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+
+            blob, expires_at, stale_until = row
+            deadline = stale_until or expires_at
+            if deadline is not None and deadline <= time.time():
+                self._stats["misses"] += 1
+                return None
+
+            self._stats["hits"] += 1
+            return json.loads(blob), expires_at, stale_until, tags
+
+    def delete(self, key: str) -> bool:
+        """
+        Delete an entry.
+
+        Returns:
+            True if the key was on disk
+        """
+        if key not in self._keys:
+            return False
+        with self._lock:
+            return self._delete(key)
+
+    def invalidate_tag(self, tag: str) -> int:
+        """
+        Delete every entry indexed under a tag.
+
+        Returns:
+            Number of entries deleted
+        """
+        with self._lock:
+            keys = [
+                key for (key,) in
+                self._conn.execute("SELECT key FROM tags WHERE tag = ?", (tag,))
+            ]
+            for key in keys:
+                self._delete(key)
+            self._stats["invalidations"] += len(keys)
+        return len(keys)
+
+    def invalidate_pattern(self, pattern: str) -> int:
+        """
+        Delete every entry whose key matches a regex.
+
+        Returns:
+            Number of entries deleted
+        """
+        compiled = re.compile(pattern)
+        with self._lock:
+            keys = [key for key in self._keys if compiled.match(key)]
+            for key in keys:
+                self._delete(key)
+            self._stats["invalidations"] += len(keys)
+        return len(keys)
+
+    def keys(self) -> list[str]:
+        """Get all keys on disk."""
+        return list(self._keys)
+
+    def _delete(self, key: str) -> bool:
+        """Delete an entry. Must be called with the lock held."""
+        if key not in self._keys:
+            return False
+        row = self._conn.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+        self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        self._conn.execute("DELETE FROM tags WHERE key = ?", (key,))
+        self._keys.discard(key)
+        if row is not None:
+            self.total_bytes -= row[0]
+        return True
+
+    def _evict(self):
+        """Drop least recently written entries until within max_bytes."""
+        while self.total_bytes > self.max_bytes and self._keys:
+            row = self._conn.execute(
+                "SELECT key FROM entries ORDER BY accessed_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            self._delete(row[0])
+            self._stats["evictions"] += 1
+
+    def clear(self):
+        """Delete every entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.execute("DELETE FROM tags")
+            self._keys.clear()
+            self.total_bytes = 0
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+
+    def get_stats(self) -> dict:
+        """
+        Get disk tier statistics.
+
+        Returns:
+            Statistics dictionary
+        """
+        total = self._stats["hits"] + self._stats["misses"]
+        return {
+            "size": len(self._keys),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hit_rate": round(self._stats["hits"] / total * 100, 2) if total else 0,
+            **self._stats,
+        }
@@ -0,0 +1,310 @@
+"""Compact storage of JSON values as (optionally compressed) bytes."""
+
+import json
+import re
+import sys
+import uuid
+import zlib
+from typing import Any, Callable, Iterator, Optional
+
+# name -> (compress, decompress)
+Codec = tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]
+
+
+def _identity(data: bytes) -> bytes:
+    """Leave bytes uncompressed."""
+    return data
+
+
+def _load_codec(name: str) -> Codec:
+    """Build a codec, importing its library on first use."""
+    if name == "none":
+        return _identity, _identity
+    if name == "zlib":
+        return (lambda data: zlib.compress(data, 6)), zlib.decompress
+    if name == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=3).compress, zstandard.ZstdDecompressor().decompress
+    if name == "lz4":
+        import lz4.frame
+
+        return lz4.frame.compress, lz4.frame.decompress
+    raise ValueError(f"Unknown cache codec: {name!r} (expected none, zlib, zstd or lz4)")
+
+
+_codecs: dict[str, Codec] = {}
+
+
+def get_codec(name: str) -> Codec:
+    """
+    Get a codec by name.
+
+    Args:
+        name: "none", "zlib", "zstd" (needs zstandard) or "lz4" (needs lz4)
+
+    Returns:
+        (compress, decompress) functions
+
+    Raises:
+        ValueError: If the codec is unknown
+        ImportError: If the codec's library isn't installed
+    """
+    codec = _codecs.get(name)
+    if codec is None:
+        codec = _codecs[name] = _load_codec(name)
+    return codec
+
+
+class EncodedJSON:
+    """
+    A JSON value held as encoded bytes and parsed on demand.
+
+    A parsed dict of a CMS list page takes several times the size of
+    its JSON text; keeping the bytes (compressed, if a codec is given)
+    and parsing only when a caller reads the value keeps large cache
+    entries small. ``raw()`` returns the JSON text without parsing it.
+
+    Example:
+        value = EncodedJSON.from_bytes(response.content, "zlib")
+        value.decode()["docs"]
+    """
+
+    __slots__ = ("data", "codec", "raw_size")
+
+    def __init__(self, data: bytes, codec: str, raw_size: int):
+        """
+        Wrap already encoded bytes.
+
+        Args:
+            data: Encoded bytes
+            codec: Codec the bytes were encoded with
+            raw_size: Length of the JSON text
+        """
+        self.data = data
+        self.codec = codec
+        self.raw_size = raw_size
+
+    @classmethod
+    def from_bytes(cls, body: bytes, codec: str = "none") -> "EncodedJSON":
+        """
+        Encode JSON text, e.g. a response body as received.
+
+        Args:
+            body: UTF-8 JSON text
+            codec: Codec name
+
+        Returns:
+            Encoded value
+        """
+        compress, _ = get_codec(codec)
+        return cls(compress(body), codec, len(body))
+
+    @classmethod
+    def from_value(cls, value: Any, codec: str = "none") -> "EncodedJSON":
+        """
+        Serialize and encode a JSON-compatible value.
+
+        Args:
+            value: Value to encode
+            codec: Codec name
+
+        Returns:
+            Encoded value
+        """
+        body = json.dumps(value, separators=(",", ":")).encode()
+        return cls.from_bytes(body, codec)
+
+    def raw(self) -> bytes:
+        """Get the JSON text."""
+        _, decompress = get_codec(self.codec)
+        return decompress(self.data)
+
+    def decode(self) -> Any:
+        """Parse the value. Every call returns a new object."""
+        return json.loads(self.raw())
+
+    def __sizeof__(self) -> int:
+        """Resident size, including the encoded bytes."""
+        return object.__sizeof__(self) + sys.getsizeof(self.data)
+
+    def __repr__(self) -> str:
+        """Show codec and sizes rather than the bytes."""
+        return f"EncodedJSON({self.codec}, {len(self.data)}/{self.raw_size} bytes)"
+
+
+def decoded(value: Any) -> Any:
+    """Parse a value if it is encoded; return anything else unchanged."""
+    if isinstance(value, EncodedJSON):
+        return value.decode()
+    return value
+
+
+def to_json(value: Any) -> bytes:
+    """Get a value's JSON text, without parsing it if it is encoded."""
+    if isinstance(value, EncodedJSON):
+        return value.raw()
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+class RawJSON:
+    """
+    JSON text to be spliced into a tool result as is.
+
+    Lets a handler return a CMS response body (or part of it) inside
+    its result envelope without parsing it into objects only for
+    ``dumps_result`` to serialize them again.
+
+    Example:
+        {"success": True, "data": RawJSON(response.content)}
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: bytes):
+        """
+        Wrap JSON text.
+
+        Args:
+            data: UTF-8 JSON text of a single value
+        """
+        self.data = data
+
+    def text(self) -> str:
+        """Get the JSON text as a string."""
+        return self.data.decode("utf-8")
+
+    def __repr__(self) -> str:
+        """Show the size rather than the text."""
+        return f"RawJSON({len(self.data)} bytes)"
+
+
+def dumps_result(result: Any) -> str:
+    """
+    Serialize a tool result, splicing in any RawJSON values verbatim.
+
+    Args:
+        result: JSON-compatible value that may contain RawJSON
+
+    Returns:
+        JSON text (as json.dumps would produce for the parsed values)
+    """
+    fragments: list[str] = []
+    token = uuid.uuid4().hex
+
+    def _placeholder(value: Any) -> str:
+        if isinstance(value, RawJSON):
+            fragments.append(value.text())
+            return f"{token}:{len(fragments) - 1}"
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+    text = json.dumps(result, default=_placeholder)
+    if not fragments:
+        return text
+
+    # Odd pieces are the indices captured from the placeholders
+    pieces = re.split(f'"{token}:(\\d+)"', text)
+    return "".join(
+        fragments[int(piece)] if i % 2 else piece
+        for i, piece in enumerate(pieces)
+    )
+
+
+_LIST_HEAD = re.compile(rb'\s*\{\s*"docs"\s*:\s*(?=\[)')
+
+# Fields Payload sends after a list response's docs
+_PAGINATION_FIELDS = frozenset({
+    "totalDocs", "limit", "totalPages", "page", "pagingCounter",
+    "hasPrevPage", "hasNextPage", "prevPage", "nextPage",
+})
+
+
+def parse_list_page(body: bytes) -> dict:
+    """
+    Parse a CMS list response, leaving its ``docs`` array unparsed.
+
+    Payload puts ``docs`` first, followed only by scalar pagination
+    fields (totalDocs, page, ...), so those can be parsed from the tail
+    of the body alone. Bodies that don't have this layout are parsed
+    in full.
+
+    Args:
+        body: JSON text of a list response
+
+    Returns:
+        The response with ``docs`` as RawJSON (or parsed, as a fallback)
+    """
+    page = _split_list_page(body)
+    if page is None:
+        return json.loads(body)
+    return page
+
+
+def _split_list_page(body: bytes) -> Optional[dict]:
+    """Split a list response into RawJSON docs and parsed pagination fields."""
+    head = _LIST_HEAD.match(body)
+    end = body.rfind(b"]")
+    if head is None or end < head.end():
+        return None
+
+    tail = body[end + 1:].strip()
+    if not tail.startswith(b","):
+        return None
+    try:
+        fields = json.loads(b"{" + tail[1:])
+    except ValueError:
+        return None
+
+    # Anything else after the docs (or a "]" inside a tail value) means
+    # the last "]" isn't where the docs end
+    if (
+        not isinstance(fields, dict)
+        or "totalDocs" not in fields
+        or not fields.keys() <= _PAGINATION_FIELDS
+        or any(isinstance(value, (dict, list)) for value in fields.values())
+    ):
+        return None
+
+    return {"docs": RawJSON(body[head.end():end + 1]), **fields}
+
+
+_WHITESPACE = re.compile(r"\s*")
+_decoder = json.JSONDecoder()
+
+
+def iter_json_array(text: str) -> Iterator[Any]:
+    """
+    Parse a JSON array one element at a time.
+
+    Only the element being yielded is held parsed, so arrays of any
+    length can be consumed in constant memory beyond the text itself.
+    A syntax error is raised when it is reached, after the elements
+    before it have been yielded.
+
+    Args:
+        text: JSON text of an array
+
+    Yields:
+        Each element, in order
+
+    Raises:
+        ValueError: If the text isn't a well-formed JSON array
+    """
+    pos = _WHITESPACE.match(text).end()
+    if not text.startswith("[", pos):
+        raise ValueError(f"Expected a JSON array at position {pos}")
+    pos = _WHITESPACE.match(text, pos + 1).end()
+
+    if not text.startswith("]", pos):
+        while True:
+            value, pos = _decoder.raw_decode(text, pos)
+            yield value
+            pos = _WHITESPACE.match(text, pos).end()
+            if text.startswith("]", pos):
+                break
+            if not text.startswith(",", pos):
+                raise ValueError(f"Expected ',' or ']' at position {pos}")
+            pos = _WHITESPACE.match(text, pos + 1).end()
+
+    if text[pos + 1:].strip():
+        raise ValueError(f"Extra data after the array at position {pos + 1}")
@@ -0,0 +1,157 @@
+"""Fixed-memory tracking of the most requested cache keys."""
+
+import heapq
+import time
+from typing import Callable, Hashable
+
+# Renormalize once increments grow past 2**_MAX_EXPONENT
+_MAX_EXPONENT = 40
+
+
+class SpaceSaving:
+    """
+    Space-Saving top-K tracker with exponential time decay.
+
+    Monitors at most ``capacity`` keys. A key that isn't monitored
+    replaces the one with the lowest count and inherits that count (as
+    its error bound), so any key requested more than ``total / capacity``
+    times is guaranteed to be tracked. Memory is fixed no matter how many
+    distinct keys are seen.
+
+    Counts decay with the given half-life using forward decay: each hit
+    is weighted by ``2 ** (age / half_life)`` relative to a landmark
+    time, so old hits fade without touching every counter on each tick.
+
+    Example:
+        tracker = SpaceSaving(capacity=256, half_life=600)
+        tracker.record("global:site-settings")
+        for key, count in tracker.top(10):
+            ...
+    """
+
+    def __init__(
+        self,
+        capacity: int = 256,
+        half_life: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize tracker.
+
+        Args:
+            capacity: Maximum number of keys monitored (at least 1)
+            half_life: Seconds for a count to halve (0 = no decay)
+            clock: Monotonic time source
+
+        Raises:
+            ValueError: If capacity is less than 1
+        """
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+        self.capacity = capacity
+        self.half_life = half_life
+        self._clock = clock
+        self._landmark = clock()
+
+        # key -> [scaled count, scaled error]
+        self._counters: dict[Hashable, list[float]] = {}
+        # Min-heap of (scaled count, key); items whose count changed are skipped
+        self._heap: list[tuple[float, Hashable]] = []
+
+    def __len__(self) -> int:
+        """Number of monitored keys."""
+        return len(self._counters)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Check if a key is monitored."""
+        return key in self._counters
+
+    def _scale(self, now: float) -> float:
+        """Get the weight of a hit at ``now`` relative to the landmark."""
+        if self.half_life <= 0:
+            return 1.0
+        exponent = (now - self._landmark) / self.half_life
+        if exponent > _MAX_EXPONENT:
+            self._renormalize(now)
+            exponent = 0.0
+        return 2.0 ** exponent
+
+    def _renormalize(self, now: float):
+        """Move the landmark to ``now`` so weights stay in float range."""
+        # Underflows to 0 (rather than overflowing) after a long idle gap
+        decay = 2.0 ** -((now - self._landmark) / self.half_life)
+        for counter in self._counters.values():
+            counter[0] *= decay
+            counter[1] *= decay
+        self._landmark = now
+        self._rebuild_heap()
+
+    def _rebuild_heap(self):
+        """Rebuild the heap from live counters only."""
+        self._heap = [(counter[0], key) for key, counter in self._counters.items()]
+        heapq.heapify(self._heap)
+
+    def _pop_min(self) -> tuple[Hashable, list[float]]:
+        """Remove and return the monitored key with the lowest count."""
+        while True:
+            count, key = heapq.heappop(self._heap)
+            counter = self._counters.get(key)
+            if counter is not None and counter[0] == count:
+                del self._counters[key]
+                return key, counter
+
+    def record(self, key: Hashable, weight: float = 1.0):
+        """
+        Record a request for a key.
+
+        Args:
+            key: Cache key
+            weight: Number of requests to record
+        """
+        increment = weight * self._scale(self._clock())
+        counter = self._counters.get(key)
+
+        if counter is not None:
+            counter[0] += increment
+        elif len(self._counters) < self.capacity:
+            counter = self._counters[key] = [increment, 0.0]
+        else:
+            # Replace the least requested key and inherit its count
+            _, evicted = self._pop_min()
+            counter = self._counters[key] = [evicted[0] + increment, evicted[0]]
+
+        heapq.heappush(self._heap, (counter[0], key))
+        if len(self._heap) > 4 * self.capacity:
+            self._rebuild_heap()
+
+    def estimate(self, key: Hashable) -> float:
+        """
+        Estimate a key's decayed request count.
+
+        Returns:
+            Upper bound on the count (0 if not monitored)
+        """
+        counter = self._counters.get(key)
+        if counter is None:
+            return 0.0
+        return counter[0] / self._scale(self._clock())
+
+    def top(self, limit: int = 10) -> list[tuple[Hashable, float]]:
+        """
+        Get the most requested keys.
+
+        Args:
+            limit: Number of keys to return
+
+        Returns:
+            List of (key, decayed count) tuples, highest first
+        """
+        scale = self._scale(self._clock())
+        hottest = heapq.nlargest(limit, self._counters.items(), key=lambda item: item[1][0])
+        return [(key, counter[0] / scale) for key, counter in hottest]
+
+    def clear(self):
+        """Forget all keys."""
+        self._counters.clear()
+        self._heap.clear()
+        self._landmark = self._clock()
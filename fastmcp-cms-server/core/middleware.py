@@ -6,6 +6,7 @@ import time
 import asyncio
 from collections import defaultdict
 from datetime import datetime, timedelta
+from core.encoded_json import iter_json_array
 from utils.logging import get_logger
 from utils.errors import ValidationError
 from services.audit import AuditService
@@ -13,6 +14,18 @@ from services.audit import AuditService
 logger = get_logger(__name__)
 
 
+def _is_empty_array(text: str) -> bool:
+    """Whether JSON text is an empty array, parsing at most its first item."""
+    try:
+        next(iter_json_array(text))
+    except StopIteration:
+        return True
+    except ValueError:
+        # Not a well-formed array; the chunked run reports where it breaks
+        pass
+    return False
+
+
 class RateLimitError(Exception):
     """Raised when rate limit is exceeded."""
     pass
@@ -201,12 +214,16 @@ class ValidationMiddleware(Middleware):
 
         # Operation-specific validation
         if operation in ["batch_create", "batch_update", "batch_delete"]:
-            items = kwargs.get("items", [])
-            if not items:
+            # batch_delete takes its documents as doc_ids
+            param = "doc_ids" if operation == "batch_delete" else "items"
+            items = kwargs.get(param) or []
+            if not items or isinstance(items, str) and _is_empty_array(items):
                 raise ValidationError(
-                    f"Batch operation requires non-empty 'items' list"
+                    f"Batch operation requires non-empty '{param}' list"
                 )
-            if len(items) > 100:
+            # Chunked batches take any number of items (possibly still
+            # as JSON text, parsed as they are run)
+            if not kwargs.get("chunked") and len(items) > 100:
                 raise ValidationError(
                     f"Batch operation limited to 100 items, got {len(items)}"
                 )
@@ -1,6 +1,6 @@
 """Retry strategies for operations."""
 
-from typing import Callable, TypeVar, Coroutine, Any
+from typing import Callable, TypeVar, Coroutine, Any, Optional
 from dataclasses import dataclass
 import asyncio
 from utils.logging import get_logger
@@ -13,11 +13,18 @@ T = TypeVar('T')
 
 @dataclass
 class RetryConfig:
-    """Retry configuration for an operation."""
+    """
+    Retry configuration for an operation.
+
+    ``timeout`` bounds one attempt (one item, for batch items).
+    ``deadline``, if set, bounds the whole operation instead, for
+    operations that run many items one after another.
+    """
     max_retries: int
     backoff_factor: float
     retry_on: tuple[type[Exception], ...]
     timeout: int
+    deadline: Optional[int] = None
 
     def __post_init__(self):
         """Validate configuration."""
@@ -27,6 +34,8 @@ class RetryConfig:
             raise ValueError("backoff_factor must be >= 1")
         if self.timeout <= 0:
             raise ValueError("timeout must be > 0")
+        if self.deadline is not None and self.deadline < self.timeout:
+            raise ValueError("deadline must be >= timeout")
 
 
 # Operation-specific retry configurations
@@ -67,24 +76,33 @@ RETRY_CONFIGS = {
         retry_on=(CMSTimeoutError, CMSConnectionError),
         timeout=30,
     ),
+    # Batch items are retried one by one with the create/update/delete
+    # configs (see services.batch), so a failed batch isn't re-sent whole
     "batch_create": RetryConfig(
-        max_retries=2,
+        max_retries=0,
         backoff_factor=3.0,
         retry_on=(CMSTimeoutError, CMSConnectionError),
         timeout=120,  # Longer timeout for batch ops
     ),
     "batch_update": RetryConfig(
-        max_retries=2,
+        max_retries=0,
         backoff_factor=3.0,
         retry_on=(CMSTimeoutError, CMSConnectionError),
         timeout=120,
     ),
     "batch_delete": RetryConfig(
-        max_retries=1,
+        max_retries=0,
         backoff_factor=2.0,
         retry_on=(CMSTimeoutError,),
         timeout=120,
     ),
+    "batch_chunked": RetryConfig(
+        max_retries=0,
+        backoff_factor=2.0,
+        retry_on=(CMSTimeoutError,),
+        timeout=120,
+        deadline=3600,  # Batches of any size, run a chunk at a time
+    ),
     "search": RetryConfig(
         max_retries=3,
         backoff_factor=2.0,
@@ -144,15 +162,19 @@ async def execute_with_retry(
         )
     """
     config = RETRY_CONFIGS.get(operation, DEFAULT_RETRY_CONFIG)
+    loop = asyncio.get_running_loop()
+    deadline = None if config.deadline is None else loop.time() + config.deadline
 
     last_exception: Exception | None = None
 
     for attempt in range(config.max_retries + 1):
+        # The deadline spans the whole operation, retries included
+        timeout = config.timeout if deadline is None else deadline - loop.time()
         try:
             # Execute with timeout
             result = await asyncio.wait_for(
                 handler(*args, **kwargs),
-                timeout=config.timeout
+                timeout=timeout
             )
 
             if attempt > 0:
@@ -165,24 +187,26 @@ async def execute_with_retry(
 
         except asyncio.TimeoutError as e:
             last_exception = CMSTimeoutError(
-                f"Operation timed out after {config.timeout}s"
+                f"Operation timed out after {config.deadline or config.timeout}s"
             )
 
-        except config.retry_on as e:
-            last_exception = e
-
         except Exception as e:
-            # Don't retry on other exceptions
-            logger.error(
-                f"Non-retryable error in operation",
-                operation=operation,
-                error=str(e),
-                error_type=type(e).__name__,
-            )
-            raise
+            if is_retryable(e, config):
+                last_exception = e
+            else:
+                # Don't retry on other exceptions
+                logger.error(
+                    f"Non-retryable error in operation",
+                    operation=operation,
+                    error=str(e),
+                    error_type=type(e).__name__,
+                )
+                raise
 
         # Check if we should retry
-        if attempt < config.max_retries:
+        if attempt < config.max_retries and (
+            deadline is None or loop.time() + config.backoff_factor ** attempt < deadline
+        ):
             wait_time = config.backoff_factor ** attempt
             logger.warning(
                 f"Retry {attempt + 1}/{config.max_retries}",
@@ -205,6 +229,27 @@ async def execute_with_retry(
     raise last_exception
 
 
+def is_retryable(error: BaseException, config: RetryConfig) -> bool:
+    """
+    Check whether a failed attempt may be retried.
+
+    An attempt the CMS refused with a 4xx is never retried: it is known
+    not to have applied, and sending it again gets the same answer.
+    Only failures whose outcome is unknown (timeouts, transport errors,
+    5xx) are retried, if the config lists them.
+
+    Args:
+        error: Error the attempt failed with
+        config: Retry configuration
+
+    Returns:
+        True if the attempt may be retried
+    """
+    if isinstance(error, CMSConnectionError) and error.is_client_error:
+        return False
+    return isinstance(error, config.retry_on)
+
+
 def get_retry_config(operation: str) -> RetryConfig:
     """
     Get retry configuration for an operation.
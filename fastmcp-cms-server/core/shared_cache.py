@@ -0,0 +1,849 @@
+"""Cache tier and invalidation channel shared by server workers."""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Iterable, Optional
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# (value, expires_at, stale_until) with expiry as Unix time
+SharedEntry = tuple[Any, Optional[float], Optional[float]]
+
+
+class SharedCacheBackend(ABC):
+    """
+    Interface for a cache tier every worker reads and fills.
+
+    Besides entries, a backend carries invalidation messages between
+    workers: ``publish`` sends one to every other subscriber and
+    ``poll`` waits for the next batch. Expiry is Unix time so all
+    workers agree on it.
+
+    A put can land after another worker invalidated the key (its queue
+    was behind), which would bring back the old value. Backends remember
+    when keys, tags and patterns were last invalidated and refuse a put
+    whose value was fetched before then (see ``fetched_at``).
+
+    Methods are blocking; SmartCache calls them from a single worker
+    thread so operations from one process apply in order.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[SharedEntry]:
+        """Get an entry that is still within its hard TTL."""
+        pass
+
+    @abstractmethod
+    def put(
+        self,
+        key: str,
+        value: Any,
+        expires_at: Optional[float] = None,
+        stale_until: Optional[float] = None,
+        tags: Iterable[str] = (),
+        fetched_at: Optional[float] = None,
+    ) -> bool:
+        """
+        Store an entry fetched at ``fetched_at`` (Unix time; None = skip
+        the check); returns False if the value can't be stored or was
+        invalidated since it was fetched.
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        """Delete an entry."""
+        pass
+
+    @abstractmethod
+    def invalidate_tag(self, tag: str) -> int:
+        """Delete every entry indexed under a tag."""
+        pass
+
+    @abstractmethod
+    def invalidate_pattern(self, pattern: str) -> int:
+        """Delete every entry whose key matches a regex."""
+        pass
+
+    @abstractmethod
+    def clear(self):
+        """Delete every entry."""
+        pass
+
+    @abstractmethod
+    def publish(self, message: dict):
+        """Send an invalidation message to the other subscribers."""
+        pass
+
+    @abstractmethod
+    def poll(self, timeout: float = 1.0) -> list[dict]:
+        """Wait up to ``timeout`` seconds for invalidation messages."""
+        pass
+
+    @abstractmethod
+    def get_stats(self) -> dict:
+        """Get backend statistics."""
+        pass
+
+    def close(self):
+        """Release connections."""
+
+
+def _encode(value: Any) -> Optional[bytes]:
+    """Encode a value as compact JSON, or None if it isn't serializable."""
+    try:
+        return json.dumps(value, separators=(",", ":")).encode()
+    except (TypeError, ValueError):
+        return None
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL,
+    stale_until REAL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_by_access ON entries (accessed_at);
+CREATE TABLE IF NOT EXISTS tags (
+    tag TEXT NOT NULL,
+    key TEXT NOT NULL,
+    PRIMARY KEY (tag, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS tags_by_key ON tags (key);
+CREATE TABLE IF NOT EXISTS usage (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO usage SELECT 1, COALESCE(SUM(size), 0) FROM entries;
+CREATE TRIGGER IF NOT EXISTS usage_on_insert AFTER INSERT ON entries BEGIN
+    UPDATE usage SET bytes = bytes + NEW.size WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS usage_on_delete AFTER DELETE ON entries BEGIN
+    UPDATE usage SET bytes = bytes - OLD.size WHERE id = 1;
+END;
+CREATE TABLE IF NOT EXISTS invalidations (
+    scope TEXT PRIMARY KEY,
+    at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    message TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+
+class SQLiteSharedCache(SharedCacheBackend):
+    """
+    Shared cache for workers on the same host.
+
+    Every worker opens the same SQLite file in WAL mode, whose index
+    lives in a memory-mapped ``-shm`` segment, so readers never block
+    writers and each worker sees the others' writes immediately.
+    Invalidation messages are rows in an ``events`` table that
+    subscribers tail by id; rows older than ``event_retention`` seconds
+    are pruned. Triggers keep the total size of entries in a ``usage``
+    row, so a put only scans for eviction once the bound is exceeded.
+    The ``invalidations`` table records when each key, tag and pattern
+    was last invalidated (``all`` for a clear), for as long as events
+    are kept.
+
+    Example:
+        shared = SQLiteSharedCache("/dev/shm/cms-cache.sqlite")
+        cache = SmartCache(shared=shared)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 256 * 1024 * 1024,
+        poll_interval: float = 0.05,
+        event_retention: float = 300.0,
+    ):
+        """
+        Open (or create) the shared database.
+
+        Args:
+            path: SQLite database file, ideally on tmpfs (e.g. /dev/shm)
+            max_bytes: Maximum total size of stored values
+            poll_interval: Seconds between checks for new events
+            event_retention: Seconds to keep published events and
+                             invalidation times; values fetched longer
+                             ago than this are not stored
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.poll_interval = poll_interval
+        self.event_retention = event_retention
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None, timeout=10.0
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._closed = False
+
+        # Only events published after opening are delivered
+        self._last_event: int = self._conn.execute(
+            "SELECT COALESCE(MAX(id), 0) FROM events"
+        ).fetchone()[0]
+
+        # Statistics
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0,
+            "stale_puts": 0,
+            "published": 0,
+            "received": 0,
+        }
+
+    def get(self, key: str) -> Optional[SharedEntry]:
+        """
+        Get an entry that is still within its hard TTL.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            (value, expires_at, stale_until), or None if missing or expired
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at, stale_until FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+
+            blob, expires_at, stale_until = row
+            deadline = stale_until or expires_at
+            if deadline is not None and deadline <= time.time():
+                self._stats["misses"] += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+            self._stats["hits"] += 1
+        return json.loads(blob), expires_at, stale_until
+
+    def put(
+        self,
+        key: str,
+        value: Any,
+        expires_at: Optional[float] = None,
+        stale_until: Optional[float] = None,
+        tags: Iterable[str] = (),
+        fetched_at: Optional[float] = None,
+    ) -> bool:
+        """
+        Store an entry, evicting least recently used entries to fit.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+            expires_at: Soft expiry as Unix time (None = never)
+            stale_until: Hard expiry as Unix time (None = same as soft)
+            tags: Tags the key is indexed under
+            fetched_at: Unix time the value's fetch started (None = don't
+                        check for invalidations since)
+
+        Returns:
+            True if stored; False if the value can't be stored or the
+            key, one of its tags or a matching pattern was invalidated
+            at or after ``fetched_at``
+        """
+        blob = _encode(value)
+        if blob is None or len(blob) > self.max_bytes:
+            return False
+        tags = list(tags)
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                stale = fetched_at is not None and self._invalidated_since(key, tags, fetched_at)
+                if not stale:
+                    self._delete(key)
+                    self._conn.execute(
+                        "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                        (key, blob, len(blob), expires_at, stale_until, time.time()),
+                    )
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO tags VALUES (?, ?)",
+                        [(tag, key) for tag in tags],
+                    )
+                    self._evict()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            if stale:
+                self._stats["stale_puts"] += 1
+                return False
+            self._stats["writes"] += 1
+        return True
+
+    def _invalidated_since(self, key: str, tags: list[str], since: float) -> bool:
+        """Whether a key was invalidated at or after a time. Must be called with the lock held."""
+        if since < time.time() - self.event_retention:
+            # Invalidations that old are no longer recorded
+            return True
+        scopes = ["all", f"key:{key}", *(f"tag:{tag}" for tag in tags)]
+        placeholders = ", ".join("?" * len(scopes))
+        if self._conn.execute(
+            f"SELECT 1 FROM invalidations WHERE at >= ? AND scope IN ({placeholders}) LIMIT 1",
+            (since, *scopes),
+        ).fetchone():
+            return True
+        return any(
+            re.match(scope[len("pattern:"):], key)
+            for (scope,) in self._conn.execute(
+                "SELECT scope FROM invalidations WHERE at >= ? AND substr(scope, 1, 8) = 'pattern:'",
+                (since,),
+            )
+        )
+
+    def _mark(self, scope: str):
+        """Record an invalidation of a scope. Must be called in a transaction."""
+        now = time.time()
+        cursor = self._conn.execute(
+            "INSERT OR REPLACE INTO invalidations (scope, at) VALUES (?, ?)", (scope, now)
+        )
+        if cursor.lastrowid % 100 == 0:
+            self._conn.execute(
+                "DELETE FROM invalidations WHERE at < ?", (now - self.event_retention,)
+            )
+
+    def delete(self, key: str) -> bool:
+        """
+        Delete an entry.
+
+        Returns:
+            True if the key was stored
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            deleted = self._delete(key)
+            self._mark(f"key:{key}")
+            self._conn.execute("COMMIT")
+        return deleted
+
+    def invalidate_tag(self, tag: str) -> int:
+        """
+        Delete every entry indexed under a tag.
+
+        Returns:
+            Number of entries deleted
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            keys = [
+                key for (key,) in
+                self._conn.execute("SELECT key FROM tags WHERE tag = ?", (tag,))
+            ]
+            for key in keys:
+                self._delete(key)
+            self._mark(f"tag:{tag}")
+            self._conn.execute("COMMIT")
+        return len(keys)
+
+    def invalidate_pattern(self, pattern: str) -> int:
+        """
+        Delete every entry whose key matches a regex.
+
+        Returns:
+            Number of entries deleted
+        """
+        compiled = re.compile(pattern)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            keys = [
+                key for (key,) in self._conn.execute("SELECT key FROM entries")
+                if compiled.match(key)
+            ]
+            for key in keys:
+                self._delete(key)
+            self._mark(f"pattern:{pattern}")
+            self._conn.execute("COMMIT")
+        return len(keys)
+
+    def _delete(self, key: str) -> bool:
+        """Delete an entry. Must be called with the lock held."""
+        deleted = self._conn.execute("DELETE FROM entries WHERE key = ?", (key,)).rowcount
+        self._conn.execute("DELETE FROM tags WHERE key = ?", (key,))
+        return deleted > 0
+
+    def _evict(self):
+        """Drop least recently used entries until within max_bytes."""
+        total = self._conn.execute("SELECT bytes FROM usage").fetchone()[0]
+        while total > self.max_bytes:
+            row = self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            self._delete(row[0])
+            total -= row[1]
+            self._stats["evictions"] += 1
+
+    def clear(self):
+        """Delete every entry."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute("DELETE FROM entries")
+            self._conn.execute("DELETE FROM tags")
+            self._conn.execute("DELETE FROM invalidations")
+            self._mark("all")
+            self._conn.execute("COMMIT")
+
+    def publish(self, message: dict):
+        """
+        Append an invalidation message for the other subscribers.
+
+        Args:
+            message: JSON-serializable message
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            cursor = self._conn.execute(
+                "INSERT INTO events (message, created_at) VALUES (?, ?)",
+                (json.dumps(message), now),
+            )
+            if cursor.lastrowid % 100 == 0:
+                self._conn.execute(
+                    "DELETE FROM events WHERE created_at < ?", (now - self.event_retention,)
+                )
+            self._conn.execute("COMMIT")
+            self._stats["published"] += 1
+
+    def poll(self, timeout: float = 1.0) -> list[dict]:
+        """
+        Wait for messages published since the last poll.
+
+        Messages this instance published are included; callers filter
+        out their own.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            Messages in publish order (empty on timeout)
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT id, message FROM events WHERE id > ? ORDER BY id",
+                    (self._last_event,),
+                ).fetchall()
+            if rows:
+                self._last_event = rows[-1][0]
+                self._stats["received"] += len(rows)
+                return [json.loads(message) for _, message in rows]
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return []
+            time.sleep(min(self.poll_interval, remaining))
+
+    def get_stats(self) -> dict:
+        """
+        Get shared tier statistics.
+
+        Returns:
+            Statistics dictionary
+        """
+        size = total_bytes = None
+        with self._lock:
+            if not self._closed:
+                size, total_bytes = self._conn.execute(
+                    "SELECT (SELECT COUNT(*) FROM entries), bytes FROM usage"
+                ).fetchone()
+        total = self._stats["hits"] + self._stats["misses"]
+        return {
+            "backend": "sqlite",
+            "size": size,
+            "bytes": total_bytes,
+            "max_bytes": self.max_bytes,
+            "hit_rate": round(self._stats["hits"] / total * 100, 2) if total else 0,
+            **self._stats,
+        }
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
+            self._closed = True
+
+
+# KEYS: entry, invalidated patterns, tag sets, then invalidation markers
+# (clear, key, tags). ARGV: entry blob, TTL in ms (0 = none), cache key,
+# number of tags, fetch time (-1 = don't check), patterns invalidated
+# since then. Nothing is stored if a marker is as new as the fetch, or
+# a pattern was invalidated after the caller checked them.
+# A tag set lives as long as its longest-lived entry, and without a TTL
+# while it indexes an entry that has none.
+_REDIS_PUT = """
+local ttl = tonumber(ARGV[2])
+local tags = tonumber(ARGV[4])
+local since = tonumber(ARGV[5])
+if since >= 0 then
+    if redis.call('ZCOUNT', KEYS[2], since, '+inf') ~= tonumber(ARGV[6]) then
+        return 0
+    end
+    for i = 3 + tags, #KEYS do
+        local at = redis.call('GET', KEYS[i])
+        if at and tonumber(at) >= since then
+            return 0
+        end
+    end
+end
+if ttl > 0 then
+    redis.call('SET', KEYS[1], ARGV[1], 'PX', ttl)
+else
+    redis.call('SET', KEYS[1], ARGV[1])
+end
+for i = 3, 2 + tags do
+    local current = redis.call('PTTL', KEYS[i])
+    redis.call('SADD', KEYS[i], ARGV[3])
+    if ttl == 0 then
+        redis.call('PERSIST', KEYS[i])
+    elseif current == -2 or (current >= 0 and current < ttl) then
+        redis.call('PEXPIRE', KEYS[i], ttl)
+    end
+end
+return 1
+"""
+
+
+class RedisSharedCache(SharedCacheBackend):
+    """
+    Shared cache for workers on different hosts, backed by Redis.
+
+    Entries are stored under ``prefix`` with a TTL at their hard expiry,
+    so Redis drops them on its own; size is bounded by the server's
+    ``maxmemory`` policy. Tags are Redis sets of keys, expiring with
+    the last of their entries. Invalidation messages go over Redis
+    pub/sub on ``channel``.
+
+    Invalidations leave marker keys (a sorted set for patterns) for
+    ``invalidation_retention`` seconds, which puts are checked against
+    in the same script that stores them. Fetch and invalidation times
+    come from the workers' clocks, which must agree to well within the
+    time a fetch takes.
+
+    Requires the ``redis`` package (the ``redis`` extra).
+
+    Example:
+        shared = RedisSharedCache("redis://cache:6379/0")
+        cache = SmartCache(shared=shared)
+    """
+
+    def __init__(
+        self,
+        url: str,
+        prefix: str = "cms:",
+        channel: str = "cms:invalidations",
+        invalidation_retention: float = 300.0,
+    ):
+        """
+        Connect to Redis.
+
+        Args:
+            url: Redis URL (redis://host:port/db)
+            prefix: Prefix for every key written
+            channel: Pub/sub channel for invalidation messages
+            invalidation_retention: Seconds to remember invalidations;
+                                    values fetched longer ago than this
+                                    are not stored
+        """
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError(
+                "A redis:// shared cache URL needs the redis package: "
+                "pip install 'fastmcp-cms-server[redis]'"
+            ) from e
+
+        self.url = url
+        self.prefix = prefix
+        self.channel = channel
+        self.invalidation_retention = invalidation_retention
+        self._redis = redis.Redis.from_url(url)
+        self._put = self._redis.register_script(_REDIS_PUT)
+        self._pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(channel)
+
+        # Statistics
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "stale_puts": 0,
+            "published": 0,
+            "received": 0,
+        }
+
+    def _key(self, key: str) -> str:
+        """Redis key for a cache key."""
+        return f"{self.prefix}entry:{key}"
+
+    def _tag(self, tag: str) -> str:
+        """Redis set holding the keys indexed under a tag."""
+        return f"{self.prefix}tag:{tag}"
+
+    def _marker(self, scope: str) -> str:
+        """Redis key holding when a scope (key:..., tag:..., all) was last invalidated."""
+        return f"{self.prefix}invalidated:{scope}"
+
+    @property
+    def _patterns(self) -> str:
+        """Redis sorted set of invalidated patterns, scored by time."""
+        return f"{self.prefix}invalidated-patterns"
+
+    def _mark(self, pipe: Any, scope: str):
+        """Queue setting an invalidation marker on a pipeline."""
+        pipe.set(
+            self._marker(scope),
+            repr(time.time()),
+            px=int(self.invalidation_retention * 1000),
+        )
+
+    def get(self, key: str) -> Optional[SharedEntry]:
+        """
+        Get an entry that is still within its hard TTL.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            (value, expires_at, stale_until), or None if missing or expired
+        """
+        blob = self._redis.get(self._key(key))
+        if blob is None:
+            self._stats["misses"] += 1
+            return None
+        entry = json.loads(blob)
+        self._stats["hits"] += 1
+        return entry["value"], entry["expires_at"], entry["stale_until"]
+
+    def put(
+        self,
+        key: str,
+        value: Any,
+        expires_at: Optional[float] = None,
+        stale_until: Optional[float] = None,
+        tags: Iterable[str] = (),
+        fetched_at: Optional[float] = None,
+    ) -> bool:
+        """
+        Store an entry until its hard expiry.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+            expires_at: Soft expiry as Unix time (None = never)
+            stale_until: Hard expiry as Unix time (None = same as soft)
+            tags: Tags the key is indexed under
+            fetched_at: Unix time the value's fetch started (None = don't
+                        check for invalidations since)
+
+        Returns:
+            True if stored; False if the value can't be stored or the
+            key, one of its tags or a matching pattern was invalidated
+            at or after ``fetched_at``
+        """
+        blob = _encode({"value": value, "expires_at": expires_at, "stale_until": stale_until})
+        if blob is None:
+            return False
+
+        deadline = stale_until or expires_at
+        ttl_ms = None
+        if deadline is not None:
+            ttl_ms = int((deadline - time.time()) * 1000)
+            if ttl_ms <= 0:
+                return False
+
+        tags = list(tags)
+        patterns = []
+        if fetched_at is not None:
+            if fetched_at < time.time() - self.invalidation_retention:
+                # Invalidations that old are no longer recorded
+                self._stats["stale_puts"] += 1
+                return False
+            patterns = self._redis.zrangebyscore(self._patterns, fetched_at, "+inf")
+            if any(re.match(pattern.decode(), key) for pattern in patterns):
+                self._stats["stale_puts"] += 1
+                return False
+
+        markers = ["all", f"key:{key}", *(f"tag:{tag}" for tag in tags)]
+        stored = self._put(
+            keys=[
+                self._key(key),
+                self._patterns,
+                *(self._tag(tag) for tag in tags),
+                *(self._marker(scope) for scope in markers),
+            ],
+            args=[
+                blob,
+                ttl_ms or 0,
+                key,
+                len(tags),
+                fetched_at if fetched_at is not None else -1,
+                len(patterns),
+            ],
+        )
+        if not stored:
+            self._stats["stale_puts"] += 1
+            return False
+        self._stats["writes"] += 1
+        return True
+
+    def delete(self, key: str) -> bool:
+        """
+        Delete an entry.
+
+        Returns:
+            True if the key was stored
+        """
+        pipe = self._redis.pipeline()
+        self._mark(pipe, f"key:{key}")
+        pipe.delete(self._key(key))
+        return bool(pipe.execute()[-1])
+
+    def invalidate_tag(self, tag: str) -> int:
+        """
+        Delete every entry indexed under a tag.
+
+        Returns:
+            Number of entries deleted
+        """
+        pipe = self._redis.pipeline()
+        self._mark(pipe, f"tag:{tag}")
+        pipe.smembers(self._tag(tag))
+        pipe.delete(self._tag(tag))
+        _, members, _ = pipe.execute()
+        if not members:
+            return 0
+        return self._redis.delete(*(self._key(member.decode()) for member in members))
+
+    def invalidate_pattern(self, pattern: str) -> int:
+        """
+        Delete every entry whose key matches a regex.
+
+        Returns:
+            Number of entries deleted
+        """
+        compiled = re.compile(pattern)
+        now = time.time()
+        pipe = self._redis.pipeline()
+        pipe.zadd(self._patterns, {pattern: now})
+        pipe.zremrangebyscore(self._patterns, "-inf", now - self.invalidation_retention)
+        pipe.execute()
+
+        start = len(self._key(""))
+        keys = [
+            name for name in self._redis.scan_iter(match=self._key("*"), count=500)
+            if compiled.match(name.decode()[start:])
+        ]
+        return self._redis.delete(*keys) if keys else 0
+
+    def clear(self):
+        """Delete every entry written under the prefix."""
+        pipe = self._redis.pipeline()
+        self._mark(pipe, "all")
+        pipe.execute()
+        markers = self._marker("").encode()
+        keys = [
+            name for name in self._redis.scan_iter(match=f"{self.prefix}*", count=500)
+            if not name.startswith(markers)
+        ]
+        if keys:
+            self._redis.delete(*keys)
+
+    def publish(self, message: dict):
+        """
+        Publish an invalidation message.
+
+        Args:
+            message: JSON-serializable message
+        """
+        self._redis.publish(self.channel, json.dumps(message))
+        self._stats["published"] += 1
+
+    def poll(self, timeout: float = 1.0) -> list[dict]:
+        """
+        Wait for published messages.
+
+        Args:
+            timeout: Maximum seconds to wait for the first message
+
+        Returns:
+            Messages received (empty on timeout)
+        """
+        messages = []
+        deadline = time.monotonic() + timeout
+        while True:
+            wait = 0 if messages else max(0.0, deadline - time.monotonic())
+            # Also None for subscribe confirmations, which are skipped
+            message = self._pubsub.get_message(timeout=wait)
+            if message is not None and message["type"] == "message":
+                messages.append(json.loads(message["data"]))
+            elif message is None and (messages or wait == 0):
+                break
+        self._stats["received"] += len(messages)
+        return messages
+
+    def get_stats(self) -> dict:
+        """
+        Get shared tier statistics.
+
+        Returns:
+            Statistics dictionary
+        """
+        total = self._stats["hits"] + self._stats["misses"]
+        return {
+            "backend": "redis",
+            "hit_rate": round(self._stats["hits"] / total * 100, 2) if total else 0,
+            **self._stats,
+        }
+
+    def close(self):
+        """Close the pub/sub subscription and connection pool."""
+        self._pubsub.close()
+        self._redis.close()
+
+
+def create_shared_cache(url: str, max_bytes: int = 256 * 1024 * 1024) -> SharedCacheBackend:
+    """
+    Create a shared cache backend from a URL.
+
+    ``redis://`` and ``rediss://`` URLs use Redis; anything else is a
+    path to a SQLite file (``sqlite:///`` prefix optional).
+
+    Args:
+        url: Backend URL or SQLite path
+        max_bytes: Size bound for the SQLite backend
+
+    Returns:
+        Shared cache backend
+    """
+    if url.startswith(("redis://", "rediss://")):
+        return RedisSharedCache(url)
+    return SQLiteSharedCache(url.removeprefix("sqlite:///"), max_bytes=max_bytes)
@@ -1,24 +1,179 @@
 """Smart caching with cache warming and intelligent invalidation."""
 
 import asyncio
-from typing import Any, Optional, Pattern
+import heapq
+import math
+import random
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Iterable, Iterator, Optional, Pattern
 import re
 from collections import defaultdict
-from datetime import datetime, timedelta
+from datetime import datetime
+from core.cache_keys import (
+    QueryKey,
+    document_tag,
+    field_tag,
+    key_prefix_tags,
+    list_page_tags,
+    opaque_tag,
+)
+from core.cache_policy import WTinyLFUPolicy, estimate_size
+from core.disk_cache import DiskCache
+from core.encoded_json import EncodedJSON, decoded, get_codec, to_json
+from core.heavy_hitters import SpaceSaving
+from core.shared_cache import SharedCacheBackend
+from utils.errors import ResourceNotFoundError
 from utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# "kind:*" or "kind:name:*" (glob or regex) - exactly the prefix tags
+_SEGMENT = r"[^:*?+.\[\](){}^$|\\]+"
+_PREFIX_PATTERN = re.compile(rf"^({_SEGMENT}(?::{_SEGMENT})?):(?:\*|\.\*)$")
+
+
+class StaleReads:
+    """Records whether any cache read in a block served a stale value."""
+
+    def __init__(self):
+        """Initialize with no stale reads seen."""
+        self.stale = False
+
+
+_stale_reads: ContextVar[Optional[StaleReads]] = ContextVar("stale_reads", default=None)
+
+# Unix time the fetch running in this context started, for shared-tier puts
+_fetch_started: ContextVar[Optional[float]] = ContextVar("fetch_started", default=None)
+
+
+@contextmanager
+def track_stale_reads() -> Iterator[StaleReads]:
+    """
+    Track whether reads inside the block were served stale.
+
+    Tool handlers use this to mark their responses with
+    ``meta.stale=true`` without changing client return types.
+
+    Example:
+        with track_stale_reads() as reads:
+            doc = await client.get_document("projects", "p1")
+        if reads.stale:
+            response["meta"] = {"stale": True}
+    """
+    reads = StaleReads()
+    token = _stale_reads.set(reads)
+    try:
+        yield reads
+    finally:
+        _stale_reads.reset(token)
+
+
+class _NotFound:
+    """Negative cache entry recording that a resource does not exist."""
+
+    __slots__ = ("message",)
+
+    def __init__(self, message: str):
+        """
+        Initialize negative entry.
+
+        Args:
+            message: Message of the ResourceNotFoundError to re-raise
+        """
+        self.message = message
+
+
+class _RestoreGuard:
+    """Keys, tags and patterns changed in a cache while a snapshot loads."""
+
+    __slots__ = ("keys", "tags", "patterns", "cleared")
+
+    def __init__(self):
+        """Initialize with nothing changed."""
+        self.keys: set[str] = set()
+        self.tags: set[str] = set()
+        self.patterns: list[Pattern] = []
+        self.cleared = False
+
+    def covers(self, key: str, tags: Iterable[str]) -> bool:
+        """Whether a key (indexed under tags) was written or invalidated."""
+        return (
+            self.cleared
+            or key in self.keys
+            or not self.tags.isdisjoint(tags)
+            or any(pattern.match(key) for pattern in self.patterns)
+        )
+
+
+def _version(value: Any, field: str) -> Optional[datetime]:
+    """Parse a document's ISO-8601 version timestamp (e.g. updatedAt)."""
+    if not isinstance(value, dict) or not isinstance(value.get(field), str):
+        return None
+    try:
+        return datetime.fromisoformat(value[field])
+    except ValueError:
+        return None
+
+
+def _to_unix(deadline: Optional[float]) -> Optional[float]:
+    """Convert a monotonic deadline to Unix time (for disk and snapshots)."""
+    if deadline is None:
+        return None
+    return time.time() + (deadline - time.monotonic())
+
+
+def _from_unix(timestamp: Optional[float]) -> Optional[float]:
+    """Convert a Unix time deadline to the monotonic clock."""
+    if timestamp is None:
+        return None
+    return time.monotonic() + (timestamp - time.time())
+
+
+def _log_shared_failure(future: Future):
+    """Log a failed shared-tier call; the local tiers are unaffected."""
+    if not future.cancelled() and future.exception() is not None:
+        logger.warning("Shared cache call failed", error=str(future.exception()))
+
+
+def _log_disk_failure(future: Future):
+    """Log a failed disk-tier call; the entry just isn't kept on disk."""
+    if not future.cancelled() and future.exception() is not None:
+        logger.warning("Disk cache call failed", error=str(future.exception()))
+
 
 class SmartCache:
     """
     Enhanced cache with warming and invalidation strategies.
 
     Features:
-    - Access tracking to identify hot keys
+    - Bounded memory (max entries and max bytes) with W-TinyLFU
+      admission and eviction
+    - Fixed-memory tracking of the most requested keys, decayed over
+      time so warming follows current traffic
     - Proactive cache warming for frequently accessed resources
-    - Pattern-based invalidation
-    - TTL support per key
+    - Tag index so invalidation costs O(affected keys), not O(cache size)
+    - Probabilistic early refresh (XFetch) of hot keys before they
+      expire, so concurrent readers don't all miss at once
+    - TTL support per key, with a stale window past it: stale values
+      are served while a single background refresh runs, and keep being
+      served while the CMS is failing, until the hard TTL
+    - Deadlines on the monotonic clock (immune to wall-clock jumps) in
+      a min-heap, so ``sweep`` reclaims expired entries nobody reads
+    - Short-lived negative entries for lookups that raised
+      ResourceNotFoundError, so repeated probes for a missing document
+      don't each reach the CMS
+    - Optional disk tier (``l2``): entries evicted from memory, or too
+      large for it, move to disk, and ``get_or_fetch`` checks the disk
+      before the CMS and promotes what it finds
+    - Optional shared tier (``shared``) for multi-worker deployments:
+      misses fill from and write to a tier every worker sees, and
+      invalidations are published so other workers evict too
+    - Optional compact storage (``codec``): dicts and lists are kept as
+      (compressed) JSON bytes and parsed only when read
     - Statistics tracking
 
     Example:
@@ -37,28 +192,129 @@ class SmartCache:
         cache.invalidate_smart("create", "projects")
     """
 
-    def __init__(self, default_ttl: int = 300):
+    def __init__(
+        self,
+        default_ttl: int = 300,
+        max_entries: int = 10_000,
+        max_bytes: int = 128 * 1024 * 1024,
+        stale_ttl: int = 0,
+        xfetch_beta: float = 1.0,
+        l2: Optional[DiskCache] = None,
+        negative_ttl: int = 0,
+        hot_key_capacity: int = 256,
+        hot_key_half_life: float = 600.0,
+        shared: Optional[SharedCacheBackend] = None,
+        codec: Optional[str] = None,
+    ):
         """
         Initialize smart cache.
 
         Args:
-            default_ttl: Default time-to-live in seconds
+            default_ttl: Default time-to-live in seconds (soft TTL)
+            max_entries: Maximum number of cached keys
+            max_bytes: Maximum estimated resident size of cached values
+            stale_ttl: Default seconds past the soft TTL that a value may
+                       still be served stale (0 = never serve stale)
+            xfetch_beta: Eagerness of early refresh (0 = disabled, >1
+                         refreshes earlier)
+            l2: Disk tier behind memory (None = memory only)
+            negative_ttl: Seconds to remember that a resource was not
+                          found (0 = never)
+            hot_key_capacity: Number of most requested keys tracked for
+                              warming (0 = no tracking)
+            hot_key_half_life: Seconds for a key's request count to halve
+            shared: Tier and invalidation channel shared with other
+                    workers (None = this process only)
+            codec: Keep dicts and lists as JSON bytes compressed with
+                   this codec ("none", "zlib", "zstd" or "lz4"; None =
+                   keep parsed objects)
         """
         self.default_ttl = default_ttl
+        self.negative_ttl = negative_ttl
+        self.stale_ttl = stale_ttl
+        self.xfetch_beta = xfetch_beta
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.l2 = l2
+        self.shared = shared
+        if codec is not None:
+            # Fail at startup, not on the first set(), if a library is missing
+            get_codec(codec)
+        self.codec = codec
+        self.worker_id = uuid.uuid4().hex
+        # One thread, so this worker's shared-tier writes, drops, publishes
+        # and reads happen in the order they were issued
+        self._shared_executor = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="shared-cache")
+            if shared is not None
+            else None
+        )
+        # One thread for the disk tier too, so a demotion and a later
+        # drop or read of the same key apply in order, off the event loop
+        self._disk_executor = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="disk-cache")
+            if l2 is not None
+            else None
+        )
+        # Disk calls queued and finished (each written by one thread only)
+        self._disk_queued = 0
+        self._disk_done = 0
+        # Set while applying another worker's invalidation
+        self._remote = False
+        self._policy = WTinyLFUPolicy(max_entries, max_bytes)
         self._cache: dict[str, Any] = {}
-        self._expiry: dict[str, datetime] = {}
+        # Soft and hard deadlines on the time.monotonic() clock
+        self._expiry: dict[str, float] = {}
+        self._stale_until: dict[str, float] = {}
+        # Min-heap of (hard deadline, key); superseded items are skipped
+        self._deadlines: list[tuple[float, str]] = []
+        self._recompute_time: dict[str, float] = {}
+        # HTTP validators (ETag, Last-Modified) per key for revalidation
+        self._validators: dict[str, dict[str, str]] = {}
         self._access_counts: dict[str, int] = defaultdict(int)
-        self._last_access: dict[str, datetime] = {}
+        self._last_access: dict[str, float] = {}
+        self._hot_keys = (
+            SpaceSaving(hot_key_capacity, hot_key_half_life)
+            if hot_key_capacity > 0
+            else None
+        )
+        self._tags: dict[str, set[str]] = defaultdict(set)
+        self._key_tags: dict[str, tuple[str, ...]] = {}
         self._warming_tasks: dict[str, asyncio.Task] = {}
+        self._refresh_tasks: dict[str, asyncio.Task] = {}
         self._lock = asyncio.Lock()
 
+        # Bumped on every invalidation so a promotion that raced one is dropped
+        self._generation = 0
+        # Set while a snapshot loads, so it can't undo newer changes
+        self._restore_guard: Optional[_RestoreGuard] = None
+
         # Statistics
-        self._stats = {
+        self._stats = self._empty_stats()
+
+    @staticmethod
+    def _empty_stats() -> dict:
+        """Fresh statistics counters."""
+        return {
             "hits": 0,
             "misses": 0,
             "sets": 0,
             "invalidations": 0,
+            "evictions": 0,
+            "admission_rejections": 0,
+            "oversize_rejections": 0,
+            "stale_writes_ignored": 0,
+            "stale_hits": 0,
+            "revalidations": 0,
+            "negative_hits": 0,
+            "negative_sets": 0,
+            "expired_reclaimed": 0,
+            "expirations": 0,
+            "early_refreshes": 0,
+            "background_refreshes": 0,
+            "refresh_failures": 0,
             "warming_operations": 0,
+            "remote_invalidations": 0,
         }
 
     def get(self, key: str) -> Optional[Any]:
@@ -71,77 +327,915 @@ class SmartCache:
         Returns:
             Cached value or None if not found/expired
         """
+        return decoded(self._lookup(key))
+
+    def _lookup(self, key: str) -> Optional[Any]:
+        """Get a live value as stored (possibly encoded), tracking access."""
+        # Hits and misses both count as demand for warming
+        if self._hot_keys is not None:
+            self._hot_keys.record(key)
+
         # Check expiry
         if key in self._expiry:
-            if datetime.now() > self._expiry[key]:
-                # Expired
-                self.delete(key)
+            now = time.monotonic()
+            if now > self._expiry[key]:
+                # Expired; keep it around for get_stale() until the hard TTL
+                if key not in self._stale_until or now > self._stale_until[key]:
+                    self._expire(key)
                 self._stats["misses"] += 1
                 return None
 
-        # Get value
+        # Get value (negative entries only answer get_or_fetch)
         value = self._cache.get(key)
+        if isinstance(value, _NotFound):
+            value = None
 
         # Track access
         if value is not None:
             self._access_counts[key] += 1
-            self._last_access[key] = datetime.now()
+            self._last_access[key] = time.monotonic()
+            self._policy.on_hit(key)
             self._stats["hits"] += 1
         else:
+            # Misses still count towards admission frequency
+            self._policy.record(key)
             self._stats["misses"] += 1
 
         return value
 
-    def set(self, key: str, value: Any, ttl: Optional[int] = None):
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Iterable[str] = (),
+        stale_ttl: Optional[int] = None,
+        raw: Optional[bytes] = None,
+    ):
         """
         Set cache value with optional TTL.
 
+        The key is always indexed under its prefix tags (e.g.
+        ``collection:projects``), list pages are also indexed by the
+        documents they contain and the fields they filter on, and
+        ``tags`` adds extra ones.
+
+        The entry may be evicted straight away if the cache is full and
+        the key is accessed less often than the entry it would displace.
+        With a disk tier, evicted and oversize entries move to disk
+        instead of being dropped. With a shared tier, the entry is also
+        written there for other workers, unless another worker
+        invalidated it since it was fetched (since the fetch run by
+        ``get_or_fetch`` started, or else since this call).
+
         Args:
             key: Cache key
             value: Value to cache
             ttl: Time-to-live in seconds (None = use default)
+            tags: Additional tags to index the key under
+            stale_ttl: Seconds past ``ttl`` the value may be served stale
+                       (None = use default)
+            raw: JSON text ``value`` was parsed from (e.g. the response
+                 body); with a codec it is stored instead of
+                 re-serializing ``value``
+        """
+        ttl = ttl if ttl is not None else self.default_ttl
+        stale_ttl = stale_ttl if stale_ttl is not None else self.stale_ttl
+        expires_at = time.monotonic() + ttl if ttl > 0 else None
+        stale_until = (
+            expires_at + stale_ttl
+            if expires_at is not None and stale_ttl > 0
+            else None
+        )
+        self._store(key, value, expires_at, stale_until, tuple(tags), raw)
+
+        if self._sharing() and not isinstance(value, _NotFound):
+            self._shared_call(
+                self.shared.put,
+                key,
+                value,
+                _to_unix(expires_at),
+                _to_unix(stale_until),
+                self._derived_tags(key, value) + tuple(tags),
+                _fetch_started.get() or time.time(),
+            )
+
+    def _sharing(self) -> bool:
+        """Whether changes made here should reach the shared tier."""
+        return self.shared is not None and not self._remote
+
+    def _shared_call(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Queue a call on the shared tier behind this worker's earlier ones."""
+        future = self._shared_executor.submit(fn, *args)
+        future.add_done_callback(_log_shared_failure)
+        return future
+
+    def _publish(self, op: str, **args: Any):
+        """Tell other workers about an invalidation made here."""
+        if self._sharing():
+            self._shared_call(self.shared.publish, {"origin": self.worker_id, "op": op, **args})
+
+    def apply_invalidation(self, message: dict) -> bool:
+        """
+        Apply an invalidation published by another worker.
+
+        Only this worker's memory and disk tiers are touched; the
+        publisher already dropped the entries from the shared tier.
+
+        Args:
+            message: Message from the shared tier's channel
+
+        Returns:
+            True if applied; False for this worker's own or unknown messages
+        """
+        if message.get("origin") == self.worker_id:
+            return False
+
+        op = message.get("op")
+        self._remote = True
+        try:
+            if op == "delete":
+                self.delete(message["key"])
+            elif op == "tag":
+                self.invalidate_tag(message["tag"])
+            elif op == "pattern":
+                self.invalidate_pattern(message["pattern"])
+            elif op == "smart":
+                self.invalidate_smart(
+                    message["operation"],
+                    message["collection"],
+                    doc_id=message.get("doc_id"),
+                    changes=message.get("changes"),
+                )
+            elif op == "clear":
+                self.clear()
+            else:
+                return False
+        finally:
+            self._remote = False
+
+        self._stats["remote_invalidations"] += 1
+        return True
+
+    def _store(
+        self,
+        key: str,
+        value: Any,
+        expires_at: Optional[float],
+        stale_until: Optional[float],
+        tags: tuple[str, ...] = (),
+        raw: Optional[bytes] = None,
+        encoded: Optional[EncodedJSON] = None,
+    ):
         """
+        Store a value with absolute soft and hard expiry.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            expires_at: Soft expiry, monotonic (None = never)
+            stale_until: Hard expiry, monotonic (None = no stale window)
+            tags: Additional tags to index the key under
+            raw: JSON text of ``value``, if the caller has it
+            encoded: ``value`` already encoded with the cache's codec
+        """
+        tags = self._derived_tags(key, value) + tags
+        if self._restore_guard is not None:
+            self._restore_guard.keys.add(key)
+
+        if self.codec is not None and isinstance(value, (dict, list)):
+            # Tags come from the parsed value; only the bytes are kept
+            if encoded is not None:
+                value = encoded
+            elif raw is not None:
+                value = EncodedJSON.from_bytes(raw, self.codec)
+            else:
+                value = EncodedJSON.from_value(value, self.codec)
+
+        # A key lives in one tier at a time
+        if self._may_be_on_disk(key):
+            self._disk_call(self.l2.delete, key)
+
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            # Would flush the whole cache and still not fit
+            self._stats["oversize_rejections"] += 1
+            self._remove(key)
+            if self.l2 is not None:
+                self._put_l2(key, value, expires_at, stale_until, tags)
+            return
+
         self._cache[key] = value
+        self._validators.pop(key, None)
         self._stats["sets"] += 1
 
-        # Set expiry
-        ttl = ttl if ttl is not None else self.default_ttl
-        if ttl > 0:
-            self._expiry[key] = datetime.now() + timedelta(seconds=ttl)
+        if expires_at is not None:
+            self._expiry[key] = expires_at
+        else:
+            self._expiry.pop(key, None)
+        if expires_at is not None and stale_until is not None:
+            self._stale_until[key] = stale_until
+        else:
+            self._stale_until.pop(key, None)
+        self._schedule(key)
+
+        self._index(key, tags)
+
+        rejections = self._policy.admission_rejections
+        for evicted in self._policy.add(key, size):
+            self._demote(evicted)
+            self._remove(evicted)
+            self._stats["evictions"] += 1
+        self._stats["admission_rejections"] += self._policy.admission_rejections - rejections
+
+    def _put_l2(
+        self,
+        key: str,
+        value: Any,
+        expires_at: Optional[float],
+        stale_until: Optional[float],
+        tags: Iterable[str],
+    ):
+        """Queue writing an entry to the disk tier with the same expiry."""
+        expires_at, stale_until = _to_unix(expires_at), _to_unix(stale_until)
+        self._disk_call(
+            lambda: self.l2.put(key, decoded(value), expires_at, stale_until, tags)
+        )
+
+    def _disk_call(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Queue a call on the disk tier behind this cache's earlier ones."""
+        self._disk_queued += 1
+        future = self._disk_executor.submit(self._run_disk_call, fn, *args)
+        future.add_done_callback(_log_disk_failure)
+        return future
+
+    def _run_disk_call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a queued disk call (on the disk thread)."""
+        try:
+            return fn(*args)
+        finally:
+            self._disk_done += 1
+
+    def _may_be_on_disk(self, key: str) -> bool:
+        """Whether a key is on disk, or may be once queued writes land."""
+        return self.l2 is not None and (key in self.l2 or self._disk_done != self._disk_queued)
+
+    def _demote(self, key: str):
+        """Move an evicted entry to the disk tier if it is still live."""
+        if self.l2 is None or key not in self._cache:
+            return
+        expires_at = self._expiry.get(key)
+        stale_until = self._stale_until.get(key)
+        deadline = stale_until or expires_at
+        if deadline is not None and deadline <= time.monotonic():
+            return
+        self._put_l2(key, self._cache[key], expires_at, stale_until, self._key_tags.get(key, ()))
+
+    def _deadline(self, key: str) -> Optional[float]:
+        """Get the monotonic time after which a key can be dropped."""
+        return self._stale_until.get(key) or self._expiry.get(key)
+
+    def _schedule(self, key: str):
+        """Queue a key's hard deadline for the sweeper."""
+        deadline = self._deadline(key)
+        if deadline is None:
+            return
+        heapq.heappush(self._deadlines, (deadline, key))
+
+        # Rewrites leave superseded items behind; rebuild before they pile up
+        if len(self._deadlines) > 2 * len(self._cache) + 1024:
+            self._deadlines = [
+                (self._deadline(k), k) for k in self._cache
+                if self._deadline(k) is not None
+            ]
+            heapq.heapify(self._deadlines)
+
+    def sweep(self, limit: int = 500) -> int:
+        """
+        Drop up to ``limit`` entries past their hard deadline.
+
+        Entries are popped from the deadline heap in expiry order, so a
+        call costs O(limit log n) no matter how large the cache is.
+
+        Args:
+            limit: Maximum number of entries to drop
+
+        Returns:
+            Number of entries dropped
+        """
+        now = time.monotonic()
+        heap = self._deadlines
+        removed = 0
+
+        while heap and heap[0][0] <= now and removed < limit:
+            deadline, key = heapq.heappop(heap)
+            if key not in self._cache or self._deadline(key) != deadline:
+                # Rewritten or removed since it was queued
+                continue
+            self._remove(key)
+            removed += 1
+
+        self._stats["expired_reclaimed"] += removed
+        return removed
+
+    def _expire(self, key: str):
+        """
+        Drop a key found past its deadline on read.
+
+        Unlike an invalidation, this doesn't bump the generation (so
+        fetches in flight for other keys still get stored), and the key
+        can't be on disk, since memory and disk don't share keys.
+
+        Args:
+            key: Cache key
+        """
+        if self._remove(key):
+            self._stats["expirations"] += 1
+
+    def _remove(self, key: str) -> bool:
+        """
+        Drop a key and all of its bookkeeping.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            True if key existed
+        """
+        existed = self._cache.pop(key, None) is not None
+        self._unindex(key)
+        self._policy.remove(key)
+        self._expiry.pop(key, None)
+        self._stale_until.pop(key, None)
+        self._recompute_time.pop(key, None)
+        self._validators.pop(key, None)
+        self._access_counts.pop(key, None)
+        self._last_access.pop(key, None)
+        return existed
+
+    def set_if_newer(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        version_field: str = "updatedAt",
+    ) -> bool:
+        """
+        Set a document unless the cached copy is a newer version.
+
+        Responses to concurrent writes and reads can arrive out of order;
+        comparing ``updatedAt`` keeps an older response from replacing a
+        newer one. Values without a parseable version are always stored.
+
+        Args:
+            key: Cache key
+            value: Document to cache
+            ttl: Time-to-live in seconds (None = use default)
+            version_field: Field holding the document's version timestamp
+
+        Returns:
+            True if the value was stored
+        """
+        current = self._peek(key)
+        new_version = _version(value, version_field)
+        current_version = _version(current, version_field)
+
+        if new_version and current_version:
+            try:
+                is_stale = new_version < current_version
+            except TypeError:
+                # Naive vs aware timestamps can't be ordered
+                is_stale = False
+            if is_stale:
+                self._stats["stale_writes_ignored"] += 1
+                return False
+
+        self.set(key, value, ttl)
+        return True
+
+    def is_current(self, key: str, version: str, version_field: str = "updatedAt") -> bool:
+        """
+        Check whether the cached copy of a document is at least a version.
+
+        Args:
+            key: Cache key
+            version: ISO-8601 version timestamp (e.g. from a change event)
+            version_field: Field holding the document's version timestamp
+
+        Returns:
+            True if a cached copy exists and is this version or newer
+        """
+        cached = _version(self._peek(key), version_field)
+        wanted = _version({version_field: version}, version_field)
+        if cached is None or wanted is None:
+            return False
+        try:
+            return cached >= wanted
+        except TypeError:
+            return False
+
+    def _peek(self, key: str) -> Optional[Any]:
+        """Get a fresh or stale value without recording an access."""
+        deadline = self._stale_until.get(key) or self._expiry.get(key)
+        if deadline is not None and time.monotonic() > deadline:
+            return None
+        return decoded(self._cache.get(key))
+
+    def set_validators(
+        self,
+        key: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ):
+        """
+        Remember the HTTP validators a cached response was served with.
+
+        Args:
+            key: Cache key (must be cached)
+            etag: ETag response header
+            last_modified: Last-Modified response header
+        """
+        if key not in self._cache:
+            return
+        validators = {}
+        if etag:
+            validators["etag"] = etag
+        if last_modified:
+            validators["last_modified"] = last_modified
+        if validators:
+            self._validators[key] = validators
+        else:
+            self._validators.pop(key, None)
+
+    def get_validators(self, key: str) -> dict[str, str]:
+        """
+        Get what a refresh of a key can be revalidated against.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Any of "etag", "last_modified" and "updated_at" (the cached
+            document's updatedAt); empty if nothing is cached
+        """
+        value = self._peek(key)
+        if value is None or isinstance(value, _NotFound):
+            return {}
+        validators = dict(self._validators.get(key, {}))
+        if isinstance(value, dict) and isinstance(value.get("updatedAt"), str):
+            validators["updated_at"] = value["updatedAt"]
+        return validators
+
+    def revalidate(self, key: str, ttl: Optional[int] = None) -> Optional[Any]:
+        """
+        Mark a cached value as confirmed unchanged and restart its TTL.
+
+        Args:
+            key: Cache key
+            ttl: Time-to-live in seconds (None = use default)
+
+        Returns:
+            The cached value, or None if it is no longer cached
+        """
+        value = self._peek(key)
+        if value is None:
+            return None
+        validators = self._validators.get(key)
+        self.set(key, value, ttl)
+        if validators is not None and key in self._cache:
+            self._validators[key] = validators
+        self._stats["revalidations"] += 1
+        return value
+
+    def get_stale(self, key: str) -> Optional[Any]:
+        """
+        Get a value that is past its soft TTL but within its hard TTL.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Stale value, or None if the key is fresh, missing or past
+            its hard TTL
+        """
+        return decoded(self._lookup_stale(key))
+
+    def _lookup_stale(self, key: str) -> Optional[Any]:
+        """Get a stale value as stored (possibly encoded)."""
+        expiry = self._expiry.get(key)
+        stale_until = self._stale_until.get(key)
+        if expiry is None or stale_until is None:
+            return None
+
+        now = time.monotonic()
+        if now <= expiry:
+            return None
+        if now > stale_until:
+            self._expire(key)
+            return None
+
+        return self._cache.get(key)
+
+    async def get_or_fetch(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        cache_not_found: bool = False,
+        as_json: bool = False,
+    ) -> Any:
+        """
+        Read through the cache (memory, then disk) with stale-while-revalidate.
+
+        A fresh value is returned as is, but as it nears expiry it may
+        also trigger an early background refresh (see
+        ``_should_refresh_early``). A stale value is returned
+        immediately while ``fetch`` runs once in the background; if the
+        refresh fails (CMS down, circuit open) the stale value keeps being
+        served until its hard TTL. Otherwise the caller waits for
+        ``fetch``. ``fetch`` is responsible for storing what it fetched.
+
+        With ``cache_not_found``, a ResourceNotFoundError from ``fetch``
+        is remembered for ``negative_ttl`` seconds and re-raised from
+        cache until then.
+
+        With ``as_json``, the value's JSON text is returned instead; an
+        entry stored encoded (see ``codec``) is returned without being
+        parsed.
+
+        Args:
+            key: Cache key
+            fetch: Coroutine function that fetches and caches the value
+            cache_not_found: Whether to cache ResourceNotFoundError
+            as_json: Whether to return JSON text (bytes)
+
+        Returns:
+            Cached or fetched value
+
+        Raises:
+            ResourceNotFoundError: If the resource is (cached as) missing
+        """
+        if cache_not_found:
+            missing = self._get_not_found(key)
+            if missing is not None:
+                self._stats["negative_hits"] += 1
+                raise ResourceNotFoundError(missing.message)
+
+        read = to_json if as_json else decoded
+
+        value = self._lookup(key)
+        if value is not None:
+            if self._should_refresh_early(key) and self.refresh_in_background(key, fetch):
+                self._stats["early_refreshes"] += 1
+            return read(value)
+
+        stale = self._lookup_stale(key)
+        if stale is not None:
+            self._stats["stale_hits"] += 1
+            self.refresh_in_background(key, fetch)
+
+            reads = _stale_reads.get()
+            if reads is not None:
+                reads.stale = True
+            return read(stale)
+
+        if self.l2 is not None:
+            value = await self._promote(key, fetch)
+            if value is not None:
+                return self._as_json(key, value) if as_json else value
+
+        if self.shared is not None:
+            value = await self._fill_from_shared(key, fetch)
+            if value is not None:
+                return self._as_json(key, value) if as_json else value
+
+        generation = self._generation
+        try:
+            value = await self._timed_fetch(key, fetch)
+            return self._as_json(key, value) if as_json else value
+        except ResourceNotFoundError as e:
+            # Skip if the key was invalidated (e.g. created) meanwhile
+            if cache_not_found and generation == self._generation:
+                self.set_not_found(key, str(e))
+            raise
+
+    def _as_json(self, key: str, value: Any) -> bytes:
+        """Get the JSON text of a value just stored under a key."""
+        stored = self._cache.get(key)
+        if isinstance(stored, EncodedJSON):
+            # Keeps the response body as received, if the codec stored it
+            return stored.raw()
+        return to_json(value)
+
+    def set_not_found(self, key: str, message: str, ttl: Optional[int] = None):
+        """
+        Remember that the resource behind a key does not exist.
+
+        The negative entry is indexed like a normal one, so the
+        invalidation that follows a create (or an explicit delete of the
+        key) removes it immediately.
+
+        Args:
+            key: Cache key
+            message: Error message to re-raise on negative hits
+            ttl: Seconds to keep the entry (None = negative_ttl)
+        """
+        ttl = ttl if ttl is not None else self.negative_ttl
+        if ttl <= 0:
+            return
+        self.set(key, _NotFound(message), ttl=ttl, stale_ttl=0)
+        self._stats["negative_sets"] += 1
+
+    def _get_not_found(self, key: str) -> Optional[_NotFound]:
+        """Get a live negative entry for a key."""
+        value = self._cache.get(key)
+        if not isinstance(value, _NotFound):
+            return None
+        expiry = self._expiry.get(key)
+        if expiry is not None and time.monotonic() > expiry:
+            self._delete(key)
+            return None
+        self._policy.on_hit(key)
+        return value
+
+    async def _promote(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Optional[Any]:
+        """
+        Move an entry from the disk tier into memory.
+
+        A promoted entry keeps its expiry; if it is past its soft TTL it
+        is served stale and refreshed like any other stale entry.
+
+        Args:
+            key: Cache key (missed in memory)
+            fetch: Coroutine function that fetches and caches the value
+
+        Returns:
+            Value from disk, or None on a disk miss
+        """
+        generation = self._generation
+        if self._may_be_on_disk(key):
+            entry = await asyncio.wrap_future(self._disk_call(self.l2.pop, key))
+        else:
+            # Unknown keys are answered from memory; no thread hop needed
+            entry = self.l2.pop(key)
+        if entry is None:
+            return None
+
+        value, expires_at, stale_until, tags = entry
+        if generation != self._generation:
+            # Invalidated while reading from disk
+            return None
+        return self._adopt(key, value, expires_at, stale_until, tuple(tags), fetch)
+
+    async def _fill_from_shared(
+        self, key: str, fetch: Callable[[], Awaitable[Any]]
+    ) -> Optional[Any]:
+        """
+        Copy an entry another worker cached into memory.
+
+        Args:
+            key: Cache key (missed in memory and on disk)
+            fetch: Coroutine function that fetches and caches the value
+
+        Returns:
+            Value from the shared tier, or None on a miss
+        """
+        generation = self._generation
+        entry = await asyncio.wrap_future(self._shared_call(self.shared.get, key))
+        if entry is None:
+            return None
+
+        value, expires_at, stale_until = entry
+        if generation != self._generation:
+            # Invalidated while reading from the shared tier
+            return None
+        return self._adopt(key, value, expires_at, stale_until, (), fetch)
+
+    def _adopt(
+        self,
+        key: str,
+        value: Any,
+        expires_at: Optional[float],
+        stale_until: Optional[float],
+        tags: tuple[str, ...],
+        fetch: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Store an entry read from a lower tier, keeping its expiry.
+
+        An entry past its soft TTL is served stale and refreshed like
+        any other stale entry.
+
+        Args:
+            key: Cache key
+            value: Value read from the tier
+            expires_at: Soft expiry as Unix time (None = never)
+            stale_until: Hard expiry as Unix time (None = no stale window)
+            tags: Additional tags the entry was indexed under
+            fetch: Coroutine function that fetches and caches the value
+
+        Returns:
+            The value
+        """
+        if key not in self._cache:
+            self._store(key, value, _from_unix(expires_at), _from_unix(stale_until), tags)
+
+        if expires_at is not None and expires_at <= time.time():
+            self._stats["stale_hits"] += 1
+            self.refresh_in_background(key, fetch)
+            reads = _stale_reads.get()
+            if reads is not None:
+                reads.stale = True
+        return value
+
+    def _should_refresh_early(self, key: str) -> bool:
+        """
+        Decide whether a fresh key should be recomputed ahead of expiry.
+
+        XFetch: refresh when ``delta * beta * -ln(U) >= time to expiry``
+        where ``delta`` is how long the key last took to fetch and U is
+        uniform in (0, 1]. The chance rises smoothly as expiry nears and
+        is higher for slow keys, so under heavy read load one reader
+        refreshes shortly before expiry instead of all readers missing
+        at once.
+
+        Args:
+            key: Cache key (known to be fresh)
+
+        Returns:
+            True if this read should trigger a refresh
+        """
+        delta = self._recompute_time.get(key)
+        expiry = self._expiry.get(key)
+        if not delta or expiry is None or self.xfetch_beta <= 0:
+            return False
+
+        remaining = expiry - time.monotonic()
+        gap = -delta * self.xfetch_beta * math.log(1.0 - random.random())
+        return gap >= remaining
+
+    async def _timed_fetch(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """Run a fetch, recording when it started (for shared-tier puts) and how long it took."""
+        start = time.perf_counter()
+        token = _fetch_started.set(time.time())
+        try:
+            result = await fetch()
+        finally:
+            _fetch_started.reset(token)
+        if key in self._cache:
+            self._recompute_time[key] = time.perf_counter() - start
+        return result
+
+    def refresh_in_background(self, key: str, fetch: Callable[[], Awaitable[Any]]) -> bool:
+        """
+        Refresh a key in the background unless a refresh is already running.
+
+        Args:
+            key: Cache key
+            fetch: Coroutine function that fetches and caches the value
+
+        Returns:
+            True if a new refresh was started
+        """
+        task = self._refresh_tasks.get(key)
+        if task is not None and not task.done():
+            return False
+
+        self._refresh_tasks[key] = asyncio.create_task(self._refresh(key, fetch))
+        return True
+
+    async def _refresh(self, key: str, fetch: Callable[[], Awaitable[Any]]):
+        """Run one background refresh, keeping the stale value on failure."""
+        try:
+            await self._timed_fetch(key, fetch)
+            self._stats["background_refreshes"] += 1
+        except Exception as e:
+            self._stats["refresh_failures"] += 1
+            logger.warning(
+                "Background cache refresh failed, serving stale",
+                key=key[:50],
+                error=str(e),
+            )
+        finally:
+            if self._refresh_tasks.get(key) is asyncio.current_task():
+                del self._refresh_tasks[key]
+
+    @staticmethod
+    def _derived_tags(key: str, value: Any) -> tuple[str, ...]:
+        """Get the tags implied by a key and its value."""
+        tags = key_prefix_tags(key)
+        if key.startswith("collection:"):
+            try:
+                tags += list_page_tags(QueryKey.parse(key), value)
+            except ValueError:
+                pass
+        return tags
+
+    def _index(self, key: str, tags: tuple[str, ...]):
+        """Record the tags a key is indexed under."""
+        self._unindex(key)
+        tags = tuple(dict.fromkeys(tags))
+        if tags:
+            self._key_tags[key] = tags
+            for tag in tags:
+                self._tags[tag].add(key)
+
+    def _unindex(self, key: str):
+        """Remove a key from the tag index."""
+        for tag in self._key_tags.pop(key, ()):
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
 
     def delete(self, key: str) -> bool:
         """
         Delete key from cache.
 
+        With a shared tier, other workers drop the key too.
+
         Args:
             key: Cache key
 
         Returns:
             True if key existed
         """
-        existed = key in self._cache
+        existed = self._delete(key)
+        if self._sharing():
+            self._shared_call(self.shared.delete, key)
+            self._publish("delete", key=key)
+        return existed
 
+    def _delete(self, key: str) -> bool:
+        """Delete a key from this worker's memory and disk tiers."""
+        self._generation += 1
+        if self._restore_guard is not None:
+            self._restore_guard.keys.add(key)
+        existed = self._remove(key)
+        if self._may_be_on_disk(key):
+            existed = existed or key in self.l2
+            self._disk_call(self.l2.delete, key)
         if existed:
-            del self._cache[key]
             self._stats["invalidations"] += 1
+        return existed
 
-        if key in self._expiry:
-            del self._expiry[key]
-        if key in self._access_counts:
-            del self._access_counts[key]
-        if key in self._last_access:
-            del self._last_access[key]
+    def invalidate_tag(self, tag: str) -> int:
+        """
+        Invalidate every key indexed under a tag.
 
-        return existed
+        Args:
+            tag: Tag name (e.g. "collection:projects")
 
-    def invalidate_pattern(self, pattern: str):
+        Returns:
+            Number of keys invalidated
+        """
+        count = self._invalidate_tag(tag)
+        self._publish("tag", tag=tag)
+        return count
+
+    def _invalidate_tag(self, tag: str) -> int:
+        """Invalidate a tag in every tier without publishing it."""
+        if self._restore_guard is not None:
+            self._restore_guard.tags.add(tag)
+        keys = list(self._tags.get(tag, ()))
+        for key in keys:
+            self._delete(key)
+        count = len(keys)
+
+        if self.l2 is not None or self.shared is not None:
+            # Lower tiers may hold keys memory doesn't know about
+            self._generation += 1
+        if self.l2 is not None:
+            # Counted in the disk tier's stats, once it has run
+            self._disk_call(self.l2.invalidate_tag, tag)
+        if self._sharing():
+            self._shared_call(self.shared.invalidate_tag, tag)
+        return count
+
+    def invalidate_pattern(self, pattern: str) -> int:
         """
         Invalidate all keys matching a pattern.
 
+        Prefix patterns such as "collection:projects:*" are answered from
+        the tag index; anything else falls back to a regex scan.
+
         Args:
             pattern: Regex pattern or glob-style pattern
                     (e.g., "collection:projects:*")
+
+        Returns:
+            Number of keys invalidated
         """
+        prefix = _PREFIX_PATTERN.match(pattern)
+        if prefix:
+            count = self._invalidate_tag(prefix.group(1))
+            self._publish("pattern", pattern=pattern)
+            logger.debug(
+                f"Invalidated {count} keys by tag",
+                pattern=pattern,
+            )
+            return count
+
         # Convert glob pattern to regex
         if "*" in pattern:
             regex_pattern = pattern.replace("*", ".*")
@@ -149,51 +1243,105 @@ class SmartCache:
             regex_pattern = pattern
 
         compiled = re.compile(regex_pattern)
+        if self._restore_guard is not None:
+            self._restore_guard.patterns.append(compiled)
 
         # Find and delete matching keys
         keys_to_delete = [
-            key for key in self._cache.keys()
+            key for key in self._cache
             if compiled.match(key)
         ]
 
         for key in keys_to_delete:
-            self.delete(key)
+            self._delete(key)
+
+        if self.l2 is not None:
+            self._generation += 1
+            self._disk_call(self.l2.invalidate_pattern, regex_pattern)
+        if self.shared is not None:
+            self._generation += 1
+        if self._sharing():
+            self._shared_call(self.shared.invalidate_pattern, regex_pattern)
+        self._publish("pattern", pattern=pattern)
 
         logger.debug(
             f"Invalidated {len(keys_to_delete)} keys matching pattern",
             pattern=pattern,
         )
+        return len(keys_to_delete)
 
-    def invalidate_smart(self, operation: str, collection: str):
+    def invalidate_smart(
+        self,
+        operation: str,
+        collection: str,
+        doc_id: Optional[str] = None,
+        changes: Optional[Iterable[str]] = None,
+    ):
         """
         Smart invalidation based on operation type.
 
         Different operations require different invalidation strategies.
+        An update that names the document and the fields it changed only
+        drops list pages that contain the document or filter/sort on one
+        of those fields; other pages of the collection stay cached.
+        With a shared tier, other workers apply the same invalidation.
 
         Args:
             operation: Operation that triggered invalidation
             collection: Collection that was modified
+            doc_id: Updated document (None = unknown)
+            changes: Fields the update wrote (None = unknown)
         """
+        changes = list(changes) if changes is not None else None
+        self._invalidate_smart(operation, collection, doc_id, changes)
+        self._publish(
+            "smart",
+            operation=operation,
+            collection=collection,
+            doc_id=doc_id,
+            changes=changes,
+        )
+
+    def _invalidate_smart(
+        self,
+        operation: str,
+        collection: str,
+        doc_id: Optional[str],
+        changes: Optional[list[str]],
+    ):
+        """Apply a smart invalidation in every tier without publishing it."""
         if operation in ["create", "delete", "batch_create", "batch_delete"]:
             # These operations affect collection listings
-            pattern = f"collection:{collection}:*"
-            self.invalidate_pattern(pattern)
+            self._invalidate_tag(f"collection:{collection}")
             logger.debug(
                 f"Invalidated collection listings",
                 operation=operation,
                 collection=collection,
             )
 
-        elif operation in ["update", "batch_update"]:
-            # Update affects specific documents and listings
-            # Invalidate all cached collection queries
-            pattern = f"collection:{collection}:*"
-            self.invalidate_pattern(pattern)
+        elif operation in ["update", "batch_update", "publish"]:
+            if doc_id is None or changes is None:
+                # Update affects specific documents and listings
+                # Invalidate all cached collection queries
+                self._invalidate_tag(f"collection:{collection}")
+                return
+
+            # Publishing changes _status; every write bumps updatedAt
+            fields = {str(field).split(".")[0] for field in changes}
+            fields.add("updatedAt")
+            if operation == "publish":
+                fields.add("_status")
+
+            tags = {document_tag(collection, doc_id), opaque_tag(collection)}
+            tags.update(field_tag(collection, field) for field in fields)
+            count = sum(self._invalidate_tag(tag) for tag in tags)
 
-        elif operation == "publish":
-            # Publishing affects status filters
-            pattern = f"collection:{collection}:*"
-            self.invalidate_pattern(pattern)
+            logger.debug(
+                f"Invalidated {count} list pages for document update",
+                collection=collection,
+                doc_id=doc_id,
+                fields=sorted(fields),
+            )
 
     async def warm_frequently_accessed(
         self,
@@ -203,18 +1351,24 @@ class SmartCache:
         """
         Proactively warm cache for frequently accessed resources.
 
+        Candidates are the keys tracked as most requested, including hot
+        keys that were evicted or invalidated.
+
         Args:
             client: CMSClient instance to fetch data
-            threshold: Access count threshold for warming
+            threshold: Decayed request count threshold for warming
         """
+        if self._hot_keys is None:
+            return
+
         async with self._lock:
-            for key, count in self._access_counts.items():
+            for key, count in self._hot_keys.top(self._hot_keys.capacity):
                 if count < threshold:
-                    continue
+                    break
 
                 # Skip if already cached and not expired
                 if key in self._cache:
-                    if key not in self._expiry or datetime.now() < self._expiry[key]:
+                    if key not in self._expiry or time.monotonic() < self._expiry[key]:
                         continue
 
                 # Skip if already warming
@@ -224,7 +1378,7 @@ class SmartCache:
                         continue
 
                 # Start warming this key
-                logger.debug(f"Warming cache for hot key", key=key[:50], access_count=count)
+                logger.debug(f"Warming cache for hot key", key=key[:50], access_count=round(count))
                 task = asyncio.create_task(self._warm_key(key, client))
                 self._warming_tasks[key] = task
                 self._stats["warming_operations"] += 1
@@ -233,42 +1387,42 @@ class SmartCache:
         """
         Warm a specific cache key.
 
+        The key is parsed back into the exact query that produced it, so
+        a filtered or paginated list is refetched with the same params.
+
         Args:
             key: Cache key to warm
             client: CMSClient instance
         """
         try:
-            # Parse key to extract operation and params
-            # Key format: "operation:param1:param2:..."
-            parts = key.split(":")
+            query = QueryKey.parse(key)
 
-            if parts[0] == "collection":
-                # collection:projects:filters_hash
-                collection = parts[1]
+            if query.kind == "collection":
+                params = query.to_params()
+                limit = int(params.pop("limit", 100))
+                page = int(params.pop("page", 1))
                 result = await client.get_collection(
-                    collection=collection,
+                    collection=query.name,
+                    filters=params,
+                    limit=limit,
+                    page=page,
                     use_cache=False,
                 )
                 self.set(key, result)
                 logger.debug(f"Warmed collection cache", key=key[:50])
 
-            elif parts[0] == "doc":
-                # doc:projects:doc_id
-                collection = parts[1]
-                doc_id = parts[2]
+            elif query.kind == "doc":
                 result = await client.get_document(
-                    collection=collection,
-                    doc_id=doc_id,
+                    collection=query.name,
+                    doc_id=query.doc_id,
                     use_cache=False,
                 )
                 self.set(key, result)
                 logger.debug(f"Warmed document cache", key=key[:50])
 
-            elif parts[0] == "global":
-                # global:slug
-                global_slug = parts[1]
+            elif query.kind == "global":
                 result = await client.get_global(
-                    global_slug=global_slug,
+                    global_slug=query.name,
                     use_cache=False,
                 )
                 self.set(key, result)
@@ -284,20 +1438,20 @@ class SmartCache:
 
     def get_hot_keys(self, limit: int = 10) -> list[tuple[str, int]]:
         """
-        Get most frequently accessed keys.
+        Get most frequently requested keys.
+
+        Counts are decayed by ``hot_key_half_life``, so keys that were
+        only popular in the past drop out.
 
         Args:
             limit: Number of keys to return
 
         Returns:
-            List of (key, access_count) tuples
+            List of (key, request_count) tuples (empty if not tracked)
         """
-        sorted_keys = sorted(
-            self._access_counts.items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
-        return sorted_keys[:limit]
+        if self._hot_keys is None:
+            return []
+        return [(key, round(count)) for key, count in self._hot_keys.top(limit)]
 
     def get_stats(self) -> dict:
         """
@@ -313,38 +1467,259 @@ class SmartCache:
             else 0
         )
 
+        tiers = {
+            "memory": {
+                "hits": self._stats["hits"],
+                "misses": self._stats["misses"],
+                "size": len(self._cache),
+                "bytes": self._policy.total_weight,
+            },
+        }
+        if self.l2 is not None:
+            tiers["disk"] = self.l2.get_stats()
+        if self.shared is not None:
+            tiers["shared"] = self.shared.get_stats()
+
         return {
             "size": len(self._cache),
+            "bytes": self._policy.total_weight,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
             "hits": self._stats["hits"],
             "misses": self._stats["misses"],
             "hit_rate": round(hit_rate, 2),
             "sets": self._stats["sets"],
             "invalidations": self._stats["invalidations"],
+            "tags": len(self._tags),
+            "evictions": self._stats["evictions"],
+            "admission_rejections": self._stats["admission_rejections"],
+            "oversize_rejections": self._stats["oversize_rejections"],
+            "stale_writes_ignored": self._stats["stale_writes_ignored"],
+            "stale_hits": self._stats["stale_hits"],
+            "revalidations": self._stats["revalidations"],
+            "negative_hits": self._stats["negative_hits"],
+            "negative_sets": self._stats["negative_sets"],
+            "expired_reclaimed": self._stats["expired_reclaimed"],
+            "expirations": self._stats["expirations"],
+            "early_refreshes": self._stats["early_refreshes"],
+            "background_refreshes": self._stats["background_refreshes"],
+            "refresh_failures": self._stats["refresh_failures"],
             "warming_operations": self._stats["warming_operations"],
+            "remote_invalidations": self._stats["remote_invalidations"],
+            "hot_keys_tracked": len(self._hot_keys) if self._hot_keys is not None else 0,
+            "codec": self.codec,
             "in_flight_warming": len([
                 t for t in self._warming_tasks.values()
                 if not t.done()
             ]),
+            "in_flight_refreshes": len([
+                t for t in self._refresh_tasks.values()
+                if not t.done()
+            ]),
+            "tiers": tiers,
         }
 
+    def export_entries(self) -> Iterator[tuple]:
+        """
+        Iterate over live entries for a snapshot, hottest first.
+
+        Yields:
+            (key, value, expires_at, stale_until, access_count,
+            recompute_time) tuples, with expiry as Unix time and the
+            value as stored (EncodedJSON with a codec; not decoded)
+        """
+        now = time.monotonic()
+        keys = sorted(self._cache, key=lambda k: self._access_counts.get(k, 0), reverse=True)
+        for key in keys:
+            expires_at = self._expiry.get(key)
+            stale_until = self._stale_until.get(key)
+            deadline = stale_until or expires_at
+            if deadline is not None and deadline <= now:
+                continue
+            yield (
+                key,
+                self._cache[key],
+                _to_unix(expires_at),
+                _to_unix(stale_until),
+                self._access_counts.get(key, 0),
+                self._recompute_time.get(key),
+            )
+
+    def begin_restore(self):
+        """
+        Start a snapshot load.
+
+        Until end_restore(), every key written and every key, tag and
+        pattern invalidated is remembered, and restore_entry() skips
+        entries they cover: the snapshot copy is older than the change.
+        """
+        self._restore_guard = _RestoreGuard()
+
+    def end_restore(self):
+        """Finish a snapshot load and stop remembering changes."""
+        self._restore_guard = None
+
+    def restore_entry(
+        self,
+        key: str,
+        value: Any,
+        expires_at: Optional[float],
+        stale_until: Optional[float] = None,
+        access_count: int = 0,
+        recompute_time: Optional[float] = None,
+        encoded: Optional[EncodedJSON] = None,
+    ) -> bool:
+        """
+        Restore an entry from a snapshot with its original expiry.
+
+        Args:
+            key: Cache key
+            value: Cached value
+            expires_at: Soft expiry as Unix time (None = never)
+            stale_until: Hard expiry as Unix time (None = no stale window)
+            access_count: Access count to restore for hot-key tracking
+            recompute_time: Measured fetch time for early refresh
+            encoded: ``value`` already encoded with this cache's codec
+
+        Returns:
+            True if restored; False if expired, already cached, written or
+            invalidated since the load began (see begin_restore), or not
+            admitted
+        """
+        if key in self._cache:
+            return False
+        guard = self._restore_guard
+        if guard is not None and guard.covers(key, self._derived_tags(key, value)):
+            return False
+
+        deadline = stale_until or expires_at
+        if deadline is not None and deadline <= time.time():
+            return False
+
+        self._store(
+            key, value, _from_unix(expires_at), _from_unix(stale_until), encoded=encoded
+        )
+        if key not in self._cache:
+            return False
+
+        if access_count:
+            self._access_counts[key] = access_count
+            if self._hot_keys is not None:
+                self._hot_keys.record(key, access_count)
+        if recompute_time:
+            self._recompute_time[key] = recompute_time
+        return True
+
     def reset_stats(self):
         """Reset statistics counters."""
-        self._stats = {
-            "hits": 0,
-            "misses": 0,
-            "sets": 0,
-            "invalidations": 0,
-            "warming_operations": 0,
-        }
+        self._stats = self._empty_stats()
 
     def clear(self):
-        """Clear entire cache."""
+        """Clear entire cache, including the disk and shared tiers."""
+        self._generation += 1
+        if self._restore_guard is not None:
+            self._restore_guard.cleared = True
+        if self.l2 is not None:
+            self._disk_call(self.l2.clear)
+        if self._sharing():
+            self._shared_call(self.shared.clear)
+            self._publish("clear")
         self._cache.clear()
+        self._policy.clear()
         self._expiry.clear()
+        self._stale_until.clear()
+        self._deadlines.clear()
+        self._recompute_time.clear()
+        self._validators.clear()
         self._access_counts.clear()
         self._last_access.clear()
+        if self._hot_keys is not None:
+            self._hot_keys.clear()
+        self._tags.clear()
+        self._key_tags.clear()
         logger.info("Cache cleared")
 
+    async def close(self):
+        """Cancel background tasks and close the disk and shared tiers."""
+        tasks = [
+            task for task in (*self._refresh_tasks.values(), *self._warming_tasks.values())
+            if not task.done()
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._refresh_tasks.clear()
+        self._warming_tasks.clear()
+        if self.l2 is not None:
+            await asyncio.to_thread(self._disk_executor.shutdown)
+            self.l2.close()
+        if self.shared is not None:
+            # Let queued writes and invalidations reach other workers first
+            await asyncio.to_thread(self._shared_executor.shutdown)
+            self.shared.close()
+
+
+async def cache_sweeper_task(cache: SmartCache, interval: float = 1.0, batch_size: int = 500):
+    """
+    Background task to reclaim expired entries nobody reads again.
+
+    Each cycle sweeps in slices of ``batch_size`` entries and yields to
+    the event loop between slices, so a burst of expiries never stalls
+    request handling.
+
+    Args:
+        cache: SmartCache instance
+        interval: Seconds between sweeps
+        batch_size: Entries dropped per slice
+    """
+    logger.info(f"Starting cache sweeper task (interval: {interval}s)")
+
+    while True:
+        try:
+            await asyncio.sleep(interval)
+            total = 0
+            while True:
+                removed = cache.sweep(batch_size)
+                total += removed
+                if removed < batch_size:
+                    break
+                await asyncio.sleep(0)
+            if total:
+                logger.debug("Reclaimed expired cache entries", count=total)
+
+        except asyncio.CancelledError:
+            logger.info("Cache sweeper task cancelled")
+            break
+
+        except Exception as e:
+            logger.error("Error in cache sweeper task", error=str(e))
+
+
+async def cache_invalidation_listener(cache: SmartCache, poll_timeout: float = 1.0):
+    """
+    Background task applying invalidations published by other workers.
+
+    Args:
+        cache: SmartCache instance with a shared tier
+        poll_timeout: Seconds each poll of the channel waits
+    """
+    logger.info("Starting cache invalidation listener", worker_id=cache.worker_id)
+
+    while True:
+        try:
+            messages = await asyncio.to_thread(cache.shared.poll, poll_timeout)
+            applied = sum(cache.apply_invalidation(message) for message in messages)
+            if applied:
+                logger.debug("Applied remote cache invalidations", count=applied)
+
+        except asyncio.CancelledError:
+            logger.info("Cache invalidation listener cancelled")
+            break
+
+        except Exception as e:
+            logger.error("Error in cache invalidation listener", error=str(e))
+            await asyncio.sleep(poll_timeout)
+
 
 async def cache_warming_task(cache: SmartCache, client: Any, interval: int = 300):
     """
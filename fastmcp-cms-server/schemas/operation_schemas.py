@@ -91,6 +91,18 @@ class HealthCheckOutput(TypedDict):
 # JSON Schema Definitions (MCP 2025 Standard)
 # ============================================================================
 
+# Present on read results served from cache past their TTL
+CACHE_META_SCHEMA = {
+    "type": "object",
+    "description": "Cache metadata for the response",
+    "properties": {
+        "stale": {
+            "type": "boolean",
+            "description": "True if served from an expired cache entry while it is refreshed"
+        }
+    }
+}
+
 OPERATION_SCHEMAS = {
     # Collection Operations
     "create": {
@@ -118,7 +130,8 @@ OPERATION_SCHEMAS = {
             "data": {
                 "type": "object",
                 "description": "Full document data"
-            }
+            },
+            "meta": CACHE_META_SCHEMA
         },
         "required": ["success", "documentId", "message"]
     },
@@ -198,7 +211,8 @@ OPERATION_SCHEMAS = {
             "limit": {
                 "type": "integer",
                 "description": "Documents per page"
-            }
+            },
+            "meta": CACHE_META_SCHEMA
         },
         "required": ["success", "documents", "totalDocs"]
     },
@@ -288,11 +302,24 @@ OPERATION_SCHEMAS = {
                     "properties": {
                         "index": {"type": "integer"},
                         "item": {"type": "object"},
-                        "error": {"type": "string"}
+                        "error": {"type": "string"},
+                        "attempts": {"type": "integer"}
                     }
                 },
                 "description": "Array of errors"
-            }
+            },
+            "timing": {
+                "type": "object",
+                "properties": {
+                    "totalMs": {"type": "number"},
+                    "itemMs": {"type": "array", "items": {"type": "number"}},
+                    "attempts": {"type": "array", "items": {"type": "integer"}}
+                },
+                "description": "Batch duration, and per-item durations and attempt counts in input order"
+            },
+            "chunked": {"type": "boolean", "description": "Run in chunks (results omitted)"},
+            "chunks": {"type": "integer", "description": "Chunks run (chunked mode)"},
+            "errorsTruncated": {"type": "boolean", "description": "More errors than listed (chunked mode)"}
         },
         "required": ["success", "totalRequested", "successful", "failed"]
     },
@@ -307,7 +334,11 @@ OPERATION_SCHEMAS = {
             "successful": {"type": "integer"},
             "failed": {"type": "integer"},
             "results": {"type": "array"},
-            "errors": {"type": "array"}
+            "errors": {"type": "array"},
+            "timing": {"type": "object"},
+            "chunked": {"type": "boolean"},
+            "chunks": {"type": "integer"},
+            "errorsTruncated": {"type": "boolean"}
         },
         "required": ["success", "totalRequested", "successful", "failed"]
     },
@@ -322,7 +353,11 @@ OPERATION_SCHEMAS = {
             "successful": {"type": "integer"},
             "failed": {"type": "integer"},
             "results": {"type": "array"},
-            "errors": {"type": "array"}
+            "errors": {"type": "array"},
+            "timing": {"type": "object"},
+            "chunked": {"type": "boolean"},
+            "chunks": {"type": "integer"},
+            "errorsTruncated": {"type": "boolean"}
         },
         "required": ["success", "totalRequested", "successful", "failed"]
     },
@@ -339,7 +374,8 @@ OPERATION_SCHEMAS = {
                 "items": {"type": "object"}
             },
             "totalResults": {"type": "integer"},
-            "query": {"type": "string"}
+            "query": {"type": "string"},
+            "meta": CACHE_META_SCHEMA
         },
         "required": ["success", "results", "totalResults"]
     },
@@ -375,7 +411,8 @@ OPERATION_SCHEMAS = {
         "description": "Global singleton data",
         "properties": {
             "success": {"type": "boolean"},
-            "data": {"type": "object"}
+            "data": {"type": "object"},
+            "meta": CACHE_META_SCHEMA
         },
         "required": ["success", "data"]
     },
@@ -539,7 +576,8 @@ OPERATION_SCHEMAS = {
             "message": {"type": "string"},
             "error": {"type": "string"},
             "mediaId": {"type": ["string", "null"]},
-            "data": {"type": ["object", "null"]}
+            "data": {"type": ["object", "null"]},
+            "meta": CACHE_META_SCHEMA
         },
         "required": ["success", "operation"]
     },
@@ -560,7 +598,8 @@ OPERATION_SCHEMAS = {
             "totalDocs": {"type": "integer"},
             "page": {"type": "integer"},
             "totalPages": {"type": "integer"},
-            "limit": {"type": "integer"}
+            "limit": {"type": "integer"},
+            "meta": CACHE_META_SCHEMA
         },
         "required": ["success", "operation"]
     },
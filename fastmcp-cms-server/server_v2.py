@@ -11,10 +11,17 @@ This version implements the improved functional density architecture with:
 """
 
 import time
-from fastmcp import FastMCP
+from contextlib import asynccontextmanager
+from fastmcp import Context, FastMCP
 from typing import Optional, Any
 from config import Config
 from utils.logging import setup_logging, get_logger
+from services.cms_client_enhanced import get_cms_client, close_cms_client
+from core.connection_pool import close_global_pool
+from services.invalidation import handle_change_event
+from core.encoded_json import dumps_result
+from starlette.requests import Request
+from starlette.responses import Response
 
 # Import consolidated tool handlers
 from tools.consolidated.collections import cms_collection_ops_handler
@@ -29,8 +36,44 @@ from schemas.operation_schemas import OPERATION_SCHEMAS
 setup_logging()
 logger = get_logger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    """
+    Manage the process-wide CMS client for the server lifetime.
+
+    The shared client is created at startup and injected into every tool
+    handler, so caching, deduplication and circuit breaker state survive
+    across tool calls. It is closed together with the connection pool on
+    shutdown.
+    """
+    client = await get_cms_client()
+    try:
+        await client.start()
+    except Exception as e:
+        # Authentication is retried lazily on the first request
+        logger.warning("CMS client startup authentication failed", error=str(e))
+
+    try:
+        yield
+    finally:
+        await close_cms_client()
+        await close_global_pool()
+
+
 # Initialize FastMCP server
-mcp = FastMCP(Config.MCP_SERVER_NAME)
+mcp = FastMCP(Config.MCP_SERVER_NAME, lifespan=lifespan)
+
+
+def _progress_reporter(ctx: Optional[Context]):
+    """Report items done to the client, if it asked for progress."""
+    if ctx is None:
+        return None
+
+    async def report(done: int):
+        await ctx.report_progress(progress=done)
+
+    return report
 
 
 # ============================================================================
@@ -54,6 +97,8 @@ async def cms_collection_ops(
     page: int = 1,
     query: Optional[str] = None,
     fields: Optional[str] = None,
+    chunked: bool = False,
+    ctx: Optional[Context] = None,
 ) -> str:
     """
     Unified tool for all collection operations.
@@ -81,7 +126,8 @@ async def cms_collection_ops(
         doc_id: Document ID (for update, get, delete, publish, archive, restore)
         data: Document data as JSON string (for create, update)
         items: List of items as JSON string (for batch_create, batch_update)
-        doc_ids: List of document IDs as JSON string (for batch_delete)
+        doc_ids: List of document IDs as JSON string (for batch_delete, or
+                 instead of doc_id to publish, archive or restore in bulk)
         filters: Query filters as JSON string (for list)
         draft: Create as draft (for create, batch_create)
         confirm: Confirmation flag (for delete, batch_delete)
@@ -91,6 +137,9 @@ async def cms_collection_ops(
         page: Page number (for list)
         query: Search query (for search)
         fields: Fields to search in as JSON string (for search)
+        chunked: Run a batch_* operation of any size in chunks, reporting
+                 progress as chunks finish (no 100-item limit; the result
+                 has counts and errors but not the documents)
 
     Returns:
         Operation result as JSON string with success status, data, and message
@@ -128,6 +177,14 @@ async def cms_collection_ops(
             parallel=True
         )
 
+        # Content migration of thousands of items in one call
+        cms_collection_ops(
+            operation="batch_create",
+            collection="portfolio",
+            items='[{"id": "item-1", ...}, ...]',
+            chunked=True
+        )
+
         # Search
         cms_collection_ops(
             operation="search",
@@ -147,8 +204,9 @@ async def cms_collection_ops(
     
     # Parse JSON string parameters
     parsed_data = json.loads(data) if data and isinstance(data, str) else data
-    parsed_items = json.loads(items) if items and isinstance(items, str) else items
-    parsed_doc_ids = json.loads(doc_ids) if doc_ids and isinstance(doc_ids, str) else doc_ids
+    # Chunked batches parse their items as they run them
+    parsed_items = json.loads(items) if items and isinstance(items, str) and not chunked else items
+    parsed_doc_ids = json.loads(doc_ids) if doc_ids and isinstance(doc_ids, str) and not chunked else doc_ids
     parsed_filters = json.loads(filters) if filters and isinstance(filters, str) else filters
     parsed_fields = json.loads(fields) if fields and isinstance(fields, str) else fields
     
@@ -168,10 +226,14 @@ async def cms_collection_ops(
         page=page,
         query=query,
         fields=parsed_fields,
+        chunked=chunked,
+        progress=_progress_reporter(ctx) if chunked else None,
+        passthrough=True,
     )
     
-    # Return result as JSON string for Letta compatibility
-    return json.dumps(result)
+    # Return result as JSON string for Letta compatibility (CMS bodies
+    # are spliced in as received rather than parsed and re-serialized)
+    return dumps_result(result)
 
 
 # ============================================================================
@@ -230,10 +292,11 @@ async def cms_global_ops(
         operation=operation,
         global_slug=global_slug,
         data=parsed_data,
+        passthrough=True,
     )
     
     # Return result as JSON string for Letta compatibility
-    return json.dumps(result)
+    return dumps_result(result)
 
 
 # ============================================================================
@@ -442,6 +505,22 @@ async def about_page_resource() -> str:
     return await get_about_page_resource()
 
 
+# ============================================================================
+# CACHE INVALIDATION WEBHOOK
+# ============================================================================
+
+@mcp.custom_route(Config.CACHE_INVALIDATION_PATH, methods=["POST"])
+async def payload_change_hook(request: Request) -> Response:
+    """
+    Receive change events from the Payload cache invalidation hook.
+
+    Editor changes made in the Payload admin evict exactly the affected
+    cache entries instead of waiting for their TTL. Requests must be
+    signed with CACHE_INVALIDATION_SECRET.
+    """
+    return await handle_change_event(request)
+
+
 # ============================================================================
 # MAIN ENTRY POINT
 # ============================================================================
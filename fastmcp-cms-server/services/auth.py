@@ -1,19 +1,61 @@
 """Authentication service for Payload CMS."""
 
+import asyncio
+import base64
+import json
 import time
 from typing import Optional
 import httpx
 from config import Config
+from core.connection_pool import ConnectionPool, get_global_pool
 from utils.logging import get_logger
 from utils.errors import AuthenticationError, CMSConnectionError
 
 logger = get_logger(__name__)
 
 
+def decode_token_expiry(token: str) -> Optional[float]:
+    """
+    Read the ``exp`` claim from a JWT without verifying it.
+
+    The signature is the CMS's business; we only need to know when the
+    token stops being accepted so it can be refreshed ahead of time.
+
+    Args:
+        token: Encoded JWT
+
+    Returns:
+        Expiry as a Unix timestamp, or None if the token has no usable claim
+    """
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        exp = claims.get("exp")
+        return float(exp) if exp is not None else None
+    except (IndexError, ValueError, TypeError, AttributeError):
+        return None
+
+
 class AuthService:
-    """Handle authentication with Payload CMS."""
+    """
+    Handle authentication with Payload CMS.
 
-    def __init__(self, email: str, password: str, base_url: str):
+    Features:
+    - Token expiry taken from the JWT ``exp`` claim
+    - Single-flight login (concurrent refreshes share one request)
+    - Background refresh ahead of expiry, off the request path
+    - Logins go through the shared connection pool
+    """
+
+    def __init__(
+        self,
+        email: str,
+        password: str,
+        base_url: str,
+        connection_pool: Optional[ConnectionPool] = None,
+        refresh_margin: int = Config.TOKEN_REFRESH_MARGIN,
+    ):
         """
         Initialize authentication service.
 
@@ -21,14 +63,31 @@ class AuthService:
             email: Admin email
             password: Admin password
             base_url: CMS API base URL
+            connection_pool: Pool for login requests (None = global pool)
+            refresh_margin: Seconds before expiry to refresh the token
         """
         self.email = email
         self.password = password
         self.base_url = base_url
+        self.connection_pool = connection_pool
+        self.refresh_margin = refresh_margin
         self._token: Optional[str] = None
+        self._token_issued_at: Optional[float] = None
         self._token_expires_at: Optional[float] = None
         self._user_info: Optional[dict] = None
 
+        self._lock = asyncio.Lock()
+        self._generation = 0
+        self._pending_refresh: Optional[asyncio.Task] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+
+        # Statistics
+        self._stats = {
+            "logins": 0,
+            "background_refreshes": 0,
+            "refresh_failures": 0,
+        }
+
     @property
     def is_authenticated(self) -> bool:
         """Check if currently authenticated with valid token."""
@@ -50,6 +109,10 @@ class AuthService:
         """
         Authenticate with CMS and get JWT token.
 
+        Only one login runs at a time. Callers that were waiting while
+        another caller logged in reuse the fresh token instead of logging
+        in again, even when they asked for a forced refresh.
+
         Args:
             force: Force re-authentication even if token is valid
 
@@ -64,72 +127,220 @@ class AuthService:
             logger.debug("Using cached authentication token")
             return self._token
 
-        logger.info("Authenticating with CMS", email=self.email)
-
-        try:
-            async with httpx.AsyncClient(timeout=Config.REQUEST_TIMEOUT) as client:
-                response = await client.post(
-                    f"{self.base_url}/users/login",
-                    json={"email": self.email, "password": self.password},
-                )
-
-                if response.status_code == 401:
-                    logger.error("Authentication failed - invalid credentials")
-                    raise AuthenticationError("Invalid email or password")
-
-                if response.status_code != 200:
-                    logger.error(
-                        "Authentication failed",
-                        status_code=response.status_code,
-                        response=response.text,
-                    )
-                    raise AuthenticationError(
-                        f"Authentication failed with status {response.status_code}"
-                    )
-
-                data = response.json()
-                self._token = data.get("token")
-                self._user_info = data.get("user")
-
-                if not self._token:
-                    raise AuthenticationError("No token received from CMS")
-
-                # Set token expiration (default to cache TTL from config)
-                self._token_expires_at = time.time() + Config.TOKEN_CACHE_TTL
-
-                logger.info(
-                    "Authentication successful",
-                    user_id=self._user_info.get("id") if self._user_info else None,
-                    expires_in=Config.TOKEN_CACHE_TTL,
-                )
+        generation = self._generation
 
+        async with self._lock:
+            if self.is_authenticated and (
+                not force or self._generation != generation
+            ):
                 return self._token
 
+            return await self._login()
+
+    async def _login(self) -> str:
+        """
+        POST credentials to the CMS and store the returned token.
+
+        Must be called with ``self._lock`` held.
+
+        Returns:
+            JWT token
+        """
+        logger.info("Authenticating with CMS", email=self.email)
+
+        pool = self.connection_pool or await get_global_pool()
+
+        try:
+            response = await pool.request(
+                "POST",
+                f"{self.base_url}/users/login",
+                json={"email": self.email, "password": self.password},
+            )
         except httpx.RequestError as e:
             logger.error("Connection error during authentication", error=str(e))
             raise CMSConnectionError(f"Failed to connect to CMS: {e}")
 
+        if response.status_code == 401:
+            logger.error("Authentication failed - invalid credentials")
+            raise AuthenticationError("Invalid email or password")
+
+        if response.status_code != 200:
+            logger.error(
+                "Authentication failed",
+                status_code=response.status_code,
+                response=response.text,
+            )
+            raise AuthenticationError(
+                f"Authentication failed with status {response.status_code}"
+            )
+
+        data = response.json()
+        token = data.get("token")
+
+        if not token:
+            raise AuthenticationError("No token received from CMS")
+
+        # Prefer the token's own expiry; fall back to the login response,
+        # then to the configured TTL for opaque tokens
+        now = time.time()
+        expires_at = decode_token_expiry(token) or data.get("exp")
+        if not expires_at:
+            expires_at = now + Config.TOKEN_CACHE_TTL
+
+        self._token = token
+        self._user_info = data.get("user")
+        self._token_issued_at = now
+        self._token_expires_at = float(expires_at)
+        self._generation += 1
+        self._stats["logins"] += 1
+
+        logger.info(
+            "Authentication successful",
+            user_id=self._user_info.get("id") if self._user_info else None,
+            expires_in=round(self._token_expires_at - now),
+        )
+
+        return token
+
+    def refresh_at(self) -> float:
+        """
+        Get the time at which the current token should be refreshed.
+
+        Returns:
+            Unix timestamp (now if there is no token)
+        """
+        if not self._token_expires_at or not self._token_issued_at:
+            return time.time()
+
+        # Short-lived tokens refresh halfway through their lifetime
+        lifetime = self._token_expires_at - self._token_issued_at
+        margin = min(self.refresh_margin, lifetime / 2)
+        return self._token_expires_at - margin
+
     async def refresh_if_needed(self) -> str:
         """
-        Refresh token if it's close to expiration.
+        Get a valid token, refreshing ahead of expiry without blocking.
+
+        Only blocks when there is no usable token at all. A token that is
+        still valid but inside the refresh margin is returned immediately
+        while a refresh runs in the background.
 
         Returns:
             JWT token (current or refreshed)
         """
-        if not self._token_expires_at:
+        if not self.is_authenticated:
             return await self.authenticate()
 
-        # Refresh if less than 2 minutes remaining
-        time_remaining = self._token_expires_at - time.time()
-        if time_remaining < 120:
-            logger.info("Token expiring soon, refreshing", time_remaining=time_remaining)
-            return await self.authenticate(force=True)
+        if time.time() >= self.refresh_at():
+            self._schedule_refresh()
 
         return self._token
 
+    async def refresh(self) -> bool:
+        """
+        Refresh the token ahead of expiry, joining a refresh already running.
+
+        Both the background task and requests that find the token inside
+        the refresh margin go through here, so they never log in twice.
+
+        Returns:
+            True if the token was refreshed (failures are logged, not raised)
+        """
+        return await asyncio.shield(self._schedule_refresh())
+
+    def _schedule_refresh(self) -> asyncio.Task:
+        """Start a background refresh unless one is already running."""
+        if self._pending_refresh is None or self._pending_refresh.done():
+            self._pending_refresh = asyncio.create_task(self._background_refresh())
+        return self._pending_refresh
+
+    async def _background_refresh(self) -> bool:
+        """Refresh the token, logging instead of raising on failure."""
+        logger.info(
+            "Refreshing token ahead of expiry",
+            time_remaining=(
+                round(self._token_expires_at - time.time())
+                if self._token_expires_at else None
+            ),
+        )
+        try:
+            await self.authenticate(force=True)
+        except Exception as e:
+            self._stats["refresh_failures"] += 1
+            logger.error("Background token refresh failed", error=str(e))
+            return False
+        self._stats["background_refreshes"] += 1
+        return True
+
+    def start_background_refresh(self, retry_interval: float = 10.0):
+        """
+        Keep the token fresh with a background task.
+
+        Args:
+            retry_interval: Seconds to wait after a failed refresh
+        """
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+
+        self._refresh_task = asyncio.create_task(token_refresh_task(self, retry_interval))
+
+    async def stop_background_refresh(self):
+        """Cancel background refresh tasks."""
+        for task in (self._refresh_task, self._pending_refresh):
+            if task is not None and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+        self._refresh_task = None
+        self._pending_refresh = None
+
+    def get_stats(self) -> dict:
+        """
+        Get authentication statistics.
+
+        Returns:
+            Statistics dictionary
+        """
+        return {
+            "authenticated": self.is_authenticated,
+            "expires_in": (
+                round(self._token_expires_at - time.time())
+                if self._token_expires_at else None
+            ),
+            "background_refresh_active": (
+                self._refresh_task is not None and not self._refresh_task.done()
+            ),
+            **self._stats,
+        }
+
     def invalidate(self) -> None:
         """Invalidate current authentication token."""
         logger.info("Invalidating authentication token")
         self._token = None
+        self._token_issued_at = None
         self._token_expires_at = None
         self._user_info = None
+
+
+async def token_refresh_task(auth: AuthService, retry_interval: float = 10.0):
+    """
+    Background task that refreshes the token before it expires.
+
+    Args:
+        auth: AuthService instance
+        retry_interval: Seconds to wait after a failed refresh
+    """
+    logger.info("Starting token refresh task")
+
+    while True:
+        try:
+            await asyncio.sleep(max(0.0, auth.refresh_at() - time.time()))
+            if not await auth.refresh():
+                await asyncio.sleep(retry_interval)
+
+        except asyncio.CancelledError:
+            logger.info("Token refresh task cancelled")
+            break
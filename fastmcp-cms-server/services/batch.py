@@ -1,8 +1,14 @@
 """Batch operations for efficient multi-document processing."""
 
 import asyncio
-from typing import Any
+import time
+from collections import deque
+from itertools import islice
+from typing import Any, Awaitable, Callable, Iterable, Optional
+from core.batch_executor import BatchExecutor, ItemResult, get_batch_executor
+from core.retry import RetryConfig
 from services.cms_client import CMSClient
+from utils.errors import BulkWriteRejectedError, CMSError, ResourceNotFoundError, ValidationError
 from utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -14,6 +20,9 @@ async def batch_create_documents(
     draft: bool = True,
     parallel: bool = True,
     client: CMSClient = None,
+    executor: Optional[BatchExecutor] = None,
+    retry: Optional[RetryConfig] = None,
+    deadline: Optional[float] = None,
 ) -> dict:
     """
     Create multiple documents in a single operation.
@@ -22,12 +31,20 @@ async def batch_create_documents(
         collection: Target collection
         items: List of documents to create
         draft: Create as drafts
-        parallel: Execute requests in parallel
+        parallel: Execute requests in parallel (bounded by the executor)
         client: Optional CMSClient instance (creates new if None)
+        executor: Executor for parallel runs (None = process-wide one)
+        retry: Per-item retry policy (None = one attempt per item)
+        deadline: Seconds after which unfinished items are reported as
+                  timed out (None = no limit)
 
     Returns:
         Batch operation result with success/failure for each item
 
+    A failed item is only retried once it's known not to have been
+    created, which takes its "id"; items without one aren't retried
+    after a failure that may have reached the CMS.
+
     Example:
         result = await batch_create_documents(
             collection="projects",
@@ -40,6 +57,8 @@ async def batch_create_documents(
     """
     results = []
     errors = []
+    item_results: list[ItemResult] = []
+    started = time.monotonic()
 
     # Use provided client or create new one
     if client:
@@ -51,60 +70,44 @@ async def batch_create_documents(
         await cms_client.__aenter__()
 
     try:
-        if parallel:
-            # Execute all creates in parallel
-            logger.info(
-                f"Batch creating {len(items)} documents in parallel",
+        logger.info(
+            f"Batch creating {len(items)} documents "
+            f"{'in parallel' if parallel else 'sequentially'}",
+            collection=collection,
+        )
+
+        async def _create(item: dict) -> Any:
+            return await cms_client.create_document(
                 collection=collection,
+                data=item,
+                draft=draft,
             )
 
-            tasks = [
-                cms_client.create_document(
+        async def _created(item: dict) -> Any:
+            if item.get("id") is None:
+                raise ValueError("Can't check for a created document without an id")
+            try:
+                return await cms_client.get_document(
                     collection=collection,
-                    data=item,
-                    draft=draft,
+                    doc_id=item["id"],
+                    use_cache=False,
                 )
-                for item in items
-            ]
-
-            # Gather results with error handling
-            responses = await asyncio.gather(
-                *tasks,
-                return_exceptions=True
-            )
-
-            for i, response in enumerate(responses):
-                if isinstance(response, Exception):
-                    errors.append({
-                        "index": i,
-                        "item": items[i],
-                        "error": str(response),
-                    })
-                else:
-                    results.append(response)
-
-        else:
-            # Execute sequentially (safer for order-dependent ops)
-            logger.info(
-                f"Batch creating {len(items)} documents sequentially",
-                collection=collection,
-            )
-
-            for i, item in enumerate(items):
-                try:
-                    result = await cms_client.create_document(
-                        collection=collection,
-                        data=item,
-                        draft=draft,
-                    )
-                    results.append(result)
+            except ResourceNotFoundError:
+                return None
 
-                except Exception as e:
-                    errors.append({
-                        "index": i,
-                        "item": item,
-                        "error": str(e),
-                    })
+        item_results = await _executor_for(parallel, executor).run(
+            _create, items, retry, _created, deadline
+        )
+        for result in item_results:
+            if result.ok:
+                results.append(result.value)
+            else:
+                errors.append({
+                    "index": result.index,
+                    "item": result.item,
+                    "error": str(result.error),
+                    "attempts": result.attempts,
+                })
 
     finally:
         if should_close:
@@ -125,6 +128,7 @@ async def batch_create_documents(
         "failed": len(errors),
         "results": results,
         "errors": errors,
+        "timing": _timing(started, item_results),
     }
 
 
@@ -133,6 +137,10 @@ async def batch_update_documents(
     items: list[dict],  # Each item: {"id": "...", "data": {...}}
     parallel: bool = True,
     client: CMSClient = None,
+    bulk: bool = False,
+    executor: Optional[BatchExecutor] = None,
+    retry: Optional[RetryConfig] = None,
+    deadline: Optional[float] = None,
 ) -> dict:
     """
     Update multiple documents in a single operation.
@@ -140,11 +148,19 @@ async def batch_update_documents(
     Args:
         collection: Target collection
         items: List of updates, each with "id" and "data" keys
-        parallel: Execute requests in parallel
+        parallel: Execute requests in parallel (bounded by the executor)
         client: Optional CMSClient instance
+        bulk: If every item has the same data, send one where-based
+              PATCH (client must support bulk_update_documents); falls
+              back to per-document updates otherwise
+        executor: Executor for parallel runs (None = process-wide one)
+        retry: Per-item retry policy (None = one attempt per item)
+        deadline: Seconds after which unfinished items are reported as
+                  timed out (None = no limit)
 
     Returns:
-        Batch operation result
+        Batch operation result (items without an "id" and a "data"
+        object fail on their own)
 
     Example:
         result = await batch_update_documents(
@@ -157,6 +173,8 @@ async def batch_update_documents(
     """
     results = []
     errors = []
+    item_results: list[ItemResult] = []
+    started = time.monotonic()
 
     # Use provided client or create new one
     if client:
@@ -168,57 +186,38 @@ async def batch_update_documents(
         await cms_client.__aenter__()
 
     try:
-        if parallel:
+        item_results = await _bulk_update(cms_client, collection, items) if bulk else None
+        if item_results is None:
             logger.info(
-                f"Batch updating {len(items)} documents in parallel",
+                f"Batch updating {len(items)} documents "
+                f"{'in parallel' if parallel else 'sequentially'}",
                 collection=collection,
             )
 
-            tasks = [
-                cms_client.update_document(
+            async def _update(item: dict) -> Any:
+                if not _is_update_item(item):
+                    raise ValidationError('Update items need an "id" and a "data" object')
+                return await cms_client.update_document(
                     collection=collection,
                     doc_id=item["id"],
                     data=item["data"],
                 )
-                for item in items
-            ]
 
-            responses = await asyncio.gather(
-                *tasks,
-                return_exceptions=True
+            # Updates set absolute values, so sending one again is harmless
+            item_results = await _executor_for(parallel, executor).run(
+                _update, items, retry, deadline=deadline
             )
 
-            for i, response in enumerate(responses):
-                if isinstance(response, Exception):
-                    errors.append({
-                        "index": i,
-                        "item": items[i],
-                        "error": str(response),
-                    })
-                else:
-                    results.append(response)
-
-        else:
-            logger.info(
-                f"Batch updating {len(items)} documents sequentially",
-                collection=collection,
-            )
-
-            for i, item in enumerate(items):
-                try:
-                    result = await cms_client.update_document(
-                        collection=collection,
-                        doc_id=item["id"],
-                        data=item["data"],
-                    )
-                    results.append(result)
-
-                except Exception as e:
-                    errors.append({
-                        "index": i,
-                        "item": item,
-                        "error": str(e),
-                    })
+        for result in item_results:
+            if result.ok:
+                results.append(result.value)
+            else:
+                errors.append({
+                    "index": result.index,
+                    "item": result.item,
+                    "error": str(result.error),
+                    "attempts": result.attempts,
+                })
 
     finally:
         if should_close:
@@ -239,6 +238,7 @@ async def batch_update_documents(
         "failed": len(errors),
         "results": results,
         "errors": errors,
+        "timing": _timing(started, item_results),
     }
 
 
@@ -248,6 +248,10 @@ async def batch_delete_documents(
     confirm: bool = False,
     parallel: bool = True,
     client: CMSClient = None,
+    bulk: bool = False,
+    executor: Optional[BatchExecutor] = None,
+    retry: Optional[RetryConfig] = None,
+    deadline: Optional[float] = None,
 ) -> dict:
     """
     Delete multiple documents in a single operation.
@@ -256,8 +260,15 @@ async def batch_delete_documents(
         collection: Target collection
         doc_ids: List of document IDs to delete
         confirm: Must be True to proceed
-        parallel: Execute requests in parallel
+        parallel: Execute requests in parallel (bounded by the executor)
         client: Optional CMSClient instance
+        bulk: Send one where-based DELETE (client must support
+              bulk_delete_documents), falling back to per-document
+              deletes if the CMS refuses it
+        executor: Executor for parallel runs (None = process-wide one)
+        retry: Per-item retry policy (None = one attempt per item)
+        deadline: Seconds after which unfinished items are reported as
+                  timed out (None = no limit)
 
     Returns:
         Batch operation result
@@ -270,19 +281,12 @@ async def batch_delete_documents(
         )
     """
     if not confirm:
-        return {
-            "success": False,
-            "requiresConfirmation": True,
-            "message": "Batch deletion requires confirm=True",
-            "totalRequested": len(doc_ids),
-            "successful": 0,
-            "failed": 0,
-            "results": [],
-            "errors": [],
-        }
+        return confirmation_required(len(doc_ids))
 
     results = []
     errors = []
+    item_results: list[ItemResult] = []
+    started = time.monotonic()
 
     # Use provided client or create new one
     if client:
@@ -294,56 +298,45 @@ async def batch_delete_documents(
         await cms_client.__aenter__()
 
     try:
-        if parallel:
+        item_results = await _bulk_delete(cms_client, collection, doc_ids) if bulk else None
+        if item_results is None:
             logger.info(
-                f"Batch deleting {len(doc_ids)} documents in parallel",
+                f"Batch deleting {len(doc_ids)} documents "
+                f"{'in parallel' if parallel else 'sequentially'}",
                 collection=collection,
             )
 
-            tasks = [
-                cms_client.delete_document(
+            async def _delete(doc_id: str) -> Any:
+                return await cms_client.delete_document(
                     collection=collection,
                     doc_id=doc_id,
                 )
-                for doc_id in doc_ids
-            ]
-
-            responses = await asyncio.gather(
-                *tasks,
-                return_exceptions=True
-            )
-
-            for i, response in enumerate(responses):
-                doc_id = doc_ids[i]
-                if isinstance(response, Exception):
-                    errors.append({
-                        "index": i,
-                        "doc_id": doc_id,
-                        "error": str(response),
-                    })
-                else:
-                    results.append({"doc_id": doc_id, "deleted": True})
 
-        else:
-            logger.info(
-                f"Batch deleting {len(doc_ids)} documents sequentially",
-                collection=collection,
-            )
-
-            for i, doc_id in enumerate(doc_ids):
+            async def _deleted(doc_id: str) -> Any:
                 try:
-                    await cms_client.delete_document(
+                    await cms_client.get_document(
                         collection=collection,
                         doc_id=doc_id,
+                        use_cache=False,
                     )
-                    results.append({"doc_id": doc_id, "deleted": True})
+                except ResourceNotFoundError:
+                    return True
+                return None
 
-                except Exception as e:
-                    errors.append({
-                        "index": i,
-                        "doc_id": doc_id,
-                        "error": str(e),
-                    })
+            item_results = await _executor_for(parallel, executor).run(
+                _delete, doc_ids, retry, _deleted, deadline
+            )
+
+        for result in item_results:
+            if result.ok:
+                results.append({"doc_id": result.item, "deleted": True})
+            else:
+                errors.append({
+                    "index": result.index,
+                    "doc_id": result.item,
+                    "error": str(result.error),
+                    "attempts": result.attempts,
+                })
 
     finally:
         if should_close:
@@ -364,4 +357,301 @@ async def batch_delete_documents(
         "failed": len(errors),
         "results": results,
         "errors": errors,
+        "timing": _timing(started, item_results),
+    }
+
+
+async def batch_in_chunks(
+    run_chunk: Callable[[list], Awaitable[dict]],
+    items: Iterable[Any],
+    chunk_size: int = 100,
+    chunks_in_flight: int = 2,
+    progress: Optional[Callable[[int], Awaitable[Any]]] = None,
+    max_errors: int = 100,
+) -> dict:
+    """
+    Run a batch of any size as a pipeline of chunks.
+
+    Items are taken from ``items`` a chunk at a time and each chunk is
+    run with ``run_chunk`` (one of the batch_*_documents functions).
+    Up to ``chunks_in_flight`` chunks run at once, so the next chunk
+    fills the executor while the last items of the previous one finish;
+    total concurrency is still bounded by the executor they share.
+
+    Only counts and the first ``max_errors`` errors are kept, not the
+    documents, so memory stays flat however many items there are.
+
+    Args:
+        run_chunk: Coroutine function running one chunk of items
+        items: Items (any iterable; consumed lazily, e.g. iter_json_array)
+        chunk_size: Items per chunk
+        chunks_in_flight: Chunks run at once (1 = one after another)
+        progress: Coroutine function called with the number of items
+                  done after each chunk
+        max_errors: Errors to include in the result
+
+    Returns:
+        Batch operation summary (without "results"); errors are indexed
+        by position in the whole input
+
+    Example:
+        result = await batch_in_chunks(
+            lambda chunk: batch_create_documents("projects", chunk, client=client),
+            iter_json_array(items_json),
+        )
+    """
+    started = time.monotonic()
+    iterator = iter(items)
+    chunks = iter(lambda: list(islice(iterator, chunk_size)), [])
+    queue: deque[tuple[int, asyncio.Task]] = deque()
+    summary = {"totalRequested": 0, "successful": 0, "failed": 0, "chunks": 0}
+    errors: list[dict] = []
+    stopped: Optional[str] = None
+
+    try:
+        while True:
+            while stopped is None and len(queue) < max(1, chunks_in_flight):
+                try:
+                    chunk = next(chunks)
+                except StopIteration:
+                    break
+                except ValueError as e:
+                    # Malformed input; the chunks before it still finish
+                    stopped = f"Stopped before item {summary['totalRequested']}: {e}"
+                    break
+                queue.append((summary["totalRequested"], asyncio.create_task(run_chunk(chunk))))
+                summary["totalRequested"] += len(chunk)
+
+            if not queue:
+                break
+            offset, task = queue.popleft()
+            result = await task
+            summary["chunks"] += 1
+            summary["successful"] += result["successful"]
+            summary["failed"] += result["failed"]
+            for error in result["errors"]:
+                if len(errors) < max_errors:
+                    errors.append({**error, "index": offset + error["index"]})
+
+            logger.info(
+                "Batch chunk completed",
+                chunk=summary["chunks"],
+                done=summary["successful"] + summary["failed"],
+                failed=summary["failed"],
+            )
+            if progress is not None:
+                await progress(summary["successful"] + summary["failed"])
+    finally:
+        # Stopped early (cancelled, or a chunk raised)
+        for _, task in queue:
+            task.cancel()
+        await asyncio.gather(*(task for _, task in queue), return_exceptions=True)
+
+    result = {
+        "success": summary["failed"] == 0 and stopped is None,
+        "chunked": True,
+        **summary,
+        "errors": errors,
+        "errorsTruncated": summary["failed"] > len(errors),
+        "timing": {"totalMs": round((time.monotonic() - started) * 1000, 2)},
+    }
+    if stopped is not None:
+        result["message"] = stopped
+    return result
+
+
+def confirmation_required(total: Optional[int]) -> dict:
+    """
+    Result of a batch deletion that wasn't confirmed.
+
+    Args:
+        total: Documents that would have been deleted (None if unknown)
+
+    Returns:
+        Batch operation result asking for confirm=True
+    """
+    return {
+        "success": False,
+        "requiresConfirmation": True,
+        "message": "Batch deletion requires confirm=True",
+        "totalRequested": total,
+        "successful": 0,
+        "failed": 0,
+        "results": [],
+        "errors": [],
+    }
+
+
+def _executor_for(parallel: bool, executor: Optional[BatchExecutor]) -> BatchExecutor:
+    """Pick the executor for a batch; sequential batches run one item at a time."""
+    if not parallel:
+        return BatchExecutor(initial_concurrency=1, max_concurrency=1)
+    return executor or get_batch_executor()
+
+
+def _timing(started: float, item_results: list[ItemResult]) -> dict:
+    """
+    Summarize how long a batch took.
+
+    Args:
+        started: time.monotonic() when the batch started
+        item_results: Per-item results (a bulk request's duration counts
+                      for each item it covered)
+
+    Returns:
+        {"totalMs": ..., "itemMs": [...], "attempts": [...]}, with
+        "itemMs" (all attempts) and "attempts" per item, in input order
+    """
+    return {
+        "totalMs": round((time.monotonic() - started) * 1000, 2),
+        "itemMs": [round(result.duration * 1000, 2) for result in item_results],
+        "attempts": [result.attempts for result in item_results],
     }
+
+
+def _is_update_item(item: Any) -> bool:
+    """Whether a batch update item has the "id" and "data" it needs."""
+    return isinstance(item, dict) and "id" in item and isinstance(item.get("data"), dict)
+
+
+async def _bulk_update(
+    cms_client: Any,
+    collection: str,
+    items: list[dict],
+) -> Optional[list[ItemResult]]:
+    """
+    Update documents that all get the same data with one bulk request.
+
+    Args:
+        cms_client: Client with bulk_update_documents
+        collection: Target collection
+        items: List of updates, each with "id" and "data" keys
+
+    Returns:
+        ItemResult for each item, or None if the items differ or the CMS
+        refused the bulk request (update one by one)
+    """
+    if (
+        len(items) < 2
+        or not all(_is_update_item(item) for item in items)
+        or any(item["data"] != items[0]["data"] for item in items)
+    ):
+        return None
+
+    logger.info(
+        f"Batch updating {len(items)} documents in bulk",
+        collection=collection,
+    )
+    return await _bulk_write(
+        "update",
+        items,
+        [item["id"] for item in items],
+        lambda: cms_client.bulk_update_documents(
+            collection=collection,
+            doc_ids=[item["id"] for item in items],
+            data=items[0]["data"],
+        ),
+        lambda docs: {str(doc.get("id")): doc for doc in docs},
+        collection,
+    )
+
+
+async def _bulk_delete(
+    cms_client: Any,
+    collection: str,
+    doc_ids: list[str],
+) -> Optional[list[ItemResult]]:
+    """
+    Delete documents with one bulk request.
+
+    Args:
+        cms_client: Client with bulk_delete_documents
+        collection: Target collection
+        doc_ids: List of document IDs to delete
+
+    Returns:
+        ItemResult for each document, or None if the CMS refused the
+        bulk request (delete one by one)
+    """
+    if len(doc_ids) < 2:
+        return None
+
+    logger.info(
+        f"Batch deleting {len(doc_ids)} documents in bulk",
+        collection=collection,
+    )
+    return await _bulk_write(
+        "delete",
+        doc_ids,
+        doc_ids,
+        lambda: cms_client.bulk_delete_documents(
+            collection=collection,
+            doc_ids=doc_ids,
+        ),
+        lambda deleted: {doc_id: True for doc_id in deleted},
+        collection,
+    )
+
+
+async def _bulk_write(
+    operation: str,
+    items: list,
+    doc_ids: list,
+    send: Callable[[], Awaitable[tuple[list, dict]]],
+    by_id: Callable[[list], dict],
+    collection: str,
+) -> Optional[list[ItemResult]]:
+    """
+    Send a bulk write and split its outcome into per-item results.
+
+    Only a request the CMS refused (or has no endpoint for) is known to
+    have changed nothing, so only then is None returned for the batch
+    to be written one by one. Any other failure, such as a timeout or
+    a dropped connection, may come after the CMS applied the write;
+    every item is reported failed with it rather than sent again.
+
+    Args:
+        operation: "update" or "delete" (for messages)
+        items: Batch items, in input order
+        doc_ids: Document ID of each item
+        send: Coroutine function sending the bulk request, returning
+              (written, {doc_id: error})
+        by_id: Maps the written part of the response to {doc_id: value}
+        collection: Target collection (for logging)
+
+    Returns:
+        ItemResult for each item (one attempt, the request's duration
+        each), or None to fall back to one write per item
+    """
+    started = time.monotonic()
+    try:
+        written, failures = await send()
+        values = by_id(written)
+        error = None
+    except (BulkWriteRejectedError, ResourceNotFoundError) as e:
+        logger.warning(
+            f"Bulk {operation} refused, sending documents one by one",
+            collection=collection,
+            error=str(e),
+        )
+        return None
+    except Exception as e:
+        logger.error(
+            f"Bulk {operation} failed and may have been applied, not retrying",
+            collection=collection,
+            error=str(e),
+        )
+        values, failures, error = {}, {}, e
+    duration = time.monotonic() - started
+
+    results = []
+    for i, (item, doc_id) in enumerate(zip(items, doc_ids)):
+        result = ItemResult(index=i, item=item, duration=duration, attempts=1)
+        if str(doc_id) in values:
+            result.value = values[str(doc_id)]
+        else:
+            result.error = error or CMSError(
+                failures.get(str(doc_id), f"{operation.capitalize()} failed")
+            )
+        results.append(result)
+    return results
@@ -1,8 +1,10 @@
 """Caching service for API responses."""
 
 import time
-from typing import Any, Optional, Dict
+from collections import defaultdict
+from typing import Any, Optional, Dict, Set
 from config import Config
+from core.cache_keys import key_prefix_tags
 from utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -34,6 +36,7 @@ class CacheService:
     def __init__(self):
         """Initialize cache service."""
         self._cache: Dict[str, CacheEntry] = {}
+        self._tags: Dict[str, Set[str]] = defaultdict(set)
         self._enabled = Config.ENABLE_CACHING
 
     def get(self, key: str) -> Optional[Any]:
@@ -56,7 +59,7 @@ class CacheService:
 
         if entry:
             logger.debug("Cache entry expired", key=key)
-            del self._cache[key]
+            self._remove(key)
 
         logger.debug("Cache miss", key=key)
         return None
@@ -75,8 +78,20 @@ class CacheService:
 
         ttl = ttl or Config.CACHE_TTL
         self._cache[key] = CacheEntry(value, ttl)
+        for tag in key_prefix_tags(key):
+            self._tags[tag].add(key)
         logger.debug("Cache set", key=key, ttl=ttl)
 
+    def _remove(self, key: str) -> None:
+        """Drop a key and its tag index entries."""
+        del self._cache[key]
+        for tag in key_prefix_tags(key):
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
     def delete(self, key: str) -> None:
         """
         Delete value from cache.
@@ -85,24 +100,31 @@ class CacheService:
             key: Cache key
         """
         if key in self._cache:
-            del self._cache[key]
+            self._remove(key)
             logger.debug("Cache deleted", key=key)
 
     def clear(self) -> None:
         """Clear all cached values."""
         self._cache.clear()
+        self._tags.clear()
         logger.info("Cache cleared")
 
     def invalidate_pattern(self, pattern: str) -> None:
         """
         Invalidate all cache keys matching a pattern.
 
+        A key prefix such as "collection:projects" is answered from the
+        tag index; other patterns fall back to a scan.
+
         Args:
-            pattern: Pattern to match (simple string contains check)
+            pattern: Key prefix tag, or substring to match
         """
-        keys_to_delete = [key for key in self._cache.keys() if pattern in key]
+        if pattern.count(":") <= 1 and not pattern.endswith(":"):
+            keys_to_delete = list(self._tags.get(pattern, ()))
+        else:
+            keys_to_delete = [key for key in self._cache.keys() if pattern in key]
         for key in keys_to_delete:
-            del self._cache[key]
+            self._remove(key)
         logger.info("Cache invalidated by pattern", pattern=pattern, count=len(keys_to_delete))
 
     def get_stats(self) -> dict:
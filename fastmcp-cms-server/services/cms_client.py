@@ -135,7 +135,7 @@ class CMSClient:
                     status_code=response.status_code,
                     response=response.text[:500],
                 )
-                raise CMSConnectionError(error_msg)
+                raise CMSConnectionError(error_msg, status_code=response.status_code)
 
             return response.json()
 
@@ -2,20 +2,28 @@
 
 import asyncio
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional
+import httpx
 from config import Config
 from services.auth import AuthService
 from services.audit import AuditService
 from core.circuit_breaker import CircuitBreaker
-from core.smart_cache import SmartCache
+from core.smart_cache import SmartCache, cache_invalidation_listener, cache_sweeper_task
+from core.disk_cache import DiskCache
+from core.shared_cache import create_shared_cache
+from core.encoded_json import to_json
+from core.cache_snapshot import cache_snapshot_task, load_snapshot, save_snapshot
+from core.cache_keys import QueryKey
 from core.connection_pool import get_global_pool, ConnectionPool
 from core.deduplication import RequestDeduplicator
+from core.batch_loader import BatchLoader
 from utils.logging import get_logger
 from utils.errors import (
     CMSConnectionError,
     CMSTimeoutError,
     ResourceNotFoundError,
     AuthenticationError,
+    BulkWriteRejectedError,
 )
 
 logger = get_logger(__name__)
@@ -32,9 +40,13 @@ class EnhancedCMSClient:
     - Request deduplication
     - Comprehensive error handling
 
+    Tool handlers should use the process-wide instance from
+    ``get_cms_client()`` so cache, deduplication and circuit breaker
+    state is shared across calls.
+
     Example:
-        async with EnhancedCMSClient() as client:
-            result = await client.get_document("projects", "proj-1")
+        client = await get_cms_client()
+        result = await client.get_document("projects", "proj-1")
     """
 
     def __init__(
@@ -42,6 +54,7 @@ class EnhancedCMSClient:
         base_url: str = Config.CMS_API_URL,
         email: str = Config.CMS_ADMIN_EMAIL,
         password: str = Config.CMS_ADMIN_PASSWORD,
+        connection_pool: Optional[ConnectionPool] = None,
     ):
         """
         Initialize enhanced CMS client.
@@ -50,9 +63,10 @@ class EnhancedCMSClient:
             base_url: CMS API base URL
             email: Admin email
             password: Admin password
+            connection_pool: Connection pool to use (None = global pool)
         """
         self.base_url = base_url.rstrip("/")
-        self.auth = AuthService(email, password, self.base_url)
+        self.auth = AuthService(email, password, self.base_url, connection_pool)
         self.audit = AuditService()
 
         # Enhanced features
@@ -61,15 +75,48 @@ class EnhancedCMSClient:
             recovery_timeout=60,
             success_threshold=2,
         )
-        self.cache = SmartCache(default_ttl=Config.CACHE_TTL)
+        self.cache = SmartCache(
+            default_ttl=Config.CACHE_TTL,
+            max_entries=Config.CACHE_MAX_ENTRIES,
+            max_bytes=Config.CACHE_MAX_BYTES,
+            codec=Config.CACHE_CODEC or None,
+            stale_ttl=Config.CACHE_STALE_TTL,
+            xfetch_beta=Config.CACHE_XFETCH_BETA,
+            negative_ttl=Config.CACHE_NEGATIVE_TTL,
+            hot_key_capacity=Config.CACHE_HOT_KEYS,
+            hot_key_half_life=Config.CACHE_HOT_KEY_HALF_LIFE,
+            l2=(
+                DiskCache(Config.CACHE_L2_PATH, Config.CACHE_L2_MAX_BYTES)
+                if Config.CACHE_L2_PATH
+                else None
+            ),
+            shared=(
+                create_shared_cache(Config.CACHE_SHARED_URL, Config.CACHE_SHARED_MAX_BYTES)
+                if Config.CACHE_SHARED_URL
+                else None
+            ),
+        )
         self.deduplicator = RequestDeduplicator()
+        # Per-collection batching of get_document misses
+        self._document_loaders: Dict[str, BatchLoader] = {}
+        self._snapshot_tasks: list[asyncio.Task] = []
+        self._sweeper_task: Optional[asyncio.Task] = None
+        self._listener_task: Optional[asyncio.Task] = None
+
+        # Refreshes of cached documents and globals
+        self._refresh_stats = {
+            "refreshes": 0,
+            "not_modified": 0,
+            "bytes_received": 0,
+        }
 
-        self._connection_pool: Optional[ConnectionPool] = None
+        self._connection_pool: Optional[ConnectionPool] = connection_pool
 
     async def __aenter__(self):
         """Async context manager entry."""
         # Get global connection pool
-        self._connection_pool = await get_global_pool()
+        if self._connection_pool is None:
+            self._connection_pool = await get_global_pool()
         await self.auth.authenticate()
         return self
 
@@ -78,6 +125,77 @@ class EnhancedCMSClient:
         # Don't close global pool
         pass
 
+    async def start(self):
+        """
+        Prepare a long-lived client for serving requests.
+
+        Attaches the global connection pool, starts the cache expiry
+        sweeper and (with a shared tier) the listener for other workers'
+        invalidations, starts loading the cache snapshot (if configured) in the
+        background, authenticates up front
+        so the first tool call doesn't pay for the login round trip, and
+        keeps the token fresh in the background from then on.
+        """
+        if self._connection_pool is None:
+            self._connection_pool = await get_global_pool()
+
+        if Config.CACHE_SWEEP_INTERVAL > 0 and self._sweeper_task is None:
+            self._sweeper_task = asyncio.create_task(
+                cache_sweeper_task(
+                    self.cache, Config.CACHE_SWEEP_INTERVAL, Config.CACHE_SWEEP_BATCH_SIZE
+                )
+            )
+
+        if self.cache.shared is not None and self._listener_task is None:
+            self._listener_task = asyncio.create_task(
+                cache_invalidation_listener(self.cache, Config.CACHE_SHARED_POLL_TIMEOUT)
+            )
+
+        if Config.CACHE_SNAPSHOT_PATH and not self._snapshot_tasks:
+            path = Config.CACHE_SNAPSHOT_PATH
+            self._snapshot_tasks = [
+                asyncio.create_task(load_snapshot(self.cache, path)),
+                asyncio.create_task(
+                    cache_snapshot_task(self.cache, path, Config.CACHE_SNAPSHOT_INTERVAL)
+                ),
+            ]
+
+        try:
+            await self.auth.authenticate()
+        finally:
+            # Also retries the initial login if the CMS isn't reachable yet
+            self.auth.start_background_refresh()
+
+    async def close(self):
+        """Cancel in-flight requests and background tasks."""
+        await self.auth.stop_background_refresh()
+
+        if self._sweeper_task is not None:
+            self._sweeper_task.cancel()
+            await asyncio.gather(self._sweeper_task, return_exceptions=True)
+            self._sweeper_task = None
+
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            await asyncio.gather(self._listener_task, return_exceptions=True)
+            self._listener_task = None
+
+        if self._snapshot_tasks:
+            for task in self._snapshot_tasks:
+                task.cancel()
+            await asyncio.gather(*self._snapshot_tasks, return_exceptions=True)
+            self._snapshot_tasks = []
+            try:
+                await save_snapshot(self.cache, Config.CACHE_SNAPSHOT_PATH)
+            except Exception as e:
+                logger.error("Failed to save cache snapshot", error=str(e))
+
+        await self.cache.close()
+        for loader in self._document_loaders.values():
+            await loader.close()
+        await self.deduplicator.clear()
+        logger.debug("CMS client closed", metrics=self.get_metrics())
+
     async def _get_headers(self) -> Dict[str, str]:
         """Get request headers with authentication token."""
         token = await self.auth.refresh_if_needed()
@@ -93,7 +211,10 @@ class EnhancedCMSClient:
         data: Optional[Dict] = None,
         params: Optional[Dict] = None,
         retry_count: int = 0,
-    ) -> Dict[str, Any]:
+        headers: Optional[Dict[str, str]] = None,
+        raw: bool = False,
+        accept_status: tuple[int, ...] = (),
+    ) -> Any:
         """
         Make HTTP request with circuit breaker protection.
 
@@ -103,9 +224,14 @@ class EnhancedCMSClient:
             data: Request body data
             params: Query parameters
             retry_count: Current retry attempt
+            headers: Extra request headers (e.g. If-None-Match)
+            raw: Return the httpx.Response (which may be a 304) instead
+                 of the decoded body
+            accept_status: Error statuses returned like a success instead
+                 of raising (e.g. 400 for partially failed bulk writes)
 
         Returns:
-            Response data
+            Response data, or the response itself if ``raw``
         """
         # Wrap request in circuit breaker
         return await self.circuit_breaker.call(
@@ -115,6 +241,9 @@ class EnhancedCMSClient:
             data,
             params,
             retry_count,
+            headers,
+            raw,
+            accept_status,
         )
 
     async def _do_request(
@@ -124,7 +253,10 @@ class EnhancedCMSClient:
         data: Optional[Dict] = None,
         params: Optional[Dict] = None,
         retry_count: int = 0,
-    ) -> Dict[str, Any]:
+        extra_headers: Optional[Dict[str, str]] = None,
+        raw: bool = False,
+        accept_status: tuple[int, ...] = (),
+    ) -> Any:
         """
         Execute HTTP request.
 
@@ -134,12 +266,17 @@ class EnhancedCMSClient:
             data: Request body data
             params: Query parameters
             retry_count: Current retry attempt
+            extra_headers: Extra request headers
+            raw: Return the httpx.Response instead of the decoded body
+            accept_status: Error statuses not to raise for
 
         Returns:
-            Response data
+            Response data, or the response itself if ``raw``
         """
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
         headers = await self._get_headers()
+        if extra_headers:
+            headers.update(extra_headers)
 
         if self._connection_pool is None:
             self._connection_pool = await get_global_pool()
@@ -167,7 +304,10 @@ class EnhancedCMSClient:
                 if retry_count < 1:
                     logger.warning("Authentication failed, refreshing token")
                     await self.auth.authenticate(force=True)
-                    return await self._request(method, endpoint, data, params, retry_count + 1)
+                    return await self._request(
+                        method, endpoint, data, params, retry_count + 1, extra_headers, raw,
+                        accept_status,
+                    )
                 raise AuthenticationError("Authentication failed")
 
             # Handle not found
@@ -175,7 +315,7 @@ class EnhancedCMSClient:
                 raise ResourceNotFoundError(f"Resource not found: {endpoint}")
 
             # Handle other errors
-            if response.status_code >= 400:
+            if response.status_code >= 400 and response.status_code not in accept_status:
                 error_msg = f"CMS request failed with status {response.status_code}"
                 logger.error(
                     error_msg,
@@ -184,10 +324,13 @@ class EnhancedCMSClient:
                     status_code=response.status_code,
                     response=response.text[:500],
                 )
-                raise CMSConnectionError(error_msg)
+                raise CMSConnectionError(error_msg, status_code=response.status_code)
 
-            return response.json()
+            return response if raw else response.json()
 
+        except httpx.TimeoutException as e:
+            logger.error("Request timeout", endpoint=endpoint, error=str(e))
+            raise CMSTimeoutError(f"Request timed out: {e}")
         except Exception as e:
             if not isinstance(e, (CMSConnectionError, CMSTimeoutError, ResourceNotFoundError, AuthenticationError)):
                 logger.error("Request error", endpoint=endpoint, error=str(e))
@@ -200,94 +343,287 @@ class EnhancedCMSClient:
         filters: Optional[Dict] = None,
         limit: int = 100,
         page: int = 1,
+        depth: Optional[int] = None,
+        select: Optional[list[str]] = None,
         use_cache: bool = True,
+        as_json: bool = False,
     ) -> Dict[str, Any]:
         """
         Get collection documents with caching and deduplication.
 
+        Concurrent calls are coalesced only when they ask for the same
+        query (filters, limit, page, depth and select).
+
         Args:
             collection: Collection name
             filters: Filter criteria
             limit: Results per page
             page: Page number
+            depth: Relationship population depth (None = CMS default)
+            select: Fields to return (None = all fields)
             use_cache: Whether to use cache
+            as_json: Return the response as JSON text (bytes), unparsed
+                if it is cached encoded
 
         Returns:
             Collection response
         """
-        params = {"limit": limit, "page": page}
+        params: Dict[str, Any] = {"limit": limit, "page": page}
+
+        if depth is not None:
+            params["depth"] = depth
+        if select:
+            for field in select:
+                params[f"select[{field}]"] = "true"
 
         # Add filters
         if filters:
             for key, value in filters.items():
                 params[key] = value
 
-        # Check cache
-        cache_key = f"collection:{collection}:{str(params)}"
-        if use_cache and Config.ENABLE_CACHING:
-            cached = self.cache.get(cache_key)
-            if cached:
-                return cached
+        query = QueryKey.for_collection(collection, params)
 
-        # Execute with deduplication
-        async def _fetch():
-            response = await self._request("GET", f"/{collection}", params=params)
+        cache_key = str(query)
+
+        async def _fetch(query: QueryKey):
+            response = await self._request(
+                "GET", f"/{collection}", params=query.to_params(), raw=True
+            )
+            body = response.json()
             if use_cache and Config.ENABLE_CACHING:
-                self.cache.set(cache_key, response)
-            return response
+                # With a cache codec the body is kept as received
+                self.cache.set(cache_key, body, raw=response.content)
+            return body
 
-        return await self.deduplicator.execute(
-            f"get_collection:{collection}",
-            _fetch,
-        )
+        # Execute with deduplication
+        async def _deduplicated():
+            return await self.deduplicator.execute(
+                f"get_collection:{collection}",
+                _fetch,
+                query=query,
+            )
+
+        # Check cache (stale entries are served while refreshing)
+        if use_cache and Config.ENABLE_CACHING:
+            return await self.cache.get_or_fetch(cache_key, _deduplicated, as_json=as_json)
+        result = await _deduplicated()
+        return to_json(result) if as_json else result
 
     async def get_document(
         self,
         collection: str,
         doc_id: str,
         use_cache: bool = True,
+        as_json: bool = False,
     ) -> Dict[str, Any]:
         """
         Get document with caching and deduplication.
 
+        Cache misses for different documents of a collection that arrive
+        within ``DOCUMENT_BATCH_WINDOW`` are fetched together with one
+        ``where[id][in]`` query (see ``_document_loader``). Refreshes of
+        a cached copy are revalidated one by one instead.
+
         Args:
             collection: Collection name
             doc_id: Document ID
             use_cache: Whether to use cache
+            as_json: Return the document as JSON text (bytes)
 
         Returns:
             Document data
         """
-        # Check cache
-        cache_key = f"doc:{collection}:{doc_id}"
-        if use_cache and Config.ENABLE_CACHING:
-            cached = self.cache.get(cache_key)
-            if cached:
-                return cached
+        cache_key = str(QueryKey.for_document(collection, doc_id))
+
+        def _first_doc(response: Dict[str, Any]) -> Dict[str, Any]:
+            if not response.get("docs"):
+                raise ResourceNotFoundError(f"Document not found: {collection}/{doc_id}")
+            return response["docs"][0]
 
-        # Execute with deduplication
         async def _fetch():
+            caching = use_cache and Config.ENABLE_CACHING
+            if Config.DOCUMENT_BATCH_WINDOW > 0 and not (
+                caching and self.cache.get_validators(cache_key)
+            ):
+                doc = await self._document_loader(collection).load(doc_id)
+                if caching:
+                    self.cache.set_if_newer(cache_key, doc)
+                return doc
+
+            doc, response = await self._get_revalidated(
+                cache_key,
+                f"/{collection}",
+                {"where[id][equals]": doc_id, "limit": 1},
+                _first_doc,
+                revalidate=caching,
+            )
+
+            if caching and response is not None:
+                if self.cache.set_if_newer(cache_key, doc):
+                    self._store_validators(cache_key, response)
+
+            return doc
+
+        # Execute with deduplication
+        async def _deduplicated():
+            return await self.deduplicator.execute(
+                f"get_document:{collection}:{doc_id}",
+                _fetch,
+            )
+
+        # Check cache (stale entries are served while refreshing, and
+        # missing documents are remembered briefly)
+        if use_cache and Config.ENABLE_CACHING:
+            return await self.cache.get_or_fetch(
+                cache_key, _deduplicated, cache_not_found=True, as_json=as_json
+            )
+        result = await _deduplicated()
+        return to_json(result) if as_json else result
+
+    def _document_loader(self, collection: str) -> BatchLoader:
+        """
+        Get the loader batching document reads for a collection.
+
+        If a batched read fails, its documents are read one by one, so
+        an ID the CMS rejects only fails its own callers.
+
+        Args:
+            collection: Collection name
+
+        Returns:
+            BatchLoader resolving document IDs to documents (or
+            ResourceNotFoundError)
+        """
+        loader = self._document_loaders.get(collection)
+        if loader is not None:
+            return loader
+
+        async def _find(doc_ids: list[str]) -> list[Any]:
             response = await self._request(
                 "GET",
                 f"/{collection}",
-                params={"where[id][equals]": doc_id, "limit": 1},
+                params={"where[id][in]": doc_ids, "limit": len(doc_ids)},
             )
+            # Payload returns numeric IDs as numbers, whatever type was asked for
+            docs = {str(doc.get("id")): doc for doc in response.get("docs", [])}
+            return [
+                docs.get(str(doc_id))
+                or ResourceNotFoundError(f"Document not found: {collection}/{doc_id}")
+                for doc_id in doc_ids
+            ]
+
+        async def _load(doc_ids: list[str]) -> list[Any]:
+            try:
+                return await _find(doc_ids)
+            except Exception as e:
+                if len(doc_ids) == 1:
+                    raise
+                # One bad ID mustn't fail the documents batched with it
+                logger.warning(
+                    "Batched document read failed, reading one by one",
+                    collection=collection,
+                    documents=len(doc_ids),
+                    error=str(e),
+                )
+            results = await asyncio.gather(
+                *(_find([doc_id]) for doc_id in doc_ids), return_exceptions=True
+            )
+            return [
+                result if isinstance(result, Exception) else result[0]
+                for result in results
+            ]
+
+        loader = self._document_loaders[collection] = BatchLoader(
+            _load,
+            window=Config.DOCUMENT_BATCH_WINDOW,
+            max_batch=Config.DOCUMENT_BATCH_MAX_SIZE,
+        )
+        return loader
 
-            if not response.get("docs"):
-                raise ResourceNotFoundError(f"Document not found: {collection}/{doc_id}")
+    async def _get_revalidated(
+        self,
+        cache_key: str,
+        endpoint: str,
+        params: Dict[str, Any],
+        extract: Callable[[Dict[str, Any]], Any],
+        revalidate: bool = True,
+    ) -> tuple[Any, Optional[httpx.Response]]:
+        """
+        Fetch a document or global, revalidating a cached copy if possible.
 
-            doc = response["docs"][0]
+        If the cached response came with an ETag or Last-Modified header,
+        the GET is made conditional and a 304 just restarts the cached
+        entry's TTL. Otherwise, if the cached copy has an ``updatedAt``,
+        a ``select[updatedAt]`` probe checks whether it changed before
+        downloading the full body. Bytes received are recorded for every
+        refresh of a cached key.
 
-            if use_cache and Config.ENABLE_CACHING:
-                self.cache.set(cache_key, doc)
+        Args:
+            cache_key: Cache key of the document or global
+            endpoint: API endpoint
+            params: Query parameters of the full request
+            extract: Turns the response body into the cached value
+            revalidate: Whether to revalidate against the cache
 
-            return doc
+        Returns:
+            (value, response); response is None if the cached value was
+            confirmed unchanged (and is already cached)
+        """
+        validators = self.cache.get_validators(cache_key) if revalidate else {}
+        received = 0
 
-        return await self.deduplicator.execute(
-            f"get_document:{collection}:{doc_id}",
-            _fetch,
+        headers: Dict[str, str] = {}
+        if "etag" in validators:
+            headers["If-None-Match"] = validators["etag"]
+        if "last_modified" in validators:
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+        if not headers and "updated_at" in validators:
+            probe = await self._request(
+                "GET",
+                endpoint,
+                params={**params, "select[updatedAt]": "true", "depth": 0},
+                raw=True,
+            )
+            received += len(probe.content)
+            current = extract(probe.json())
+            if isinstance(current, dict) and current.get("updatedAt") == validators["updated_at"]:
+                value = self.cache.revalidate(cache_key)
+                if value is not None:
+                    self._record_refresh(received, not_modified=True)
+                    return value, None
+
+        response = await self._request("GET", endpoint, params=params, headers=headers or None, raw=True)
+        received += len(response.content)
+
+        if response.status_code == 304:
+            value = self.cache.revalidate(cache_key)
+            if value is not None:
+                self._record_refresh(received, not_modified=True)
+                return value, None
+            # Evicted while revalidating
+            response = await self._request("GET", endpoint, params=params, raw=True)
+            received += len(response.content)
+
+        if validators:
+            self._record_refresh(received, not_modified=False)
+        return extract(response.json()), response
+
+    def _store_validators(self, cache_key: str, response: httpx.Response):
+        """Keep a response's ETag / Last-Modified with its cache entry."""
+        self.cache.set_validators(
+            cache_key,
+            etag=response.headers.get("etag"),
+            last_modified=response.headers.get("last-modified"),
         )
 
+    def _record_refresh(self, received: int, not_modified: bool):
+        """Record the bytes one refresh of a cached key downloaded."""
+        self._refresh_stats["refreshes"] += 1
+        self._refresh_stats["bytes_received"] += received
+        if not_modified:
+            self._refresh_stats["not_modified"] += 1
+
     async def create_document(
         self,
         collection: str,
@@ -310,13 +646,18 @@ class EnhancedCMSClient:
             data["_status"] = "draft"
 
         response = await self._request("POST", f"/{collection}", data=data)
+        doc = response.get("doc", response)
+        doc_id = response.get("id") or response.get("doc", {}).get("id")
 
         # Invalidate cache
         if Config.ENABLE_CACHING:
             self.cache.invalidate_smart("create", collection)
+            if doc_id is not None:
+                # Drop any "not found" entry left by a lookup before the create
+                self.cache.delete(str(QueryKey.for_document(collection, doc_id)))
+            self._write_through(collection, doc)
 
         # Audit log
-        doc_id = response.get("id") or response.get("doc", {}).get("id")
         if Config.ENABLE_AUDIT_LOG:
             self.audit.log_create(
                 resource_type=collection,
@@ -332,7 +673,7 @@ class EnhancedCMSClient:
             draft=draft,
         )
 
-        return response.get("doc", response)
+        return doc
 
     async def update_document(
         self,
@@ -361,11 +702,13 @@ class EnhancedCMSClient:
 
         # Update document
         response = await self._request("PATCH", f"/{collection}/{doc_id}", data=data)
+        doc = response.get("doc", response)
 
         # Invalidate cache
         if Config.ENABLE_CACHING:
-            self.cache.delete(f"doc:{collection}:{doc_id}")
-            self.cache.invalidate_smart("update", collection)
+            if not self._write_through(collection, doc):
+                self.cache.delete(str(QueryKey.for_document(collection, doc_id)))
+            self.cache.invalidate_smart("update", collection, doc_id=doc_id, changes=data.keys())
 
         # Audit log
         if Config.ENABLE_AUDIT_LOG:
@@ -378,7 +721,200 @@ class EnhancedCMSClient:
 
         logger.info("Document updated", collection=collection, doc_id=doc_id)
 
-        return response.get("doc", response)
+        return doc
+
+    def _write_through(self, collection: str, doc: Any) -> bool:
+        """
+        Cache a document returned by a write.
+
+        The next read of the document (usually issued right after a
+        write) is then served from cache. An out-of-order response older
+        than the cached copy is ignored.
+
+        Args:
+            collection: Collection name
+            doc: Document from the POST/PATCH response
+
+        Returns:
+            True if the document is cached (this version or a newer one)
+        """
+        if not Config.CACHE_WRITE_THROUGH:
+            return False
+        if not isinstance(doc, dict) or doc.get("id") is None:
+            return False
+
+        self.cache.set_if_newer(str(QueryKey.for_document(collection, doc["id"])), doc)
+        return True
+
+    async def bulk_update_documents(
+        self,
+        collection: str,
+        doc_ids: list[str],
+        data: Dict[str, Any],
+    ) -> tuple[list[Dict[str, Any]], Dict[str, str]]:
+        """
+        Apply the same update to many documents with one request.
+
+        Uses Payload's where-based ``PATCH /{collection}?where[id][in]=...``.
+        Cache and audit log are updated per document, as by
+        ``update_document``.
+
+        Args:
+            collection: Collection name
+            doc_ids: IDs of the documents to update
+            data: Update applied to every document
+
+        Returns:
+            (updated documents, {doc_id: error} for documents that were
+            not updated)
+
+        Raises:
+            BulkWriteRejectedError: If the CMS refused the request as a whole
+            CMSConnectionError: If the request failed as a whole (it may
+                                still have been applied)
+        """
+        before: Dict[str, Any] = {}
+        if Config.ENABLE_AUDIT_LOG:
+            current = await self.get_collection(
+                collection,
+                filters={"where[id][in]": doc_ids},
+                limit=len(doc_ids),
+                use_cache=False,
+            )
+            before = {str(doc.get("id")): doc for doc in current.get("docs", [])}
+
+        docs, errors = await self._bulk_request("PATCH", collection, doc_ids, data)
+
+        for doc in docs:
+            doc_id = str(doc.get("id"))
+            if Config.ENABLE_CACHING:
+                if not self._write_through(collection, doc):
+                    self.cache.delete(str(QueryKey.for_document(collection, doc_id)))
+                self.cache.invalidate_smart("update", collection, doc_id=doc_id, changes=data.keys())
+
+            if Config.ENABLE_AUDIT_LOG:
+                self.audit.log_update(
+                    resource_type=collection,
+                    resource_id=doc_id,
+                    before=before.get(doc_id),
+                    after=data,
+                    metadata={"bulk": True},
+                )
+
+        logger.info(
+            "Documents updated in bulk",
+            collection=collection,
+            updated=len(docs),
+            failed=len(errors),
+        )
+
+        return docs, errors
+
+    async def bulk_delete_documents(
+        self,
+        collection: str,
+        doc_ids: list[str],
+    ) -> tuple[list[str], Dict[str, str]]:
+        """
+        Delete many documents with one request.
+
+        Uses Payload's where-based ``DELETE /{collection}?where[id][in]=...``.
+
+        Args:
+            collection: Collection name
+            doc_ids: IDs of the documents to delete
+
+        Returns:
+            (IDs of deleted documents, {doc_id: error} for the rest)
+
+        Raises:
+            BulkWriteRejectedError: If the CMS refused the request as a whole
+            CMSConnectionError: If the request failed as a whole (it may
+                                still have been applied)
+        """
+        docs, errors = await self._bulk_request("DELETE", collection, doc_ids)
+        deleted = [str(doc.get("id")) for doc in docs]
+
+        if Config.ENABLE_CACHING and deleted:
+            for doc_id in deleted:
+                self.cache.delete(str(QueryKey.for_document(collection, doc_id)))
+            self.cache.invalidate_smart("delete", collection)
+
+        if Config.ENABLE_AUDIT_LOG:
+            for doc in docs:
+                self.audit.log_delete(
+                    resource_type=collection,
+                    resource_id=str(doc.get("id")),
+                    data=doc,
+                    metadata={"bulk": True},
+                )
+
+        logger.info(
+            "Documents deleted in bulk",
+            collection=collection,
+            deleted=len(deleted),
+            failed=len(errors),
+        )
+
+        return deleted, errors
+
+    async def _bulk_request(
+        self,
+        method: str,
+        collection: str,
+        doc_ids: list[str],
+        data: Optional[Dict[str, Any]] = None,
+    ) -> tuple[list[Dict[str, Any]], Dict[str, str]]:
+        """
+        Send a where-based bulk write and split its result per document.
+
+        Payload answers with the documents it changed and an ``errors``
+        list for the rest, with status 400 if any failed. IDs in neither
+        didn't match a document. Any other 4xx answer means the write
+        was refused as a whole, before any document was changed.
+
+        Args:
+            method: "PATCH" or "DELETE"
+            collection: Collection name
+            doc_ids: IDs of the documents to write
+            data: Request body (for PATCH)
+
+        Returns:
+            (changed documents, {doc_id: error})
+
+        Raises:
+            BulkWriteRejectedError: If the CMS refused the write (4xx)
+            ResourceNotFoundError: If the collection has no bulk endpoint
+        """
+        response = await self._request(
+            method,
+            f"/{collection}",
+            data=data,
+            params={"where[id][in]": doc_ids, "limit": len(doc_ids)},
+            raw=True,
+            accept_status=tuple(range(400, 500)),
+        )
+        try:
+            body = response.json()
+        except ValueError:
+            body = {}
+        if response.status_code >= 400 and "docs" not in body:
+            raise BulkWriteRejectedError(
+                f"CMS rejected bulk {method} with status {response.status_code}"
+            )
+
+        docs = [doc for doc in body.get("docs", []) if isinstance(doc, dict)]
+        errors = {
+            str(error["id"]): error.get("message", "Update failed")
+            for error in body.get("errors", [])
+            if isinstance(error, dict) and error.get("id") is not None
+        }
+        changed = {str(doc.get("id")) for doc in docs}
+        for doc_id in map(str, doc_ids):
+            if doc_id not in changed and doc_id not in errors:
+                errors[doc_id] = f"Document not found: {collection}/{doc_id}"
+
+        return docs, errors
 
     async def delete_document(
         self,
@@ -407,7 +943,7 @@ class EnhancedCMSClient:
 
         # Invalidate cache
         if Config.ENABLE_CACHING:
-            self.cache.delete(f"doc:{collection}:{doc_id}")
+            self.cache.delete(str(QueryKey.for_document(collection, doc_id)))
             self.cache.invalidate_smart("delete", collection)
 
         # Audit log
@@ -498,7 +1034,7 @@ class EnhancedCMSClient:
                     status_code=response.status_code,
                     response=response.text[:500],
                 )
-                raise CMSConnectionError(error_msg)
+                raise CMSConnectionError(error_msg, status_code=response.status_code)
 
             result = response.json()
 
@@ -524,6 +1060,9 @@ class EnhancedCMSClient:
 
         try:
             return await self.circuit_breaker.call(_upload)
+        except httpx.TimeoutException as e:
+            logger.error("Upload timeout", error=str(e), filename=upload_filename)
+            raise CMSTimeoutError(f"Upload timed out: {e}")
         except Exception as e:
             if not isinstance(e, (CMSConnectionError, CMSTimeoutError, ResourceNotFoundError, AuthenticationError)):
                 logger.error("Upload error", error=str(e), filename=upload_filename)
@@ -534,6 +1073,7 @@ class EnhancedCMSClient:
         self,
         global_slug: str,
         use_cache: bool = True,
+        as_json: bool = False,
     ) -> Dict[str, Any]:
         """
         Get global singleton with caching.
@@ -541,24 +1081,43 @@ class EnhancedCMSClient:
         Args:
             global_slug: Global slug
             use_cache: Whether to use cache
+            as_json: Return the global as JSON text (bytes), unparsed
+                if it is cached encoded
 
         Returns:
             Global data
         """
-        # Check cache
-        cache_key = f"global:{global_slug}"
-        if use_cache and Config.ENABLE_CACHING:
-            cached = self.cache.get(cache_key)
-            if cached:
-                return cached
+        cache_key = str(QueryKey.for_global(global_slug))
+
+        async def _fetch():
+            caching = use_cache and Config.ENABLE_CACHING
+            data, response = await self._get_revalidated(
+                cache_key,
+                f"/globals/{global_slug}",
+                {},
+                lambda body: body,
+                revalidate=caching,
+            )
 
-        response = await self._request("GET", f"/globals/{global_slug}")
+            # Cache result
+            if caching and response is not None:
+                self.cache.set(cache_key, data, raw=response.content)
+                self._store_validators(cache_key, response)
 
-        # Cache result
-        if use_cache and Config.ENABLE_CACHING:
-            self.cache.set(cache_key, response)
+            return data
 
-        return response
+        # Execute with deduplication
+        async def _deduplicated():
+            return await self.deduplicator.execute(f"get_global:{global_slug}", _fetch)
+
+        # Check cache (stale entries are served while refreshing, and
+        # missing globals are remembered briefly)
+        if use_cache and Config.ENABLE_CACHING:
+            return await self.cache.get_or_fetch(
+                cache_key, _deduplicated, cache_not_found=True, as_json=as_json
+            )
+        result = await _deduplicated()
+        return to_json(result) if as_json else result
 
     async def update_global(
         self,
@@ -587,7 +1146,7 @@ class EnhancedCMSClient:
 
         # Invalidate cache
         if Config.ENABLE_CACHING:
-            self.cache.delete(f"global:{global_slug}")
+            self.cache.delete(str(QueryKey.for_global(global_slug)))
 
         # Audit log
         if Config.ENABLE_AUDIT_LOG:
@@ -630,12 +1189,62 @@ class EnhancedCMSClient:
         Returns:
             Metrics dictionary
         """
+        refreshes = self._refresh_stats["refreshes"]
         return {
             "cache": self.cache.get_stats(),
+            "revalidation": {
+                **self._refresh_stats,
+                "bytes_per_refresh": (
+                    round(self._refresh_stats["bytes_received"] / refreshes)
+                    if refreshes else 0
+                ),
+            },
             "circuit_breaker": self.circuit_breaker.get_state(),
             "request_deduplication": self.deduplicator.get_stats(),
+            "document_batching": {
+                collection: loader.get_stats()
+                for collection, loader in self._document_loaders.items()
+            },
+            "auth": self.auth.get_stats(),
             "connection_pool": (
                 self._connection_pool.get_stats()
                 if self._connection_pool else {}
             ),
         }
+
+
+# Process-wide client instance
+_cms_client: Optional[EnhancedCMSClient] = None
+_client_lock = asyncio.Lock()
+
+
+async def get_cms_client() -> EnhancedCMSClient:
+    """
+    Get the process-wide CMS client instance.
+
+    Creates the client on first use. Sharing one instance lets the
+    SmartCache, RequestDeduplicator, CircuitBreaker and AuthService keep
+    their state across tool calls.
+
+    Returns:
+        Shared EnhancedCMSClient instance
+    """
+    global _cms_client
+
+    async with _client_lock:
+        if _cms_client is None:
+            logger.info("Initializing shared CMS client")
+            _cms_client = EnhancedCMSClient(connection_pool=await get_global_pool())
+
+        return _cms_client
+
+
+async def close_cms_client():
+    """Close the process-wide CMS client."""
+    global _cms_client
+
+    async with _client_lock:
+        if _cms_client:
+            await _cms_client.close()
+            _cms_client = None
+            logger.info("Shared CMS client closed")
@@ -0,0 +1,175 @@
+"""Push-based cache invalidation from Payload change hooks."""
+
+import hashlib
+import hmac
+import json
+import math
+import time
+from typing import Any, Optional
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from config import Config
+from core.cache_keys import QueryKey
+from core.smart_cache import SmartCache
+from services.cms_client_enhanced import get_cms_client
+from utils.errors import ValidationError
+from utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+SIGNATURE_HEADER = "X-Payload-Signature"
+
+OPERATIONS = ("create", "update", "delete")
+
+
+def sign_payload(secret: str, body: bytes) -> str:
+    """
+    Sign a change event body the way the Payload hook does.
+
+    Args:
+        secret: Shared secret (CACHE_INVALIDATION_SECRET)
+        body: Raw request body
+
+    Returns:
+        Signature header value ("sha256=<hex digest>")
+    """
+    digest = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    """
+    Check a change event's HMAC signature in constant time.
+
+    Args:
+        secret: Shared secret
+        body: Raw request body
+        signature: Value of the signature header
+
+    Returns:
+        True if the signature matches
+    """
+    if not secret or not signature:
+        return False
+    return hmac.compare_digest(sign_payload(secret, body), signature)
+
+
+def apply_change_event(cache: SmartCache, event: dict[str, Any]) -> int:
+    """
+    Invalidate the cache entries affected by one CMS change.
+
+    Collection events look like ``{"collection": "projects", "id": "p1",
+    "operation": "update", "changes": ["title"], "updatedAt": "..."}``;
+    global events name the slug instead: ``{"global": "footer",
+    "operation": "update"}``. With ``changes``, only list pages that
+    contain the document or filter on a changed field are dropped. A
+    cached document at least as new as ``updatedAt`` (e.g. written
+    through by this server's own update) is kept.
+
+    Args:
+        cache: Cache to invalidate
+        event: Decoded change event
+
+    Returns:
+        Number of cache entries invalidated
+
+    Raises:
+        ValidationError: If the event is malformed
+    """
+    operation = event.get("operation")
+    if operation not in OPERATIONS:
+        raise ValidationError(f"Unknown operation: {operation!r}")
+
+    before = cache.get_stats()["invalidations"]
+
+    slug = event.get("global")
+    if slug is not None:
+        if not isinstance(slug, str) or not slug:
+            raise ValidationError("'global' must be a non-empty string")
+        _invalidate_document(cache, str(QueryKey.for_global(slug)), event.get("updatedAt"))
+        return cache.get_stats()["invalidations"] - before
+
+    collection = event.get("collection")
+    if not isinstance(collection, str) or not collection:
+        raise ValidationError("'collection' must be a non-empty string")
+
+    doc_id = event.get("id")
+    changes = event.get("changes")
+    if changes is not None and not isinstance(changes, list):
+        raise ValidationError("'changes' must be a list of field names")
+
+    if doc_id is not None:
+        doc_id = str(doc_id)
+        _invalidate_document(
+            cache,
+            str(QueryKey.for_document(collection, doc_id)),
+            event.get("updatedAt") if operation == "update" else None,
+        )
+
+    if operation == "update":
+        cache.invalidate_smart("update", collection, doc_id=doc_id, changes=changes)
+    else:
+        cache.invalidate_smart(operation, collection)
+
+    return cache.get_stats()["invalidations"] - before
+
+
+def _invalidate_document(cache: SmartCache, key: str, updated_at: Optional[str]):
+    """Drop a cached document or global unless it is already this version."""
+    if isinstance(updated_at, str) and cache.is_current(key, updated_at):
+        return
+    cache.delete(key)
+
+
+async def handle_change_event(request: Request) -> JSONResponse:
+    """
+    HTTP endpoint receiving change events from the Payload hook.
+
+    The body must be signed with CACHE_INVALIDATION_SECRET (see
+    ``sign_payload``) and carry a ``timestamp`` within
+    CACHE_INVALIDATION_MAX_SKEW seconds, so captured requests can't be
+    replayed later. The endpoint answers 404 while no secret is set.
+
+    Args:
+        request: Incoming POST request
+
+    Returns:
+        JSON response with the number of entries invalidated
+    """
+    secret = Config.CACHE_INVALIDATION_SECRET
+    if not secret:
+        return JSONResponse({"success": False, "error": "Not found"}, status_code=404)
+
+    body = await request.body()
+    if not verify_signature(secret, body, request.headers.get(SIGNATURE_HEADER)):
+        logger.warning("Rejected change event with bad signature")
+        return JSONResponse({"success": False, "error": "Invalid signature"}, status_code=401)
+
+    try:
+        event = json.loads(body)
+        if not isinstance(event, dict):
+            raise ValidationError("Event must be a JSON object")
+        timestamp = event.get("timestamp")
+        # JSON true is an int to Python, and NaN never compares as too old
+        if (
+            isinstance(timestamp, bool)
+            or not isinstance(timestamp, (int, float))
+            or not math.isfinite(timestamp)
+            or abs(time.time() - timestamp) > Config.CACHE_INVALIDATION_MAX_SKEW
+        ):
+            return JSONResponse({"success": False, "error": "Stale event"}, status_code=401)
+
+        client = await get_cms_client()
+        invalidated = apply_change_event(client.cache, event)
+
+    except (ValueError, ValidationError) as e:
+        return JSONResponse({"success": False, "error": str(e)}, status_code=400)
+
+    logger.info(
+        "Applied CMS change event",
+        collection=event.get("collection") or event.get("global"),
+        doc_id=event.get("id"),
+        operation=event.get("operation"),
+        invalidated=invalidated,
+    )
+    return JSONResponse({"success": True, "invalidated": invalidated})
@@ -3,9 +3,11 @@
 import pytest
 import asyncio
 import os
+import json
+import httpx
 from unittest.mock import Mock, AsyncMock, patch
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 # Set test environment variables BEFORE importing config
 os.environ["CMS_API_URL"] = "http://localhost:3001/api"
@@ -178,6 +180,196 @@ async def connection_pool():
     await pool.close()
 
 
+# ============================================================================
+# Fake Payload Fixtures
+# ============================================================================
+
+class FakePayload:
+    """In-process stand-in for the Payload REST API."""
+
+    def __init__(self):
+        """Initialize fake CMS with a small set of documents."""
+        self.collections: Dict[str, list[dict]] = {
+            "projects": [
+                {"id": "test-1", "title": "Test Project", "_status": "draft"},
+                {"id": "test-2", "title": "Another Project", "_status": "published"},
+            ],
+            "portfolio": [],
+            "media": [],
+        }
+        self.globals: Dict[str, dict] = {
+            "site-settings": {"metaTitle": "Test Site"},
+        }
+        self.requests: list[httpx.Request] = []
+        self.latency = 0.0
+        # Optional per-request delay applied after the request is served
+        self.response_delay = None
+        # Send ETags for globals and honour If-None-Match
+        self.etags = False
+        # Document IDs that where-based bulk writes report as failed
+        self.bulk_errors: set[str] = set()
+        # Status for where-based bulk writes to fail with, changing nothing
+        self.bulk_status: Optional[int] = None
+        self._writes = 0
+
+    def _touch(self, doc: dict) -> dict:
+        """Stamp a document with a strictly increasing updatedAt."""
+        self._writes += 1
+        doc["updatedAt"] = f"2025-01-01T00:00:{self._writes:02d}.000Z"
+        return doc
+
+    def requests_to(self, path: str, method: str = "GET") -> list[httpx.Request]:
+        """Get recorded requests for an API path (e.g. "/projects")."""
+        return [
+            r for r in self.requests
+            if r.method == method and r.url.path == f"/api{path}"
+        ]
+
+    @staticmethod
+    def _matches(doc: dict, params: httpx.QueryParams) -> bool:
+        """Apply simple where[field][equals] and where[field][in] filters to a document."""
+        for key, value in params.multi_items():
+            if key.startswith("where[") and key.endswith("][equals]"):
+                field = key[len("where["):-len("][equals]")]
+                if str(doc.get(field)) != value:
+                    return False
+            elif key.startswith("where[") and key.endswith("][in]"):
+                field = key[len("where["):-len("][in]")]
+                if str(doc.get(field)) not in params.get_list(key):
+                    return False
+        return True
+
+    @staticmethod
+    def _select(doc: dict, params: httpx.QueryParams) -> dict:
+        """Apply select[field]=true projection (id is always returned)."""
+        fields = [
+            key[len("select["):-1] for key in params
+            if key.startswith("select[") and key.endswith("]")
+        ]
+        if not fields:
+            return doc
+        return {k: v for k, v in doc.items() if k == "id" or k in fields}
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        """Serve a request, then hold the response if response_delay says so."""
+        response = await self._serve(request)
+        if self.response_delay:
+            await asyncio.sleep(self.response_delay(request))
+        return response
+
+    async def _serve(self, request: httpx.Request) -> httpx.Response:
+        """Serve a request against the in-memory collections."""
+        self.requests.append(request)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        parts = request.url.path.removeprefix("/api/").split("/")
+
+        if parts == ["users", "login"]:
+            return httpx.Response(200, json={"token": "test-token", "user": {"id": "admin"}})
+
+        if parts[0] == "globals":
+            if parts[1] not in self.globals:
+                return httpx.Response(404, json={"errors": [{"message": "Not Found"}]})
+            body = self._select(self.globals[parts[1]], request.url.params)
+            if not self.etags:
+                return httpx.Response(200, json=body)
+            etag = f'"{hash(json.dumps(body, sort_keys=True)) & 0xFFFFFFFF:x}"'
+            if request.headers.get("if-none-match") == etag:
+                return httpx.Response(304, headers={"ETag": etag})
+            return httpx.Response(200, json=body, headers={"ETag": etag})
+
+        docs = self.collections.get(parts[0])
+        if docs is None:
+            return httpx.Response(404, json={"errors": [{"message": "Not Found"}]})
+
+        if request.method == "GET":
+            matches = [
+                self._select(d, request.url.params)
+                for d in docs if self._matches(d, request.url.params)
+            ]
+            return httpx.Response(200, json={
+                "docs": matches,
+                "totalDocs": len(matches),
+                "page": int(request.url.params.get("page", 1)),
+                "totalPages": 1,
+                "limit": int(request.url.params.get("limit", 10)),
+            })
+
+        if request.method in ("PATCH", "DELETE") and len(parts) == 1:
+            return self._bulk_write(request, docs)
+
+        if request.method == "POST" and len(parts) == 1:
+            doc = self._touch({"id": f"new-{len(docs) + 1}", **json.loads(request.content)})
+            docs.append(doc)
+            return httpx.Response(201, json={"doc": doc, "message": "Created"})
+
+        doc = next((d for d in docs if len(parts) == 2 and d["id"] == parts[1]), None)
+        if doc is None:
+            return httpx.Response(404, json={"errors": [{"message": "Not Found"}]})
+
+        if request.method == "PATCH":
+            doc.update(json.loads(request.content))
+            return httpx.Response(200, json={"doc": self._touch(doc), "message": "Updated"})
+
+        if request.method == "DELETE":
+            docs.remove(doc)
+            return httpx.Response(200, json={"doc": doc, "message": "Deleted"})
+
+        return httpx.Response(405, json={"errors": [{"message": "Method Not Allowed"}]})
+
+    def _bulk_write(self, request: httpx.Request, docs: list[dict]) -> httpx.Response:
+        """Serve a where-based bulk PATCH or DELETE like Payload does."""
+        if self.bulk_status is not None:
+            return httpx.Response(self.bulk_status, json={"errors": [{"message": "Refused"}]})
+        matches = [d for d in docs if self._matches(d, request.url.params)]
+        changed, errors = [], []
+        for doc in matches:
+            if doc["id"] in self.bulk_errors:
+                errors.append({"id": doc["id"], "message": "Validation failed"})
+            elif request.method == "PATCH":
+                doc.update(json.loads(request.content))
+                changed.append(self._touch(doc))
+            else:
+                docs.remove(doc)
+                changed.append(doc)
+        return httpx.Response(400 if errors else 200, json={
+            "docs": changed,
+            "errors": errors,
+            "message": f"{len(changed)} documents changed",
+        })
+
+
+@pytest.fixture
+def fake_payload():
+    """Fake Payload CMS recording every request it receives."""
+    return FakePayload()
+
+
+@pytest.fixture
+def serve_stale(monkeypatch):
+    """Opt clients created after this fixture in to serving stale entries."""
+    from config import Config
+
+    monkeypatch.setattr(Config, "CACHE_STALE_TTL", 3600)
+
+
+@pytest.fixture
+async def shared_cms_client(fake_payload):
+    """Install a process-wide EnhancedCMSClient backed by the fake CMS."""
+    import services.cms_client_enhanced as enhanced
+
+    pool = ConnectionPool(http2=False)
+    pool._client = httpx.AsyncClient(transport=httpx.MockTransport(fake_payload.handler))
+
+    client = enhanced.EnhancedCMSClient(connection_pool=pool)
+    enhanced._cms_client = client
+
+    yield client
+
+    await enhanced.close_cms_client()
+    await pool.close()
+
+
 # ============================================================================
 # Test Data Fixtures
 # ============================================================================
@@ -0,0 +1,351 @@
+"""Integration tests for EnhancedCMSClient against a fake CMS."""
+
+import pytest
+import asyncio
+import json
+import time
+
+
+@pytest.mark.integration
+class TestEnhancedCMSClientIntegration:
+    """Integration tests for EnhancedCMSClient."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lists_with_different_filters_not_coalesced(
+        self, shared_cms_client, fake_payload
+    ):
+        """Test that different queries each get their own result."""
+        fake_payload.latency = 0.05
+
+        drafts, published = await asyncio.gather(
+            shared_cms_client.get_collection(
+                "projects", filters={"where[_status][equals]": "draft"}
+            ),
+            shared_cms_client.get_collection(
+                "projects", filters={"where[_status][equals]": "published"}
+            ),
+        )
+
+        assert [d["id"] for d in drafts["docs"]] == ["test-1"]
+        assert [d["id"] for d in published["docs"]] == ["test-2"]
+        assert len(fake_payload.requests_to("/projects")) == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lists_with_different_pages_not_coalesced(
+        self, shared_cms_client, fake_payload
+    ):
+        """Test that pagination is part of the coalescing key."""
+        fake_payload.latency = 0.05
+
+        first, second = await asyncio.gather(
+            shared_cms_client.get_collection("projects", page=1),
+            shared_cms_client.get_collection("projects", page=2),
+        )
+
+        assert first["page"] == 1
+        assert second["page"] == 2
+        assert len(fake_payload.requests_to("/projects")) == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_lists_coalesced(self, shared_cms_client, fake_payload):
+        """Test that identical queries share one upstream request."""
+        fake_payload.latency = 0.05
+        filters_a = {"where[_status][equals]": "draft", "sort": "-updatedAt"}
+        filters_b = {"sort": "-updatedAt", "where[_status][equals]": "draft"}
+
+        results = await asyncio.gather(
+            shared_cms_client.get_collection("projects", filters=filters_a),
+            shared_cms_client.get_collection("projects", filters=filters_b),
+            shared_cms_client.get_collection("projects", filters=filters_a),
+        )
+
+        assert all(r == results[0] for r in results)
+        assert len(fake_payload.requests_to("/projects")) == 1
+
+        stats = shared_cms_client.get_metrics()["request_deduplication"]
+        assert stats["saved_by_operation"]["get_collection:projects"] == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_key_independent_of_filter_order(self, shared_cms_client, fake_payload):
+        """Test that reordered filters hit the cached query."""
+        await shared_cms_client.get_collection(
+            "projects", filters={"where[_status][equals]": "draft", "sort": "title"}
+        )
+        await shared_cms_client.get_collection(
+            "projects", filters={"sort": "title", "where[_status][equals]": "draft"}
+        )
+
+        assert len(fake_payload.requests_to("/projects")) == 1
+        assert shared_cms_client.cache.get_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_warming_preserves_filtered_entry(self, shared_cms_client, fake_payload):
+        """Test that warming a filtered list keeps it filtered."""
+        filters = {"where[_status][equals]": "published"}
+        await shared_cms_client.get_collection("projects", filters=filters)
+        key = next(iter(shared_cms_client.cache._cache))
+
+        await shared_cms_client.cache._warm_key(key, shared_cms_client)
+
+        warmed = shared_cms_client.cache.get(key)
+        assert [d["id"] for d in warmed["docs"]] == ["test-2"]
+        assert fake_payload.requests_to("/projects")[-1].url.params["where[_status][equals]"] == "published"
+
+    @pytest.mark.asyncio
+    async def test_update_keeps_unrelated_list_pages_cached(
+        self, shared_cms_client, fake_payload
+    ):
+        """Test that editing one project only refetches pages showing it."""
+        drafts = {"where[_status][equals]": "draft"}
+        published = {"where[_status][equals]": "published"}
+        await shared_cms_client.get_collection("projects", filters=drafts)
+        await shared_cms_client.get_collection("projects", filters=published)
+
+        await shared_cms_client.update_document("projects", "test-1", {"title": "Renamed"})
+
+        await shared_cms_client.get_collection("projects", filters=drafts)
+        result = await shared_cms_client.get_collection("projects", filters=published)
+
+        # Only the drafts page (which contains test-1) was refetched
+        assert len(fake_payload.requests_to("/projects")) == 3
+        assert [d["id"] for d in result["docs"]] == ["test-2"]
+
+    @pytest.mark.asyncio
+    async def test_update_writes_through_to_document_cache(
+        self, shared_cms_client, fake_payload
+    ):
+        """Test that a get right after an update is served from cache."""
+        await shared_cms_client.update_document("projects", "test-1", {"title": "Renamed"})
+
+        doc = await shared_cms_client.get_document("projects", "test-1")
+
+        assert doc["title"] == "Renamed"
+        assert fake_payload.requests_to("/projects") == []
+
+    @pytest.mark.asyncio
+    async def test_create_writes_through_to_document_cache(
+        self, shared_cms_client, fake_payload
+    ):
+        """Test that a created document is cached under its id."""
+        created = await shared_cms_client.create_document("projects", {"title": "New"})
+
+        doc = await shared_cms_client.get_document("projects", created["id"])
+
+        assert doc == created
+        assert fake_payload.requests_to("/projects") == []
+
+    @pytest.mark.asyncio
+    async def test_out_of_order_update_responses(self, shared_cms_client, fake_payload):
+        """Test that a late response from an earlier write is ignored."""
+        # The first write is applied first but its response arrives last
+        fake_payload.response_delay = lambda request: (
+            0.1 if request.method == "PATCH"
+            and json.loads(request.content)["title"] == "first" else 0.0
+        )
+
+        first_task = asyncio.create_task(
+            shared_cms_client.update_document("projects", "test-1", {"title": "first"})
+        )
+        await asyncio.sleep(0.02)
+        await shared_cms_client.update_document("projects", "test-1", {"title": "second"})
+        await first_task
+
+        doc = await shared_cms_client.get_document("projects", "test-1")
+        assert doc["title"] == "second"
+        assert shared_cms_client.cache.get_stats()["stale_writes_ignored"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cache_snapshot_survives_restart(
+        self, shared_cms_client, fake_payload, tmp_path, monkeypatch
+    ):
+        """Test that a restarted client starts with the previous cache."""
+        from config import Config
+        from services.cms_client_enhanced import EnhancedCMSClient
+
+        monkeypatch.setattr(Config, "CACHE_SNAPSHOT_PATH", str(tmp_path / "cache.snapshot"))
+
+        await shared_cms_client.start()
+        await shared_cms_client.get_global("site-settings")
+        await shared_cms_client.close()
+
+        restarted = EnhancedCMSClient(connection_pool=shared_cms_client._connection_pool)
+        await restarted.start()
+        await restarted._snapshot_tasks[0]
+
+        assert await restarted.get_global("site-settings") == {"metaTitle": "Test Site"}
+        assert len(fake_payload.requests_to("/globals/site-settings")) == 1
+        await restarted.close()
+
+
+    @pytest.mark.asyncio
+    async def test_missing_document_cached_until_created(
+        self, shared_cms_client, fake_payload
+    ):
+        """Test that repeated probes for a missing id hit the CMS once."""
+        from utils.errors import ResourceNotFoundError
+
+        for _ in range(3):
+            with pytest.raises(ResourceNotFoundError):
+                await shared_cms_client.get_document("projects", "probe")
+
+        assert len(fake_payload.requests_to("/projects")) == 1
+        stats = shared_cms_client.cache.get_stats()
+        assert stats["negative_hits"] == 2
+        assert stats["hits"] == 0
+
+        await shared_cms_client.create_document("projects", {"id": "probe", "title": "Probe"})
+        doc = await shared_cms_client.get_document("projects", "probe")
+        assert doc["title"] == "Probe"
+
+    @pytest.mark.asyncio
+    async def test_concurrent_document_reads_batched(self, shared_cms_client, fake_payload):
+        """Test that concurrent gets of different documents make one request."""
+        from utils.errors import ResourceNotFoundError
+
+        fake_payload.collections["projects"] += [
+            {"id": f"bulk-{i}", "title": f"Bulk {i}"} for i in range(40)
+        ]
+
+        results = await asyncio.gather(
+            *(shared_cms_client.get_document("projects", f"bulk-{i}") for i in range(40)),
+            shared_cms_client.get_document("projects", "missing"),
+            return_exceptions=True,
+        )
+
+        assert [doc["title"] for doc in results[:40]] == [f"Bulk {i}" for i in range(40)]
+        assert isinstance(results[40], ResourceNotFoundError)
+
+        requests = fake_payload.requests_to("/projects")
+        assert len(requests) == 1
+        assert len(requests[0].url.params.get_list("where[id][in]")) == 41
+        stats = shared_cms_client.get_metrics()["document_batching"]["projects"]
+        assert stats["batches"] == 1
+        assert stats["avg_batch_size"] == 41
+
+        # Each document, and the miss, was cached under its own key
+        await shared_cms_client.get_document("projects", "bulk-7")
+        with pytest.raises(ResourceNotFoundError):
+            await shared_cms_client.get_document("projects", "missing")
+        assert len(fake_payload.requests_to("/projects")) == 1
+
+    @pytest.mark.asyncio
+    async def test_batched_reads_match_integer_ids(self, shared_cms_client, fake_payload):
+        """Test that numeric document IDs are found, not cached as missing."""
+        fake_payload.collections["projects"] += [
+            {"id": 7, "title": "Seven"},
+            {"id": 8, "title": "Eight"},
+        ]
+
+        seven, eight = await asyncio.gather(
+            shared_cms_client.get_document("projects", 7),
+            shared_cms_client.get_document("projects", "8"),
+        )
+
+        assert (seven["title"], eight["title"]) == ("Seven", "Eight")
+        assert len(fake_payload.requests_to("/projects")) == 1
+        assert shared_cms_client.cache.get_stats()["negative_hits"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_read_retried_per_document(
+        self, shared_cms_client, fake_payload, monkeypatch
+    ):
+        """Test that a batch the CMS rejects is read one document at a time."""
+        import httpx
+        from utils.errors import CMSConnectionError
+
+        serve = fake_payload._serve
+
+        async def reject_bad_ids(request):
+            if "bad id" in request.url.params.get_list("where[id][in]"):
+                fake_payload.requests.append(request)
+                return httpx.Response(400, json={"errors": [{"message": "Invalid ID"}]})
+            return await serve(request)
+
+        monkeypatch.setattr(fake_payload, "_serve", reject_bad_ids)
+
+        first, second, bad = await asyncio.gather(
+            shared_cms_client.get_document("projects", "test-1"),
+            shared_cms_client.get_document("projects", "test-2"),
+            shared_cms_client.get_document("projects", "bad id"),
+            return_exceptions=True,
+        )
+
+        assert first["title"] == "Test Project"
+        assert second["title"] == "Another Project"
+        assert isinstance(bad, CMSConnectionError)
+        # The batch, then one read per document
+        assert len(fake_payload.requests_to("/projects")) == 4
+        stats = shared_cms_client.get_metrics()["document_batching"]["projects"]
+        assert stats["batches"] == 1
+        assert stats["failed_batches"] == 0
+
+    @pytest.mark.asyncio
+    async def test_missing_global_cached(self, shared_cms_client, fake_payload):
+        """Test that a missing global is remembered."""
+        from utils.errors import ResourceNotFoundError
+
+        for _ in range(2):
+            with pytest.raises(ResourceNotFoundError):
+                await shared_cms_client.get_global("no-such-global")
+
+        assert len(fake_payload.requests_to("/globals/no-such-global")) == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_document_revalidated_by_updated_at(
+        self, serve_stale, shared_cms_client, fake_payload
+    ):
+        """Test that an unchanged document is confirmed with a small probe."""
+        await shared_cms_client.update_document("projects", "test-1", {"title": "Same"})
+        await shared_cms_client.get_document("projects", "test-1")
+        fake_payload.requests.clear()
+
+        # Past the soft TTL: served stale, refreshed in the background
+        shared_cms_client.cache._expiry["doc:projects:test-1"] = time.monotonic() - 1
+        await shared_cms_client.get_document("projects", "test-1")
+        await asyncio.gather(*shared_cms_client.cache._refresh_tasks.values())
+
+        (probe,) = fake_payload.requests_to("/projects")
+        assert probe.url.params["select[updatedAt]"] == "true"
+        assert shared_cms_client.cache.get("doc:projects:test-1")["title"] == "Same"
+
+        revalidation = shared_cms_client.get_metrics()["revalidation"]
+        assert revalidation["refreshes"] == 1
+        assert revalidation["not_modified"] == 1
+        assert 0 < revalidation["bytes_per_refresh"] < 200
+
+    @pytest.mark.asyncio
+    async def test_changed_document_refetched_after_probe(
+        self, serve_stale, shared_cms_client, fake_payload
+    ):
+        """Test that a changed updatedAt triggers a full fetch."""
+        await shared_cms_client.update_document("projects", "test-1", {"title": "Old"})
+        await shared_cms_client.get_document("projects", "test-1")
+        fake_payload._touch(fake_payload.collections["projects"][0])["title"] = "New"
+
+        shared_cms_client.cache._expiry["doc:projects:test-1"] = time.monotonic() - 1
+        await shared_cms_client.get_document("projects", "test-1")
+        await asyncio.gather(*shared_cms_client.cache._refresh_tasks.values())
+
+        assert len(fake_payload.requests_to("/projects")) == 2
+        assert shared_cms_client.cache.get("doc:projects:test-1")["title"] == "New"
+        assert shared_cms_client.get_metrics()["revalidation"]["not_modified"] == 0
+
+    @pytest.mark.asyncio
+    async def test_global_revalidated_with_etag(
+        self, serve_stale, shared_cms_client, fake_payload
+    ):
+        """Test that a global with an ETag is refreshed with If-None-Match."""
+        fake_payload.etags = True
+        await shared_cms_client.get_global("site-settings")
+
+        shared_cms_client.cache._expiry["global:site-settings"] = time.monotonic() - 1
+        await shared_cms_client.get_global("site-settings")
+        await asyncio.gather(*shared_cms_client.cache._refresh_tasks.values())
+
+        first, second = fake_payload.requests_to("/globals/site-settings")
+        assert "if-none-match" not in first.headers
+        assert second.headers["if-none-match"].startswith('"')
+        revalidation = shared_cms_client.get_metrics()["revalidation"]
+        assert revalidation["not_modified"] == 1
+        assert revalidation["bytes_received"] == 0
+        assert shared_cms_client.cache.get("global:site-settings") == {"metaTitle": "Test Site"}
@@ -1,8 +1,12 @@
 """Integration tests for cms_collection_ops tool."""
 
+import json
 import pytest
 from unittest.mock import patch, AsyncMock
 from tools.consolidated.collections import cms_collection_ops_handler
+from services.batch import batch_delete_documents
+from services.cms_client_enhanced import get_cms_client
+from core.encoded_json import dumps_result
 
 
 @pytest.mark.integration
@@ -12,12 +16,10 @@ class TestCollectionsToolIntegration:
     @pytest.mark.asyncio
     async def test_create_operation(self, mock_project_data):
         """Test create operation end-to-end."""
-        with patch('tools.consolidated.collections.EnhancedCMSClient') as MockClient:
+        with patch('tools.consolidated.collections.get_cms_client', new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
             mock_client.create_document = AsyncMock(return_value={"id": "test-1"})
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            MockClient.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             result = await cms_collection_ops_handler(
                 operation="create",
@@ -33,15 +35,13 @@ class TestCollectionsToolIntegration:
     @pytest.mark.asyncio
     async def test_get_operation(self):
         """Test get operation end-to-end."""
-        with patch('tools.consolidated.collections.EnhancedCMSClient') as MockClient:
+        with patch('tools.consolidated.collections.get_cms_client', new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
             mock_client.get_document = AsyncMock(return_value={
                 "id": "test-1",
                 "title": "Test Project",
             })
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            MockClient.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             result = await cms_collection_ops_handler(
                 operation="get",
@@ -56,7 +56,7 @@ class TestCollectionsToolIntegration:
     @pytest.mark.asyncio
     async def test_list_operation(self):
         """Test list operation end-to-end."""
-        with patch('tools.consolidated.collections.EnhancedCMSClient') as MockClient:
+        with patch('tools.consolidated.collections.get_cms_client', new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
             mock_client.get_collection = AsyncMock(return_value={
                 "docs": [{"id": "1"}, {"id": "2"}],
@@ -65,9 +65,7 @@ class TestCollectionsToolIntegration:
                 "totalPages": 1,
                 "limit": 100,
             })
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            MockClient.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             result = await cms_collection_ops_handler(
                 operation="list",
@@ -83,15 +81,13 @@ class TestCollectionsToolIntegration:
     @pytest.mark.asyncio
     async def test_update_operation(self):
         """Test update operation end-to-end."""
-        with patch('tools.consolidated.collections.EnhancedCMSClient') as MockClient:
+        with patch('tools.consolidated.collections.get_cms_client', new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
             mock_client.update_document = AsyncMock(return_value={
                 "id": "test-1",
                 "title": "Updated",
             })
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            MockClient.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             result = await cms_collection_ops_handler(
                 operation="update",
@@ -119,12 +115,10 @@ class TestCollectionsToolIntegration:
     @pytest.mark.asyncio
     async def test_delete_with_confirmation(self):
         """Test delete operation with confirmation."""
-        with patch('tools.consolidated.collections.EnhancedCMSClient') as MockClient:
+        with patch('tools.consolidated.collections.get_cms_client', new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
             mock_client.delete_document = AsyncMock(return_value=True)
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            MockClient.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             # Also need to patch Config
             with patch('tools.consolidated.collections.Config') as MockConfig:
@@ -142,15 +136,13 @@ class TestCollectionsToolIntegration:
     @pytest.mark.asyncio
     async def test_publish_operation(self):
         """Test publish operation."""
-        with patch('tools.consolidated.collections.EnhancedCMSClient') as MockClient:
+        with patch('tools.consolidated.collections.get_cms_client', new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
             mock_client.update_document = AsyncMock(return_value={
                 "id": "test-1",
                 "_status": "published",
             })
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            MockClient.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             with patch('tools.consolidated.collections.Config') as MockConfig:
                 MockConfig.REQUIRE_APPROVAL_FOR_PUBLISH = False
@@ -190,15 +182,13 @@ class TestCollectionsToolIntegration:
     @pytest.mark.asyncio
     async def test_search_operation(self):
         """Test search operation."""
-        with patch('tools.consolidated.collections.EnhancedCMSClient') as MockClient:
+        with patch('tools.consolidated.collections.get_cms_client', new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
             mock_client.get_collection = AsyncMock(return_value={
                 "docs": [{"id": "1", "title": "React Project"}],
                 "totalDocs": 1,
             })
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            MockClient.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             result = await cms_collection_ops_handler(
                 operation="search",
@@ -213,15 +203,13 @@ class TestCollectionsToolIntegration:
     @pytest.mark.asyncio
     async def test_archive_operation(self):
         """Test archive operation."""
-        with patch('tools.consolidated.collections.EnhancedCMSClient') as MockClient:
+        with patch('tools.consolidated.collections.get_cms_client', new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
             mock_client.update_document = AsyncMock(return_value={
                 "id": "test-1",
                 "_status": "archived",
             })
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            MockClient.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             result = await cms_collection_ops_handler(
                 operation="archive",
@@ -234,15 +222,13 @@ class TestCollectionsToolIntegration:
     @pytest.mark.asyncio
     async def test_restore_operation(self):
         """Test restore operation."""
-        with patch('tools.consolidated.collections.EnhancedCMSClient') as MockClient:
+        with patch('tools.consolidated.collections.get_cms_client', new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
             mock_client.update_document = AsyncMock(return_value={
                 "id": "test-1",
                 "_status": "draft",
             })
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            MockClient.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             result = await cms_collection_ops_handler(
                 operation="restore",
@@ -255,12 +241,10 @@ class TestCollectionsToolIntegration:
     @pytest.mark.asyncio
     async def test_error_handling(self):
         """Test that errors are handled gracefully."""
-        with patch('tools.consolidated.collections.EnhancedCMSClient') as MockClient:
+        with patch('tools.consolidated.collections.get_cms_client', new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
             mock_client.get_document = AsyncMock(side_effect=Exception("CMS Error"))
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            MockClient.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             result = await cms_collection_ops_handler(
                 operation="get",
@@ -271,3 +255,230 @@ class TestCollectionsToolIntegration:
             assert result["success"] is False
             assert "error" in result
             assert "message" in result
+
+    @pytest.mark.asyncio
+    async def test_handlers_share_process_wide_client(self, shared_cms_client):
+        """Test that every call resolves to the same client instance."""
+        assert await get_cms_client() is shared_cms_client
+        assert await get_cms_client() is shared_cms_client
+
+    @pytest.mark.asyncio
+    async def test_cache_hits_across_sequential_calls(self, shared_cms_client, fake_payload):
+        """Test that a second get is served from the shared client's cache."""
+        for _ in range(2):
+            result = await cms_collection_ops_handler(
+                operation="get",
+                collection="projects",
+                doc_id="test-1",
+            )
+            assert result["success"] is True
+            assert result["data"]["title"] == "Test Project"
+
+        stats = shared_cms_client.cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["hit_rate"] > 0
+        assert len(fake_payload.requests_to("/projects")) == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("codec", [None, "zlib"])
+    async def test_passthrough_matches_parsed_result(self, shared_cms_client, codec):
+        """Test that spliced CMS bodies serialize to the same result."""
+        shared_cms_client.cache.codec = codec
+        calls = [
+            {"operation": "get", "collection": "projects", "doc_id": "test-1"},
+            {"operation": "list", "collection": "projects", "limit": 10},
+            {"operation": "search", "collection": "projects", "query": "Project"},
+        ]
+
+        # First round fetches, second is served from cache
+        for _ in range(2):
+            for call in calls:
+                expected = await cms_collection_ops_handler(**call)
+                result = await cms_collection_ops_handler(**call, passthrough=True)
+                assert json.loads(dumps_result(result)) == expected
+
+    @pytest.mark.asyncio
+    async def test_bulk_publish(self, shared_cms_client, fake_payload):
+        """Test that publishing many documents takes one where-based PATCH."""
+        fake_payload.collections["projects"] += [
+            {"id": f"bulk-{i}", "title": f"Bulk {i}", "_status": "draft"} for i in range(5)
+        ]
+        fake_payload.bulk_errors = {"bulk-3"}
+        doc_ids = [f"bulk-{i}" for i in range(5)] + ["missing"]
+
+        # Cached drafts must not outlive the publish
+        assert (await shared_cms_client.get_document("projects", "bulk-0"))["_status"] == "draft"
+
+        result = await cms_collection_ops_handler(
+            operation="publish",
+            collection="projects",
+            doc_ids=doc_ids,
+        )
+
+        assert result["successful"] == 4
+        assert [e["item"]["id"] for e in result["errors"]] == ["bulk-3", "missing"]
+        assert len(fake_payload.requests_to("/projects", method="PATCH")) == 1
+        assert (await shared_cms_client.get_document("projects", "bulk-0"))["_status"] == "published"
+
+    @pytest.mark.asyncio
+    async def test_publish_requires_a_document(self, shared_cms_client):
+        """Test that publish without doc_id or doc_ids is rejected."""
+        result = await cms_collection_ops_handler(operation="publish", collection="projects")
+
+        assert result["success"] is False
+        assert result["error"] == "Validation error"
+
+    @pytest.mark.asyncio
+    async def test_bulk_delete(self, shared_cms_client, fake_payload):
+        """Test that batch_delete takes one where-based DELETE."""
+        result = await cms_collection_ops_handler(
+            operation="batch_delete",
+            collection="projects",
+            doc_ids=["test-1", "test-2"],
+            confirm=True,
+        )
+
+        assert result["successful"] == 2
+        assert len(fake_payload.requests_to("/projects", method="DELETE")) == 1
+        assert fake_payload.collections["projects"] == []
+
+    @pytest.mark.asyncio
+    async def test_refused_bulk_publish_sent_per_document(self, shared_cms_client, fake_payload):
+        """Test that a bulk write refused with a 4xx falls back to one PATCH per document."""
+        fake_payload.bulk_status = 403
+
+        result = await cms_collection_ops_handler(
+            operation="publish",
+            collection="projects",
+            doc_ids=["test-1", "test-2"],
+        )
+
+        assert result["successful"] == 2
+        assert len(fake_payload.requests_to("/projects/test-1", method="PATCH")) == 1
+        assert len(fake_payload.requests_to("/projects/test-2", method="PATCH")) == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_bulk_delete_not_resent(self, shared_cms_client, fake_payload):
+        """Test that a bulk write failing with a 5xx isn't repeated per document."""
+        fake_payload.bulk_status = 502
+
+        result = await batch_delete_documents(
+            collection="projects",
+            doc_ids=["test-1", "test-2"],
+            confirm=True,
+            client=shared_cms_client,
+            bulk=True,
+        )
+
+        assert result["failed"] == 2
+        assert [e["attempts"] for e in result["errors"]] == [1, 1]
+        assert fake_payload.requests_to("/projects/test-1", method="DELETE") == []
+        assert fake_payload.requests_to("/projects/test-2", method="DELETE") == []
+
+    @pytest.mark.asyncio
+    async def test_timed_out_delete_retried(self, shared_cms_client, fake_payload, monkeypatch):
+        """Test that a transport timeout is retried under the delete policy."""
+        import httpx
+        from core.batch_executor import BatchExecutor
+        from core.retry import get_retry_config
+        from utils.errors import CMSTimeoutError
+
+        serve = fake_payload._serve
+        timed_out = set()
+
+        async def time_out_once(request):
+            # Each document's first delete times out before reaching the CMS
+            if request.method == "DELETE" and request.url.path not in timed_out:
+                timed_out.add(request.url.path)
+                fake_payload.requests.append(request)
+                raise httpx.ReadTimeout("timed out", request=request)
+            return await serve(request)
+
+        monkeypatch.setattr(fake_payload, "_serve", time_out_once)
+
+        with pytest.raises(CMSTimeoutError):
+            await shared_cms_client.delete_document("projects", "test-2")
+
+        result = await batch_delete_documents(
+            collection="projects",
+            doc_ids=["test-1", "test-2"],
+            confirm=True,
+            client=shared_cms_client,
+            executor=BatchExecutor(backoff_unit=0),
+            retry=get_retry_config("delete"),
+        )
+
+        assert result["successful"] == 2
+        assert fake_payload.collections["projects"] == []
+        assert len(fake_payload.requests_to("/projects/test-1", method="DELETE")) == 2
+
+    @pytest.mark.asyncio
+    async def test_slow_item_past_batch_timeout(self, shared_cms_client, fake_payload, monkeypatch):
+        """Test that a batch over its timeout still reports the items that finished."""
+        from core.retry import RETRY_CONFIGS, RetryConfig
+
+        monkeypatch.setitem(RETRY_CONFIGS, "batch_create", RetryConfig(
+            max_retries=0, backoff_factor=1.0, retry_on=(), timeout=1,
+        ))
+        # The slow item's response takes far longer than the whole batch may
+        fake_payload.response_delay = lambda request: (
+            30.0 if request.url.path == "/api/portfolio"
+            and json.loads(request.content)["title"] == "Slow" else 0.0
+        )
+
+        result = await cms_collection_ops_handler(
+            operation="batch_create",
+            collection="portfolio",
+            items=[{"title": "Fast"}, {"title": "Slow"}, {"title": "Also fast"}],
+        )
+
+        assert result["successful"] == 2
+        assert [doc["title"] for doc in result["results"]] == ["Fast", "Also fast"]
+        assert result["failed"] == 1
+        assert result["errors"][0]["index"] == 1
+        assert result["errors"][0]["attempts"] == 1
+        assert "deadline" in result["errors"][0]["error"]
+
+    @pytest.mark.asyncio
+    async def test_chunked_batch_create(self, shared_cms_client, fake_payload):
+        """Test that chunked mode takes batches over the 100-item limit as JSON text."""
+        items = [{"id": f"migrated-{i}", "title": f"Item {i}"} for i in range(250)]
+        done = []
+
+        async def progress(count):
+            done.append(count)
+
+        capped = await cms_collection_ops_handler(
+            operation="batch_create",
+            collection="portfolio",
+            items=items,
+        )
+        assert capped["error"] == "Validation error"
+
+        result = await cms_collection_ops_handler(
+            operation="batch_create",
+            collection="portfolio",
+            items=json.dumps(items),
+            chunked=True,
+            progress=progress,
+        )
+
+        assert result["success"] is True
+        assert result["totalRequested"] == 250
+        assert result["chunks"] == 3
+        assert done == [100, 200, 250]
+        assert len(fake_payload.requests_to("/portfolio", method="POST")) == 250
+
+    @pytest.mark.asyncio
+    async def test_chunked_batch_delete_requires_confirmation(self, shared_cms_client, fake_payload):
+        """Test that an unconfirmed chunked delete touches nothing."""
+        result = await cms_collection_ops_handler(
+            operation="batch_delete",
+            collection="projects",
+            doc_ids='["test-1", "test-2"]',
+            confirm=False,
+            chunked=True,
+        )
+
+        assert result["requiresConfirmation"] is True
+        assert len(fake_payload.collections["projects"]) == 2
@@ -1,7 +1,12 @@
 """Integration tests for cms_global_ops tool."""
 
+import json
 import pytest
+import time
+from datetime import datetime
 from unittest.mock import patch, AsyncMock
+from core.circuit_breaker import CircuitState
+from core.encoded_json import dumps_result
 from tools.consolidated.globals import cms_global_ops_handler
 
 
@@ -12,12 +17,10 @@ class TestGlobalsToolIntegration:
     @pytest.mark.asyncio
     async def test_get_global(self, mock_global_data):
         """Test get global operation."""
-        with patch('tools.consolidated.globals.EnhancedCMSClient') as MockClient:
+        with patch('tools.consolidated.globals.get_cms_client', new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
             mock_client.get_global = AsyncMock(return_value=mock_global_data)
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            MockClient.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             result = await cms_global_ops_handler(
                 operation="get",
@@ -30,14 +33,12 @@ class TestGlobalsToolIntegration:
     @pytest.mark.asyncio
     async def test_update_global(self):
         """Test update global operation."""
-        with patch('tools.consolidated.globals.EnhancedCMSClient') as MockClient:
+        with patch('tools.consolidated.globals.get_cms_client', new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
             mock_client.update_global = AsyncMock(return_value={
                 "metaTitle": "Updated Site",
             })
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            MockClient.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             result = await cms_global_ops_handler(
                 operation="update",
@@ -65,14 +66,12 @@ class TestGlobalsToolIntegration:
     @pytest.mark.asyncio
     async def test_export_global(self):
         """Test export global operation."""
-        with patch('tools.consolidated.globals.EnhancedCMSClient') as MockClient:
+        with patch('tools.consolidated.globals.get_cms_client', new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
             mock_client.get_global = AsyncMock(return_value={
                 "metaTitle": "Test Site",
             })
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            MockClient.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             result = await cms_global_ops_handler(
                 operation="export",
@@ -87,12 +86,10 @@ class TestGlobalsToolIntegration:
     @pytest.mark.asyncio
     async def test_import_global(self):
         """Test import global operation."""
-        with patch('tools.consolidated.globals.EnhancedCMSClient') as MockClient:
+        with patch('tools.consolidated.globals.get_cms_client', new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
             mock_client.update_global = AsyncMock(return_value={})
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            MockClient.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             import_data = {"metaTitle": "Imported Site"}
 
@@ -141,12 +138,10 @@ class TestGlobalsToolIntegration:
     @pytest.mark.asyncio
     async def test_error_handling(self):
         """Test error handling in global operations."""
-        with patch('tools.consolidated.globals.EnhancedCMSClient') as MockClient:
+        with patch('tools.consolidated.globals.get_cms_client', new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
             mock_client.get_global = AsyncMock(side_effect=Exception("CMS Error"))
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            MockClient.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             result = await cms_global_ops_handler(
                 operation="get",
@@ -155,3 +150,36 @@ class TestGlobalsToolIntegration:
 
             assert result["success"] is False
             assert "error" in result
+
+    @pytest.mark.asyncio
+    async def test_stale_global_served_while_circuit_open(self, serve_stale, shared_cms_client):
+        """Test that an expired global is served stale when the CMS is unavailable."""
+        first = await cms_global_ops_handler(operation="get", global_slug="site-settings")
+        assert "meta" not in first
+
+        # Expire the entry and trip the breaker
+        shared_cms_client.cache._expiry["global:site-settings"] = time.monotonic() - 1
+        shared_cms_client.circuit_breaker.state = CircuitState.OPEN
+        shared_cms_client.circuit_breaker.last_failure_time = datetime.now()
+
+        result = await cms_global_ops_handler(operation="get", global_slug="site-settings")
+
+        assert result["success"] is True
+        assert result["data"] == first["data"]
+        assert result["meta"] == {"stale": True}
+
+
+    @pytest.mark.asyncio
+    async def test_passthrough_global(self, serve_stale, shared_cms_client):
+        """Test that a spliced global serializes like the parsed one, stale or not."""
+        expected = await cms_global_ops_handler(operation="get", global_slug="site-settings")
+        result = await cms_global_ops_handler(
+            operation="get", global_slug="site-settings", passthrough=True
+        )
+        assert json.loads(dumps_result(result)) == expected
+
+        shared_cms_client.cache._expiry["global:site-settings"] = time.monotonic() - 1
+        stale = await cms_global_ops_handler(
+            operation="get", global_slug="site-settings", passthrough=True
+        )
+        assert json.loads(dumps_result(stale)) == {**expected, "meta": {"stale": True}}
@@ -12,15 +12,13 @@ class TestHealthToolIntegration:
     @pytest.mark.asyncio
     async def test_health_check_healthy(self):
         """Test health check when everything is healthy."""
-        with patch('tools.consolidated.health.EnhancedCMSClient') as MockClient:
+        with patch('tools.consolidated.health.get_cms_client', new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
             mock_client.check_health = AsyncMock(return_value={
                 "cms_connected": True,
                 "cms_status": "ok",
             })
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            MockClient.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             result = await cms_health_ops_handler(
                 operation="health_check",
@@ -35,15 +33,13 @@ class TestHealthToolIntegration:
     @pytest.mark.asyncio
     async def test_health_check_degraded(self):
         """Test health check when CMS is not connected."""
-        with patch('tools.consolidated.health.EnhancedCMSClient') as MockClient:
+        with patch('tools.consolidated.health.get_cms_client', new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
             mock_client.check_health = AsyncMock(return_value={
                 "cms_connected": False,
                 "error": "Connection failed",
             })
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            MockClient.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             result = await cms_health_ops_handler(
                 operation="health_check",
@@ -55,15 +51,13 @@ class TestHealthToolIntegration:
     @pytest.mark.asyncio
     async def test_metrics_operation(self):
         """Test metrics operation."""
-        with patch('tools.consolidated.health.EnhancedCMSClient') as MockClient:
+        with patch('tools.consolidated.health.get_cms_client', new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
             mock_client.get_metrics = AsyncMock(return_value={
                 "cache": {"hits": 100, "misses": 20},
                 "circuit_breaker": {"state": "closed"},
             })
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            MockClient.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             with patch('tools.consolidated.health.get_global_pool') as mock_pool_func:
                 mock_pool = AsyncMock()
@@ -83,7 +77,7 @@ class TestHealthToolIntegration:
     @pytest.mark.asyncio
     async def test_cache_stats_operation(self):
         """Test cache stats operation."""
-        with patch('tools.consolidated.health.EnhancedCMSClient') as MockClient:
+        with patch('tools.consolidated.health.get_cms_client', new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
             mock_client.cache = AsyncMock()
             mock_client.cache.get_stats = AsyncMock(return_value={
@@ -92,9 +86,7 @@ class TestHealthToolIntegration:
                 "misses": 100,
                 "hit_rate": 83.33,
             })
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            MockClient.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             result = await cms_health_ops_handler(
                 operation="cache_stats",
@@ -117,16 +109,14 @@ class TestHealthToolIntegration:
             })
             mock_pool_func.return_value = mock_pool
 
-            with patch('tools.consolidated.health.EnhancedCMSClient') as MockClient:
+            with patch('tools.consolidated.health.get_cms_client', new_callable=AsyncMock) as mock_get_client:
                 mock_client = AsyncMock()
                 mock_client.circuit_breaker = AsyncMock()
                 mock_client.circuit_breaker.get_state = AsyncMock(return_value={
                     "state": "closed",
                     "failure_count": 0,
                 })
-                mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-                mock_client.__aexit__ = AsyncMock(return_value=None)
-                MockClient.return_value = mock_client
+                mock_get_client.return_value = mock_client
 
                 result = await cms_health_ops_handler(
                     operation="connection_status",
@@ -139,12 +129,10 @@ class TestHealthToolIntegration:
     @pytest.mark.asyncio
     async def test_error_handling(self):
         """Test error handling in health operations."""
-        with patch('tools.consolidated.health.EnhancedCMSClient') as MockClient:
+        with patch('tools.consolidated.health.get_cms_client', new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
             mock_client.check_health = AsyncMock(side_effect=Exception("Health check failed"))
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            MockClient.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             result = await cms_health_ops_handler(
                 operation="health_check",
@@ -156,14 +144,12 @@ class TestHealthToolIntegration:
     @pytest.mark.asyncio
     async def test_server_info_in_health_check(self):
         """Test that server info is included in health check."""
-        with patch('tools.consolidated.health.EnhancedCMSClient') as MockClient:
+        with patch('tools.consolidated.health.get_cms_client', new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
             mock_client.check_health = AsyncMock(return_value={
                 "cms_connected": True,
             })
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            MockClient.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             result = await cms_health_ops_handler(
                 operation="health_check",
@@ -178,14 +164,12 @@ class TestHealthToolIntegration:
     @pytest.mark.asyncio
     async def test_features_info_in_health_check(self):
         """Test that features info is included in health check."""
-        with patch('tools.consolidated.health.EnhancedCMSClient') as MockClient:
+        with patch('tools.consolidated.health.get_cms_client', new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
             mock_client.check_health = AsyncMock(return_value={
                 "cms_connected": True,
             })
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            MockClient.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             result = await cms_health_ops_handler(
                 operation="health_check",
@@ -0,0 +1,173 @@
+"""Integration tests for the Payload change-hook endpoint."""
+
+import pytest
+import httpx
+import json
+import time
+from starlette.applications import Starlette
+from starlette.routing import Route
+from config import Config
+from services.invalidation import SIGNATURE_HEADER, handle_change_event, sign_payload
+
+SECRET = "test-secret"
+
+
+@pytest.fixture
+def hook_client(shared_cms_client, monkeypatch):
+    """HTTP client for the change-hook endpoint, wired to the shared CMS client."""
+    monkeypatch.setattr(Config, "CACHE_INVALIDATION_SECRET", SECRET)
+    app = Starlette(routes=[
+        Route(Config.CACHE_INVALIDATION_PATH, handle_change_event, methods=["POST"]),
+    ])
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://mcp")
+
+
+async def post_event(client, event, secret=SECRET, timestamp=None):
+    """Post a change event signed the way payload/hooks/cacheInvalidation.ts does."""
+    body = json.dumps({**event, "timestamp": timestamp or time.time()}).encode()
+    return await client.post(
+        Config.CACHE_INVALIDATION_PATH,
+        content=body,
+        headers={"Content-Type": "application/json", SIGNATURE_HEADER: sign_payload(secret, body)},
+    )
+
+
+def edit_in_admin(fake_payload, collection, doc_id, **changes):
+    """Change a document behind the MCP server's back, as an editor would."""
+    doc = next(d for d in fake_payload.collections[collection] if d["id"] == doc_id)
+    doc.update(changes)
+    return fake_payload._touch(doc)
+
+
+@pytest.mark.integration
+class TestInvalidationWebhook:
+    """Tests for push-based cache invalidation."""
+
+    @pytest.mark.asyncio
+    async def test_update_evicts_document_and_lists_containing_it(
+        self, hook_client, shared_cms_client, fake_payload
+    ):
+        """Test that an admin edit is visible on the next read."""
+        cache = shared_cms_client.cache
+        await shared_cms_client.get_document("projects", "test-1")
+        await shared_cms_client.get_collection(
+            "projects", filters={"where[_status][equals]": "draft"}
+        )
+        await shared_cms_client.get_collection(
+            "projects", filters={"where[_status][equals]": "published"}
+        )
+        assert cache.get_stats()["size"] == 3
+
+        doc = edit_in_admin(fake_payload, "projects", "test-1", title="Edited")
+        response = await post_event(hook_client, {
+            "collection": "projects",
+            "id": "test-1",
+            "operation": "update",
+            "changes": ["title"],
+            "updatedAt": doc["updatedAt"],
+        })
+
+        assert response.status_code == 200
+        assert response.json() == {"success": True, "invalidated": 2}
+        # The published page doesn't contain test-1 and stays cached
+        assert cache.get_stats()["size"] == 1
+
+        fresh = await shared_cms_client.get_document("projects", "test-1")
+        assert fresh["title"] == "Edited"
+
+    @pytest.mark.asyncio
+    async def test_own_write_through_kept(self, hook_client, shared_cms_client):
+        """Test that the echo of this server's own update doesn't evict it."""
+        updated = await shared_cms_client.update_document(
+            "projects", "test-1", {"title": "Via MCP"}
+        )
+        key = "doc:projects:test-1"
+        assert shared_cms_client.cache.get(key) is not None
+
+        response = await post_event(hook_client, {
+            "collection": "projects",
+            "id": "test-1",
+            "operation": "update",
+            "changes": ["title"],
+            "updatedAt": updated["updatedAt"],
+        })
+
+        assert response.status_code == 200
+        assert shared_cms_client.cache.get(key)["title"] == "Via MCP"
+
+    @pytest.mark.asyncio
+    async def test_global_update_evicts_global(
+        self, hook_client, shared_cms_client, fake_payload
+    ):
+        """Test that a global change evicts only that global."""
+        await shared_cms_client.get_global("site-settings")
+        fake_payload.globals["site-settings"]["metaTitle"] = "Renamed"
+
+        response = await post_event(
+            hook_client, {"global": "site-settings", "operation": "update"}
+        )
+
+        assert response.json()["invalidated"] == 1
+        settings = await shared_cms_client.get_global("site-settings")
+        assert settings["metaTitle"] == "Renamed"
+
+    @pytest.mark.asyncio
+    async def test_bad_signature_rejected(self, hook_client, shared_cms_client):
+        """Test that unsigned or wrongly signed events change nothing."""
+        await shared_cms_client.get_document("projects", "test-1")
+
+        response = await post_event(
+            hook_client,
+            {"collection": "projects", "id": "test-1", "operation": "delete"},
+            secret="wrong",
+        )
+
+        assert response.status_code == 401
+        assert shared_cms_client.cache.get("doc:projects:test-1") is not None
+
+    @pytest.mark.asyncio
+    async def test_stale_timestamp_rejected(self, hook_client, shared_cms_client):
+        """Test that replayed events outside the allowed skew are refused."""
+        response = await post_event(
+            hook_client,
+            {"collection": "projects", "id": "test-1", "operation": "delete"},
+            timestamp=time.time() - Config.CACHE_INVALIDATION_MAX_SKEW - 60,
+        )
+
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("timestamp", [True, float("nan")])
+    async def test_non_numeric_timestamp_rejected(
+        self, hook_client, shared_cms_client, timestamp
+    ):
+        """Test that booleans and NaN don't pass as timestamps."""
+        await shared_cms_client.get_document("projects", "test-1")
+
+        response = await post_event(
+            hook_client,
+            {"collection": "projects", "id": "test-1", "operation": "delete"},
+            timestamp=timestamp,
+        )
+
+        assert response.status_code == 401
+        assert shared_cms_client.cache.get("doc:projects:test-1") is not None
+
+    @pytest.mark.asyncio
+    async def test_malformed_event_rejected(self, hook_client):
+        """Test that an event without a collection or global is a 400."""
+        response = await post_event(hook_client, {"operation": "update"})
+
+        assert response.status_code == 400
+        assert response.json()["success"] is False
+
+    @pytest.mark.asyncio
+    async def test_disabled_without_secret(self, hook_client, monkeypatch):
+        """Test that the endpoint doesn't exist until a secret is configured."""
+        monkeypatch.setattr(Config, "CACHE_INVALIDATION_SECRET", "")
+
+        response = await post_event(
+            hook_client, {"global": "site-settings", "operation": "update"}
+        )
+
+        assert response.status_code == 404
@@ -15,12 +15,10 @@ class TestMediaToolIntegration:
         file_path = tmp_path / "example.png"
         file_path.write_bytes(b"fake")
 
-        with patch("tools.consolidated.media.EnhancedCMSClient") as MockClient:
+        with patch("tools.consolidated.media.get_cms_client", new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
             mock_client.upload_media_file_path = AsyncMock(return_value={"id": "m1"})
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            MockClient.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             result = await cms_media_ops_handler(
                 operation="upload",
@@ -64,12 +62,10 @@ class TestMediaToolIntegration:
 
     @pytest.mark.asyncio
     async def test_register_success(self):
-        with patch("tools.consolidated.media.EnhancedCMSClient") as MockClient:
+        with patch("tools.consolidated.media.get_cms_client", new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
             mock_client.create_document = AsyncMock(return_value={"id": "m2"})
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            MockClient.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             result = await cms_media_ops_handler(
                 operation="register",
@@ -106,7 +102,7 @@ class TestMediaToolIntegration:
     @pytest.mark.asyncio
     async def test_get_success(self):
         """Test get operation returns media document."""
-        with patch("tools.consolidated.media.EnhancedCMSClient") as MockClient:
+        with patch("tools.consolidated.media.get_cms_client", new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
             mock_client.get_document = AsyncMock(return_value={
                 "id": "media-123",
@@ -114,9 +110,7 @@ class TestMediaToolIntegration:
                 "filename": "test.jpg",
                 "mimeType": "image/jpeg",
             })
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            MockClient.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             result = await cms_media_ops_handler(
                 operation="get",
@@ -146,7 +140,7 @@ class TestMediaToolIntegration:
     @pytest.mark.asyncio
     async def test_list_success(self):
         """Test list operation returns paginated media documents."""
-        with patch("tools.consolidated.media.EnhancedCMSClient") as MockClient:
+        with patch("tools.consolidated.media.get_cms_client", new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
             mock_client.get_collection = AsyncMock(return_value={
                 "docs": [
@@ -158,9 +152,7 @@ class TestMediaToolIntegration:
                 "totalPages": 1,
                 "limit": 50,
             })
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            MockClient.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             result = await cms_media_ops_handler(
                 operation="list",
@@ -178,7 +170,7 @@ class TestMediaToolIntegration:
     @pytest.mark.asyncio
     async def test_list_with_filters(self):
         """Test list operation with JSON filters."""
-        with patch("tools.consolidated.media.EnhancedCMSClient") as MockClient:
+        with patch("tools.consolidated.media.get_cms_client", new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
             mock_client.get_collection = AsyncMock(return_value={
                 "docs": [{"id": "m1", "source": "upload"}],
@@ -187,9 +179,7 @@ class TestMediaToolIntegration:
                 "totalPages": 1,
                 "limit": 25,
             })
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            MockClient.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             result = await cms_media_ops_handler(
                 operation="list",
@@ -206,7 +196,7 @@ class TestMediaToolIntegration:
     @pytest.mark.asyncio
     async def test_list_with_dict_filters(self):
         """Test list operation with dict filters (not JSON string)."""
-        with patch("tools.consolidated.media.EnhancedCMSClient") as MockClient:
+        with patch("tools.consolidated.media.get_cms_client", new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
             mock_client.get_collection = AsyncMock(return_value={
                 "docs": [],
@@ -215,9 +205,7 @@ class TestMediaToolIntegration:
                 "totalPages": 1,
                 "limit": 50,
             })
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            MockClient.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             result = await cms_media_ops_handler(
                 operation="list",
@@ -242,7 +230,7 @@ class TestMediaToolIntegration:
     @pytest.mark.asyncio
     async def test_list_pagination(self):
         """Test list operation pagination parameters."""
-        with patch("tools.consolidated.media.EnhancedCMSClient") as MockClient:
+        with patch("tools.consolidated.media.get_cms_client", new_callable=AsyncMock) as mock_get_client:
             mock_client = AsyncMock()
             mock_client.get_collection = AsyncMock(return_value={
                 "docs": [{"id": "m5"}],
@@ -251,9 +239,7 @@ class TestMediaToolIntegration:
                 "totalPages": 10,
                 "limit": 10,
             })
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=None)
-            MockClient.return_value = mock_client
+            mock_get_client.return_value = mock_client
 
             result = await cms_media_ops_handler(
                 operation="list",
@@ -0,0 +1,49 @@
+"""Performance tests for cache invalidation."""
+
+import time
+import pytest
+from core.smart_cache import SmartCache
+
+
+def fill_cache(size: int) -> SmartCache:
+    """Build a cache holding ``size`` list pages spread over 100 collections."""
+    cache = SmartCache(default_ttl=300, max_entries=size * 2)
+    for i in range(size):
+        cache.set(f"collection:c{i % 100}:page={i}", {"docs": []})
+    return cache
+
+
+def time_writes(cache: SmartCache, writes: int = 200) -> float:
+    """Average seconds per invalidate_smart call on a hot collection."""
+    start = time.perf_counter()
+    for i in range(writes):
+        cache.set(f"collection:projects:page={i}", {"docs": []})
+        cache.invalidate_smart("update", "projects")
+    return (time.perf_counter() - start) / writes
+
+
+@pytest.mark.performance
+class TestInvalidationPerformance:
+    """Write-path invalidation must not scale with cache size."""
+
+    def test_write_latency_flat_as_cache_grows(self):
+        """Test that invalidation cost is independent of unrelated entries."""
+        small = time_writes(fill_cache(1_000))
+        large = time_writes(fill_cache(50_000))
+
+        print(f"\ninvalidate_smart: {small * 1e6:.1f}us @1k, {large * 1e6:.1f}us @50k")
+
+        # A regex scan over 50x the keys would be ~50x slower
+        assert large < small * 5
+
+    def test_glob_pattern_uses_index(self):
+        """Test that a prefix glob only touches matching keys."""
+        cache = fill_cache(20_000)
+        cache.set("collection:projects:page=1", {"docs": []})
+
+        start = time.perf_counter()
+        count = cache.invalidate_pattern("collection:projects:*")
+        elapsed = time.perf_counter() - start
+
+        assert count == 1
+        assert elapsed < 0.005
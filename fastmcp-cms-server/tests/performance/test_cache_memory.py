@@ -0,0 +1,97 @@
+"""Benchmark of resident cache memory with and without encoded storage."""
+
+import json
+import time
+import tracemalloc
+import pytest
+from core.smart_cache import SmartCache
+
+PAGES = 200
+DOCS_PER_PAGE = 50
+
+
+def list_page(page: int) -> bytes:
+    """Build a realistic Payload list response body."""
+    docs = [
+        {
+            "id": f"{page}-{i}",
+            "title": f"Project {page}-{i}",
+            "slug": f"project-{page}-{i}",
+            "_status": "published",
+            "summary": "A case study of a redesign, with process notes and results.",
+            "tags": ["design", "react", "typescript"],
+            "metrics": {"views": i * 13, "likes": i * 3},
+            "createdAt": "2025-01-01T00:00:00.000Z",
+            "updatedAt": "2025-01-02T00:00:00.000Z",
+        }
+        for i in range(DOCS_PER_PAGE)
+    ]
+    return json.dumps({
+        "docs": docs,
+        "totalDocs": PAGES * DOCS_PER_PAGE,
+        "limit": DOCS_PER_PAGE,
+        "page": page,
+    }).encode()
+
+
+def resident_bytes(codec) -> tuple[int, int]:
+    """
+    Fill a cache with list pages and measure what it keeps allocated.
+
+    Args:
+        codec: SmartCache codec (None = parsed objects)
+
+    Returns:
+        (resident bytes, wire bytes)
+    """
+    wire = 0
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    cache = SmartCache(max_bytes=1024 ** 3, codec=codec)
+    for page in range(1, PAGES + 1):
+        # Bodies are released after caching unless the cache keeps them
+        body = list_page(page)
+        wire += len(body)
+        cache.set(f"collection:projects:limit=50&page={page}", json.loads(body), raw=body)
+    del body
+    resident = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+
+    assert cache.get_stats()["size"] == PAGES
+    return resident, wire
+
+
+@pytest.mark.performance
+class TestCacheMemory:
+    """Encoded storage must cut resident memory for the same entries."""
+
+    def test_resident_memory_by_codec(self):
+        """Test that raw and compressed bytes take a fraction of parsed dicts."""
+        parsed, wire = resident_bytes(None)
+        raw, _ = resident_bytes("none")
+        compressed, _ = resident_bytes("zlib")
+
+        print(
+            f"\n{PAGES} list pages, {wire / 1e6:.1f} MB on the wire:"
+            f"\n  parsed dicts: {parsed / 1e6:6.1f} MB ({parsed / wire:.1f}x wire)"
+            f"\n  raw bytes:    {raw / 1e6:6.1f} MB ({raw / wire:.1f}x wire)"
+            f"\n  zlib:         {compressed / 1e6:6.1f} MB ({compressed / wire:.2f}x wire)"
+        )
+        # The tag index (~3 MB here) is the same in every mode; only values shrink
+        assert raw < parsed / 2
+        assert compressed < raw * 0.75
+
+    def test_decode_cost_per_hit(self):
+        """Report what lazy decoding costs on each cache hit."""
+        body = list_page(1)
+        cache = SmartCache(codec="zlib")
+        cache.set("collection:projects:limit=50", json.loads(body), raw=body)
+
+        start = time.perf_counter()
+        for _ in range(200):
+            cache.get("collection:projects:limit=50")
+        per_hit = (time.perf_counter() - start) / 200
+
+        print(f"\nzlib decode of a {len(body) / 1e3:.0f} kB page: {per_hit * 1e3:.2f} ms per hit")
+        assert per_hit < 0.05
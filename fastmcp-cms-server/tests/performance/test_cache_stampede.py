@@ -0,0 +1,70 @@
+"""Load test for cache stampedes on a hot key."""
+
+import asyncio
+import time
+import pytest
+from core.smart_cache import SmartCache
+
+
+async def run_readers(cache: SmartCache, readers: int, duration: float, ttl: int) -> int:
+    """
+    Hammer one key with concurrent readers and count upstream fetches.
+
+    Args:
+        cache: Cache under test
+        readers: Number of concurrent reader tasks
+        duration: Seconds to keep reading
+        ttl: TTL of the hot key
+
+    Returns:
+        Number of upstream fetches
+    """
+    fetches = 0
+
+    async def fetch():
+        nonlocal fetches
+        fetches += 1
+        await asyncio.sleep(0.05)
+        cache.set("global:site-settings", {"metaTitle": "Site"}, ttl=ttl)
+        return {"metaTitle": "Site"}
+
+    await cache.get_or_fetch("global:site-settings", fetch)
+    fetches = 0
+    deadline = time.monotonic() + duration
+
+    async def reader():
+        while time.monotonic() < deadline:
+            await cache.get_or_fetch("global:site-settings", fetch)
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*[reader() for _ in range(readers)])
+    await cache.close()
+    return fetches
+
+
+@pytest.mark.performance
+class TestCacheStampede:
+    """Hot keys must not stampede the CMS when they expire."""
+
+    @pytest.mark.asyncio
+    async def test_one_fetch_per_ttl_under_500_readers(self):
+        """Test that XFetch keeps upstream fetches at ~1 per TTL period."""
+        cache = SmartCache(stale_ttl=0, xfetch_beta=1.0)
+
+        fetches = await run_readers(cache, readers=500, duration=4.0, ttl=2)
+
+        # ~50k reads/s against a 50ms fetch refresh ~0.4s before expiry,
+        # so a 2s TTL yields slightly more than one fetch per period
+        print(f"\nxfetch: {fetches} upstream fetches over 2 TTL periods")
+        assert 1 <= fetches <= 4
+        assert cache.get_stats()["early_refreshes"] == fetches
+
+    @pytest.mark.asyncio
+    async def test_stampede_without_early_refresh(self):
+        """Test the baseline: without XFetch every reader misses at expiry."""
+        cache = SmartCache(stale_ttl=0, xfetch_beta=0)
+
+        fetches = await run_readers(cache, readers=500, duration=1.5, ttl=1)
+
+        print(f"\nno xfetch: {fetches} upstream fetches over 1.5 TTL periods")
+        assert fetches > 50
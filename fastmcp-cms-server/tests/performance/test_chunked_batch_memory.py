@@ -0,0 +1,82 @@
+"""Benchmark of peak memory for chunked batches of growing size."""
+
+import json
+import tracemalloc
+import pytest
+from core.batch_executor import BatchExecutor
+from core.encoded_json import iter_json_array
+from services.batch import batch_create_documents, batch_in_chunks
+
+
+class StubClient:
+    """CMS client that stores nothing, so only the batch machinery is measured."""
+
+    async def create_document(self, collection, data, draft):
+        """Return the created document."""
+        return {**data, "_status": "draft" if draft else "published"}
+
+
+def items_json(count: int) -> str:
+    """Build a batch_create items payload."""
+    return json.dumps([
+        {
+            "id": f"migrated-{i}",
+            "title": f"Portfolio item {i}",
+            "summary": "A case study of a redesign, with process notes and results.",
+            "tags": ["design", "react", "typescript"],
+        }
+        for i in range(count)
+    ])
+
+
+async def peak_bytes(text: str, chunked: bool) -> int:
+    """
+    Run a batch create and measure its peak allocation.
+
+    Args:
+        text: Items as JSON text (allocated before measuring)
+        chunked: Run in chunks from the text, or parse it all up front
+
+    Returns:
+        Peak bytes allocated during the batch
+    """
+    client = StubClient()
+    executor = BatchExecutor(initial_concurrency=8, max_concurrency=8)
+
+    async def run_chunk(chunk):
+        return await batch_create_documents("portfolio", chunk, client=client, executor=executor)
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    if chunked:
+        result = await batch_in_chunks(run_chunk, iter_json_array(text), chunk_size=100)
+    else:
+        result = await run_chunk(json.loads(text))
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+
+    assert result["successful"] == result["totalRequested"]
+    return peak
+
+
+@pytest.mark.performance
+class TestChunkedBatchMemory:
+    """Chunked batches must hold a bounded number of items at once."""
+
+    @pytest.mark.asyncio
+    async def test_peak_memory_flat_in_item_count(self):
+        """Test that ten times the items doesn't raise the chunked peak."""
+        small, large = items_json(1_000), items_json(10_000)
+
+        chunked_small = await peak_bytes(small, chunked=True)
+        chunked_large = await peak_bytes(large, chunked=True)
+        whole_large = await peak_bytes(large, chunked=False)
+
+        print(
+            f"\nPeak memory of batch_create beyond the {len(large) / 1e6:.1f} MB request:"
+            f"\n  chunked,  1,000 items: {chunked_small / 1e6:6.2f} MB"
+            f"\n  chunked, 10,000 items: {chunked_large / 1e6:6.2f} MB"
+            f"\n  whole,   10,000 items: {whole_large / 1e6:6.2f} MB"
+        )
+        assert chunked_large < chunked_small * 1.5
+        assert chunked_large < whole_large / 4
@@ -0,0 +1,99 @@
+"""Benchmark of serving a large list page with and without passthrough."""
+
+import json
+import time
+import pytest
+from core.encoded_json import dumps_result, parse_list_page
+from core.smart_cache import SmartCache
+
+KEY = "collection:projects:limit=3500"
+ROUNDS = 10
+
+
+def list_body(target_bytes: int = 5_000_000) -> bytes:
+    """Build a Payload list response body of about the given size."""
+    doc_count = target_bytes // 1400
+    docs = [
+        {
+            "id": f"project-{i}",
+            "title": f"Project {i}",
+            "slug": f"project-{i}",
+            "_status": "published",
+            "summary": "A case study of a redesign, with process notes and results. " * 20,
+            "tags": ["design", "react", "typescript"],
+            "metrics": {"views": i * 13, "likes": i * 3},
+            "createdAt": "2025-01-01T00:00:00.000Z",
+            "updatedAt": "2025-01-02T00:00:00.000Z",
+        }
+        for i in range(doc_count)
+    ]
+    return json.dumps({
+        "docs": docs,
+        "hasNextPage": False,
+        "limit": doc_count,
+        "page": 1,
+        "totalDocs": doc_count,
+        "totalPages": 1,
+    }, separators=(",", ":")).encode()
+
+
+def envelope(page: dict) -> dict:
+    """Build the list tool result the way list_handler does."""
+    return {
+        "success": True,
+        "documents": page.get("docs", []),
+        "totalDocs": page.get("totalDocs", 0),
+        "page": page.get("page", 1),
+        "totalPages": page.get("totalPages", 1),
+        "limit": page.get("limit", 100),
+    }
+
+
+@pytest.mark.performance
+class TestJSONPassthrough:
+    """Passthrough must avoid the parse/serialize round trip of a cache hit."""
+
+    @pytest.mark.asyncio
+    async def test_large_list_hit(self):
+        """Compare serving a ~5 MB cached list page to a tool result."""
+        body = list_body()
+        parsed_cache = SmartCache(max_bytes=1024 ** 3)
+        encoded_cache = SmartCache(max_bytes=1024 ** 3, codec="none")
+        for cache in (parsed_cache, encoded_cache):
+            cache.set(KEY, json.loads(body), raw=body)
+
+        async def fetch():
+            raise AssertionError("should be cached")
+
+        results = {}
+
+        async def timed(name: str, serve) -> float:
+            # Warm up, then average
+            results[name] = await serve()
+            start = time.perf_counter()
+            for _ in range(ROUNDS):
+                await serve()
+            return (time.perf_counter() - start) / ROUNDS
+
+        async def current_parsed():
+            return json.dumps(envelope(await parsed_cache.get_or_fetch(KEY, fetch)))
+
+        async def current_encoded():
+            return json.dumps(envelope(await encoded_cache.get_or_fetch(KEY, fetch)))
+
+        async def passthrough():
+            page = parse_list_page(await encoded_cache.get_or_fetch(KEY, fetch, as_json=True))
+            return dumps_result(envelope(page))
+
+        parsed_time = await timed("parsed", current_parsed)
+        encoded_time = await timed("encoded", current_encoded)
+        passthrough_time = await timed("passthrough", passthrough)
+
+        print(
+            f"\n{len(body) / 1e6:.1f} MB list page, cache hit to tool result:"
+            f"\n  parsed cache + json.dumps:   {parsed_time * 1e3:7.1f} ms"
+            f"\n  encoded cache, parse + dumps: {encoded_time * 1e3:7.1f} ms"
+            f"\n  passthrough:                 {passthrough_time * 1e3:7.1f} ms"
+        )
+        assert json.loads(results["passthrough"]) == json.loads(results["parsed"])
+        assert passthrough_time < parsed_time / 5
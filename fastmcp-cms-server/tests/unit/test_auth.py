@@ -0,0 +1,153 @@
+"""Unit tests for AuthService token management."""
+
+import pytest
+import asyncio
+import base64
+import json
+import time
+import httpx
+from core.connection_pool import ConnectionPool
+from services.auth import AuthService, decode_token_expiry
+
+
+def make_jwt(exp: float) -> str:
+    """Build an unsigned JWT carrying an exp claim."""
+    def _encode(obj: dict) -> str:
+        raw = json.dumps(obj).encode()
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+    return f"{_encode({'alg': 'HS256'})}.{_encode({'exp': exp})}.signature"
+
+
+class FakeLogin:
+    """Login endpoint that issues JWTs with a fixed lifetime."""
+
+    def __init__(self, lifetime: float = 3600, delay: float = 0.0):
+        self.lifetime = lifetime
+        self.delay = delay
+        self.calls = 0
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        token = make_jwt(time.time() + self.lifetime)
+        return httpx.Response(200, json={"token": token, "user": {"id": "admin"}})
+
+
+@pytest.fixture
+async def login_pool():
+    """Factory for connection pools routed to a FakeLogin."""
+    pools = []
+
+    def _make(login: FakeLogin) -> ConnectionPool:
+        pool = ConnectionPool(http2=False)
+        pool._client = httpx.AsyncClient(transport=httpx.MockTransport(login.handler))
+        pools.append(pool)
+        return pool
+
+    yield _make
+
+    for pool in pools:
+        await pool.close()
+
+
+@pytest.mark.unit
+class TestAuthService:
+    """Tests for AuthService."""
+
+    def test_decode_token_expiry(self):
+        """Test that exp is read from the JWT payload."""
+        assert decode_token_expiry(make_jwt(1234567890)) == 1234567890.0
+
+    def test_decode_token_expiry_opaque_token(self):
+        """Test that non-JWT tokens have no expiry."""
+        assert decode_token_expiry("not-a-jwt") is None
+        assert decode_token_expiry("a.b.c") is None
+
+    @pytest.mark.asyncio
+    async def test_expiry_taken_from_token(self, login_pool):
+        """Test that token expiry comes from the exp claim, not TOKEN_CACHE_TTL."""
+        login = FakeLogin(lifetime=42)
+        auth = AuthService("a@b.c", "pw", "http://cms/api", login_pool(login))
+
+        await auth.authenticate()
+
+        assert auth.is_authenticated
+        assert auth._token_expires_at == pytest.approx(time.time() + 42, abs=2)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_logins_are_single_flight(self, login_pool):
+        """Test that concurrent callers share one login request."""
+        login = FakeLogin(delay=0.05)
+        auth = AuthService("a@b.c", "pw", "http://cms/api", login_pool(login))
+
+        tokens = await asyncio.gather(*[auth.refresh_if_needed() for _ in range(20)])
+
+        assert login.calls == 1
+        assert len(set(tokens)) == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_forced_refreshes_are_single_flight(self, login_pool):
+        """Test that simultaneous 401 recoveries only log in once."""
+        login = FakeLogin(delay=0.05)
+        auth = AuthService("a@b.c", "pw", "http://cms/api", login_pool(login))
+        await auth.authenticate()
+
+        await asyncio.gather(*[auth.authenticate(force=True) for _ in range(10)])
+
+        assert login.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_refresh_near_expiry_does_not_block(self, login_pool):
+        """Test that a token inside the refresh margin is returned immediately."""
+        login = FakeLogin(delay=0.2)
+        auth = AuthService(
+            "a@b.c", "pw", "http://cms/api", login_pool(login), refresh_margin=120
+        )
+        first = await auth.authenticate()
+
+        # Age the token to one minute before expiry
+        auth._token_issued_at -= 3540
+        auth._token_expires_at = time.time() + 60
+
+        start = time.monotonic()
+        token = await auth.refresh_if_needed()
+        assert time.monotonic() - start < 0.1
+        assert token == first
+
+        # Refresh completes in the background
+        await auth._pending_refresh
+        assert login.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_background_refresh_before_expiry(self, login_pool):
+        """Test that the background task refreshes ahead of expiry."""
+        login = FakeLogin(lifetime=0.4)
+        auth = AuthService("a@b.c", "pw", "http://cms/api", login_pool(login))
+        await auth.authenticate()
+        first_expiry = auth._token_expires_at
+
+        auth.start_background_refresh()
+        await asyncio.sleep(0.35)
+        await auth.stop_background_refresh()
+
+        assert login.calls >= 2
+        assert auth._token_expires_at > first_expiry
+        assert auth.get_stats()["background_refreshes"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_refreshes_share_one_login(self, login_pool):
+        """Test that the background task joins a refresh a request started."""
+        login = FakeLogin(delay=0.05)
+        auth = AuthService(
+            "a@b.c", "pw", "http://cms/api", login_pool(login), refresh_margin=120
+        )
+        await auth.authenticate()
+        auth._token_issued_at -= 3540
+        auth._token_expires_at = time.time() + 60
+
+        await auth.refresh_if_needed()
+        assert await auth.refresh()
+
+        assert login.calls == 2
+        assert auth.get_stats()["background_refreshes"] == 1
@@ -0,0 +1,233 @@
+"""Unit tests for BatchExecutor."""
+
+import pytest
+import asyncio
+import itertools
+import random
+from core.batch_executor import BatchExecutor
+from core.retry import RetryConfig
+from utils.errors import CMSConnectionError, CMSTimeoutError, ValidationError
+
+RETRY = RetryConfig(max_retries=2, backoff_factor=2.0, retry_on=(CMSTimeoutError,), timeout=1)
+
+
+class Tracker:
+    """Item function that records how many items run at once."""
+
+    def __init__(self, delay=0.001, fail=()):
+        """Initialize with a delay per item and items that raise."""
+        self.delay = delay
+        self.fail = dict(fail)
+        self.in_flight = 0
+        self.peak = 0
+
+    async def __call__(self, item):
+        """Run one item."""
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay() if callable(self.delay) else self.delay)
+            if item in self.fail:
+                raise self.fail[item]
+            return item * 10
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.mark.unit
+class TestBatchExecutor:
+    """Tests for BatchExecutor."""
+
+    @pytest.mark.asyncio
+    async def test_results_in_input_order(self):
+        """Test that results come back in input order despite varying latency."""
+        executor = BatchExecutor(initial_concurrency=8)
+        results = await executor.run(Tracker(delay=lambda: random.uniform(0, 0.01)), range(50))
+
+        assert [r.index for r in results] == list(range(50))
+        assert [r.value for r in results] == [i * 10 for i in range(50)]
+        assert all(r.duration > 0 for r in results)
+
+    @pytest.mark.asyncio
+    async def test_concurrency_bounded(self):
+        """Test that no more than max_concurrency items run at once."""
+        tracker = Tracker(delay=0.005)
+        executor = BatchExecutor(initial_concurrency=4, max_concurrency=4)
+
+        await executor.run(tracker, range(40))
+
+        assert tracker.peak == 4
+        assert executor.get_stats()["peak_in_flight"] == 4
+
+    @pytest.mark.asyncio
+    async def test_additive_increase(self):
+        """Test that fast successes raise the limit by about one per round."""
+        executor = BatchExecutor(initial_concurrency=2, max_concurrency=16)
+        await executor.run(Tracker(), range(20))
+
+        assert 4 <= executor.concurrency <= 8
+
+    @pytest.mark.asyncio
+    async def test_multiplicative_decrease_once_per_burst(self):
+        """Test that one burst of timeouts halves the limit once."""
+        executor = BatchExecutor(initial_concurrency=8, max_concurrency=8)
+        tracker = Tracker(delay=0.005, fail={i: CMSTimeoutError("slow") for i in range(8)})
+
+        results = await executor.run(tracker, range(8))
+
+        assert all(isinstance(r.error, CMSTimeoutError) for r in results)
+        assert executor.concurrency == 4
+        assert executor.get_stats()["decreases"] == 1
+
+    @pytest.mark.asyncio
+    async def test_slow_items_back_off(self):
+        """Test that items over the latency target count as overload."""
+        executor = BatchExecutor(initial_concurrency=4, latency_target=0.001)
+        await executor.run(Tracker(delay=0.01), range(4))
+
+        assert executor.concurrency == 2
+
+    @pytest.mark.asyncio
+    async def test_item_errors_do_not_back_off(self):
+        """Test that a bad item doesn't slow down the rest."""
+        executor = BatchExecutor(initial_concurrency=4)
+        results = await executor.run(Tracker(fail={1: ValidationError("bad")}), range(4))
+
+        assert not results[1].ok
+        assert results[0].ok and results[2].ok
+        assert executor.get_stats()["decreases"] == 0
+        assert executor.get_stats()["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_refused_item_does_not_back_off(self):
+        """Test that a 4xx item leaves the limit alone while a 5xx cuts it."""
+        executor = BatchExecutor(initial_concurrency=4, max_concurrency=4)
+        refused = Tracker(fail={1: CMSConnectionError("bad request", status_code=400)})
+
+        await executor.run(refused, range(4))
+
+        assert executor.concurrency == 4
+        assert executor.get_stats()["overloads"] == 0
+
+        failing = Tracker(fail={1: CMSConnectionError("unavailable", status_code=503)})
+        await executor.run(failing, range(4))
+
+        assert executor.concurrency == 2
+
+    @pytest.mark.asyncio
+    async def test_input_consumed_lazily(self):
+        """Test that only a bounded window of items is started ahead."""
+        tracker = Tracker()
+        executor = BatchExecutor(initial_concurrency=2, max_concurrency=2)
+        consumed = []
+
+        def items():
+            for i in itertools.count():
+                consumed.append(i)
+                yield i
+
+        stream = executor.map(tracker, items())
+        async for result in stream:
+            if result.index == 10:
+                break
+        await stream.aclose()
+
+        assert len(consumed) <= 11 + 2 * 2
+        assert tracker.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_only_failed_items_retried(self):
+        """Test that a transient failure re-runs that item and nothing else."""
+        calls = []
+
+        async def flaky(item):
+            calls.append(item)
+            if item == 2 and calls.count(2) < 3:
+                raise CMSTimeoutError("slow")
+            return item * 10
+
+        executor = BatchExecutor(backoff_unit=0.001)
+        results = await executor.run(flaky, range(4), retry=RETRY)
+
+        assert [r.value for r in results] == [0, 10, 20, 30]
+        assert [r.attempts for r in results] == [1, 1, 3, 1]
+        assert sorted(calls) == [0, 1, 2, 2, 2, 3]
+        assert executor.get_stats()["retries"] == 2
+        assert executor.get_stats()["recovered_by_retry"] == 1
+
+    @pytest.mark.asyncio
+    async def test_retries_exhausted_or_not_retryable(self):
+        """Test that retries stop at max_retries and skip other errors."""
+        tracker = Tracker(fail={0: CMSTimeoutError("slow"), 1: ValidationError("bad")})
+        executor = BatchExecutor(backoff_unit=0.001)
+
+        results = await executor.run(tracker, range(2), retry=RETRY)
+
+        assert [r.attempts for r in results] == [3, 1]
+        assert isinstance(results[0].error, CMSTimeoutError)
+        assert isinstance(results[1].error, ValidationError)
+
+    @pytest.mark.asyncio
+    async def test_attempt_timeout(self):
+        """Test that an attempt over the RetryConfig timeout fails as a timeout."""
+        retry = RetryConfig(max_retries=0, backoff_factor=1.0, retry_on=(), timeout=0.01)
+        results = await BatchExecutor().run(Tracker(delay=1), [1], retry=retry)
+
+        assert isinstance(results[0].error, CMSTimeoutError)
+
+    @pytest.mark.asyncio
+    async def test_committed_item_not_resent(self):
+        """Test that an item whose failed attempt took effect isn't run again."""
+        stored = {}
+
+        async def create(item):
+            stored[item] = item * 10
+            raise CMSTimeoutError("response lost")
+
+        async def created(item):
+            return stored.get(item)
+
+        executor = BatchExecutor(backoff_unit=0.001)
+        results = await executor.run(create, [1], retry=RETRY, committed=created)
+
+        assert results[0].ok and results[0].value == 10
+        assert results[0].attempts == 2
+        assert executor.get_stats()["found_committed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_commit_not_retried(self):
+        """Test that an item isn't retried when the check can't tell."""
+        tracker = Tracker(fail={1: CMSTimeoutError("slow")})
+
+        async def unknown(item):
+            raise ValueError("no id")
+
+        results = await BatchExecutor(backoff_unit=0.001).run(
+            tracker, [1], retry=RETRY, committed=unknown
+        )
+
+        assert isinstance(results[0].error, CMSTimeoutError)
+        assert results[0].attempts == 2
+
+    @pytest.mark.asyncio
+    async def test_deadline_keeps_finished_items(self):
+        """Test that a deadline reports finished items and times out the rest."""
+        tracker = Tracker(delay=lambda: 0.001)
+        slow = Tracker(delay=5)
+        executor = BatchExecutor(initial_concurrency=2, max_concurrency=2)
+
+        async def run(item):
+            return await (slow if item == 1 else tracker)(item)
+
+        results = await executor.run(run, range(10), deadline=0.05)
+
+        assert [r.index for r in results] == list(range(10))
+        assert results[0].ok and results[0].value == 0
+        assert isinstance(results[1].error, CMSTimeoutError)
+        assert results[1].attempts == 1
+        assert all(isinstance(r.error, CMSTimeoutError) for r in results[2:] if not r.ok)
+        assert results[-1].attempts == 0
+        assert slow.in_flight == 0
+        assert executor.get_stats()["in_flight"] == 0
+        assert executor.get_stats()["items"] == 10
+        assert executor.get_stats()["decreases"] == 0
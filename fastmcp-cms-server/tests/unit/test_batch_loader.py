@@ -0,0 +1,106 @@
+"""Unit tests for BatchLoader."""
+
+import pytest
+import asyncio
+from core.batch_loader import BatchLoader
+
+
+class Recorder:
+    """Batch function that records the batches it was called with."""
+
+    def __init__(self, missing=()):
+        """Initialize with keys to report as missing."""
+        self.batches: list[list] = []
+        self.missing = set(missing)
+
+    async def __call__(self, keys):
+        """Load a batch, returning KeyError for missing keys."""
+        self.batches.append(list(keys))
+        await asyncio.sleep(0)
+        return [KeyError(k) if k in self.missing else f"value-{k}" for k in keys]
+
+
+@pytest.mark.unit
+class TestBatchLoader:
+    """Tests for BatchLoader."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_loads_batched(self):
+        """Test that loads within one window become one batch."""
+        load_batch = Recorder()
+        loader = BatchLoader(load_batch, window=0.01)
+
+        results = await asyncio.gather(*(loader.load(i) for i in range(40)))
+
+        assert results == [f"value-{i}" for i in range(40)]
+        assert load_batch.batches == [list(range(40))]
+        stats = loader.get_stats()
+        assert stats["batches"] == 1
+        assert stats["avg_batch_size"] == 40
+        assert stats["max_batch_size"] == 40
+
+    @pytest.mark.asyncio
+    async def test_max_batch_splits(self):
+        """Test that a full batch is sent without waiting for the window."""
+        load_batch = Recorder()
+        loader = BatchLoader(load_batch, window=10, max_batch=4)
+
+        results = await asyncio.wait_for(
+            asyncio.gather(*(loader.load(i) for i in range(8))), timeout=1
+        )
+
+        assert results == [f"value-{i}" for i in range(8)]
+        assert load_batch.batches == [[0, 1, 2, 3], [4, 5, 6, 7]]
+        assert loader.get_stats()["full_batches"] == 2
+
+    @pytest.mark.asyncio
+    async def test_duplicate_keys_loaded_once(self):
+        """Test that waiters for the same key share one slot."""
+        load_batch = Recorder()
+        loader = BatchLoader(load_batch, window=0.01)
+
+        results = await asyncio.gather(loader.load("a"), loader.load("a"), loader.load("b"))
+
+        assert results == ["value-a", "value-a", "value-b"]
+        assert load_batch.batches == [["a", "b"]]
+        assert loader.get_stats()["loads"] == 3
+
+    @pytest.mark.asyncio
+    async def test_missing_keys_fail_individually(self):
+        """Test that an error returned for one key only reaches its callers."""
+        loader = BatchLoader(Recorder(missing={"b"}), window=0.01)
+
+        results = await asyncio.gather(
+            loader.load("a"), loader.load("b"), return_exceptions=True
+        )
+
+        assert results[0] == "value-a"
+        assert isinstance(results[1], KeyError)
+
+    @pytest.mark.asyncio
+    async def test_batch_failure_reaches_every_caller(self):
+        """Test that a raising batch function fails the whole batch."""
+        async def load_batch(keys):
+            raise ConnectionError("CMS down")
+
+        loader = BatchLoader(load_batch, window=0.01)
+        results = await asyncio.gather(
+            loader.load("a"), loader.load("b"), return_exceptions=True
+        )
+
+        assert all(isinstance(r, ConnectionError) for r in results)
+        assert loader.get_stats()["failed_batches"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_break_batch(self):
+        """Test that other callers still get their values."""
+        load_batch = Recorder()
+        loader = BatchLoader(load_batch, window=0.01)
+
+        cancelled = asyncio.create_task(loader.load("a"))
+        other = asyncio.create_task(loader.load("b"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        assert await other == "value-b"
+        assert load_batch.batches == [["a", "b"]]
@@ -1,12 +1,25 @@
 """Unit tests for batch operations."""
 
 import pytest
+import asyncio
 from unittest.mock import AsyncMock, patch
+from core.batch_executor import BatchExecutor
+from core.retry import RetryConfig
 from services.batch import (
     batch_create_documents,
     batch_update_documents,
     batch_delete_documents,
+    batch_in_chunks,
 )
+from core.encoded_json import iter_json_array
+from utils.errors import (
+    BulkWriteRejectedError,
+    CMSConnectionError,
+    CMSTimeoutError,
+    ResourceNotFoundError,
+)
+
+RETRY = RetryConfig(max_retries=2, backoff_factor=2.0, retry_on=(CMSTimeoutError,), timeout=5)
 
 
 @pytest.mark.unit
@@ -109,6 +122,120 @@ class TestBatchCreate:
         for call in calls:
             assert call[1]["draft"] is False
 
+    @pytest.mark.asyncio
+    async def test_batch_create_bounded_concurrency(self, batch_items):
+        """Test that parallel creates run through the executor's limit."""
+        client = AsyncMock()
+        running = peak = 0
+
+        async def create(collection, data, draft):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.005)
+            running -= 1
+            return {"id": data["id"]}
+
+        client.create_document = AsyncMock(side_effect=create)
+        items = [{"id": f"item-{i}"} for i in range(20)]
+
+        result = await batch_create_documents(
+            collection="projects",
+            items=items,
+            client=client,
+            executor=BatchExecutor(initial_concurrency=3, max_concurrency=3),
+        )
+
+        assert peak == 3
+        assert [doc["id"] for doc in result["results"]] == [item["id"] for item in items]
+        assert len(result["timing"]["itemMs"]) == 20
+        assert result["timing"]["totalMs"] > 0
+
+    @pytest.mark.asyncio
+    async def test_batch_create_retries_items_not_created(self):
+        """Test that only failed items are re-sent, and never twice once stored."""
+        client = AsyncMock()
+        stored = {}
+        sent = []
+
+        async def create(collection, data, draft):
+            sent.append(data["id"])
+            if data["id"] == "lost" or (data["id"] == "flaky" and sent.count("flaky") == 1):
+                if data["id"] == "lost":
+                    stored["lost"] = data
+                raise CMSTimeoutError("timed out")
+            stored[data["id"]] = data
+            return data
+
+        async def get_document(collection, doc_id, use_cache=True):
+            if doc_id not in stored:
+                raise ResourceNotFoundError(doc_id)
+            return stored[doc_id]
+
+        client.create_document = AsyncMock(side_effect=create)
+        client.get_document = AsyncMock(side_effect=get_document)
+        items = [{"id": "ok"}, {"id": "flaky"}, {"id": "lost"}]
+
+        result = await batch_create_documents(
+            collection="projects",
+            items=items,
+            client=client,
+            executor=BatchExecutor(backoff_unit=0.001),
+            retry=RETRY,
+        )
+
+        assert result["success"] is True
+        assert sorted(sent) == ["flaky", "flaky", "lost", "ok"]
+        assert result["timing"]["attempts"] == [1, 2, 2]
+
+    @pytest.mark.asyncio
+    async def test_batch_create_without_id_not_retried(self):
+        """Test that a create that may have been stored isn't re-sent blind."""
+        client = AsyncMock()
+        client.create_document = AsyncMock(side_effect=CMSTimeoutError("timed out"))
+
+        result = await batch_create_documents(
+            collection="projects",
+            items=[{"title": "No id"}],
+            client=client,
+            executor=BatchExecutor(backoff_unit=0.001),
+            retry=RETRY,
+        )
+
+        assert client.create_document.call_count == 1
+        assert result["errors"][0]["attempts"] == 2
+
+
+    @pytest.mark.asyncio
+    async def test_refused_create_not_recovered(self):
+        """Test that a create the CMS refused isn't reported as created."""
+        client = AsyncMock()
+        client.create_document = AsyncMock(side_effect=CMSConnectionError(
+            "CMS request failed with status 400", status_code=400
+        ))
+        # Someone else's document already has the id
+        client.get_document = AsyncMock(return_value={"id": "p1", "title": "EXISTING other"})
+        retry = RetryConfig(
+            max_retries=2,
+            backoff_factor=2.0,
+            retry_on=(CMSTimeoutError, CMSConnectionError),
+            timeout=5,
+        )
+
+        result = await batch_create_documents(
+            collection="projects",
+            items=[{"id": "p1", "title": "Mine"}],
+            client=client,
+            executor=BatchExecutor(backoff_unit=0.001),
+            retry=retry,
+        )
+
+        assert result["success"] is False
+        assert result["results"] == []
+        assert result["errors"][0]["attempts"] == 1
+        assert client.create_document.call_count == 1
+        client.get_document.assert_not_called()
+
 
 @pytest.mark.unit
 class TestBatchUpdate:
@@ -164,6 +291,120 @@ class TestBatchUpdate:
         assert result["successful"] == 2
         assert result["failed"] == 1
 
+    @pytest.mark.asyncio
+    async def test_bulk_update_when_data_shared(self, mock_cms_client):
+        """Test that identical updates go out as one bulk request."""
+        mock_cms_client.bulk_update_documents = AsyncMock(return_value=(
+            [{"id": "item-1", "_status": "published"}, {"id": "item-3", "_status": "published"}],
+            {"item-2": "Validation failed"},
+        ))
+        items = [{"id": f"item-{i}", "data": {"_status": "published"}} for i in range(1, 4)]
+
+        result = await batch_update_documents(
+            collection="projects",
+            items=items,
+            client=mock_cms_client,
+            bulk=True,
+        )
+
+        mock_cms_client.bulk_update_documents.assert_awaited_once_with(
+            collection="projects",
+            doc_ids=["item-1", "item-2", "item-3"],
+            data={"_status": "published"},
+        )
+        mock_cms_client.update_document.assert_not_called()
+        assert result["successful"] == 2
+        assert result["errors"] == [
+            {"index": 1, "item": items[1], "error": "Validation failed", "attempts": 1}
+        ]
+        assert result["timing"]["attempts"] == [1, 1, 1]
+        assert len(result["timing"]["itemMs"]) == 3
+
+    @pytest.mark.asyncio
+    async def test_bulk_falls_back_for_different_data(self, mock_cms_client):
+        """Test that heterogeneous updates are sent one by one."""
+        mock_cms_client.bulk_update_documents = AsyncMock()
+        items = [{"id": f"item-{i}", "data": {"title": f"Title {i}"}} for i in range(1, 4)]
+
+        result = await batch_update_documents(
+            collection="projects",
+            items=items,
+            client=mock_cms_client,
+            bulk=True,
+        )
+
+        mock_cms_client.bulk_update_documents.assert_not_called()
+        assert mock_cms_client.update_document.await_count == 3
+        assert result["successful"] == 3
+
+    @pytest.mark.asyncio
+    async def test_items_without_data_fail_alone(self, mock_cms_client):
+        """Test that malformed update items are failed, not raised."""
+        mock_cms_client.bulk_update_documents = AsyncMock()
+        items = [
+            {"id": "item-1", "data": {"_status": "published"}},
+            {"id": "item-2"},
+            {"id": "item-3", "data": {"_status": "published"}},
+        ]
+
+        result = await batch_update_documents(
+            collection="projects",
+            items=items,
+            client=mock_cms_client,
+            bulk=True,
+        )
+
+        mock_cms_client.bulk_update_documents.assert_not_called()
+        assert mock_cms_client.update_document.await_count == 2
+        assert result["successful"] == 2
+        assert result["errors"] == [{
+            "index": 1,
+            "item": {"id": "item-2"},
+            "error": 'Update items need an "id" and a "data" object',
+            "attempts": 1,
+        }]
+
+    @pytest.mark.asyncio
+    async def test_bulk_refusal_falls_back(self, mock_cms_client):
+        """Test that a bulk request the CMS refused is sent per document."""
+        mock_cms_client.bulk_update_documents = AsyncMock(
+            side_effect=BulkWriteRejectedError("CMS rejected bulk PATCH with status 403")
+        )
+        items = [{"id": f"item-{i}", "data": {"_status": "archived"}} for i in range(1, 4)]
+
+        result = await batch_update_documents(
+            collection="projects",
+            items=items,
+            client=mock_cms_client,
+            bulk=True,
+        )
+
+        assert mock_cms_client.update_document.await_count == 3
+        assert result["success"] is True
+
+    @pytest.mark.asyncio
+    async def test_bulk_failure_not_resent(self, mock_cms_client):
+        """Test that a bulk request that may have been applied fails every item."""
+        mock_cms_client.bulk_update_documents = AsyncMock(
+            side_effect=CMSTimeoutError("Request timed out")
+        )
+        items = [{"id": f"item-{i}", "data": {"_status": "archived"}} for i in range(1, 4)]
+
+        result = await batch_update_documents(
+            collection="projects",
+            items=items,
+            client=mock_cms_client,
+            bulk=True,
+        )
+
+        mock_cms_client.update_document.assert_not_called()
+        assert result["failed"] == 3
+        assert result["errors"] == [
+            {"index": i, "item": item, "error": "Request timed out", "attempts": 1}
+            for i, item in enumerate(items)
+        ]
+        assert len(result["timing"]["itemMs"]) == 3
+
 
 @pytest.mark.unit
 class TestBatchDelete:
@@ -233,6 +474,43 @@ class TestBatchDelete:
         assert result["failed"] == 1
         assert len(result["errors"]) == 1
 
+    @pytest.mark.asyncio
+    async def test_batch_delete_retries_failed_items(self):
+        """Test that a timed-out delete is retried alone, unless it went through."""
+        client = AsyncMock()
+        existing = {"item-1", "item-2", "item-3"}
+        sent = []
+
+        async def delete(collection, doc_id):
+            sent.append(doc_id)
+            if doc_id == "item-3":
+                existing.discard(doc_id)
+            if doc_id != "item-1" and sent.count(doc_id) == 1:
+                raise CMSTimeoutError("timed out")
+            existing.discard(doc_id)
+            return True
+
+        async def get_document(collection, doc_id, use_cache=True):
+            if doc_id not in existing:
+                raise ResourceNotFoundError(doc_id)
+            return {"id": doc_id}
+
+        client.delete_document = AsyncMock(side_effect=delete)
+        client.get_document = AsyncMock(side_effect=get_document)
+
+        result = await batch_delete_documents(
+            collection="projects",
+            doc_ids=["item-1", "item-2", "item-3"],
+            confirm=True,
+            client=client,
+            executor=BatchExecutor(backoff_unit=0.001),
+            retry=RETRY,
+        )
+
+        assert result["successful"] == 3
+        assert sorted(sent) == ["item-1", "item-2", "item-2", "item-3"]
+        assert result["timing"]["attempts"] == [1, 2, 2]
+
     @pytest.mark.asyncio
     async def test_batch_delete_parallel_vs_sequential(self, mock_cms_client):
         """Test parallel vs sequential execution."""
@@ -259,3 +537,144 @@ class TestBatchDelete:
         # Both should succeed
         assert result_parallel["success"] is True
         assert result_sequential["success"] is True
+
+    @pytest.mark.asyncio
+    async def test_bulk_delete(self, mock_cms_client):
+        """Test that a bulk delete keeps the per-item result shape."""
+        mock_cms_client.bulk_delete_documents = AsyncMock(return_value=(
+            ["item-1", "item-3"],
+            {"item-2": "Document not found: projects/item-2"},
+        ))
+
+        result = await batch_delete_documents(
+            collection="projects",
+            doc_ids=["item-1", "item-2", "item-3"],
+            confirm=True,
+            client=mock_cms_client,
+            bulk=True,
+        )
+
+        mock_cms_client.delete_document.assert_not_called()
+        assert result["results"] == [
+            {"doc_id": "item-1", "deleted": True},
+            {"doc_id": "item-3", "deleted": True},
+        ]
+        assert result["errors"] == [
+            {
+                "index": 1,
+                "doc_id": "item-2",
+                "error": "Document not found: projects/item-2",
+                "attempts": 1,
+            }
+        ]
+        assert result["timing"]["attempts"] == [1, 1, 1]
+
+
+def chunk_result(chunk, failing=()):
+    """Result of batch_create_documents for a chunk with failing items."""
+    errors = [
+        {"index": i, "item": item, "error": "bad"}
+        for i, item in enumerate(chunk) if item in failing
+    ]
+    return {
+        "success": not errors,
+        "totalRequested": len(chunk),
+        "successful": len(chunk) - len(errors),
+        "failed": len(errors),
+        "results": [item for item in chunk if item not in failing],
+        "errors": errors,
+    }
+
+
+@pytest.mark.unit
+class TestBatchInChunks:
+    """Tests for batch_in_chunks."""
+
+    @pytest.mark.asyncio
+    async def test_totals_and_errors_across_chunks(self):
+        """Test that chunk results add up, with errors indexed in the whole input."""
+        done = []
+
+        async def run_chunk(chunk):
+            return chunk_result(chunk, failing={3, 12})
+
+        async def progress(count):
+            done.append(count)
+
+        result = await batch_in_chunks(run_chunk, range(25), chunk_size=10, progress=progress)
+
+        assert result["totalRequested"] == 25
+        assert result["successful"] == 23
+        assert result["chunks"] == 3
+        assert [(e["index"], e["item"]) for e in result["errors"]] == [(3, 3), (12, 12)]
+        assert done == [10, 20, 25]
+        assert "results" not in result
+        assert result["success"] is False
+
+    @pytest.mark.asyncio
+    async def test_chunks_pipelined_and_input_read_lazily(self):
+        """Test that chunks overlap up to the limit and items are read as needed."""
+        running = peak = 0
+        consumed = []
+
+        async def run_chunk(chunk):
+            nonlocal running, peak
+            # At most the next chunk has been read ahead of this one
+            assert len(consumed) <= chunk[-1] + 1 + 10
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.005)
+            running -= 1
+            return chunk_result(chunk)
+
+        def items():
+            for i in range(100):
+                consumed.append(i)
+                yield i
+
+        result = await batch_in_chunks(run_chunk, items(), chunk_size=10, chunks_in_flight=2)
+
+        assert peak == 2
+        assert result["successful"] == 100
+
+    @pytest.mark.asyncio
+    async def test_errors_truncated(self):
+        """Test that only the first max_errors errors are kept."""
+        async def run_chunk(chunk):
+            return chunk_result(chunk, failing=set(chunk))
+
+        result = await batch_in_chunks(run_chunk, range(50), chunk_size=10, max_errors=5)
+
+        assert result["failed"] == 50
+        assert len(result["errors"]) == 5
+        assert result["errorsTruncated"] is True
+
+    @pytest.mark.asyncio
+    async def test_malformed_input_stops_after_earlier_chunks(self):
+        """Test that chunks before invalid JSON run and the rest don't."""
+        ran = []
+
+        async def run_chunk(chunk):
+            ran.extend(chunk)
+            return chunk_result(chunk)
+
+        text = "[" + ", ".join(str(i) for i in range(15)) + ", oops]"
+        result = await batch_in_chunks(run_chunk, iter_json_array(text), chunk_size=10)
+
+        assert ran == list(range(10))
+        assert result["success"] is False
+        assert result["message"].startswith("Stopped before item 10")
+
+    @pytest.mark.asyncio
+    async def test_with_batch_create(self, mock_cms_client):
+        """Test chunks run through batch_create_documents."""
+        items = [{"id": f"item-{i}"} for i in range(7)]
+
+        async def run_chunk(chunk):
+            return await batch_create_documents("projects", chunk, client=mock_cms_client)
+
+        result = await batch_in_chunks(run_chunk, items, chunk_size=3)
+
+        assert result["successful"] == 7
+        assert result["chunks"] == 3
+        assert mock_cms_client.create_document.call_count == 7
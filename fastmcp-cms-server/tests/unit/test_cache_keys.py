@@ -0,0 +1,112 @@
+"""Unit tests for QueryKey."""
+
+import pytest
+from core.cache_keys import QueryKey, canonicalize_params, list_page_tags
+
+
+@pytest.mark.unit
+class TestQueryKey:
+    """Tests for QueryKey."""
+
+    def test_param_order_does_not_matter(self):
+        """Test that dict insertion order doesn't change the key."""
+        key_a = QueryKey.for_collection(
+            "projects", {"limit": 10, "page": 2, "where[_status][equals]": "draft"}
+        )
+        key_b = QueryKey.for_collection(
+            "projects", {"where[_status][equals]": "draft", "page": 2, "limit": 10}
+        )
+
+        assert key_a == key_b
+        assert str(key_a) == str(key_b)
+        assert hash(key_a) == hash(key_b)
+
+    def test_different_queries_differ(self):
+        """Test that filters, pages and collections are all part of the key."""
+        base = QueryKey.for_collection("projects", {"page": 1})
+
+        assert base != QueryKey.for_collection("projects", {"page": 2})
+        assert base != QueryKey.for_collection("portfolio", {"page": 1})
+        assert base != QueryKey.for_collection("projects", {"page": 1, "depth": 0})
+
+    def test_scalars_rendered_as_query_strings(self):
+        """Test that equivalent query-string values share a key."""
+        assert QueryKey.for_collection("projects", {"limit": 10}) == \
+            QueryKey.for_collection("projects", {"limit": "10"})
+        assert canonicalize_params({"draft": True}) == (("draft", "true"),)
+
+    def test_nested_params_flattened(self):
+        """Test that nested where clauses use bracket notation."""
+        params = canonicalize_params({
+            "where": {"_status": {"equals": "draft"}},
+            "where[id][in]": ["b", "a"],
+        })
+
+        assert params == (
+            ("where[_status][equals]", "draft"),
+            ("where[id][in]", "b"),
+            ("where[id][in]", "a"),
+        )
+
+    def test_collection_key_round_trip(self):
+        """Test that a collection key parses back into the same query."""
+        key = QueryKey.for_collection("projects", {
+            "limit": 25,
+            "page": 3,
+            "where[title][contains]": "react & vue",
+            "where[id][in]": ["a", "b"],
+        })
+
+        parsed = QueryKey.parse(str(key))
+
+        assert parsed == key
+        assert parsed.to_params() == {
+            "limit": "25",
+            "page": "3",
+            "where[id][in]": ["a", "b"],
+            "where[title][contains]": "react & vue",
+        }
+
+    def test_document_and_global_round_trip(self):
+        """Test that document and global keys round trip."""
+        doc = QueryKey.for_document("projects", "ns:proj-1")
+        glob = QueryKey.for_global("site-settings")
+
+        assert str(doc) == "doc:projects:ns:proj-1"
+        assert str(glob) == "global:site-settings"
+        assert QueryKey.parse(str(doc)) == doc
+        assert QueryKey.parse(str(glob)) == glob
+
+    def test_parse_rejects_unknown_keys(self):
+        """Test that unrecognised key formats raise ValueError."""
+        with pytest.raises(ValueError):
+            QueryKey.parse("other:key")
+        with pytest.raises(ValueError):
+            QueryKey.parse("doc:projects")
+
+    def test_filter_fields(self):
+        """Test that where and sort params name the fields they read."""
+        key = QueryKey.for_collection("projects", {
+            "where[_status][equals]": "draft",
+            "where[or][0][meta.title][like]": "x",
+            "sort": "-updatedAt",
+            "limit": 10,
+        })
+        assert key.filter_fields() == {"_status", "meta", "updatedAt"}
+
+    def test_list_page_tags(self):
+        """Test that list pages are tagged by contents and filter fields."""
+        key = QueryKey.for_collection("projects", {"where[_status][equals]": "draft"})
+        tags = list_page_tags(key, {"docs": [{"id": "a"}, {"id": "b"}]})
+
+        assert set(tags) == {
+            "filter:projects:_status",
+            "contains:projects:a",
+            "contains:projects:b",
+        }
+
+    def test_list_page_tags_unknown_contents(self):
+        """Test that pages without readable docs are tagged opaque."""
+        key = QueryKey.for_collection("projects")
+        assert list_page_tags(key, "not a response") == ("opaque:projects",)
+
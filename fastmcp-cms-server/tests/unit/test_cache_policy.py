@@ -0,0 +1,104 @@
+"""Unit tests for the W-TinyLFU cache policy."""
+
+import pytest
+from core.cache_policy import FrequencySketch, WTinyLFUPolicy, estimate_size
+
+
+@pytest.mark.unit
+class TestFrequencySketch:
+    """Tests for FrequencySketch."""
+
+    def test_counts_accesses(self):
+        """Test that frequency tracks increments."""
+        sketch = FrequencySketch(capacity=64)
+        for _ in range(5):
+            sketch.increment("hot")
+        sketch.increment("cold")
+
+        assert sketch.frequency("hot") >= 5
+        assert sketch.frequency("cold") < sketch.frequency("hot")
+
+    def test_counters_saturate(self):
+        """Test that counters stop at MAX_COUNT."""
+        sketch = FrequencySketch(capacity=64)
+        for _ in range(100):
+            sketch.increment("key")
+
+        assert sketch.frequency("key") == FrequencySketch.MAX_COUNT
+
+    def test_aging_halves_counts(self):
+        """Test that age() decays popularity."""
+        sketch = FrequencySketch(capacity=64)
+        for _ in range(8):
+            sketch.increment("key")
+
+        sketch.age()
+
+        assert sketch.frequency("key") == 4
+
+
+@pytest.mark.unit
+class TestWTinyLFUPolicy:
+    """Tests for WTinyLFUPolicy."""
+
+    def test_estimate_size_walks_containers(self):
+        """Test that nested values weigh more than their container."""
+        flat = estimate_size({})
+        nested = estimate_size({"docs": [{"title": "x" * 1000}]})
+        assert nested > flat + 1000
+
+    def test_entry_budget(self):
+        """Test that resident keys never exceed max_entries."""
+        policy = WTinyLFUPolicy(max_entries=50, max_bytes=10**9)
+        evicted = []
+        for i in range(200):
+            evicted.extend(policy.add(f"key{i}", 1))
+
+        assert len(policy) == 50
+        assert len(evicted) == 150
+        assert policy.evictions == 150
+
+    def test_byte_budget(self):
+        """Test that total weight never exceeds max_bytes."""
+        policy = WTinyLFUPolicy(max_entries=1000, max_bytes=1000)
+        for i in range(100):
+            policy.add(f"key{i}", 100)
+
+        assert policy.total_weight <= 1000
+        assert len(policy) == 10
+
+    def test_frequent_keys_survive_scan(self):
+        """Test that a burst of one-off keys doesn't flush hot keys."""
+        policy = WTinyLFUPolicy(max_entries=100, max_bytes=10**9)
+        hot = [f"hot{i}" for i in range(50)]
+        for key in hot:
+            policy.add(key, 1)
+        for _ in range(5):
+            for key in hot:
+                policy.on_hit(key)
+        promoted = [key for key in hot if key in policy._protected]
+
+        for i in range(1000):
+            policy.add(f"scan{i}", 1)
+
+        assert len(promoted) >= 45
+        assert all(key in policy for key in promoted)
+        assert policy.admission_rejections > 0
+
+    def test_remove_releases_weight(self):
+        """Test that remove() gives back its bytes."""
+        policy = WTinyLFUPolicy(max_entries=10, max_bytes=1000)
+        policy.add("key", 300)
+
+        assert policy.remove("key")
+        assert policy.total_weight == 0
+        assert not policy.remove("key")
+
+    def test_resize_existing_key(self):
+        """Test that re-adding a key adjusts its weight."""
+        policy = WTinyLFUPolicy(max_entries=10, max_bytes=1000)
+        policy.add("key", 300)
+        policy.add("key", 100)
+
+        assert len(policy) == 1
+        assert policy.total_weight == 100
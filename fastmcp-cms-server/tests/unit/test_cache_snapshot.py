@@ -0,0 +1,188 @@
+"""Unit tests for SmartCache warm-start snapshots."""
+
+import pytest
+import struct
+import time
+from unittest.mock import patch
+from core.encoded_json import EncodedJSON
+from core.smart_cache import SmartCache
+from core.cache_snapshot import (
+    SNAPSHOT_MAGIC,
+    SNAPSHOT_VERSION,
+    load_snapshot,
+    save_snapshot,
+)
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    """Path for a snapshot file."""
+    return str(tmp_path / "cache.snapshot")
+
+
+@pytest.mark.unit
+class TestCacheSnapshot:
+    """Tests for save_snapshot/load_snapshot."""
+
+    @pytest.mark.asyncio
+    async def test_roundtrip_restores_entries_ttls_and_stats(self, snapshot_path):
+        """Test that entries come back with their expiry and access counts."""
+        cache = SmartCache(default_ttl=60, stale_ttl=120)
+        cache.set("global:site-settings", {"metaTitle": "Site"})
+        cache.set("collection:projects:limit=10", {"docs": [{"id": "a"}]})
+        for _ in range(3):
+            cache.get("global:site-settings")
+        cache._recompute_time["global:site-settings"] = 0.25
+
+        assert await save_snapshot(cache, snapshot_path) == 2
+
+        restored = SmartCache(default_ttl=60)
+        assert await load_snapshot(restored, snapshot_path) == 2
+
+        assert restored.get("global:site-settings") == {"metaTitle": "Site"}
+        assert restored._access_counts["global:site-settings"] == 4
+        assert restored._recompute_time["global:site-settings"] == pytest.approx(0.25)
+        assert abs(
+            restored._expiry["global:site-settings"] - cache._expiry["global:site-settings"]
+        ) < 0.001
+        assert "global:site-settings" in restored._stale_until
+        # Tags are rebuilt on insert
+        assert restored.invalidate_tag("contains:projects:a") == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_discarded(self, snapshot_path):
+        """Test that entries past their hard TTL are not restored."""
+        cache = SmartCache(default_ttl=60)
+        cache.set("global:live", "live")
+        cache.set("global:expiring", "old")
+        await save_snapshot(cache, snapshot_path)
+
+        # Pretend the expiring entry lapsed while the server was down
+        restored = SmartCache(default_ttl=60)
+        original = restored.restore_entry
+
+        def restore(key, value, expires_at, *args):
+            if key == "global:expiring":
+                expires_at = time.time() - 1
+            return original(key, value, expires_at, *args)
+
+        restored.restore_entry = restore
+        assert await load_snapshot(restored, snapshot_path) == 1
+        assert restored.get("global:expiring") is None
+
+    @pytest.mark.asyncio
+    async def test_version_mismatch_ignored(self, snapshot_path):
+        """Test that a snapshot from another schema version is not loaded."""
+        cache = SmartCache(default_ttl=60)
+        cache.set("global:site", "value")
+        await save_snapshot(cache, snapshot_path)
+
+        with open(snapshot_path, "r+b") as f:
+            f.seek(len(SNAPSHOT_MAGIC))
+            f.write(struct.pack("<H", SNAPSHOT_VERSION + 1))
+
+        restored = SmartCache(default_ttl=60)
+        assert await load_snapshot(restored, snapshot_path) == 0
+        assert restored.get_stats()["size"] == 0
+
+    @pytest.mark.asyncio
+    async def test_truncated_snapshot_loads_complete_records(self, snapshot_path):
+        """Test that a cut-off file restores what it can."""
+        cache = SmartCache(default_ttl=60)
+        for i in range(200):
+            cache.set(f"doc:projects:{i}", {"id": str(i), "body": "x" * 200})
+        await save_snapshot(cache, snapshot_path)
+
+        with open(snapshot_path, "r+b") as f:
+            f.truncate(f.seek(0, 2) // 2)
+
+        restored = SmartCache(default_ttl=60)
+        count = await load_snapshot(restored, snapshot_path, batch_size=16)
+        assert 0 < count < 200
+
+    @pytest.mark.asyncio
+    async def test_load_keeps_newer_live_entries(self, snapshot_path):
+        """Test that keys cached since startup aren't overwritten."""
+        cache = SmartCache(default_ttl=60)
+        cache.set("global:site", "old")
+        await save_snapshot(cache, snapshot_path)
+
+        restored = SmartCache(default_ttl=60)
+        restored.set("global:site", "new")
+        await load_snapshot(restored, snapshot_path)
+
+        assert restored.get("global:site") == "new"
+
+    @pytest.mark.asyncio
+    async def test_encoded_entries_saved_and_restored_as_held(self, snapshot_path):
+        """Test that encoded values aren't decoded or re-encoded on the way."""
+        page = {"docs": [{"id": "a", "title": "A"}], "totalDocs": 1}
+        cache = SmartCache(default_ttl=60, codec="zlib")
+        cache.set("collection:projects:limit=10", page)
+        cache.set("global:flag", "scalar")
+
+        with patch.object(EncodedJSON, "decode", side_effect=AssertionError("decoded")):
+            assert await save_snapshot(cache, snapshot_path) == 2
+
+        restored = SmartCache(default_ttl=60, codec="zlib")
+        with patch.object(EncodedJSON, "from_value", side_effect=AssertionError("re-encoded")):
+            assert await load_snapshot(restored, snapshot_path) == 2
+
+        key = "collection:projects:limit=10"
+        assert restored._cache[key].data == cache._cache[key].data
+        assert restored.get(key) == page
+        assert restored.invalidate_tag("contains:projects:a") == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("codec", [None, "none"])
+    async def test_encoded_entries_load_into_other_codecs(self, snapshot_path, codec):
+        """Test that a snapshot from a zlib cache fills a cache without it."""
+        cache = SmartCache(default_ttl=60, codec="zlib")
+        cache.set("doc:projects:p1", {"id": "p1"})
+        await save_snapshot(cache, snapshot_path)
+
+        restored = SmartCache(default_ttl=60, codec=codec)
+        assert await load_snapshot(restored, snapshot_path) == 1
+        assert restored.get("doc:projects:p1") == {"id": "p1"}
+
+    @pytest.mark.asyncio
+    async def test_missing_snapshot(self, snapshot_path):
+        """Test that a missing file is a no-op."""
+        assert await load_snapshot(SmartCache(), snapshot_path) == 0
+
+    @pytest.mark.asyncio
+    async def test_changes_during_load_not_overwritten(self, snapshot_path):
+        """Test that keys written or invalidated mid-load keep the newer state."""
+        cache = SmartCache(default_ttl=60)
+        cache.set("global:first", "old")
+        cache.set("doc:projects:p1", {"id": "p1", "title": "Old"})
+        cache.set("doc:projects:p2", {"id": "p2", "title": "Old"})
+        cache.set("collection:projects:limit=10", {"docs": [{"id": "p2"}]})
+        cache.set("global:untouched", "old")
+        await save_snapshot(cache, snapshot_path)
+
+        restored = SmartCache(default_ttl=60)
+        original = restored.restore_entry
+        calls = 0
+
+        def restore(*record):
+            nonlocal calls
+            calls += 1
+            if calls == 2:
+                # Arrive after the load started, before these are restored
+                restored.set("doc:projects:p1", {"id": "p1", "title": "New"})
+                restored.delete("doc:projects:p1")
+                restored.delete("doc:projects:p2")
+                restored.invalidate_smart("update", "projects", doc_id="p2", changes=["title"])
+            return original(*record)
+
+        restored.restore_entry = restore
+        await load_snapshot(restored, snapshot_path, batch_size=1)
+
+        assert restored.get("doc:projects:p1") is None
+        assert restored.get("doc:projects:p2") is None
+        assert restored.get("collection:projects:limit=10") is None
+        assert restored.get("global:untouched") == "old"
+        # Only while loading
+        restored.delete("global:untouched")
+        assert restored.restore_entry("global:untouched", "old", time.time() + 60)
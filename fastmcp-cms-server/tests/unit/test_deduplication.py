@@ -232,3 +232,39 @@ class TestRequestDeduplicator:
 
         stats = request_deduplicator.get_stats()
         assert stats["deduplicated"] == 2
+
+    @pytest.mark.asyncio
+    async def test_nested_params_are_order_independent(self, request_deduplicator):
+        """Test that nested dict params are canonicalised for the key."""
+        key_a = request_deduplicator._make_key(
+            "op", where={"a": {"equals": 1}, "b": [1, 2]}, limit=10
+        )
+        key_b = request_deduplicator._make_key(
+            "op", limit=10, where={"b": [1, 2], "a": {"equals": 1}}
+        )
+        key_c = request_deduplicator._make_key(
+            "op", limit=10, where={"b": [2, 1], "a": {"equals": 1}}
+        )
+
+        assert key_a == key_b
+        assert key_a != key_c
+
+    @pytest.mark.asyncio
+    async def test_saved_requests_tracked_per_operation(self, request_deduplicator):
+        """Test that saved upstream requests are counted per operation."""
+        async def handler(**kwargs):
+            await asyncio.sleep(0.05)
+            return "result"
+
+        await asyncio.gather(
+            *[request_deduplicator.execute("get_collection:projects", handler, page=1)
+              for _ in range(3)],
+            *[request_deduplicator.execute("get_collection:portfolio", handler, page=1)
+              for _ in range(2)],
+        )
+
+        stats = request_deduplicator.get_stats()
+        assert stats["saved_by_operation"] == {
+            "get_collection:projects": 2,
+            "get_collection:portfolio": 1,
+        }
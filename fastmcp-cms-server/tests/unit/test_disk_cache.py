@@ -0,0 +1,263 @@
+"""Unit tests for the disk cache tier."""
+
+import pytest
+import asyncio
+import sqlite3
+import threading
+import time
+from core.disk_cache import DiskCache
+from core.smart_cache import SmartCache, track_stale_reads
+
+
+@pytest.fixture
+def disk(tmp_path):
+    """Disk tier in a temporary directory."""
+    cache = DiskCache(str(tmp_path / "l2.sqlite"), max_bytes=1024 * 1024)
+    yield cache
+    cache.close()
+
+
+async def flush(cache):
+    """Wait until a cache's queued disk-tier calls have run."""
+    await asyncio.wrap_future(cache._disk_call(lambda: None))
+
+
+@pytest.mark.unit
+class TestDiskCache:
+    """Tests for DiskCache."""
+
+    def test_put_and_pop(self, disk):
+        """Test that an entry round-trips with its expiry and tags."""
+        expires_at = time.time() + 60
+        assert disk.put("global:site", {"title": "Site"}, expires_at, None, ["global"])
+
+        value, stored_expiry, stale_until, tags = disk.pop("global:site")
+        assert value == {"title": "Site"}
+        assert stored_expiry == pytest.approx(expires_at)
+        assert stale_until is None
+        assert tags == ["global"]
+        # Popping moves the entry out of the tier
+        assert disk.pop("global:site") is None
+        assert disk.get_stats()["hits"] == 1
+
+    def test_expired_entries_not_returned(self, disk):
+        """Test that entries past their hard TTL are dropped on read."""
+        disk.put("global:old", "old", expires_at=time.time() - 10)
+        disk.put("global:stale", "stale", time.time() - 10, time.time() + 60)
+
+        assert disk.pop("global:old") is None
+        assert disk.pop("global:stale")[0] == "stale"
+
+    def test_size_bound_evicts_oldest(self, tmp_path):
+        """Test that total size stays within max_bytes."""
+        disk = DiskCache(str(tmp_path / "l2.sqlite"), max_bytes=1000)
+        for i in range(10):
+            disk.put(f"doc:projects:{i}", "x" * 200)
+
+        stats = disk.get_stats()
+        assert stats["bytes"] <= 1000
+        assert stats["evictions"] == 6
+        assert "doc:projects:0" not in disk
+        assert "doc:projects:9" in disk
+        disk.close()
+
+    def test_invalidate_tag(self, disk):
+        """Test that tag invalidation removes only tagged entries."""
+        disk.put("collection:projects:limit=10", [], tags=["collection:projects"])
+        disk.put("collection:media:limit=10", [], tags=["collection:media"])
+
+        assert disk.invalidate_tag("collection:projects") == 1
+        assert disk.keys() == ["collection:media:limit=10"]
+
+    def test_failed_put_rolled_back(self, disk):
+        """Test that a put failing mid-transaction doesn't block later puts."""
+        with pytest.raises(sqlite3.Error):
+            disk.put("global:broken", {"title": "Broken"}, tags=[object()])
+
+        assert disk.put("global:site", {"title": "Site"}, tags=["global"])
+        assert disk.keys() == ["global:site"]
+        assert disk.pop("global:site")[0] == {"title": "Site"}
+
+    def test_persists_across_reopen(self, tmp_path):
+        """Test that entries survive closing and reopening the file."""
+        path = str(tmp_path / "l2.sqlite")
+        disk = DiskCache(path)
+        disk.put("global:site", {"title": "Site"}, time.time() + 60)
+        disk.close()
+
+        reopened = DiskCache(path)
+        assert "global:site" in reopened
+        assert reopened.get_stats()["bytes"] > 0
+        assert reopened.pop("global:site")[0] == {"title": "Site"}
+        reopened.close()
+
+
+@pytest.mark.unit
+class TestSmartCacheDiskTier:
+    """Tests for SmartCache with a disk tier."""
+
+    @pytest.mark.asyncio
+    async def test_evicted_entries_served_from_disk(self, disk):
+        """Test that memory evictions fall through to disk, not the CMS."""
+        cache = SmartCache(default_ttl=60, max_entries=2, l2=disk)
+        for i in range(5):
+            cache.set(f"doc:projects:{i}", {"id": str(i)})
+        await flush(cache)
+
+        evicted = [key for key in disk.keys()]
+        assert len(evicted) == 3
+        assert not any(key in cache._cache for key in evicted)
+
+        async def fetch():
+            raise AssertionError("should be served from disk")
+
+        key = evicted[0]
+        assert await cache.get_or_fetch(key, fetch) == {"id": key.rsplit(":", 1)[1]}
+
+        # Promoted back into memory and gone from disk
+        assert key in cache._cache
+        assert key not in disk
+        tiers = cache.get_stats()["tiers"]
+        assert tiers["disk"]["hits"] == 1
+        assert tiers["memory"]["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_promotion_keeps_expiry(self, disk):
+        """Test that TTLs are the same in both tiers."""
+        cache = SmartCache(default_ttl=60, stale_ttl=60, max_entries=1, l2=disk)
+        cache.set("global:a", "a")
+        expires_at = cache._expiry["global:a"]
+        cache.set("global:b", "b")
+        cache.set("global:c", "c")
+        await flush(cache)
+        assert "global:a" in disk
+
+        async def fetch():
+            return "fetched"
+
+        assert await cache.get_or_fetch("global:a", fetch) == "a"
+        assert abs(cache._expiry["global:a"] - expires_at) < 0.001
+
+    @pytest.mark.asyncio
+    async def test_stale_disk_entry_served_and_refreshed(self, disk):
+        """Test that a disk entry past its soft TTL goes through SWR."""
+        cache = SmartCache(default_ttl=60, l2=disk)
+        disk.put("global:site", "old", time.time() - 1, time.time() + 60)
+        fetched = []
+
+        async def fetch():
+            fetched.append(True)
+            cache.set("global:site", "new")
+            return "new"
+
+        with track_stale_reads() as reads:
+            assert await cache.get_or_fetch("global:site", fetch) == "old"
+        assert reads.stale
+
+        await cache._refresh_tasks["global:site"]
+        assert fetched == [True]
+        assert cache.get("global:site") == "new"
+
+    @pytest.mark.asyncio
+    async def test_disk_miss_fetches(self, disk):
+        """Test that a miss in both tiers goes to the CMS."""
+        cache = SmartCache(default_ttl=60, l2=disk)
+
+        async def fetch():
+            cache.set("global:site", "fetched")
+            return "fetched"
+
+        assert await cache.get_or_fetch("global:site", fetch) == "fetched"
+        assert cache.get_stats()["tiers"]["disk"]["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_oversize_values_go_to_disk(self, disk):
+        """Test that values too large for memory are kept on disk."""
+        cache = SmartCache(default_ttl=60, max_bytes=1000, l2=disk)
+        cache.set("collection:media:limit=100", {"docs": ["x" * 2000]})
+        await flush(cache)
+
+        assert "collection:media:limit=100" not in cache._cache
+        assert "collection:media:limit=100" in disk
+
+    @pytest.mark.asyncio
+    async def test_invalidation_reaches_disk(self, disk):
+        """Test that tag, pattern and smart invalidation evict disk entries."""
+        cache = SmartCache(default_ttl=60, max_entries=1, l2=disk)
+        cache.set("collection:projects:limit=10", {"docs": [{"id": "p1"}]})
+        cache.set("doc:projects:p1", {"id": "p1"})
+        cache.set("global:site", "site")
+        await flush(cache)
+        assert "collection:projects:limit=10" in disk
+
+        cache.invalidate_smart("update", "projects", doc_id="p1", changes=["title"])
+        await flush(cache)
+        assert "collection:projects:limit=10" not in disk
+
+        cache.invalidate_pattern(r"doc:projects:p\d")
+        await flush(cache)
+        assert "doc:projects:p1" not in disk
+        assert cache.delete("global:site")
+
+    @pytest.mark.asyncio
+    async def test_invalidation_queued_behind_demotion(self, disk):
+        """Test that an entry still being demoted is invalidated once it lands."""
+        cache = SmartCache(default_ttl=60, max_entries=1, l2=disk)
+        blocked = threading.Event()
+        cache._disk_call(blocked.wait)
+        cache.set("collection:projects:limit=10", {"docs": [{"id": "p1"}]})
+        cache.set("doc:media:m1", {"id": "m1"})
+        cache.set("global:site", "site")
+
+        cache.invalidate_tag("collection:projects")
+        cache.invalidate_pattern(r"doc:media:.*")
+        blocked.set()
+        await flush(cache)
+
+        assert disk.keys() == []
+
+    @pytest.mark.asyncio
+    async def test_disk_writes_off_the_event_loop(self, disk):
+        """Test that demotions and drops run on the disk thread."""
+        cache = SmartCache(default_ttl=60, max_entries=1, l2=disk)
+        threads = []
+        for name in ("put", "delete", "invalidate_tag"):
+            method = getattr(disk, name)
+
+            def record(*args, method=method, **kwargs):
+                threads.append(threading.current_thread())
+                return method(*args, **kwargs)
+
+            setattr(disk, name, record)
+
+        cache.set("global:a", "a")
+        cache.set("global:b", "b")
+        cache.delete("global:a")
+        cache.invalidate_tag("global")
+        await flush(cache)
+
+        assert threads
+        assert threading.main_thread() not in threads
+
+    @pytest.mark.asyncio
+    async def test_set_replaces_disk_copy(self, disk):
+        """Test that a new value supersedes the one on disk."""
+        cache = SmartCache(default_ttl=60, l2=disk)
+        disk.put("global:site", "old", time.time() + 60)
+
+        cache.set("global:site", "new")
+        await flush(cache)
+        assert "global:site" not in disk
+        assert cache.get("global:site") == "new"
+
+    @pytest.mark.asyncio
+    async def test_demotion_skips_expired(self, disk):
+        """Test that entries past their hard TTL are not written to disk."""
+        cache = SmartCache(default_ttl=60, max_entries=1, l2=disk)
+        cache.set("global:old", "old")
+        cache._expiry["global:old"] = time.monotonic() - 1
+        cache.set("global:new", "new")
+        cache.set("global:newer", "newer")
+        await flush(cache)
+
+        assert "global:old" not in disk
@@ -0,0 +1,213 @@
+"""Unit tests for encoded cache values."""
+
+import pytest
+import json
+from core.encoded_json import (
+    EncodedJSON,
+    RawJSON,
+    decoded,
+    dumps_result,
+    get_codec,
+    iter_json_array,
+    parse_list_page,
+)
+from core.smart_cache import SmartCache
+
+PAGE = {
+    "docs": [{"id": f"p{i}", "title": f"Project {i}", "_status": "draft"} for i in range(50)],
+    "totalDocs": 50,
+}
+
+
+@pytest.mark.unit
+class TestEncodedJSON:
+    """Tests for EncodedJSON."""
+
+    @pytest.mark.parametrize("codec", ["none", "zlib"])
+    def test_round_trip(self, codec):
+        """Test that bytes and values come back unchanged."""
+        body = json.dumps(PAGE).encode()
+        value = EncodedJSON.from_bytes(body, codec)
+
+        assert value.raw() == body
+        assert value.decode() == PAGE
+        assert value.raw_size == len(body)
+        assert EncodedJSON.from_value(PAGE, codec).decode() == PAGE
+
+    def test_compression_shrinks_repetitive_json(self):
+        """Test that zlib stores list pages in a fraction of their size."""
+        value = EncodedJSON.from_value(PAGE, "zlib")
+        assert len(value.data) < value.raw_size / 4
+
+    def test_decode_returns_independent_copies(self):
+        """Test that mutating a decoded value doesn't change the cache."""
+        value = EncodedJSON.from_value(PAGE)
+        value.decode()["docs"].clear()
+        assert len(value.decode()["docs"]) == 50
+
+    def test_unknown_codec(self):
+        """Test that a typo in the codec name fails loudly."""
+        with pytest.raises(ValueError):
+            get_codec("brotli")
+
+    def test_decoded_passes_other_values_through(self):
+        """Test the decoded() helper."""
+        assert decoded({"a": 1}) == {"a": 1}
+        assert decoded(EncodedJSON.from_value([1, 2])) == [1, 2]
+
+
+@pytest.mark.unit
+class TestSmartCacheCodec:
+    """Tests for SmartCache storing encoded values."""
+
+    def test_stores_bytes_and_returns_values(self):
+        """Test that containers are kept encoded but read back parsed."""
+        cache = SmartCache(codec="zlib")
+        body = json.dumps(PAGE).encode()
+        cache.set("collection:projects:limit=50", PAGE, raw=body)
+        cache.set("global:flag", "scalar")
+
+        stored = cache._cache["collection:projects:limit=50"]
+        assert isinstance(stored, EncodedJSON)
+        assert stored.raw() == body
+        assert cache.get("collection:projects:limit=50") == PAGE
+        assert cache._cache["global:flag"] == "scalar"
+        assert cache.get_stats()["codec"] == "zlib"
+
+    def test_list_pages_still_indexed_by_contents(self):
+        """Test that smart invalidation still finds pages holding a document."""
+        cache = SmartCache(codec="zlib")
+        cache.set("collection:projects:limit=50", PAGE)
+        cache.set("collection:projects:limit=1", {"docs": [{"id": "other"}]})
+
+        cache.invalidate_smart("update", "projects", doc_id="p3", changes=["title"])
+
+        assert cache.get("collection:projects:limit=50") is None
+        assert cache.get("collection:projects:limit=1") is not None
+
+    def test_encoded_entries_are_smaller(self):
+        """Test that the size accounting sees the encoded bytes."""
+        parsed = SmartCache()
+        encoded = SmartCache(codec="none")
+        for cache in (parsed, encoded):
+            cache.set("collection:projects:limit=50", PAGE)
+
+        assert encoded.get_stats()["bytes"] < parsed.get_stats()["bytes"] / 3
+
+    def test_versions_and_validators_read_encoded_documents(self):
+        """Test updatedAt comparisons against an encoded document."""
+        cache = SmartCache(codec="zlib")
+        cache.set("doc:projects:p1", {"id": "p1", "updatedAt": "2025-01-01T00:00:02Z"})
+
+        assert not cache.set_if_newer("doc:projects:p1", {"id": "p1", "updatedAt": "2025-01-01T00:00:01Z"})
+        assert cache.is_current("doc:projects:p1", "2025-01-01T00:00:02Z")
+        assert cache.get_validators("doc:projects:p1") == {"updated_at": "2025-01-01T00:00:02Z"}
+
+    @pytest.mark.asyncio
+    async def test_demoted_entries_stored_as_json(self, tmp_path):
+        """Test that encoded entries move to disk and come back intact."""
+        from core.disk_cache import DiskCache
+
+        disk = DiskCache(str(tmp_path / "l2.sqlite"))
+        cache = SmartCache(max_entries=1, codec="zlib", l2=disk)
+        cache.set("collection:projects:limit=50", PAGE)
+        cache.set("global:a", {"a": 1})
+        cache.set("global:b", {"b": 1})
+
+        async def fetch():
+            raise AssertionError("should be served from disk")
+
+        assert await cache.get_or_fetch("collection:projects:limit=50", fetch) == PAGE
+        await cache.close()
+
+
+@pytest.mark.unit
+class TestPassthrough:
+    """Tests for splicing unparsed JSON into tool results."""
+
+    def test_dumps_result_splices_raw_values(self):
+        """Test that RawJSON serializes like the value it holds."""
+        body = json.dumps(PAGE["docs"]).encode()
+        result = {"success": True, "documents": RawJSON(body), "meta": {"extra": RawJSON(b"[1]")}}
+
+        assert json.loads(dumps_result(result)) == {
+            "success": True,
+            "documents": PAGE["docs"],
+            "meta": {"extra": [1]},
+        }
+        assert dumps_result({"success": True}) == json.dumps({"success": True})
+
+    def test_dumps_result_rejects_other_objects(self):
+        """Test that non-JSON values still fail as with json.dumps."""
+        with pytest.raises(TypeError):
+            dumps_result({"value": object()})
+
+    def test_parse_list_page_leaves_docs_unparsed(self):
+        """Test that only the pagination fields are parsed."""
+        body = json.dumps({**PAGE, "hasNextPage": False, "nextPage": None, "page": 1}).encode()
+        page = parse_list_page(body)
+
+        assert isinstance(page["docs"], RawJSON)
+        assert json.loads(page["docs"].data) == PAGE["docs"]
+        assert page["totalDocs"] == 50
+        assert page["nextPage"] is None
+
+    @pytest.mark.parametrize("body", [
+        {"totalDocs": 1, "docs": [{"id": "a"}]},
+        {"docs": [{"id": "a"}], "note": "x]y"},
+        {"docs": [{"id": "a"}], "totalDocs": 1, "facets": [1]},
+        {"docs": [{"id": "a"}], "totalDocs": 1, "note": "x]y"},
+        {"docs": []},
+    ])
+    def test_parse_list_page_other_layouts(self, body):
+        """Test that other layouts parse to the same value."""
+        page = parse_list_page(json.dumps(body).encode())
+        if isinstance(page["docs"], RawJSON):
+            page["docs"] = json.loads(page["docs"].data)
+        assert page == body
+
+    @pytest.mark.asyncio
+    async def test_get_or_fetch_as_json(self):
+        """Test that encoded entries are returned as stored, without parsing."""
+        cache = SmartCache(codec="zlib")
+        body = json.dumps(PAGE).encode()
+        cache.set("collection:projects:limit=50", PAGE, raw=body)
+
+        async def fetch():
+            cache.set("global:site", {"title": "Site"})
+            return {"title": "Site"}
+
+        assert await cache.get_or_fetch("collection:projects:limit=50", fetch, as_json=True) == body
+        assert json.loads(await cache.get_or_fetch("global:site", fetch, as_json=True)) == {"title": "Site"}
+        assert cache.get_stats()["hits"] == 1
+
+
+@pytest.mark.unit
+class TestIterJsonArray:
+    """Tests for parsing JSON arrays one element at a time."""
+
+    @pytest.mark.parametrize("text", [
+        json.dumps(PAGE["docs"]),
+        json.dumps(PAGE["docs"], indent=2),
+        ' [ 1 , "a" , [] , {"b": [2, "]"]} , null ] ',
+        "[]",
+        " [ ] ",
+    ])
+    def test_matches_json_loads(self, text):
+        """Test that the elements are those of the parsed array."""
+        assert list(iter_json_array(text)) == json.loads(text)
+
+    def test_yields_before_reaching_errors(self):
+        """Test that elements before a syntax error are still produced."""
+        elements = iter_json_array('[{"id": "a"}, {"id": "b"}, {"id": ]')
+
+        assert next(elements) == {"id": "a"}
+        assert next(elements) == {"id": "b"}
+        with pytest.raises(ValueError):
+            next(elements)
+
+    @pytest.mark.parametrize("text", ['{"docs": []}', "[1 2]", "[1,]", "[1] x", "[1", ""])
+    def test_malformed(self, text):
+        """Test that anything but one well-formed array is rejected."""
+        with pytest.raises(ValueError):
+            list(iter_json_array(text))
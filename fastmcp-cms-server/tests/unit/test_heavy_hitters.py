@@ -0,0 +1,85 @@
+"""Unit tests for Space-Saving heavy-hitter tracking."""
+
+import pytest
+import random
+from core.heavy_hitters import SpaceSaving
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.unit
+class TestSpaceSaving:
+    """Tests for SpaceSaving."""
+
+    def test_counts_without_decay(self):
+        """Test exact counts while under capacity."""
+        tracker = SpaceSaving(capacity=10, half_life=0)
+        for key, n in (("a", 5), ("b", 3), ("c", 1)):
+            for _ in range(n):
+                tracker.record(key)
+
+        assert tracker.top(2) == [("a", 5.0), ("b", 3.0)]
+        assert tracker.estimate("c") == 1.0
+        assert tracker.estimate("missing") == 0.0
+
+    def test_memory_fixed_under_high_cardinality(self):
+        """Test that heavy hitters survive a long tail of one-off keys."""
+        tracker = SpaceSaving(capacity=32, half_life=0)
+        rng = random.Random(7)
+
+        for i in range(20_000):
+            if rng.random() < 0.3:
+                tracker.record(f"hot:{i % 5}")
+            else:
+                tracker.record(f"tail:{i}")
+
+        assert len(tracker) == 32
+        assert len(tracker._heap) <= 4 * 32 + 1
+        assert {key for key, _ in tracker.top(5)} == {f"hot:{i}" for i in range(5)}
+
+    def test_counts_decay(self):
+        """Test that old requests fade by the half-life."""
+        clock = FakeClock()
+        tracker = SpaceSaving(capacity=10, half_life=60, clock=clock)
+        for _ in range(8):
+            tracker.record("old")
+
+        clock.now = 120
+        for _ in range(3):
+            tracker.record("new")
+
+        assert tracker.estimate("old") == pytest.approx(2.0)
+        assert [key for key, _ in tracker.top(2)] == ["new", "old"]
+
+    def test_renormalizes_over_long_uptime(self):
+        """Test that weights stay finite after many half-lives."""
+        clock = FakeClock()
+        tracker = SpaceSaving(capacity=10, half_life=1, clock=clock)
+        tracker.record("a")
+
+        clock.now = 10_000
+        tracker.record("a")
+
+        assert tracker.estimate("a") == pytest.approx(1.0)
+        assert tracker._landmark == 10_000
+
+    def test_clear(self):
+        """Test that clear forgets every key."""
+        tracker = SpaceSaving(capacity=4)
+        tracker.record("a")
+        tracker.clear()
+        assert len(tracker) == 0
+        assert tracker.top() == []
+
+    def test_rejects_zero_capacity(self):
+        """Test that a tracker must monitor at least one key."""
+        with pytest.raises(ValueError):
+            SpaceSaving(capacity=0)
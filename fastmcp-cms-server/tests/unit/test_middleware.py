@@ -213,6 +213,16 @@ class TestValidationMiddleware:
                 items=[],
             )
 
+        # Empty items list as JSON text, in chunked mode
+        with pytest.raises(ValidationError, match="non-empty 'items' list"):
+            await middleware.process(
+                "batch_create",
+                {},
+                next_handler,
+                items=" [ ] ",
+                chunked=True,
+            )
+
         # Too many items
         with pytest.raises(ValidationError, match="limited to 100 items"):
             await middleware.process(
@@ -231,6 +241,16 @@ class TestValidationMiddleware:
         )
         assert result["success"] is True
 
+        # Chunked JSON text is only checked for being empty
+        result = await middleware.process(
+            "batch_create",
+            {},
+            next_handler,
+            items='[{"id": "1"}, oops',
+            chunked=True,
+        )
+        assert result["success"] is True
+
 
 @pytest.mark.unit
 class TestAuditMiddleware:
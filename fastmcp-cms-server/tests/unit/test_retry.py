@@ -2,7 +2,7 @@
 
 import pytest
 import asyncio
-from core.retry import RetryConfig, execute_with_retry, RETRY_CONFIGS
+from core.retry import RetryConfig, execute_with_retry, is_retryable, RETRY_CONFIGS
 from utils.errors import CMSTimeoutError, CMSConnectionError
 
 
@@ -42,6 +42,17 @@ class TestRetryConfig:
                 timeout=10,
             )
 
+    def test_deadline_shorter_than_timeout(self):
+        """Test that a deadline below the attempt timeout raises error."""
+        with pytest.raises(ValueError):
+            RetryConfig(
+                max_retries=0,
+                backoff_factor=2.0,
+                retry_on=(Exception,),
+                timeout=10,
+                deadline=5,
+            )
+
     def test_invalid_timeout(self):
         """Test that timeout <= 0 raises error."""
         with pytest.raises(ValueError):
@@ -103,6 +114,22 @@ class TestExecuteWithRetry:
         # get operation has max_retries=5
         assert call_count == 6  # Initial + 5 retries
 
+    @pytest.mark.asyncio
+    async def test_refused_request_not_retried(self):
+        """Test that a 4xx from the CMS isn't retried, unlike a 5xx."""
+        calls = []
+
+        async def refused(status):
+            calls.append(status)
+            raise CMSConnectionError(f"CMS request failed with status {status}", status_code=status)
+
+        with pytest.raises(CMSConnectionError):
+            await execute_with_retry("get", refused, 400)
+        assert calls == [400]
+
+        assert is_retryable(CMSConnectionError("failed", status_code=503), RETRY_CONFIGS["get"])
+        assert not is_retryable(CMSConnectionError("failed", status_code=409), RETRY_CONFIGS["get"])
+
     @pytest.mark.asyncio
     async def test_non_retryable_error_not_retried(self):
         """Test that non-retryable errors are not retried."""
@@ -182,6 +209,32 @@ class TestExecuteWithRetry:
         result = await execute_with_retry("batch_create", slow_batch)
         assert result == "success"
 
+    @pytest.mark.asyncio
+    async def test_deadline_bounds_whole_operation(self, monkeypatch):
+        """Test that a deadline replaces the attempt timeout for the operation."""
+        monkeypatch.setitem(RETRY_CONFIGS, "long_batch", RetryConfig(
+            max_retries=0,
+            backoff_factor=1.0,
+            retry_on=(),
+            timeout=0.05,
+            deadline=0.2,
+        ))
+
+        async def batch(duration):
+            await asyncio.sleep(duration)
+            return "success"
+
+        assert await execute_with_retry("long_batch", batch, 0.1) == "success"
+        with pytest.raises(CMSTimeoutError, match="after 0.2s"):
+            await execute_with_retry("long_batch", batch, 1)
+
+    def test_chunked_batches_keep_item_timeout(self):
+        """Test that chunked batches get a long deadline, not a long attempt timeout."""
+        chunked = RETRY_CONFIGS["batch_chunked"]
+
+        assert chunked.timeout == RETRY_CONFIGS["batch_create"].timeout
+        assert chunked.deadline > chunked.timeout
+
     def test_retry_configs_exist(self):
         """Test that retry configs are defined for common operations."""
         assert "create" in RETRY_CONFIGS
@@ -0,0 +1,421 @@
+"""Unit tests for the shared cache tier and invalidation channel."""
+
+import pytest
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+import time
+from core.shared_cache import RedisSharedCache, SQLiteSharedCache, create_shared_cache
+from core.smart_cache import SmartCache, cache_invalidation_listener
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def shared_path(tmp_path):
+    """Path of a shared cache file in a temporary directory."""
+    return str(tmp_path / "shared.sqlite")
+
+
+@pytest.fixture
+async def workers(shared_path):
+    """Two caches standing in for two server workers on one host."""
+    caches = [
+        SmartCache(default_ttl=60, shared=SQLiteSharedCache(shared_path, poll_interval=0.01))
+        for _ in range(2)
+    ]
+    yield caches
+    for cache in caches:
+        await cache.close()
+
+
+@pytest.fixture
+def redis_server(monkeypatch):
+    """Connect RedisSharedCache instances to one in-process fake Redis server."""
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    import redis
+
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        redis.Redis, "from_url",
+        classmethod(lambda cls, url: fakeredis.FakeRedis(server=server)),
+    )
+    return fakeredis.FakeRedis(server=server)
+
+
+async def flush(cache):
+    """Wait until a cache's queued shared-tier calls have run."""
+    await asyncio.wrap_future(cache._shared_call(lambda: None))
+
+
+def deliver(receiver):
+    """Apply what other workers published to a cache."""
+    return sum(
+        receiver.apply_invalidation(message)
+        for message in receiver.shared.poll(timeout=1.0)
+    )
+
+
+@pytest.mark.unit
+class TestSQLiteSharedCache:
+    """Tests for SQLiteSharedCache."""
+
+    def test_entries_visible_to_other_connections(self, shared_path):
+        """Test that one connection's writes are read by another."""
+        first, second = SQLiteSharedCache(shared_path), SQLiteSharedCache(shared_path)
+        expires_at = time.time() + 60
+
+        assert first.put("global:site", {"title": "Site"}, expires_at, None, ["global"])
+        value, stored_expiry, stale_until = second.get("global:site")
+
+        assert value == {"title": "Site"}
+        assert stored_expiry == pytest.approx(expires_at)
+        assert stale_until is None
+        first.close()
+        second.close()
+
+    def test_expired_entries_not_returned(self, shared_path):
+        """Test that entries past their hard TTL are misses."""
+        shared = SQLiteSharedCache(shared_path)
+        shared.put("global:old", "old", time.time() - 10)
+        shared.put("global:stale", "stale", time.time() - 10, time.time() + 60)
+
+        assert shared.get("global:old") is None
+        assert shared.get("global:stale")[0] == "stale"
+        shared.close()
+
+    def test_invalidation(self, shared_path):
+        """Test tag, pattern and key invalidation."""
+        shared = SQLiteSharedCache(shared_path)
+        shared.put("collection:projects:limit=10", [], tags=["collection:projects"])
+        shared.put("collection:media:limit=10", [], tags=["collection:media"])
+        shared.put("doc:projects:p1", {}, tags=["collection:projects"])
+        shared.put("doc:media:m1", {})
+
+        assert shared.invalidate_tag("collection:projects") == 2
+        assert shared.invalidate_pattern(r"doc:media:.*") == 1
+        assert shared.delete("collection:media:limit=10")
+        assert shared.get_stats()["size"] == 0
+        shared.close()
+
+    def test_size_bound_evicts_least_recently_used(self, shared_path):
+        """Test that total size stays within max_bytes."""
+        shared = SQLiteSharedCache(shared_path, max_bytes=1000)
+        for i in range(10):
+            shared.put(f"doc:projects:{i}", "x" * 200)
+
+        stats = shared.get_stats()
+        assert stats["bytes"] <= 1000
+        assert stats["evictions"] == 6
+        assert shared.get("doc:projects:0") is None
+        assert shared.get("doc:projects:9") is not None
+        shared.close()
+
+    def test_puts_fetched_before_an_invalidation_refused(self, shared_path):
+        """Test that a put can't bring back a value invalidated after it was fetched."""
+        first, second = SQLiteSharedCache(shared_path), SQLiteSharedCache(shared_path)
+        fetched_at = time.time()
+        second.delete("doc:projects:p1")
+        second.invalidate_tag("collection:media")
+        second.invalidate_pattern(r"global:.*")
+
+        assert not first.put("doc:projects:p1", "old", fetched_at=fetched_at)
+        assert not first.put("doc:media:m1", "old", tags=["collection:media"], fetched_at=fetched_at)
+        assert not first.put("global:site", "old", fetched_at=fetched_at)
+        # Fetched after the invalidations, or not invalidated at all
+        assert first.put("doc:projects:p1", "new", fetched_at=time.time())
+        assert first.put("doc:projects:p2", "old", tags=["collection:projects"], fetched_at=fetched_at)
+        # Too old to check
+        assert not first.put("doc:projects:p3", "old", fetched_at=time.time() - 600)
+
+        second.clear()
+        assert not first.put("doc:projects:p4", "old", fetched_at=fetched_at)
+        assert first.get_stats()["stale_puts"] == 5
+        first.close()
+        second.close()
+
+    def test_size_tracked_across_connections(self, shared_path):
+        """Test that the running size matches the stored entries after every kind of write."""
+        first, second = SQLiteSharedCache(shared_path, max_bytes=1000), SQLiteSharedCache(shared_path)
+        for i in range(4):
+            first.put(f"doc:projects:{i}", "x" * 100, tags=["collection:projects"])
+        second.put("doc:projects:0", "x" * 300)
+        second.delete("doc:projects:1")
+        first.invalidate_tag("collection:projects")
+        for i in range(6):
+            second.put(f"doc:media:{i}", "y" * 250)
+        first.put("doc:media:big", "z" * 400)
+
+        actual = first._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        assert first.get_stats()["bytes"] == second.get_stats()["bytes"] == actual
+        assert actual <= 1000
+        first.close()
+        second.close()
+
+    def test_publish_reaches_every_subscriber(self, shared_path):
+        """Test that messages are delivered once, in order, to each subscriber."""
+        publisher, subscriber = SQLiteSharedCache(shared_path), SQLiteSharedCache(shared_path)
+
+        publisher.publish({"op": "tag", "tag": "a"})
+        publisher.publish({"op": "tag", "tag": "b"})
+
+        assert [m["tag"] for m in subscriber.poll(timeout=1.0)] == ["a", "b"]
+        assert subscriber.poll(timeout=0.05) == []
+        # Only messages published after opening are delivered
+        assert SQLiteSharedCache(shared_path).poll(timeout=0.05) == []
+        publisher.close()
+        subscriber.close()
+
+    def test_create_shared_cache(self, shared_path):
+        """Test that non-Redis URLs open a SQLite file."""
+        shared = create_shared_cache(f"sqlite:///{shared_path}")
+        assert isinstance(shared, SQLiteSharedCache)
+        assert shared.path == shared_path
+        shared.close()
+
+
+@pytest.mark.unit
+class TestRedisSharedCache:
+    """Tests for RedisSharedCache."""
+
+    def test_entries_and_invalidation(self, redis_server):
+        """Test that entries round-trip and tag, pattern and key invalidation drop them."""
+        first, second = RedisSharedCache("redis://fake"), RedisSharedCache("redis://fake")
+        expires_at = time.time() + 60
+        first.put("collection:projects:limit=10", [], expires_at, tags=["collection:projects"])
+        first.put("doc:projects:p1", {"id": "p1"}, expires_at, tags=["collection:projects"])
+        first.put("doc:media:m1", {}, expires_at)
+
+        value, stored_expiry, stale_until = second.get("doc:projects:p1")
+        assert value == {"id": "p1"}
+        assert stored_expiry == pytest.approx(expires_at)
+        assert stale_until is None
+
+        assert second.invalidate_tag("collection:projects") == 2
+        assert second.invalidate_pattern(r"doc:media:.*") == 1
+        assert first.get("doc:projects:p1") is None
+        assert redis_server.keys("cms:entry:*") == redis_server.keys("cms:tag:*") == []
+        first.close()
+        second.close()
+
+    def test_tag_sets_expire_with_their_entries(self, redis_server):
+        """Test that a tag set outlives its longest-lived entry and no more."""
+        shared = RedisSharedCache("redis://fake")
+        now = time.time()
+        tag = "cms:tag:collection:projects"
+
+        shared.put("doc:projects:p1", {}, now + 10, tags=["collection:projects"])
+        assert 9_000 < redis_server.pttl(tag) <= 10_000
+        shared.put("doc:projects:p2", {}, now + 30, now + 60, tags=["collection:projects"])
+        assert 59_000 < redis_server.pttl(tag) <= 60_000
+        # A shorter-lived entry doesn't cut it short
+        shared.put("doc:projects:p3", {}, now + 5, tags=["collection:projects"])
+        assert redis_server.pttl(tag) > 59_000
+
+        # An entry without a TTL keeps the set for good
+        shared.put("doc:projects:p4", {}, tags=["collection:projects"])
+        shared.put("doc:projects:p5", {}, now + 10, tags=["collection:projects"])
+        assert redis_server.pttl(tag) == -1
+        assert redis_server.scard(tag) == 5
+        shared.close()
+
+    def test_puts_fetched_before_an_invalidation_refused(self, redis_server):
+        """Test that a put can't bring back a value invalidated after it was fetched."""
+        first, second = RedisSharedCache("redis://fake"), RedisSharedCache("redis://fake")
+        fetched_at = time.time()
+        second.delete("doc:projects:p1")
+        second.invalidate_tag("collection:media")
+        second.invalidate_pattern(r"global:.*")
+
+        assert not first.put("doc:projects:p1", "old", fetched_at=fetched_at)
+        assert not first.put("doc:media:m1", "old", tags=["collection:media"], fetched_at=fetched_at)
+        assert not first.put("global:site", "old", fetched_at=fetched_at)
+        assert first.put("doc:projects:p1", "new", fetched_at=time.time())
+        assert first.put("doc:projects:p2", "old", tags=["collection:projects"], fetched_at=fetched_at)
+        assert not first.put("doc:projects:p3", "old", fetched_at=time.time() - 600)
+
+        second.clear()
+        assert not first.put("doc:projects:p4", "old", fetched_at=fetched_at)
+        assert first.get("doc:projects:p2") is None
+        assert first.get_stats()["stale_puts"] == 5
+        first.close()
+        second.close()
+
+    def test_publish_reaches_other_subscribers(self, redis_server):
+        """Test that messages go over pub/sub to every subscriber."""
+        publisher, subscriber = RedisSharedCache("redis://fake"), RedisSharedCache("redis://fake")
+
+        publisher.publish({"op": "tag", "tag": "a"})
+        publisher.publish({"op": "tag", "tag": "b"})
+
+        assert [m["tag"] for m in subscriber.poll(timeout=1.0)] == ["a", "b"]
+        assert subscriber.poll(timeout=0.05) == []
+        publisher.close()
+        subscriber.close()
+
+    def test_missing_package_explained(self, monkeypatch):
+        """Test that a Redis URL without the redis package says how to install it."""
+        monkeypatch.setitem(sys.modules, "redis", None)
+
+        with pytest.raises(ImportError, match=r"fastmcp-cms-server\[redis\]"):
+            create_shared_cache("redis://cache:6379/0")
+
+
+@pytest.mark.unit
+class TestSmartCacheSharedTier:
+    """Tests for SmartCache workers sharing a tier."""
+
+    @pytest.mark.asyncio
+    async def test_miss_filled_from_other_worker(self, workers):
+        """Test that a value one worker fetched is not fetched again by another."""
+        first, second = workers
+        first.set("global:site", {"title": "Site"})
+        await flush(first)
+
+        async def fetch():
+            raise AssertionError("should be served from the shared tier")
+
+        assert await second.get_or_fetch("global:site", fetch) == {"title": "Site"}
+        # Copied into the second worker's memory, with the same expiry
+        assert "global:site" in second._cache
+        assert abs(second._expiry["global:site"] - first._expiry["global:site"]) < 0.01
+        assert second.get_stats()["tiers"]["shared"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_smart_evicts_everywhere(self, workers):
+        """Test that a write on one worker evicts affected pages on the other."""
+        first, second = workers
+        page = "collection:projects:where[_status][equals]=draft"
+        other_page = "collection:media:limit=10"
+        for cache in workers:
+            cache.set(page, {"docs": [{"id": "p1"}]})
+            cache.set(other_page, {"docs": []})
+
+        first.invalidate_smart("update", "projects", doc_id="p1", changes=["title"])
+        await flush(first)
+
+        assert deliver(second) == 1
+        assert second.get(page) is None
+        assert second.get(other_page) is not None
+        assert second.get_stats()["remote_invalidations"] == 1
+
+        # Dropped from the shared tier too, so the next miss goes to the CMS
+        fetched = []
+
+        async def fetch():
+            fetched.append(True)
+            return {"docs": []}
+
+        await second.get_or_fetch(page, fetch)
+        assert fetched == [True]
+
+    @pytest.mark.asyncio
+    async def test_delete_evicts_everywhere(self, workers):
+        """Test that deleting a key on one worker removes it on the other."""
+        first, second = workers
+        for cache in workers:
+            cache.set("doc:projects:p1", {"id": "p1"})
+
+        first.delete("doc:projects:p1")
+        await flush(first)
+        deliver(second)
+
+        assert second.get("doc:projects:p1") is None
+        assert second.shared.get("doc:projects:p1") is None
+
+    @pytest.mark.asyncio
+    async def test_put_queued_behind_invalidation_not_restored(self, workers):
+        """Test that a put landing after another worker's invalidation is refused."""
+        first, second = workers
+        blocked = threading.Event()
+
+        async def fetch():
+            second._shared_call(blocked.wait)
+            second.set("doc:projects:p1", {"id": "p1", "title": "Old"})
+            return {"id": "p1", "title": "Old"}
+
+        try:
+            # The second worker fetched the old version; its put is queued
+            await second.get_or_fetch("doc:projects:p1", fetch)
+            first.delete("doc:projects:p1")
+            await flush(first)
+        finally:
+            blocked.set()
+        await flush(second)
+
+        assert second.shared.get("doc:projects:p1") is None
+        assert second.shared.get_stats()["stale_puts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_own_messages_ignored(self, workers):
+        """Test that a worker doesn't re-apply its own invalidations."""
+        first, _ = workers
+        first.invalidate_tag("collection:projects")
+        await flush(first)
+
+        assert deliver(first) == 0
+        assert first.get_stats()["remote_invalidations"] == 0
+
+    @pytest.mark.asyncio
+    async def test_remote_invalidation_not_republished(self, workers):
+        """Test that applying a message doesn't echo it back."""
+        first, second = workers
+        first.invalidate_tag("collection:projects")
+        await flush(first)
+        deliver(second)
+        await flush(second)
+
+        assert second.shared.get_stats()["published"] == 0
+        assert first.shared.poll(timeout=0.05) == [
+            {"origin": first.worker_id, "op": "tag", "tag": "collection:projects"}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_negative_entries_stay_local(self, workers):
+        """Test that not-found markers aren't written to the shared tier."""
+        first, _ = workers
+        first.set_not_found("doc:projects:missing", "Not found", ttl=30)
+        await flush(first)
+
+        assert first.shared.get("doc:projects:missing") is None
+
+    @pytest.mark.asyncio
+    async def test_listener_applies_invalidations(self, workers, wait_for_condition):
+        """Test the background listener end to end."""
+        first, second = workers
+        second.set("global:site", "old")
+        listener = asyncio.create_task(cache_invalidation_listener(second, poll_timeout=0.05))
+        try:
+            first.delete("global:site")
+            await wait_for_condition(lambda: second.get("global:site") is None)
+        finally:
+            listener.cancel()
+            await asyncio.gather(listener, return_exceptions=True)
+
+    @pytest.mark.asyncio
+    async def test_shared_with_another_process(self, workers, shared_path):
+        """Test that a separate process reads fills and sees invalidations."""
+        first, _ = workers
+        first.set("global:site", {"title": "Site"})
+        first.set("doc:projects:p1", {"id": "p1"})
+        first.delete("doc:projects:p1")
+        await flush(first)
+
+        script = (
+            "import sys\n"
+            "from core.shared_cache import SQLiteSharedCache\n"
+            "shared = SQLiteSharedCache(sys.argv[1])\n"
+            "print(shared.get('global:site')[0]['title'], shared.get('doc:projects:p1'))\n"
+            "shared.publish({'origin': 'other', 'op': 'delete', 'key': 'global:site'})\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script, shared_path],
+            cwd=SERVER_DIR, capture_output=True, text=True, timeout=20,
+        )
+        assert result.stdout.split() == ["Site", "None"], result.stderr
+
+        deliver(first)
+        assert first.get("global:site") is None
@@ -2,8 +2,9 @@
 
 import pytest
 import asyncio
-from datetime import timedelta
-from core.smart_cache import SmartCache
+import time
+from core.smart_cache import SmartCache, track_stale_reads
+from core.cache_keys import QueryKey
 
 
 @pytest.mark.unit
@@ -183,6 +184,26 @@ class TestSmartCache:
         # Should have called get_collection
         mock_cms_client.get_collection.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_warm_key_refetches_exact_query(self, smart_cache, mock_cms_client):
+        """Test that warming a filtered list refetches the same filters and page."""
+        key = str(QueryKey.for_collection("projects", {
+            "limit": 10,
+            "page": 2,
+            "where[_status][equals]": "draft",
+        }))
+
+        await smart_cache._warm_key(key, mock_cms_client)
+
+        mock_cms_client.get_collection.assert_called_once_with(
+            collection="projects",
+            filters={"where[_status][equals]": "draft"},
+            limit=10,
+            page=2,
+            use_cache=False,
+        )
+        assert smart_cache.get(key) is not None
+
     def test_invalidate_pattern_with_glob(self, smart_cache):
         """Test glob-style pattern invalidation."""
         smart_cache.set("prefix:key1", "v1")
@@ -211,3 +232,437 @@ class TestSmartCache:
         """Test that hit rate is 0 with no requests."""
         stats = smart_cache.get_stats()
         assert stats["hit_rate"] == 0.0
+
+    def test_max_entries_evicts(self):
+        """Test that the cache stays within its entry budget."""
+        cache = SmartCache(default_ttl=60, max_entries=20)
+        for i in range(100):
+            cache.set(f"key{i}", {"i": i})
+
+        stats = cache.get_stats()
+        assert stats["size"] == 20
+        assert stats["evictions"] == 80
+        assert len(cache._expiry) == 20
+
+    def test_eviction_prunes_access_tracking(self):
+        """Test that evicted keys don't leak access bookkeeping."""
+        cache = SmartCache(default_ttl=60, max_entries=10)
+        for i in range(100):
+            cache.set(f"key{i}", i)
+            cache.get(f"key{i}")
+
+        assert len(cache._access_counts) <= 10
+        assert len(cache._last_access) <= 10
+
+    def test_byte_accounting(self, smart_cache):
+        """Test that resident bytes follow sets and deletes."""
+        smart_cache.set("key", {"body": "x" * 10_000})
+        assert smart_cache.get_stats()["bytes"] > 10_000
+
+        smart_cache.delete("key")
+        assert smart_cache.get_stats()["bytes"] == 0
+
+    def test_oversize_value_rejected(self):
+        """Test that a value larger than max_bytes is not cached."""
+        cache = SmartCache(default_ttl=60, max_bytes=1024)
+        cache.set("small", "ok")
+        cache.set("big", "x" * 4096)
+
+        assert cache.get("big") is None
+        assert cache.get("small") == "ok"
+        assert cache.get_stats()["oversize_rejections"] == 1
+
+    def test_keys_indexed_by_prefix_tag(self, smart_cache):
+        """Test that keys are indexed under their kind and name."""
+        smart_cache.set("collection:projects:limit=10", "list")
+        smart_cache.set("doc:projects:test-1", "doc")
+
+        assert smart_cache._tags["collection:projects"] == {"collection:projects:limit=10"}
+        assert smart_cache._tags["doc"] == {"doc:projects:test-1"}
+
+    def test_invalidate_tag(self, smart_cache):
+        """Test that invalidating a tag only touches its keys."""
+        smart_cache.set("collection:projects:page=1", "p1")
+        smart_cache.set("collection:projects:page=2", "p2")
+        smart_cache.set("collection:portfolio:page=1", "other")
+
+        assert smart_cache.invalidate_tag("collection:projects") == 2
+        assert smart_cache.get("collection:portfolio:page=1") == "other"
+        assert "collection:projects" not in smart_cache._tags
+
+    def test_extra_tags(self, smart_cache):
+        """Test that caller-supplied tags are indexed and replaced on re-set."""
+        smart_cache.set("collection:projects:page=1", "p1", tags=["doc:projects:a"])
+        smart_cache.set("collection:projects:page=1", "p1", tags=["doc:projects:b"])
+
+        assert smart_cache.invalidate_tag("doc:projects:a") == 0
+        assert smart_cache.invalidate_tag("doc:projects:b") == 1
+
+    def test_eviction_removes_tags(self):
+        """Test that evicted keys leave the tag index."""
+        cache = SmartCache(default_ttl=60, max_entries=10)
+        for i in range(100):
+            cache.set(f"collection:projects:page={i}", i)
+
+        assert len(cache._tags["collection:projects"]) == 10
+        assert len(cache._key_tags) == 10
+
+    def test_update_keeps_pages_without_document(self, smart_cache):
+        """Test that updating a doc leaves pages that don't show it."""
+        smart_cache.set("collection:projects:page=1", {"docs": [{"id": "a"}]})
+        smart_cache.set("collection:projects:page=2", {"docs": [{"id": "b"}]})
+
+        smart_cache.invalidate_smart("update", "projects", doc_id="a", changes=["title"])
+
+        assert smart_cache.get("collection:projects:page=1") is None
+        assert smart_cache.get("collection:projects:page=2") is not None
+
+    def test_update_drops_pages_filtering_on_changed_field(self, smart_cache):
+        """Test that a status change drops status-filtered pages."""
+        drafts = "collection:projects:where%5B_status%5D%5Bequals%5D=draft"
+        smart_cache.set(drafts, {"docs": [{"id": "a"}]})
+        smart_cache.set("collection:projects:page=1", {"docs": [{"id": "a"}, {"id": "b"}]})
+
+        smart_cache.invalidate_smart("publish", "projects", doc_id="b", changes=["_status"])
+
+        assert smart_cache.get(drafts) is None
+        assert smart_cache.get("collection:projects:page=1") is None
+
+    def test_update_drops_opaque_pages(self, smart_cache):
+        """Test that pages with unknown contents are always dropped."""
+        smart_cache.set("collection:projects:list", "list")
+
+        smart_cache.invalidate_smart("update", "projects", doc_id="a", changes=["title"])
+
+        assert smart_cache.get("collection:projects:list") is None
+
+    def test_set_if_newer_ignores_older_version(self, smart_cache):
+        """Test that an out-of-order older document doesn't overwrite."""
+        newer = {"id": "a", "title": "v2", "updatedAt": "2025-01-01T00:00:02.000Z"}
+        older = {"id": "a", "title": "v1", "updatedAt": "2025-01-01T00:00:01.000Z"}
+
+        assert smart_cache.set_if_newer("doc:projects:a", newer)
+        assert not smart_cache.set_if_newer("doc:projects:a", older)
+
+        assert smart_cache.get("doc:projects:a")["title"] == "v2"
+        assert smart_cache.get_stats()["stale_writes_ignored"] == 1
+
+    def test_set_if_newer_without_version(self, smart_cache):
+        """Test that unversioned values are always stored."""
+        smart_cache.set_if_newer("doc:projects:a", {"id": "a", "updatedAt": "2025-01-02T00:00:00Z"})
+        smart_cache.set_if_newer("doc:projects:a", {"id": "a", "title": "no version"})
+
+        assert smart_cache.get("doc:projects:a")["title"] == "no version"
+
+    def _expire(self, cache: SmartCache, key: str):
+        """Move a key past its soft TTL but not its hard TTL."""
+        cache._expiry[key] = time.monotonic() - 1
+
+    def test_stale_value_kept_until_hard_ttl(self):
+        """Test that get() misses on stale keys but get_stale() serves them."""
+        cache = SmartCache(default_ttl=60, stale_ttl=60)
+        cache.set("global:site", {"v": 1})
+        self._expire(cache, "global:site")
+
+        assert cache.get("global:site") is None
+        assert cache.get_stale("global:site") == {"v": 1}
+
+        cache._stale_until["global:site"] = time.monotonic() - 1
+        assert cache.get_stale("global:site") is None
+        assert "global:site" not in cache._cache
+
+    @pytest.mark.asyncio
+    async def test_get_or_fetch_serves_stale_and_refreshes_once(self):
+        """Test stale-while-revalidate triggers a single background refresh."""
+        cache = SmartCache(default_ttl=60, stale_ttl=60)
+        cache.set("global:site", {"v": 1})
+        self._expire(cache, "global:site")
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            cache.set("global:site", {"v": 2})
+            return {"v": 2}
+
+        with track_stale_reads() as reads:
+            results = await asyncio.gather(*[
+                cache.get_or_fetch("global:site", fetch) for _ in range(10)
+            ])
+
+        assert all(r == {"v": 1} for r in results)
+        assert reads.stale is True
+
+        await asyncio.sleep(0.1)
+        assert calls == 1
+        assert await cache.get_or_fetch("global:site", fetch) == {"v": 2}
+        assert cache.get_stats()["background_refreshes"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stale_served_while_refresh_fails(self):
+        """Test that a failing CMS doesn't evict a usable stale value."""
+        cache = SmartCache(default_ttl=60, stale_ttl=60)
+        cache.set("global:site", {"v": 1})
+        self._expire(cache, "global:site")
+
+        async def failing_fetch():
+            raise ConnectionError("CMS down")
+
+        for _ in range(3):
+            assert await cache.get_or_fetch("global:site", failing_fetch) == {"v": 1}
+            await asyncio.sleep(0)
+
+        assert cache.get_stats()["refresh_failures"] >= 1
+        await cache.close()
+
+    @pytest.mark.asyncio
+    async def test_get_or_fetch_without_stale_window_blocks(self, smart_cache):
+        """Test that a miss with no stale copy waits for the fetch."""
+        async def fetch():
+            return "fresh"
+
+        with track_stale_reads() as reads:
+            assert await smart_cache.get_or_fetch("global:site", fetch) == "fresh"
+        assert reads.stale is False
+
+    @pytest.mark.asyncio
+    async def test_early_refresh_near_expiry(self, smart_cache, monkeypatch):
+        """Test that a slow key close to expiry is refreshed ahead of time."""
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            smart_cache.set("global:site", {"v": calls})
+            return {"v": calls}
+
+        await smart_cache.get_or_fetch("global:site", fetch)
+        smart_cache._recompute_time["global:site"] = 1.0
+        monkeypatch.setattr("core.smart_cache.random.random", lambda: 0.5)
+
+        # 60s from expiry: -1.0 * ln(0.5) = 0.69s is far too early
+        assert await smart_cache.get_or_fetch("global:site", fetch) == {"v": 1}
+        await asyncio.sleep(0)
+        assert calls == 1
+
+        # 0.5s from expiry: within 0.69s, so refresh in the background
+        smart_cache._expiry["global:site"] = time.monotonic() + 0.5
+        assert await smart_cache.get_or_fetch("global:site", fetch) == {"v": 1}
+        await asyncio.sleep(0.01)
+        assert calls == 2
+        assert smart_cache.get_stats()["early_refreshes"] == 1
+
+    def test_no_early_refresh_without_timing(self, smart_cache):
+        """Test that keys never fetched through get_or_fetch aren't refreshed early."""
+        smart_cache.set("global:site", {"v": 1})
+        assert smart_cache._should_refresh_early("global:site") is False
+
+
+    @pytest.mark.asyncio
+    async def test_not_found_cached_with_short_ttl(self):
+        """Test that ResourceNotFoundError is remembered for negative_ttl."""
+        from utils.errors import ResourceNotFoundError
+
+        cache = SmartCache(default_ttl=300, negative_ttl=30)
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            raise ResourceNotFoundError("Document not found: projects/x")
+
+        for _ in range(3):
+            with pytest.raises(ResourceNotFoundError, match="projects/x"):
+                await cache.get_or_fetch("doc:projects:x", fetch, cache_not_found=True)
+
+        assert calls == 1
+        stats = cache.get_stats()
+        assert stats["negative_hits"] == 2
+        assert stats["negative_sets"] == 1
+        assert stats["hits"] == 0
+        assert cache.get("doc:projects:x") is None
+        assert cache._expiry["doc:projects:x"] < time.monotonic() + 31
+
+        # Expired negative entries go back to the CMS
+        cache._expiry["doc:projects:x"] = time.monotonic() - 1
+        with pytest.raises(ResourceNotFoundError):
+            await cache.get_or_fetch("doc:projects:x", fetch, cache_not_found=True)
+        assert calls == 2
+
+    @pytest.mark.asyncio
+    async def test_not_found_not_cached_by_default(self):
+        """Test that negative caching is opt-in per call."""
+        from utils.errors import ResourceNotFoundError
+
+        cache = SmartCache(negative_ttl=30)
+
+        async def fetch():
+            raise ResourceNotFoundError("missing")
+
+        with pytest.raises(ResourceNotFoundError):
+            await cache.get_or_fetch("collection:nope:limit=10", fetch)
+        assert "collection:nope:limit=10" not in cache._cache
+
+    @pytest.mark.asyncio
+    async def test_not_found_skipped_if_invalidated_during_fetch(self):
+        """Test that a create racing the lookup isn't shadowed by a 404."""
+        from utils.errors import ResourceNotFoundError
+
+        cache = SmartCache(negative_ttl=30)
+
+        async def fetch():
+            cache.delete("doc:projects:x")
+            raise ResourceNotFoundError("missing")
+
+        with pytest.raises(ResourceNotFoundError):
+            await cache.get_or_fetch("doc:projects:x", fetch, cache_not_found=True)
+        assert "doc:projects:x" not in cache._cache
+
+    def test_ttl_uses_monotonic_clock(self, monkeypatch):
+        """Test that wall-clock jumps don't change expiry."""
+        cache = SmartCache(default_ttl=60)
+        cache.set("global:site", "value")
+
+        # NTP steps the wall clock forward a day
+        monkeypatch.setattr("time.time", lambda: 10**10)
+        assert cache.get("global:site") == "value"
+
+    def test_expiry_on_read_is_not_an_invalidation(self):
+        """Test that reading an expired key counts an expiration only."""
+        cache = SmartCache(default_ttl=60)
+        cache.set("global:site", "value")
+        cache._expiry["global:site"] = time.monotonic() - 1
+        generation = cache._generation
+
+        assert cache.get("global:site") is None
+        assert "global:site" not in cache._cache
+        # Fetches in flight for other keys may still be stored
+        assert cache._generation == generation
+        stats = cache.get_stats()
+        assert stats["expirations"] == 1
+        assert stats["invalidations"] == 0
+
+    def test_sweep_reclaims_untouched_expired_entries(self):
+        """Test that sweep drops expired entries nobody reads."""
+        cache = SmartCache(default_ttl=60, stale_ttl=60)
+        for i in range(10):
+            cache.set(f"doc:projects:{i}", {"id": i})
+        now = time.monotonic()
+        for i in range(6):
+            cache._expiry[f"doc:projects:{i}"] = now - 120
+            cache._stale_until[f"doc:projects:{i}"] = now - 60
+            cache._schedule(f"doc:projects:{i}")
+
+        # Bounded slices
+        assert cache.sweep(limit=4) == 4
+        assert cache.sweep(limit=4) == 2
+        assert cache.sweep(limit=4) == 0
+        assert len(cache._cache) == 4
+        assert cache.get_stats()["expired_reclaimed"] == 6
+        # Reclaimed entries leave the tag index too
+        assert cache.invalidate_tag("doc:projects") == 4
+
+    def test_sweep_keeps_rewritten_and_stale_entries(self):
+        """Test that sweep ignores superseded deadlines and stale windows."""
+        cache = SmartCache(default_ttl=60, stale_ttl=60)
+        cache.set("global:rewritten", "old", ttl=1)
+        cache.set("global:stale", "stale")
+        cache._expiry["global:stale"] = time.monotonic() - 1
+        cache.set("global:rewritten", "new")
+
+        cache._deadlines[0] = (time.monotonic() - 1, "global:rewritten")
+        assert cache.sweep() == 0
+        assert cache.get("global:rewritten") == "new"
+        assert cache.get_stale("global:stale") == "stale"
+
+    def test_deadline_heap_stays_bounded(self):
+        """Test that rewriting keys doesn't grow the heap without bound."""
+        cache = SmartCache(default_ttl=60)
+        for _ in range(5000):
+            cache.set("global:site", "value")
+        assert len(cache._deadlines) <= 2 * len(cache._cache) + 1025
+
+    @pytest.mark.asyncio
+    async def test_sweeper_task_yields_between_slices(self):
+        """Test that the sweeper drains expired entries in slices."""
+        from core.smart_cache import cache_sweeper_task
+
+        cache = SmartCache(default_ttl=60)
+        for i in range(25):
+            cache.set(f"doc:projects:{i}", i, ttl=1)
+        for i in range(25):
+            cache._expiry[f"doc:projects:{i}"] = time.monotonic() - 1
+            cache._schedule(f"doc:projects:{i}")
+
+        task = asyncio.create_task(cache_sweeper_task(cache, interval=0.01, batch_size=10))
+        await asyncio.sleep(0.1)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+        assert len(cache._cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_warming_follows_current_traffic(self, mock_cms_client):
+        """Test that keys popular long ago aren't warmed."""
+        now = [0.0]
+        cache = SmartCache(default_ttl=60, hot_key_half_life=60)
+        cache._hot_keys._clock = lambda: now[0]
+        cache._hot_keys.clear()
+
+        for _ in range(40):
+            cache.get("global:old")
+        now[0] = 600
+        for _ in range(20):
+            cache.get("global:current")
+
+        assert [key for key, _ in cache.get_hot_keys(limit=1)] == ["global:current"]
+
+        await cache.warm_frequently_accessed(mock_cms_client, threshold=10)
+        await asyncio.gather(*cache._warming_tasks.values())
+
+        mock_cms_client.get_global.assert_called_once_with(
+            global_slug="current",
+            use_cache=False,
+        )
+
+    def test_hot_key_tracking_bounded(self):
+        """Test that hot-key memory doesn't grow with key cardinality."""
+        cache = SmartCache(hot_key_capacity=16)
+        for i in range(1000):
+            cache.get(f"doc:projects:{i}")
+        assert cache.get_stats()["hot_keys_tracked"] == 16
+
+    @pytest.mark.asyncio
+    async def test_hot_key_tracking_disabled(self):
+        """Test that a hot-key capacity of 0 turns tracking off."""
+        cache = SmartCache(hot_key_capacity=0)
+        cache.set("doc:projects:1", {"id": "1"})
+
+        assert cache.get("doc:projects:1") == {"id": "1"}
+        assert cache.get("doc:projects:2") is None
+        assert cache.get_hot_keys() == []
+        assert cache.get_stats()["hot_keys_tracked"] == 0
+        await cache.warm_frequently_accessed(client=None, threshold=0)
+        cache.clear()
+
+    def test_revalidate_restarts_ttl_and_keeps_validators(self):
+        """Test that a confirmed-unchanged value gets a fresh TTL."""
+        cache = SmartCache(default_ttl=60, stale_ttl=60)
+        cache.set("global:site", {"title": "Site", "updatedAt": "2025-01-01T00:00:00Z"})
+        cache.set_validators("global:site", etag='"abc"')
+        cache._expiry["global:site"] = time.monotonic() - 1
+
+        assert cache.get_validators("global:site") == {
+            "etag": '"abc"',
+            "updated_at": "2025-01-01T00:00:00Z",
+        }
+        assert cache.revalidate("global:site")["title"] == "Site"
+        assert cache.get("global:site") is not None
+        assert cache.get_validators("global:site")["etag"] == '"abc"'
+        assert cache.get_stats()["revalidations"] == 1
+
+        # A new value invalidates the old validators
+        cache.set("global:site", {"title": "Changed"})
+        assert cache.get_validators("global:site") == {}
+        assert cache.revalidate("global:missing") is None
@@ -1,15 +1,19 @@
 """Consolidated collection operations tool."""
 
-from typing import Literal, Optional, Any
-from services.cms_client_enhanced import EnhancedCMSClient
+from typing import Literal, Optional, Any, Awaitable, Callable, Iterable
+from services.cms_client_enhanced import get_cms_client
 from services.batch import (
     batch_create_documents,
     batch_update_documents,
     batch_delete_documents,
+    batch_in_chunks,
+    confirmation_required,
 )
 from core.registry import OperationRegistry
 from core.middleware import create_default_middleware_stack
-from core.retry import execute_with_retry
+from core.retry import execute_with_retry, get_retry_config
+from core.smart_cache import track_stale_reads
+from core.encoded_json import RawJSON, iter_json_array, parse_list_page
 from schemas.operation_schemas import OPERATION_SCHEMAS
 from utils.logging import get_logger
 from utils.errors import ResourceNotFoundError, ValidationError
@@ -24,52 +28,64 @@ logger = get_logger(__name__)
 
 async def create_handler(collection: str, data: dict, draft: bool = True, **kwargs) -> dict:
     """Handle create operation."""
-    async with EnhancedCMSClient() as client:
-        result = await client.create_document(
-            collection=collection,
-            data=data,
-            draft=draft,
-        )
+    client = await get_cms_client()
+    result = await client.create_document(
+        collection=collection,
+        data=data,
+        draft=draft,
+    )
 
-        return {
-            "success": True,
-            "documentId": data.get("id") or result.get("id"),
-            "status": "draft" if draft else "published",
-            "message": f"Document created successfully in {collection}",
-            "data": result,
-        }
+    return {
+        "success": True,
+        "documentId": data.get("id") or result.get("id"),
+        "status": "draft" if draft else "published",
+        "message": f"Document created successfully in {collection}",
+        "data": result,
+    }
 
 
 async def update_handler(collection: str, doc_id: str, data: dict, **kwargs) -> dict:
     """Handle update operation."""
-    async with EnhancedCMSClient() as client:
-        result = await client.update_document(
-            collection=collection,
-            doc_id=doc_id,
-            data=data,
-        )
+    client = await get_cms_client()
+    result = await client.update_document(
+        collection=collection,
+        doc_id=doc_id,
+        data=data,
+    )
 
-        return {
-            "success": True,
-            "documentId": doc_id,
-            "message": f"Document updated successfully in {collection}",
-            "data": result,
-        }
+    return {
+        "success": True,
+        "documentId": doc_id,
+        "message": f"Document updated successfully in {collection}",
+        "data": result,
+    }
 
 
-async def get_handler(collection: str, doc_id: str, **kwargs) -> dict:
-    """Handle get operation."""
-    async with EnhancedCMSClient() as client:
+async def get_handler(collection: str, doc_id: str, passthrough: bool = False, **kwargs) -> dict:
+    """
+    Handle get operation.
+
+    With ``passthrough``, the document is returned as RawJSON (for
+    ``dumps_result``) instead of being parsed.
+    """
+    client = await get_cms_client()
+    with track_stale_reads() as reads:
         result = await client.get_document(
             collection=collection,
             doc_id=doc_id,
+            as_json=passthrough,
         )
+    if passthrough:
+        result = RawJSON(result)
 
-        return {
-            "success": True,
-            "documentId": doc_id,
-            "data": result,
-        }
+    response = {
+        "success": True,
+        "documentId": doc_id,
+        "data": result,
+    }
+    if reads.stale:
+        response["meta"] = {"stale": True}
+    return response
 
 
 async def list_handler(
@@ -77,25 +93,38 @@ async def list_handler(
     filters: dict = None,
     limit: int = 100,
     page: int = 1,
+    passthrough: bool = False,
     **kwargs
 ) -> dict:
-    """Handle list operation."""
-    async with EnhancedCMSClient() as client:
+    """
+    Handle list operation.
+
+    With ``passthrough``, the documents are returned as RawJSON (for
+    ``dumps_result``) instead of being parsed.
+    """
+    client = await get_cms_client()
+    with track_stale_reads() as reads:
         result = await client.get_collection(
             collection=collection,
             filters=filters or {},
             limit=limit,
             page=page,
+            as_json=passthrough,
         )
-
-        return {
-            "success": True,
-            "documents": result.get("docs", []),
-            "totalDocs": result.get("totalDocs", 0),
-            "page": result.get("page", 1),
-            "totalPages": result.get("totalPages", 1),
-            "limit": result.get("limit", limit),
-        }
+    if passthrough:
+        result = parse_list_page(result)
+
+    response = {
+        "success": True,
+        "documents": result.get("docs", []),
+        "totalDocs": result.get("totalDocs", 0),
+        "page": result.get("page", 1),
+        "totalPages": result.get("totalPages", 1),
+        "limit": result.get("limit", limit),
+    }
+    if reads.stale:
+        response["meta"] = {"stale": True}
+    return response
 
 
 async def delete_handler(collection: str, doc_id: str, confirm: bool = False, **kwargs) -> dict:
@@ -117,21 +146,54 @@ async def delete_handler(collection: str, doc_id: str, confirm: bool = False, **
             "documentId": doc_id,
         }
 
-    async with EnhancedCMSClient() as client:
-        await client.delete_document(
-            collection=collection,
-            doc_id=doc_id,
-        )
+    client = await get_cms_client()
+    await client.delete_document(
+        collection=collection,
+        doc_id=doc_id,
+    )
 
-        return {
-            "success": True,
-            "documentId": doc_id,
-            "message": f"Document deleted successfully from {collection}",
-        }
+    return {
+        "success": True,
+        "documentId": doc_id,
+        "message": f"Document deleted successfully from {collection}",
+    }
+
+
+async def _set_status(collection: str, doc_ids: list[str], status: str) -> dict:
+    """
+    Set the status of many documents with one bulk update.
+
+    Args:
+        collection: Target collection
+        doc_ids: Documents to change
+        status: New ``_status``
+
+    Returns:
+        Batch operation result (see batch_update_documents)
+    """
+    return await batch_update_documents(
+        collection=collection,
+        items=[{"id": doc_id, "data": {"_status": status}} for doc_id in doc_ids],
+        client=await get_cms_client(),
+        bulk=True,
+    )
 
 
-async def publish_handler(collection: str, doc_id: str, require_approval: bool = False, **kwargs) -> dict:
-    """Handle publish operation."""
+def _require_doc_id(doc_id: Optional[str], doc_ids: Optional[list[str]]):
+    """Check that a status change names at least one document."""
+    if doc_id is None and not doc_ids:
+        raise ValidationError("Missing required parameter: doc_id")
+
+
+async def publish_handler(
+    collection: str,
+    doc_id: Optional[str] = None,
+    require_approval: bool = False,
+    doc_ids: Optional[list[str]] = None,
+    **kwargs
+) -> dict:
+    """Handle publish operation (of doc_id, or in bulk of doc_ids)."""
+    _require_doc_id(doc_id, doc_ids)
     if Config.REQUIRE_APPROVAL_FOR_PUBLISH or require_approval:
         return {
             "success": False,
@@ -140,20 +202,55 @@ async def publish_handler(collection: str, doc_id: str, require_approval: bool =
             "documentId": doc_id,
         }
 
-    async with EnhancedCMSClient() as client:
-        result = await client.update_document(
-            collection=collection,
-            doc_id=doc_id,
-            data={"_status": "published"},
-        )
+    if doc_id is None:
+        return await _set_status(collection, doc_ids, "published")
+
+    client = await get_cms_client()
+    result = await client.update_document(
+        collection=collection,
+        doc_id=doc_id,
+        data={"_status": "published"},
+    )
+
+    return {
+        "success": True,
+        "documentId": doc_id,
+        "status": "published",
+        "message": f"Document published successfully in {collection}",
+        "data": result,
+    }
 
-        return {
-            "success": True,
-            "documentId": doc_id,
-            "status": "published",
-            "message": f"Document published successfully in {collection}",
-            "data": result,
-        }
+
+def _item_stream(items: Any) -> Iterable:
+    """Items of a chunked batch, parsed one at a time if still JSON text."""
+    return iter_json_array(items) if isinstance(items, str) else items
+
+
+async def _run_chunked(
+    run_chunk: Callable[[list], Awaitable[dict]],
+    items: Any,
+    parallel: bool,
+    progress: Optional[Callable[[int], Awaitable[Any]]],
+) -> dict:
+    """Run a batch of any size in chunks (see batch_in_chunks)."""
+    return await batch_in_chunks(
+        run_chunk,
+        _item_stream(items),
+        chunk_size=Config.BATCH_CHUNK_SIZE,
+        chunks_in_flight=Config.BATCH_CHUNKS_IN_FLIGHT if parallel else 1,
+        progress=progress,
+    )
+
+
+def _batch_deadline(operation: str, chunked: bool) -> Optional[float]:
+    """
+    Seconds a batch's items may run, leaving time to report them before
+    the operation's own timeout (see execute_with_retry) cancels it.
+    """
+    if chunked:
+        # Each chunk is small; the run as a whole has a long deadline
+        return None
+    return get_retry_config(operation).timeout * 0.9
 
 
 async def batch_create_handler(
@@ -161,29 +258,54 @@ async def batch_create_handler(
     items: list[dict],
     draft: bool = True,
     parallel: bool = True,
+    chunked: bool = False,
+    progress: Optional[Callable[[int], Awaitable[Any]]] = None,
     **kwargs
 ) -> dict:
-    """Handle batch create operation."""
-    return await batch_create_documents(
-        collection=collection,
-        items=items,
-        draft=draft,
-        parallel=parallel,
-    )
+    """Handle batch create operation (of any size in chunked mode)."""
+    client = await get_cms_client()
+
+    async def create(chunk: list[dict]) -> dict:
+        return await batch_create_documents(
+            collection=collection,
+            items=chunk,
+            draft=draft,
+            parallel=parallel,
+            client=client,
+            retry=get_retry_config("create"),
+            deadline=_batch_deadline("batch_create", chunked),
+        )
+
+    if chunked:
+        return await _run_chunked(create, items, parallel, progress)
+    return await create(items)
 
 
 async def batch_update_handler(
     collection: str,
     items: list[dict],
     parallel: bool = True,
+    chunked: bool = False,
+    progress: Optional[Callable[[int], Awaitable[Any]]] = None,
     **kwargs
 ) -> dict:
-    """Handle batch update operation."""
-    return await batch_update_documents(
-        collection=collection,
-        items=items,
-        parallel=parallel,
-    )
+    """Handle batch update operation (of any size in chunked mode)."""
+    client = await get_cms_client()
+
+    async def update(chunk: list[dict]) -> dict:
+        return await batch_update_documents(
+            collection=collection,
+            items=chunk,
+            parallel=parallel,
+            client=client,
+            bulk=True,
+            retry=get_retry_config("update"),
+            deadline=_batch_deadline("batch_update", chunked),
+        )
+
+    if chunked:
+        return await _run_chunked(update, items, parallel, progress)
+    return await update(items)
 
 
 async def batch_delete_handler(
@@ -191,15 +313,31 @@ async def batch_delete_handler(
     doc_ids: list[str],
     confirm: bool = False,
     parallel: bool = True,
+    chunked: bool = False,
+    progress: Optional[Callable[[int], Awaitable[Any]]] = None,
     **kwargs
 ) -> dict:
-    """Handle batch delete operation."""
-    return await batch_delete_documents(
-        collection=collection,
-        doc_ids=doc_ids,
-        confirm=confirm,
-        parallel=parallel,
-    )
+    """Handle batch delete operation (of any size in chunked mode)."""
+    client = await get_cms_client()
+
+    async def delete(chunk: list[str]) -> dict:
+        return await batch_delete_documents(
+            collection=collection,
+            doc_ids=chunk,
+            confirm=confirm,
+            parallel=parallel,
+            client=client,
+            bulk=True,
+            retry=get_retry_config("delete"),
+            deadline=_batch_deadline("batch_delete", chunked),
+        )
+
+    if chunked:
+        if not confirm:
+            # Not counted, so nothing is parsed before confirmation
+            return confirmation_required(None)
+        return await _run_chunked(delete, doc_ids, parallel, progress)
+    return await delete(doc_ids)
 
 
 async def search_handler(
@@ -207,9 +345,10 @@ async def search_handler(
     query: str,
     fields: list[str] = None,
     limit: int = 50,
+    passthrough: bool = False,
     **kwargs
 ) -> dict:
-    """Handle search operation."""
+    """Handle search operation (``passthrough`` as for list)."""
     # Build search filters
     filters = {}
     if fields:
@@ -220,53 +359,78 @@ async def search_handler(
         # Default to title search
         filters["where[title][contains]"] = query
 
-    async with EnhancedCMSClient() as client:
+    client = await get_cms_client()
+    with track_stale_reads() as reads:
         result = await client.get_collection(
             collection=collection,
             filters=filters,
             limit=limit,
+            as_json=passthrough,
         )
+    if passthrough:
+        result = parse_list_page(result)
 
-        return {
-            "success": True,
-            "results": result.get("docs", []),
-            "totalResults": result.get("totalDocs", 0),
-            "query": query,
-        }
+    response = {
+        "success": True,
+        "results": result.get("docs", []),
+        "totalResults": result.get("totalDocs", 0),
+        "query": query,
+    }
+    if reads.stale:
+        response["meta"] = {"stale": True}
+    return response
 
 
-async def archive_handler(collection: str, doc_id: str, **kwargs) -> dict:
+async def archive_handler(
+    collection: str,
+    doc_id: Optional[str] = None,
+    doc_ids: Optional[list[str]] = None,
+    **kwargs
+) -> dict:
     """Handle archive operation (update status to archived)."""
-    async with EnhancedCMSClient() as client:
-        result = await client.update_document(
-            collection=collection,
-            doc_id=doc_id,
-            data={"_status": "archived"},
-        )
+    _require_doc_id(doc_id, doc_ids)
+    if doc_id is None:
+        return await _set_status(collection, doc_ids, "archived")
 
-        return {
-            "success": True,
-            "documentId": doc_id,
-            "message": f"Document archived successfully in {collection}",
-            "data": result,
-        }
+    client = await get_cms_client()
+    result = await client.update_document(
+        collection=collection,
+        doc_id=doc_id,
+        data={"_status": "archived"},
+    )
+
+    return {
+        "success": True,
+        "documentId": doc_id,
+        "message": f"Document archived successfully in {collection}",
+        "data": result,
+    }
 
 
-async def restore_handler(collection: str, doc_id: str, **kwargs) -> dict:
+async def restore_handler(
+    collection: str,
+    doc_id: Optional[str] = None,
+    doc_ids: Optional[list[str]] = None,
+    **kwargs
+) -> dict:
     """Handle restore operation (update status to draft)."""
-    async with EnhancedCMSClient() as client:
-        result = await client.update_document(
-            collection=collection,
-            doc_id=doc_id,
-            data={"_status": "draft"},
-        )
+    _require_doc_id(doc_id, doc_ids)
+    if doc_id is None:
+        return await _set_status(collection, doc_ids, "draft")
 
-        return {
-            "success": True,
-            "documentId": doc_id,
-            "message": f"Document restored successfully in {collection}",
-            "data": result,
-        }
+    client = await get_cms_client()
+    result = await client.update_document(
+        collection=collection,
+        doc_id=doc_id,
+        data={"_status": "draft"},
+    )
+
+    return {
+        "success": True,
+        "documentId": doc_id,
+        "message": f"Document restored successfully in {collection}",
+        "data": result,
+    }
 
 
 # ============================================================================
@@ -346,8 +510,8 @@ def setup_collection_registry() -> OperationRegistry:
         side_effects=True,
         rate_limit=15,
         output_schema=OPERATION_SCHEMAS["publish"],
-        description="Publish a draft document",
-        required_params=["collection", "doc_id"],
+        description="Publish a draft document (or doc_ids in bulk)",
+        required_params=["collection"],
     )
 
     registry.register(
@@ -405,8 +569,8 @@ def setup_collection_registry() -> OperationRegistry:
         side_effects=True,
         rate_limit=20,
         output_schema=OPERATION_SCHEMAS["archive"],
-        description="Archive a document",
-        required_params=["collection", "doc_id"],
+        description="Archive a document (or doc_ids in bulk)",
+        required_params=["collection"],
     )
 
     registry.register(
@@ -416,8 +580,8 @@ def setup_collection_registry() -> OperationRegistry:
         side_effects=True,
         rate_limit=20,
         output_schema=OPERATION_SCHEMAS["restore"],
-        description="Restore an archived document",
-        required_params=["collection", "doc_id"],
+        description="Restore an archived document (or doc_ids in bulk)",
+        required_params=["collection"],
     )
 
     # Set up middleware stack
@@ -494,9 +658,10 @@ async def cms_collection_ops_handler(
     registry = get_collection_registry()
 
     try:
-        # Execute through registry (includes middleware and retry logic)
+        # Execute through registry (includes middleware and retry logic);
+        # chunked batches run far longer than a single batch
         result = await execute_with_retry(
-            operation,
+            "batch_chunked" if kwargs.get("chunked") and operation.startswith("batch_") else operation,
             registry.execute,
             operation,
             collection=collection,
@@ -3,10 +3,12 @@
 from typing import Literal, Optional
 import json
 from datetime import datetime
-from services.cms_client_enhanced import EnhancedCMSClient
+from services.cms_client_enhanced import get_cms_client
 from core.registry import OperationRegistry
 from core.middleware import create_default_middleware_stack
 from core.retry import execute_with_retry
+from core.smart_cache import track_stale_reads
+from core.encoded_json import RawJSON
 from schemas.operation_schemas import OPERATION_SCHEMAS
 from utils.logging import get_logger
 from utils.errors import ValidationError
@@ -18,15 +20,26 @@ logger = get_logger(__name__)
 # OPERATION HANDLERS
 # ============================================================================
 
-async def get_global_handler(global_slug: str, **kwargs) -> dict:
-    """Handle get global operation."""
-    async with EnhancedCMSClient() as client:
-        result = await client.get_global(global_slug=global_slug)
+async def get_global_handler(global_slug: str, passthrough: bool = False, **kwargs) -> dict:
+    """
+    Handle get global operation.
 
-        return {
-            "success": True,
-            "data": result,
-        }
+    With ``passthrough``, the global is returned as RawJSON (for
+    ``dumps_result``) instead of being parsed.
+    """
+    client = await get_cms_client()
+    with track_stale_reads() as reads:
+        result = await client.get_global(global_slug=global_slug, as_json=passthrough)
+    if passthrough:
+        result = RawJSON(result)
+
+    response = {
+        "success": True,
+        "data": result,
+    }
+    if reads.stale:
+        response["meta"] = {"stale": True}
+    return response
 
 
 async def update_global_handler(global_slug: str, data: dict, **kwargs) -> dict:
@@ -34,17 +47,17 @@ async def update_global_handler(global_slug: str, data: dict, **kwargs) -> dict:
     if not data:
         raise ValidationError("No update data provided")
 
-    async with EnhancedCMSClient() as client:
-        result = await client.update_global(
-            global_slug=global_slug,
-            data=data,
-        )
+    client = await get_cms_client()
+    result = await client.update_global(
+        global_slug=global_slug,
+        data=data,
+    )
 
-        return {
-            "success": True,
-            "message": f"Global '{global_slug}' updated successfully",
-            "data": result,
-        }
+    return {
+        "success": True,
+        "message": f"Global '{global_slug}' updated successfully",
+        "data": result,
+    }
 
 
 async def list_globals_handler(**kwargs) -> dict:
@@ -73,15 +86,15 @@ async def reset_global_handler(global_slug: str, **kwargs) -> dict:
 
 async def export_global_handler(global_slug: str, **kwargs) -> dict:
     """Handle export global operation."""
-    async with EnhancedCMSClient() as client:
-        data = await client.get_global(global_slug=global_slug)
+    client = await get_cms_client()
+    data = await client.get_global(global_slug=global_slug)
 
-        return {
-            "success": True,
-            "globalSlug": global_slug,
-            "data": data,
-            "exportedAt": datetime.now().isoformat(),
-        }
+    return {
+        "success": True,
+        "globalSlug": global_slug,
+        "data": data,
+        "exportedAt": datetime.now().isoformat(),
+    }
 
 
 async def import_global_handler(global_slug: str, data: dict, **kwargs) -> dict:
@@ -89,17 +102,17 @@ async def import_global_handler(global_slug: str, data: dict, **kwargs) -> dict:
     if not data:
         raise ValidationError("No import data provided")
 
-    async with EnhancedCMSClient() as client:
-        result = await client.update_global(
-            global_slug=global_slug,
-            data=data,
-        )
+    client = await get_cms_client()
+    result = await client.update_global(
+        global_slug=global_slug,
+        data=data,
+    )
 
-        return {
-            "success": True,
-            "globalSlug": global_slug,
-            "message": f"Global '{global_slug}' imported successfully",
-        }
+    return {
+        "success": True,
+        "globalSlug": global_slug,
+        "message": f"Global '{global_slug}' imported successfully",
+    }
 
 
 async def validate_global_handler(global_slug: str, data: dict, **kwargs) -> dict:
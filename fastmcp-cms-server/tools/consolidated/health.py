@@ -4,7 +4,7 @@ import inspect
 import time
 from typing import Literal, Optional
 
-from services.cms_client_enhanced import EnhancedCMSClient
+from services.cms_client_enhanced import get_cms_client
 from core.registry import OperationRegistry
 from core.middleware import create_default_middleware_stack
 from core.connection_pool import get_global_pool
@@ -36,49 +36,49 @@ async def health_check_handler(**kwargs) -> dict:
     """Handle health check operation."""
     uptime = int(time.time() - START_TIME)
 
-    async with EnhancedCMSClient() as client:
-        cms_health = await client.check_health()
-
-        return {
-            "status": "healthy" if cms_health.get("cms_connected") else "degraded",
-            "server": {
-                "name": Config.MCP_SERVER_NAME,
-                "version": Config.MCP_SERVER_VERSION,
-                "uptime_seconds": uptime,
-            },
-            "cms": cms_health,
-            "features": {
-                "caching": Config.ENABLE_CACHING,
-                "audit_log": Config.ENABLE_AUDIT_LOG,
-                "draft_mode": Config.ENABLE_DRAFT_MODE,
-            },
-        }
+    client = await get_cms_client()
+    cms_health = await client.check_health()
+
+    return {
+        "status": "healthy" if cms_health.get("cms_connected") else "degraded",
+        "server": {
+            "name": Config.MCP_SERVER_NAME,
+            "version": Config.MCP_SERVER_VERSION,
+            "uptime_seconds": uptime,
+        },
+        "cms": cms_health,
+        "features": {
+            "caching": Config.ENABLE_CACHING,
+            "audit_log": Config.ENABLE_AUDIT_LOG,
+            "draft_mode": Config.ENABLE_DRAFT_MODE,
+        },
+    }
 
 
 async def metrics_handler(**kwargs) -> dict:
     """Handle metrics operation."""
-    async with EnhancedCMSClient() as client:
-        metrics = await maybe_await(client.get_metrics())
+    client = await get_cms_client()
+    metrics = await maybe_await(client.get_metrics())
 
-        # Add connection pool metrics
-        pool = await get_global_pool()
-        metrics["connection_pool"] = await maybe_await(pool.get_stats())
+    # Add connection pool metrics
+    pool = await get_global_pool()
+    metrics["connection_pool"] = await maybe_await(pool.get_stats())
 
-        return {
-            "success": True,
-            "metrics": metrics,
-        }
+    return {
+        "success": True,
+        "metrics": metrics,
+    }
 
 
 async def cache_stats_handler(**kwargs) -> dict:
     """Handle cache stats operation."""
-    async with EnhancedCMSClient() as client:
-        cache_stats = await maybe_await(client.cache.get_stats())
+    client = await get_cms_client()
+    cache_stats = await maybe_await(client.cache.get_stats())
 
-        return {
-            "success": True,
-            "cache": cache_stats,
-        }
+    return {
+        "success": True,
+        "cache": cache_stats,
+    }
 
 
 async def connection_status_handler(**kwargs) -> dict:
@@ -86,14 +86,14 @@ async def connection_status_handler(**kwargs) -> dict:
     pool = await get_global_pool()
     pool_stats = await maybe_await(pool.get_stats())
 
-    async with EnhancedCMSClient() as client:
-        circuit_breaker_state = await maybe_await(client.circuit_breaker.get_state())
+    client = await get_cms_client()
+    circuit_breaker_state = await maybe_await(client.circuit_breaker.get_state())
 
-        return {
-            "success": True,
-            "connection_pool": pool_stats,
-            "circuit_breaker": circuit_breaker_state,
-        }
+    return {
+        "success": True,
+        "connection_pool": pool_stats,
+        "circuit_breaker": circuit_breaker_state,
+    }
 
 
 # ============================================================================
@@ -21,10 +21,11 @@ from typing import Literal, Optional, Any, Union
 
 import httpx
 
-from services.cms_client_enhanced import EnhancedCMSClient
+from services.cms_client_enhanced import get_cms_client
 from core.registry import OperationRegistry
 from core.middleware import create_default_middleware_stack
 from core.retry import execute_with_retry
+from core.smart_cache import track_stale_reads
 from schemas.operation_schemas import OPERATION_SCHEMAS
 from utils.logging import get_logger
 from utils.errors import ValidationError
@@ -190,13 +191,13 @@ async def media_upload_handler(
 
         assert upload_path is not None
 
-        async with EnhancedCMSClient() as cms:
-            result = await cms.upload_media_file_path(
-                local_path=upload_path,
-                filename=inferred_filename,
-                mime_type=inferred_mime,
-                fields=fields,
-            )
+        cms = await get_cms_client()
+        result = await cms.upload_media_file_path(
+            local_path=upload_path,
+            filename=inferred_filename,
+            mime_type=inferred_mime,
+            fields=fields,
+        )
 
         media_id = result.get("id")
 
@@ -262,8 +263,8 @@ async def media_register_handler(
         "media_type": media_type,
     }
 
-    async with EnhancedCMSClient() as cms:
-        created = await cms.create_document(collection="media", data=data, draft=False)
+    cms = await get_cms_client()
+    created = await cms.create_document(collection="media", data=data, draft=False)
 
     media_id = created.get("id")
 
@@ -285,16 +286,20 @@ async def media_get_handler(
     if not media_id:
         raise ValidationError("media_id is required for get operation")
 
-    async with EnhancedCMSClient() as cms:
+    cms = await get_cms_client()
+    with track_stale_reads() as reads:
         result = await cms.get_document(collection="media", doc_id=media_id)
 
-    return {
+    response = {
         "success": True,
         "operation": "get",
         "message": "Media retrieved successfully",
         "mediaId": media_id,
         "data": result,
     }
+    if reads.stale:
+        response["meta"] = {"stale": True}
+    return response
 
 
 async def media_list_handler(
@@ -321,7 +326,8 @@ async def media_list_handler(
         else:
             parsed_filters = filters
 
-    async with EnhancedCMSClient() as cms:
+    cms = await get_cms_client()
+    with track_stale_reads() as reads:
         result = await cms.get_collection(
             collection="media",
             filters=parsed_filters,
@@ -329,7 +335,7 @@ async def media_list_handler(
             page=page,
         )
 
-    return {
+    response = {
         "success": True,
         "operation": "list",
         "message": f"Found {result.get('totalDocs', 0)} media documents",
@@ -339,6 +345,9 @@ async def media_list_handler(
         "totalPages": result.get("totalPages", 1),
         "limit": result.get("limit", limit),
     }
+    if reads.stale:
+        response["meta"] = {"stale": True}
+    return response
 
 
 # ============================================================================
@@ -1,5 +1,7 @@
 """Custom exceptions for FastMCP CMS Server."""
 
+from typing import Optional
+
 
 class CMSError(Exception):
     """Base exception for CMS-related errors."""
@@ -32,10 +34,28 @@ class RateLimitError(CMSError):
 
 
 class CMSConnectionError(CMSError):
-    """Raised when CMS connection fails."""
-    pass
+    """
+    Raised when CMS connection fails or the CMS answers with an error.
+
+    ``status_code`` is the HTTP status the CMS answered with, or None
+    if no answer arrived (so the request may or may not have applied).
+    """
+
+    def __init__(self, message: str = "", status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+    @property
+    def is_client_error(self) -> bool:
+        """Whether the CMS refused the request with a 4xx, applying nothing."""
+        return self.status_code is not None and 400 <= self.status_code < 500
 
 
 class CMSTimeoutError(CMSError):
     """Raised when CMS request times out."""
     pass
+
+
+class BulkWriteRejectedError(CMSError):
+    """Raised when the CMS rejects a bulk write without applying any of it."""
+    pass
@@ -22,6 +22,7 @@ import Footer from './payload/globals/Footer';
 import PortfolioPage from './payload/globals/PortfolioPage';
 import ContactPage from './payload/globals/ContactPage';
 import UIText from './payload/globals/UIText';
+import { withCacheInvalidation, withGlobalCacheInvalidation } from './payload/hooks/cacheInvalidation';
 
 export default buildConfig({
   // Use window.location.origin in browser for admin, env var for server
@@ -95,6 +96,13 @@ export default buildConfig({
         zlib: requireShim.resolve('browserify-zlib'),
       };
 
+      // Server-only modules replaced by stand-ins in the admin bundle
+      config.resolve.alias = {
+        ...config.resolve.alias,
+        [path.resolve(__dirname, 'payload/hooks/signChangeEvent')]:
+          path.resolve(__dirname, 'payload/mocks/signChangeEvent'),
+      };
+
 
       
       return config;
@@ -105,13 +113,13 @@ export default buildConfig({
     },
   },
   editor: slateEditor({}),
-  collections: [
+  collections: withCacheInvalidation([
     Users,
     Projects,
     Portfolio,
     Media,
-  ],
-  globals: [
+  ]),
+  globals: withGlobalCacheInvalidation([
     SiteSettings,
     HomeIntro,
     AboutPage,
@@ -120,7 +128,7 @@ export default buildConfig({
     PortfolioPage,
     ContactPage,
     UIText,
-  ],
+  ]),
   typescript: {
     outputFile: path.resolve(__dirname, 'payload-types.ts'),
   },
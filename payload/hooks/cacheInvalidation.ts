@@ -0,0 +1,143 @@
+import type {
+  CollectionAfterChangeHook,
+  CollectionAfterDeleteHook,
+  CollectionConfig,
+  GlobalAfterChangeHook,
+  GlobalConfig,
+} from 'payload/types';
+import { signChangeEvent } from './signChangeEvent';
+
+/**
+ * Cache Invalidation Hooks
+ *
+ * Tells the FastMCP CMS server which documents and globals changed so it
+ * can evict exactly those cache entries instead of waiting for their TTL.
+ *
+ * Each event is POSTed to MCP_INVALIDATION_URL, signed with
+ * HMAC-SHA256 over the body using MCP_INVALIDATION_SECRET
+ * (X-Payload-Signature: sha256=<hex>). Nothing is sent unless both are
+ * set. Delivery is fire-and-forget: a slow or unreachable MCP server
+ * never blocks or fails an editor's save.
+ */
+
+interface ChangeEvent {
+  collection?: string;
+  global?: string;
+  id?: string | number;
+  operation: 'create' | 'update' | 'delete';
+  changes?: string[];
+  updatedAt?: string;
+  timestamp: number;
+}
+
+const TIMEOUT_MS = 2000;
+
+// Fields Payload rewrites on every save; they don't make a change on their own
+const BOOKKEEPING_FIELDS = new Set(['updatedAt', 'createdAt']);
+
+const isServer = () => typeof (global as any).window === 'undefined';
+
+/**
+ * Top-level fields whose values differ between two versions of a document.
+ */
+export const changedFields = (doc: any, previousDoc: any): string[] => {
+  if (!previousDoc) {
+    return Object.keys(doc || {}).filter((key) => !BOOKKEEPING_FIELDS.has(key));
+  }
+  const keys = new Set([...Object.keys(doc || {}), ...Object.keys(previousDoc)]);
+  return [...keys].filter(
+    (key) =>
+      !BOOKKEEPING_FIELDS.has(key) &&
+      JSON.stringify(doc?.[key]) !== JSON.stringify(previousDoc?.[key])
+  );
+};
+
+export const sendChangeEvent = async (event: Omit<ChangeEvent, 'timestamp'>): Promise<void> => {
+  const url = process.env.MCP_INVALIDATION_URL;
+  const secret = process.env.MCP_INVALIDATION_SECRET;
+  if (!url || !secret || !isServer()) {
+    return;
+  }
+
+  const body = JSON.stringify({ ...event, timestamp: Date.now() / 1000 });
+  const signature = signChangeEvent(body, secret);
+
+  const controller = new AbortController();
+  const timer = setTimeout(() => controller.abort(), TIMEOUT_MS);
+  try {
+    const response = await fetch(url, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        'X-Payload-Signature': `sha256=${signature}`,
+      },
+      body,
+      signal: controller.signal,
+    });
+    if (!response.ok) {
+      console.error('[CacheInvalidation] MCP server rejected event:', response.status);
+    }
+  } catch (error) {
+    console.error('[CacheInvalidation] Failed to notify MCP server:', error);
+  } finally {
+    clearTimeout(timer);
+  }
+};
+
+export const cacheInvalidationAfterChange = (slug: string): CollectionAfterChangeHook =>
+  async ({ doc, previousDoc, operation }) => {
+    void sendChangeEvent({
+      collection: slug,
+      id: doc?.id,
+      operation,
+      changes: operation === 'update' ? changedFields(doc, previousDoc) : undefined,
+      updatedAt: doc?.updatedAt,
+    });
+    return doc;
+  };
+
+export const cacheInvalidationAfterDelete = (slug: string): CollectionAfterDeleteHook =>
+  async ({ doc, id }) => {
+    void sendChangeEvent({ collection: slug, id: id ?? doc?.id, operation: 'delete' });
+    return doc;
+  };
+
+export const globalCacheInvalidationAfterChange = (slug: string): GlobalAfterChangeHook =>
+  async ({ doc }) => {
+    void sendChangeEvent({ global: slug, operation: 'update', updatedAt: doc?.updatedAt });
+    return doc;
+  };
+
+/**
+ * Add cache invalidation hooks to collections, after their own hooks.
+ */
+export const withCacheInvalidation = (collections: CollectionConfig[]): CollectionConfig[] =>
+  collections.map((collection) => ({
+    ...collection,
+    hooks: {
+      ...collection.hooks,
+      afterChange: [
+        ...(collection.hooks?.afterChange || []),
+        cacheInvalidationAfterChange(collection.slug),
+      ],
+      afterDelete: [
+        ...(collection.hooks?.afterDelete || []),
+        cacheInvalidationAfterDelete(collection.slug),
+      ],
+    },
+  }));
+
+/**
+ * Add cache invalidation hooks to globals, after their own hooks.
+ */
+export const withGlobalCacheInvalidation = (globals: GlobalConfig[]): GlobalConfig[] =>
+  globals.map((globalConfig) => ({
+    ...globalConfig,
+    hooks: {
+      ...globalConfig.hooks,
+      afterChange: [
+        ...(globalConfig.hooks?.afterChange || []),
+        globalCacheInvalidationAfterChange(globalConfig.slug),
+      ],
+    },
+  }));
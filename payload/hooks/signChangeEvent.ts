@@ -0,0 +1,11 @@
+import { createHmac } from 'crypto';
+
+/**
+ * HMAC-SHA256 signature of a change event body, as hex.
+ *
+ * Server-only: the admin bundle aliases this module to
+ * payload/mocks/signChangeEvent.ts (see payload.config.ts), so node's
+ * crypto is never bundled for the browser.
+ */
+export const signChangeEvent = (body: string, secret: string): string =>
+  createHmac('sha256', secret).update(body).digest('hex');
@@ -0,0 +1,8 @@
+/**
+ * Admin UI stand-in for payload/hooks/signChangeEvent.ts.
+ *
+ * Change events are only sent from the server, so this is never called.
+ */
+export const signChangeEvent = (_body: string, _secret: string): string => {
+  throw new Error('Change events are signed on the server only');
+};